@@ -0,0 +1,78 @@
+"""Scaling benchmark of compute_atom_map and Molecule.valid_atom_map on
+D2h clouds of 10 to 5,000 atoms, comparing the array-based mapping of all
+atoms under all operations at once against applying each operation to each
+atom and scanning for the image (the former behavior).
+
+    python devtools/scripts/bench_atom_map.py -n 10 100 1000 5000
+
+"""
+import time
+import argparse
+
+import numpy as np
+
+import qcdb
+from qcdb.molecule.libmintsmolecule import compute_atom_map
+
+parser = argparse.ArgumentParser(description='Times atom mapping under the point group on N-atom D2h molecules.')
+parser.add_argument('-n', '--natom', type=int, nargs='+', default=[10, 100, 1000, 5000],
+                    help='Approximate numbers of atoms (rounded to multiples of 8)')
+parser.add_argument('--reference-max', type=int, default=5000,
+                    help='Largest molecule for which to time the atom-by-atom reference')
+args = parser.parse_args()
+
+
+def d2h_cloud(natom, rs):
+    """Molecule of `natom` // 8 random points in an octant and their seven images."""
+
+    pts = rs.uniform(0.5, 2.0 * natom**(1. / 3.), (max(1, natom // 8), 3))
+    signs = np.array([[a, b, c] for a in (1, -1) for b in (1, -1) for c in (1, -1)])
+    xyz = (pts[:, None, :] * signs[None, :, :]).reshape(-1, 3)
+    lines = ['C {:.10f} {:.10f} {:.10f}'.format(*row) for row in xyz]
+    lines.extend(['units bohr', 'no_com', 'no_reorient'])
+    mol = qcdb.Molecule('\n'.join(lines))
+    mol.update_geometry()
+    return mol
+
+
+def atomwise_atom_map(mol, tol=0.05):
+    ct = mol.point_group().char_table()
+    atom_map = []
+    for at in range(mol.natom()):
+        ac = mol.xyz(at)
+        row = []
+        for g in range(ct.order()):
+            so = ct.symm_operation(g)
+            np3 = [sum(so[ii][jj] * ac[jj] for jj in range(3)) for ii in range(3)]
+            row.append(mol.atom_at_position(np3, tol))
+        atom_map.append(row)
+    return atom_map
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+rs = np.random.RandomState(1)
+print('{:>7} {:>5} {:>14} {:>14} {:>14} {:>9}'.format('natom', 'pg', 'atom_map [s]', 'valid [s]', 'atomwise [s]', 'speedup'))
+for natom in args.natom:
+    mol = d2h_cloud(natom, rs)
+    repeat = 5 if mol.natom() < 1000 else 2
+
+    tmap, amap = best_of(lambda: compute_atom_map(mol), repeat)
+    tvalid, valid = best_of(lambda: mol.valid_atom_map(), repeat)
+    assert valid
+
+    if mol.natom() <= args.reference_max:
+        tref, refmap = best_of(lambda: atomwise_atom_map(mol), 1)
+        assert refmap == amap
+        ref = '{:14.5f} {:9.1f}'.format(tref, tref / tmap)
+    else:
+        ref = '{:>14} {:>9}'.format('-', '-')
+
+    print('{:7d} {:>5} {:14.5f} {:14.5f} {}'.format(mol.natom(), mol.schoenflies_symbol(), tmap, tvalid, ref))
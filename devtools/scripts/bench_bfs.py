@@ -0,0 +1,118 @@
+"""Scaling benchmark of qcdb.bfs.BFS fragment detection on boxes of liquid
+water of 300 to 100,000 atoms, comparing the cell-list bond graph and
+union-find components against the atom-by-atom BFS over string-keyed
+blocks (the former behavior), which is timed only for small boxes.
+
+    python devtools/scripts/bench_bfs.py -n 300 3000 30000 100000
+
+"""
+import math
+import time
+import argparse
+import collections
+
+import numpy as np
+import qcelemental as qcel
+
+from qcdb.bfs import BFS, _get_covalent_radii
+
+parser = argparse.ArgumentParser(description='Times BFS fragmentation of N-atom water boxes.')
+parser.add_argument('-n', '--natom', type=int, nargs='+', default=[300, 3000, 30000, 100000],
+                    help='Approximate numbers of atoms (rounded to multiples of 3)')
+parser.add_argument('--seeds', type=int, default=0, help='Number of single-molecule seed fragments')
+parser.add_argument('--reference-max', type=int, default=3000,
+                    help='Largest box for which to time the atom-by-atom reference')
+args = parser.parse_args()
+
+
+def water_box(natom, rs):
+    """Randomly oriented waters on a jittered cubic lattice at liquid density."""
+
+    nwat = max(1, natom // 3)
+    side = int(math.ceil(nwat**(1. / 3.)))
+    spacing = 3.1 / qcel.constants.bohr2angstroms
+    grid = np.array([[i, j, k] for i in range(side) for j in range(side) for k in range(side)][:nwat], dtype=float)
+    centers = spacing * grid + rs.normal(0., 0.2, (nwat, 3))
+
+    water = np.array([[0., 0., 0.], [1.43, 1.11, 0.], [-1.43, 1.11, 0.]])
+    rot = np.array([np.linalg.qr(m)[0] for m in rs.normal(size=(nwat, 3, 3))])
+    geom = (centers[:, None, :] + np.einsum('wij,aj->wai', rot, water)).reshape(-1, 3)
+    elem = np.array(['O', 'H', 'H'] * nwat)
+    perm = rs.permutation(geom.shape[0])
+    return geom[perm], elem[perm]
+
+
+def blockwise_BFS(geom, elem, seed_atoms=None, bond_threshold=1.20):
+    radii = _get_covalent_radii(elem)
+    blocksize = int(math.ceil(2.0 * bond_threshold * np.max(radii)))
+
+    def key(x, y, z):
+        return '{},{},{}'.format(x - x % blocksize, y - y % blocksize, z - z % blocksize)
+
+    allblocks = collections.defaultdict(list)
+    for at in range(geom.shape[0]):
+        allblocks[key(*(int(math.floor(geom[at][j])) for j in range(3)))].append(at)
+
+    bond_tree = [[] for at in range(geom.shape[0])]
+    for blk in allblocks:
+        x, y, z = (int(v) for v in blk.split(','))
+        nbrs = set(key(x + blocksize * (i - 1), y + blocksize * (j - 1), z + blocksize * (k - 1))
+                   for i in range(3) for j in range(3) for k in range(3)) & set(allblocks)
+        atom_list = [at for nbr in nbrs for at in allblocks[nbr]]
+        for at1 in allblocks[blk]:
+            for at2 in atom_list:
+                r2_ij = sum((geom[at1][i] - geom[at2][i])**2 for i in range(3))
+                if at1 != at2 and r2_ij <= bond_threshold * (radii[at1] + radii[at2])**2:
+                    if at2 not in bond_tree[at1]:
+                        bond_tree[at1].append(at2)
+                    if at1 not in bond_tree[at2]:
+                        bond_tree[at2].append(at1)
+
+    allfragments = [list(fr) for fr in (seed_atoms or [])]
+    new_list = [list(fr) for fr in allfragments]
+    break_list = [at for fr in allfragments for at in fr]
+    unfound_list = [at for at in range(geom.shape[0]) if at not in break_list]
+    while len(unfound_list) > 0:
+        for ifr, fr in enumerate(new_list):
+            while len(fr) > 0:
+                for at1 in reversed(fr):
+                    for at2 in bond_tree[at1]:
+                        if at2 in unfound_list and at2 not in break_list:
+                            allfragments[ifr].append(at2)
+                            new_list[ifr].append(at2)
+                            unfound_list.remove(at2)
+                    new_list[ifr].remove(at1)
+        if len(unfound_list) > 0:
+            allfragments.append([unfound_list[0]])
+            new_list.append([unfound_list[0]])
+            unfound_list.remove(unfound_list[0])
+    return [sorted(fr) for fr in allfragments]
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+rs = np.random.RandomState(1)
+print('{:>7} {:>7} {:>10} {:>14} {:>9}'.format('natom', 'nfrag', 'BFS [s]', 'blockwise [s]', 'speedup'))
+for natom in args.natom:
+    geom, elem = water_box(natom, rs)
+    seeds = [[at] for at in rs.choice(geom.shape[0], min(args.seeds, geom.shape[0]), replace=False).tolist()]
+    repeat = 5 if geom.shape[0] < 10000 else 2
+
+    tbfs, frags = best_of(lambda: BFS(geom, elem, seed_atoms=seeds), repeat)
+    assert sorted(at for fr in frags for at in fr) == list(range(geom.shape[0]))
+
+    if geom.shape[0] <= args.reference_max:
+        tref, ref = best_of(lambda: blockwise_BFS(geom, elem, seed_atoms=seeds), 1)
+        assert ref == frags
+        ref = '{:14.5f} {:9.1f}'.format(tref, tref / tbfs)
+    else:
+        ref = '{:>14} {:>9}'.format('-', '-')
+
+    print('{:7d} {:7d} {:10.5f} {}'.format(geom.shape[0], len(frags), tbfs, ref))
@@ -0,0 +1,64 @@
+"""Micro-benchmark of Molecule geometry access on a long Z-matrix chain,
+comparing the cached geometry array against recomputing it from the
+CoordEntry-s on every call (the pre-cache behavior).
+
+    python devtools/scripts/bench_geometry.py -n 200
+
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+import qcdb
+
+parser = argparse.ArgumentParser(description='Times Molecule.geometry() and friends on an N-atom Z-matrix.')
+parser.add_argument('-n', '--natom', type=int, default=200, help='Number of atoms in the Z-matrix chain')
+parser.add_argument('-r', '--repeat', type=int, default=200, help='Calls per timing')
+args = parser.parse_args()
+
+
+def zmat_chain(natom):
+    lines = ['C', 'C 1 rcc', 'C 2 rcc 1 acc']
+    for at in range(4, natom + 1):
+        lines.append('C {} rcc {} acc {} d{}'.format(at - 1, at - 2, at - 3, at))
+    lines.append('rcc = 1.54')
+    lines.append('acc = 112.0')
+    lines.extend('d{} = {}'.format(at, 60.0 + 7.0 * at) for at in range(4, natom + 1))
+    lines.append('symmetry c1')
+    return '\n'.join(lines)
+
+
+def uncached_geometry(mol):
+    geom = np.asarray([mol.atoms[at].compute() for at in range(mol.natom())])
+    geom *= mol.input_units_to_au()
+    return geom
+
+
+def uncached_xyz(mol, at):
+    return (mol.input_units_to_au() * np.asarray(mol.atoms[at].compute())).tolist()
+
+
+mol = qcdb.Molecule(zmat_chain(args.natom))
+t_update = timeit.timeit(mol.update_geometry, number=1)
+assert np.allclose(uncached_geometry(mol), mol.geometry(np_out=True))
+
+timings = [
+    ('geometry()', lambda: uncached_geometry(mol), lambda: mol.geometry(np_out=True)),
+    ('xyz(at) over all atoms', lambda: [uncached_xyz(mol, at) for at in range(mol.natom())],
+     lambda: [mol.xyz(at) for at in range(mol.natom())]),
+    ('atom_at_position()', lambda: np.argmin(np.sum((uncached_geometry(mol) - mol.xyz(7))**2, axis=1)),
+     lambda: mol.atom_at_position(mol.xyz(7))),
+]
+
+print('natom {}, first update_geometry {:.3f} s'.format(mol.natom(), t_update))
+print('{:28} {:>12} {:>12} {:>8}'.format('per call', 'uncached/us', 'cached/us', 'speedup'))
+for label, before, after in timings:
+    tb = timeit.timeit(before, number=args.repeat) / args.repeat * 1.e6
+    ta = timeit.timeit(after, number=args.repeat) / args.repeat * 1.e6
+    print('{:28} {:12.1f} {:12.1f} {:8.1f}'.format(label, tb, ta, tb / ta))
+
+mol.lock_frame = False
+mol.set_variable('rcc', 1.50)
+t_update = timeit.timeit(mol.update_geometry, number=1)
+print('after set_variable, update_geometry {:.3f} s'.format(t_update))
@@ -0,0 +1,107 @@
+"""Benchmark of NWChem output harvesting on a synthetic geometry
+optimization log, comparing the single-scan harvester against running
+each quantity's pattern over the whole text of every " Line search:"
+portion in turn (the previous behavior).
+
+    python devtools/scripts/bench_nwchem_harvest.py -n 50 --fill 2000
+
+"""
+import io
+import re
+import argparse
+import contextlib
+import timeit
+
+import numpy as np
+
+from qcdb.intf_nwchem import harvester
+
+parser = argparse.ArgumentParser(description='Times NWChem harvest_output on an N-step optimization log.')
+parser.add_argument('-n', '--nstep', type=int, default=50, help='Number of optimization steps')
+parser.add_argument('--fill', type=int, default=2000, help='SCF iteration lines per step')
+parser.add_argument('-r', '--repeat', type=int, default=3, help='Calls per timing')
+args = parser.parse_args()
+
+
+def step_text(istep, nfill):
+    rs = np.random.RandomState(istep)
+    geom = np.array([[0., 0., 0.2214], [0., 1.4304, -0.8857], [0., -1.4304, -0.8857]]) * (1 + 0.001 * istep)
+    grad = rs.uniform(-0.03, 0.03, (3, 3))
+    lines = [
+        '                             Geometry "geometry" -> ""',
+        '                             -------------------------',
+        '',
+        ' Output coordinates in a.u. (scale by  1.000000000 to convert to a.u.)',
+        '',
+        '  No.       Tag          Charge          X              Y              Z',
+        ' ---- ---------------- ---------- -------------- -------------- --------------',
+    ]
+    for at, (elem, z) in enumerate([('O', 8), ('H', 1), ('H', 1)]):
+        lines.append('  {:3d} {:16s} {:10.4f} {:14.8f} {:14.8f} {:14.8f}'.format(at + 1, elem, z, *geom[at]))
+    lines.extend([
+        '',
+        '          Charge           :     0',
+        '          Spin multiplicity:     1',
+        '',
+        '      Effective nuclear repulsion energy (a.u.)       {:.10f}'.format(9.168 - 0.01 * istep),
+    ])
+    for it in range(nfill):
+        lines.append('     d= 0,ls=0.0,diis     {:3d}    -76.{:010d}  -1.23D-0{}  4.56D-05    {:.1f}'.format(
+            it % 30 + 1, rs.randint(0, 10**9), it % 9 + 1, 0.1 * it))
+    lines.extend([
+        '',
+        '         Total SCF energy =    {:.12f}'.format(-76.02663273 - 0.0001 * istep),
+        '',
+        '                         RHF ENERGY GRADIENTS',
+        '',
+        '    atom               coordinates                        gradient',
+        '                 x          y          z           x          y          z',
+    ])
+    for at, elem in enumerate(['O', 'H', 'H']):
+        lines.append('   {} {:2s}    {:10.6f} {:10.6f} {:10.6f}  {:10.6f} {:10.6f} {:10.6f}'.format(
+            at + 1, elem, *geom[at], *grad[at]))
+    lines.extend(['', ''])
+    return '\n'.join(lines)
+
+
+def opt_log(nstep, nfill):
+    text = [' Northwest Computational Chemistry Package (NWChem) 6.8\n']
+    for istep in range(nstep):
+        text.append(step_text(istep, nfill))
+        text.append('  Line search: \n      step= 1.00 grad=-1.2D-03 hess= 8.9D-04 energy=    -76.026633 mode=accept  \n')
+    text.append(step_text(nstep, nfill))
+    return '\n'.join(text)
+
+
+def per_pattern(outpass):
+    return {name: (pattern.findall(outpass) if findall else pattern.search(outpass))
+            for name, lead, findall, pattern in harvester._quantities}
+
+
+def per_pattern_output(outtext):
+    return [per_pattern(outpass) for outpass in re.split(r' Line search:', outtext)]
+
+
+def quiet_harvest_output(outtext):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return harvester.harvest_output(outtext)
+
+
+outtext = opt_log(args.nstep, args.fill)
+lastpass = outtext.rsplit(' Line search:', 1)[-1]
+
+psivar, coord, grad, version, error = quiet_harvest_output(outtext)
+assert str(psivar['HF TOTAL ENERGY']) == per_pattern(lastpass)['scf'].group(1)
+assert all(bool(per_pattern(lastpass)[k]) == bool(v) for k, v in harvester._scan(lastpass).items())
+
+timings = [
+    ('final portion', lambda: per_pattern(lastpass), lambda: harvester._scan(lastpass)),
+    ('whole log', lambda: per_pattern_output(outtext), lambda: quiet_harvest_output(outtext)),
+]
+
+print('{} steps, {:.1f} MB, {} lines'.format(args.nstep, len(outtext) / 1.e6, outtext.count('\n')))
+print('{:26} {:>12} {:>12} {:>8}'.format('per call', 'per-pat/s', 'scan/s', 'speedup'))
+for label, before, after in timings:
+    tb = timeit.timeit(before, number=args.repeat) / args.repeat
+    ta = timeit.timeit(after, number=args.repeat) / args.repeat
+    print('{:26} {:12.4f} {:12.4f} {:8.1f}'.format(label, tb, ta, tb / ta))
@@ -0,0 +1,70 @@
+"""Benchmark of PreservingDict on the writes of a large harvested output:
+per-root excited-state energies that each appear in both the detailed
+and the summary printing, per-iteration CURRENT ENERGY updates, and a
+gradient repeated at every optimization step. Values are set one at a
+time (validated upon each set) and in deferred mode (validated together).
+
+    python devtools/scripts/bench_pdict.py -n 20000
+
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from qcdb.pdict import PreservingDict
+
+parser = argparse.ArgumentParser(description='Times PreservingDict writes of a synthetic large output.')
+parser.add_argument('-n', '--nroot', type=int, default=20000, help='Number of excited-state roots')
+parser.add_argument('--nstep', type=int, default=200, help='Number of gradients (optimization steps)')
+parser.add_argument('--natom', type=int, default=100, help='Number of atoms in gradient')
+parser.add_argument('-r', '--repeat', type=int, default=3, help='Calls per timing')
+args = parser.parse_args()
+
+rs = np.random.RandomState(7)
+energies = rs.uniform(-1., 1., args.nroot) - 76.
+grad = rs.uniform(-0.1, 0.1, (args.natom, 3))
+
+writes = []
+for root, ene in enumerate(energies):
+    writes.append(('ROOT {} TOTAL ENERGY'.format(root), '{:.12f}'.format(ene)))
+    writes.append(('CURRENT ENERGY', '{:.12f}'.format(ene)))
+for root, ene in enumerate(energies):
+    writes.append(('ROOT {} TOTAL ENERGY'.format(root), '{:.8f}'.format(ene)))
+    writes.append(('ROOT {} TOTAL ENERGY'.format(root), '{:.8f}'.format(ene)))
+for step in range(args.nstep):
+    writes.append(('CURRENT GRADIENT', grad))
+    writes.append(('SCF TOTAL GRADIENT', grad + 1.e-9 * step))
+
+
+def one_by_one():
+    psivar = PreservingDict()
+    for key, value in writes:
+        psivar[key] = value
+    return psivar
+
+
+def deferred():
+    psivar = PreservingDict(defer=True)
+    for key, value in writes:
+        psivar[key] = value
+    psivar.reconcile()
+    return psivar
+
+
+def bulk():
+    psivar = PreservingDict()
+    psivar.bulk_update(writes)
+    return psivar
+
+
+ref = one_by_one()
+for fn in [deferred, bulk]:
+    assert sorted(ref.keys()) == sorted(fn().keys())
+
+print('{} writes of {} quantities'.format(len(writes), len(ref)))
+t_ref = timeit.timeit(one_by_one, number=args.repeat) / args.repeat
+print('{:12} {:10.4f} s'.format('one by one', t_ref))
+for fn in [deferred, bulk]:
+    tt = timeit.timeit(fn, number=args.repeat) / args.repeat
+    print('{:12} {:10.4f} s {:8.1f}x'.format(fn.__name__, tt, t_ref / tt))
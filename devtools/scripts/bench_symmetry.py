@@ -0,0 +1,52 @@
+"""Micro-benchmark of Molecule.update_geometry() (symmetry frame and point
+group detection) on fullerene-like spherical shells of carbon atoms.
+
+    python devtools/scripts/bench_symmetry.py -n 1500
+
+"""
+import argparse
+import time
+
+import numpy as np
+
+import qcdb
+
+parser = argparse.ArgumentParser(description='Times update_geometry() on N-atom spherical carbon shells.')
+parser.add_argument('-n', '--natom', type=int, default=1500, help='Number of atoms in the shell')
+args = parser.parse_args()
+
+
+def shell(natom, symmetric):
+    """Fibonacci-sphere shell of radius ~ natom**0.5 bohr, mirrored through
+    xy, xz, and yz for *symmetric* (D2h), else wobbled radially (C1)."""
+
+    radius = 1.3 * natom**0.5
+    if symmetric:
+        nuniq = natom // 8
+        idx = np.arange(nuniq) + 0.5
+        phi = np.arccos(idx / nuniq)
+        theta = np.pi * (1 + 5**0.5) * idx
+        octant = np.abs(np.stack([np.cos(theta) * np.sin(phi), np.sin(theta) * np.sin(phi), np.cos(phi)], axis=1))
+        octant = 0.05 + 0.95 * octant
+        signs = [(sx, sy, sz) for sx in [1, -1] for sy in [1, -1] for sz in [1, -1]]
+        pts = np.vstack([octant * sgn for sgn in signs])
+    else:
+        idx = np.arange(natom) + 0.5
+        phi = np.arccos(1 - 2 * idx / natom)
+        theta = np.pi * (1 + 5**0.5) * idx
+        pts = np.stack([np.cos(theta) * np.sin(phi), np.sin(theta) * np.sin(phi), np.cos(phi)], axis=1)
+        pts *= 1.0 + 0.01 * np.sin(7 * theta)[:, None]
+    pts *= radius
+    return '\n'.join('C {:.12f} {:.12f} {:.12f}'.format(*xyz) for xyz in pts) + '\nunits bohr\n'
+
+
+for label, symmetric in [('C1 shell', False), ('D2h shell', True)]:
+    mol = qcdb.Molecule(shell(args.natom, symmetric), fix_com=True, fix_orientation=True)
+    mol.fix_com(False)
+    mol.fix_orientation(False)
+    mol.lock_frame = False
+    t0 = time.time()
+    mol.update_geometry()
+    print('{:10} natom {:5}  point group {:4}  update_geometry {:8.3f} s'.format(label, mol.natom(),
+                                                                                   mol.point_group().symbol(),
+                                                                                   time.time() - t0))
@@ -0,0 +1,129 @@
+"""Write the reference parameters of Grimme's DFTD3 program, as used by
+the native -D3 engine qcdb.intf_dftd3.native, from the Fortran source of
+the DFTD3 program (https://www.chemie.uni-bonn.de/pctc/mulliken-center/software/dft-d3):
+reference C6 coefficients and their coordination numbers from ``pars.f``
+and cutoff radii (``setr0ab``), scaled covalent radii (``data rcov``), and
+<r4>/<r2> factors (``data r2r4``) from ``dftd3.f``. Alternatively, the same
+parameters are taken from an npz file in the layout of NumPy/PyTorch ports
+of DFTD3 (e.g., ``torch_dftd/nn/params/dftd3_params.npz``), holding
+``c6ab`` (95, 95, 5, 5, 3) as c6, CN of first atom, CN of second atom, and
+``r0ab``, ``rcov``, ``r2r4`` already in atomic units. Arrays are indexed by
+atomic number and written in atomic units.
+
+    python devtools/scripts/build_d3_reference.py path/to/dftd3-source
+    python devtools/scripts/build_d3_reference.py --c6ab path/to/dftd3_params.npz
+
+"""
+import os
+import re
+import argparse
+
+import numpy as np
+
+parser = argparse.ArgumentParser(description='Converts DFTD3 Fortran source parameters into an npz file.')
+source = parser.add_mutually_exclusive_group(required=True)
+source.add_argument('srcdir', nargs='?', help='Directory holding dftd3.f and pars.f')
+source.add_argument('--c6ab', help='npz file of c6ab, r0ab, rcov, r2r4 arrays from a port of DFTD3')
+parser.add_argument('-o', '--output', default=os.path.join('share', 'qcdb', 'dftd3', 'd3_reference.npz'),
+                    help='Location of npz file to write')
+args = parser.parse_args()
+
+max_elem = 94
+maxc = 5
+autoang = 0.52917726  # DFTD3's conversion, not qcel's, so radii match the program's
+_float = re.compile(r'[-+]?\d+\.\d*(?:[dDeE][-+]?\d+)?')
+
+
+def read_fixed_form(path):
+    """Return contents of Fortran source `path` without comment lines or trailing comments."""
+
+    lines = []
+    with open(path, 'r') as handle:
+        for line in handle:
+            if line[:1] in 'cC*!':
+                continue
+            lines.append(line.split('!')[0])
+    return ''.join(lines)
+
+
+def floats(text):
+    return [float(tok.replace('D', 'E').replace('d', 'e')) for tok in _float.findall(text)]
+
+
+def array_assignments(text, name):
+    """Return values of all `name(lo:hi)=(/ ... /)` assignments in `text`, in order."""
+
+    vals = []
+    for block in re.findall(name + r'\s*\(\s*\d+\s*:\s*\d+\s*\)\s*=\s*\(/(.*?)/\)', text, flags=re.DOTALL):
+        vals.extend(floats(block))
+    return vals
+
+
+def data_statement(text, name):
+    """Return values of `data name / ... /` in `text`."""
+
+    match = re.search(r'data\s+' + name + r'\s*/(.*?)/', text, flags=re.DOTALL | re.IGNORECASE)
+    return floats(match.group(1))
+
+
+def from_fortran(srcdir):
+    """Return reference arrays read from DFTD3 Fortran source in `srcdir`."""
+
+    dftd3 = read_fixed_form(os.path.join(srcdir, 'dftd3.f'))
+    pars = read_fixed_form(os.path.join(srcdir, 'pars.f'))
+
+    # C6 references, as copyc6 reads them: (c6, Z + 100 * (iref - 1) of each atom, CN of each atom)
+    c6ref = np.full((max_elem + 1, max_elem + 1, maxc, maxc), -1.0)
+    cnref = np.zeros((max_elem + 1, maxc))
+    nref = np.zeros(max_elem + 1, dtype=int)
+    rows = np.array(array_assignments(pars, 'pars')).reshape(-1, 5)
+    for c6, iadr, jadr, cni, cnj in rows:
+        iat, ia = int(iadr) % 100, int(iadr) // 100
+        jat, ja = int(jadr) % 100, int(jadr) // 100
+        c6ref[iat, jat, ia, ja] = c6
+        c6ref[jat, iat, ja, ia] = c6
+        cnref[iat, ia] = cni
+        cnref[jat, ja] = cnj
+        nref[iat] = max(nref[iat], ia + 1)
+        nref[jat] = max(nref[jat], ja + 1)
+
+    # cutoff radii, lower triangle by rows in Angstrom
+    r0 = np.array(array_assignments(dftd3[dftd3.lower().index('subroutine setr0ab'):], 'r0ab'))
+    assert r0.size == max_elem * (max_elem + 1) // 2, 'r0ab has {} values'.format(r0.size)
+    r0ab = np.zeros((max_elem + 1, max_elem + 1))
+    il = np.tril_indices(max_elem)
+    r0ab[1:, 1:][il] = r0 / autoang
+    r0ab[1:, 1:].T[il] = r0 / autoang
+
+    rcov = np.zeros(max_elem + 1)
+    rcov[1:] = data_statement(dftd3, 'rcov')
+    r2r4 = np.zeros(max_elem + 1)
+    r2r4[1:] = data_statement(dftd3, 'r2r4')
+    return nref, cnref, c6ref, r0ab, rcov, r2r4, rows.shape[0]
+
+
+def from_c6ab(path):
+    """Return reference arrays read from npz file `path` of a port of DFTD3."""
+
+    with np.load(path) as npz:
+        c6ab, r0ab, rcov, r2r4 = (npz[key] for key in ['c6ab', 'r0ab', 'rcov', 'r2r4'])
+
+    # references present for an element are those of nonnegative self-C6
+    selfc6 = c6ab[np.arange(max_elem + 1), np.arange(max_elem + 1), :, :, 0]
+    present = np.diagonal(selfc6, axis1=1, axis2=2) >= 0.0
+    present[0] = False
+    nref = present.sum(axis=1)
+    cnref = np.where(present, c6ab[np.arange(max_elem + 1), np.arange(max_elem + 1), :, 0, 1], 0.0)
+    c6ref = np.where(c6ab[..., 0] > 0.0, c6ab[..., 0], -1.0)
+    return nref, cnref, c6ref, r0ab, rcov, r2r4, np.count_nonzero(c6ref > 0.0)
+
+
+if args.c6ab:
+    nref, cnref, c6ref, r0ab, rcov, r2r4, nc6 = from_c6ab(args.c6ab)
+else:
+    nref, cnref, c6ref, r0ab, rcov, r2r4, nc6 = from_fortran(args.srcdir)
+
+print('{} C6 references for {} elements'.format(nc6, np.count_nonzero(nref)))
+os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+np.savez_compressed(args.output, nref=nref, cnref=cnref, c6ref=c6ref, r0ab=r0ab, rcov=rcov, r2r4=r2r4)
+print('Wrote', args.output)
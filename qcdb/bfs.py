@@ -2,11 +2,12 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import division
 import math
-import collections
 
 import numpy as np
 import qcelemental as qcel
 
+from .exceptions import *
+
 
 def BFS(geom, elem, seed_atoms=None, bond_threshold=1.20):
     """Detect fragments among real atoms through a breadth-first search (BFS) algorithm.
@@ -35,6 +36,9 @@ def BFS(geom, elem, seed_atoms=None, bond_threshold=1.20):
     -----
     Relies upon van der Waals radii and so faulty for close (especially
         hydrogen-bonded) fragments. `seed_atoms` can help.
+    Bonds are found among atoms of neighboring spatial blocks and fragments
+        are connected components of the bond graph, so cost scales linearly
+        with the number of atoms.
 
     Authors
     -------
@@ -51,48 +55,46 @@ def BFS(geom, elem, seed_atoms=None, bond_threshold=1.20):
     >>> frag_elems = [elem[fr] for fr in fragments]
 
     """
-    radii = _get_covalent_radii(elem)
+    geom = np.asarray(geom, dtype=float).reshape(-1, 3)
+    nat = geom.shape[0]
+    radii = _get_covalent_radii(np.asarray(elem))
     max_covalent_radius = np.max(radii)
     blocksize = int(math.ceil(2.0 * bond_threshold * max_covalent_radius))
-    allblocks = _get_blocks(geom, blocksize)
 
-    bond_tree = _get_bond_tree(radii, geom, allblocks, blocksize, bond_threshold)
+    indptr, indices = _get_bond_graph(radii, geom, blocksize, bond_threshold)
+    iatoms = np.repeat(np.arange(nat), np.diff(indptr))
+    jatoms = indices
+
+    # seed fragments from intrafrag atom hints
     if seed_atoms is None:
         seed_atoms = []
-    allfragments = seed_atoms
-
-    # bare queues
-    new_list = []
-    break_list = []
-    unfound_list = list(range(geom.shape[0]))
-
-    # seed queues from intrafrag atom hints
-    for ifr, fr in enumerate(allfragments):
-        new_list.append([])
+    nseed = len(seed_atoms)
+    fragment = np.full(nat, -1, dtype=int)
+    for ifr, fr in enumerate(seed_atoms):
         for at in fr:
-            new_list[ifr].append(at)
-            break_list.append(at)
-            unfound_list.remove(at)
-
-    # perform BFS
-    while len(unfound_list) > 0:
-        for ifr, fr in enumerate(new_list):
-            while len(fr) > 0:
-                for at1 in reversed(fr):
-                    for at2 in bond_tree[at1]:
-                        if at2 in unfound_list and at2 not in break_list:
-                            allfragments[ifr].append(at2)
-                            new_list[ifr].append(at2)
-                            unfound_list.remove(at2)
-                    new_list[ifr].remove(at1)
-        if len(unfound_list) > 0:
-            at_new = unfound_list[0]
-            allfragments.append([at_new])
-            new_list.append([at_new])
-            unfound_list.remove(at_new)
-
-    for fr in range(len(allfragments)):
-        allfragments[fr] = sorted(allfragments[fr])
+            if not (0 <= at < nat) or fragment[at] != -1:
+                raise ValidationError("""Seed atom {} out of range or in more than one fragment: {}""".format(
+                    at, seed_atoms))
+            fragment[at] = ifr
+    unseeded = (fragment == -1)
+
+    # components among unseeded atoms, labeled by their lowest atom index. A
+    #   component bonded to seed atoms joins the earliest such fragment; the
+    #   rest become fragments in order of lowest atom index.
+    free = unseeded[iatoms] & unseeded[jatoms]
+    root = _get_components(nat, iatoms[free], jatoms[free])
+
+    border = ~unseeded[iatoms] & unseeded[jatoms]
+    owner = np.full(nat, nseed, dtype=int)
+    np.minimum.at(owner, root[jatoms[border]], fragment[iatoms[border]])
+    newroots = np.flatnonzero(unseeded & (root == np.arange(nat)) & (owner == nseed))
+    owner[newroots] = nseed + np.arange(newroots.shape[0])
+    fragment[unseeded] = owner[root[unseeded]]
+
+    # atoms sorted by fragment, then index
+    order = np.argsort(fragment, kind='stable')
+    bounds = np.cumsum(np.bincount(fragment, minlength=nseed + newroots.shape[0]))[:-1]
+    allfragments = [fr.tolist() for fr in np.split(order, bounds)]
 
     return allfragments
 
@@ -120,75 +122,89 @@ def _get_covalent_radii(elem):
     #'SB': 2.12 / 1.5,  # Bondi JPC 68 441 (1964)
     #'TE': 2.08 / 1.5,  # Bondi JPC 68 441 (1964)
     #'XE': 2.05 / 1.5}  # Bondi JPC 68 441 (1964)
-    nat = elem.shape[0]
+    uniq, inverse = np.unique(elem, return_inverse=True)
     try:
-        caps = [el.capitalize() for el in elem]
+        caps = [el.capitalize() for el in uniq]
     except AttributeError:
-        caps = [qcel.periodictable.to_E(z) for z in elem]
+        caps = [qcel.periodictable.to_E(z) for z in uniq]
 
-    covrad = np.fromiter((covalent_radii_lookup[caps[at]] for at in range(nat)), dtype=np.float, count=nat)
+    covrad = np.array([covalent_radii_lookup[el] for el in caps], dtype=float)[inverse]
     return np.divide(covrad, qcel.constants.bohr2angstroms)
 
 
-def _get_key(x, y, z, b):
-    """Return key string from point values and block resolution"""
-
-    return """{},{},{}""".format(x - x % b, y - y % b, z - z % b)
-
-
-def _distance2(v, u):
-    """Compute the square distance between points defined by vectors *v* and *u*."""
-
-    return sum(((v[i] - u[i]) * (v[i] - u[i]) for i in range(len(v))))
-
-
-def _get_blocks(geom, blocksize):
-    """Parition atoms into spatial blocks"""
+def _get_bond_graph(radii, geom, blocksize, bond_threshold):
+    """Create bond graph in compressed sparse row form from atomic coordinates
 
-    allblocks = collections.defaultdict(list)
-    for at in range(geom.shape[0]):
-        x, y, z = (int(math.floor(geom[at][j])) for j in range(3))
-        xyz_key = _get_key(x, y, z, blocksize)
-        allblocks[xyz_key].append(at)
-    return allblocks
+    Atoms are partitioned into cubic blocks of edge `blocksize` [a0] so that
+    only atoms in the same or adjacent blocks are tested against the bond
+    cutoff. Neighbors of atom `i` are ``indices[indptr[i]:indptr[i + 1]]``.
 
+    """
+    nat = geom.shape[0]
+    blocks = np.floor_divide(np.floor(geom).astype(np.int64), blocksize)
+    blocks -= blocks.min(axis=0) - 1
+    dims = blocks.max(axis=0) + 2
+    blockid = (blocks[:, 0] * dims[1] + blocks[:, 1]) * dims[2] + blocks[:, 2]
+
+    order = np.argsort(blockid, kind='stable')
+    occupied, first, count = np.unique(blockid[order], return_index=True, return_counts=True)
+
+    # self and the 13 neighbor blocks in the forward half-shell
+    shell = [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1) if (i, j, k) >= (0, 0, 0)]
+
+    iatoms = []
+    jatoms = []
+    for shift in shell:
+        nbr = occupied + (shift[0] * dims[1] + shift[1]) * dims[2] + shift[2]
+        pos = np.minimum(np.searchsorted(occupied, nbr), occupied.shape[0] - 1)
+        blk1 = np.flatnonzero(occupied[pos] == nbr)
+        blk2 = pos[blk1]
+
+        # all atom pairs between the two blocks of each block pair
+        npair = count[blk1] * count[blk2]
+        pair = np.repeat(np.arange(blk1.shape[0]), npair)
+        offset = np.arange(pair.shape[0]) - np.repeat(np.cumsum(npair) - npair, npair)
+        at1 = order[first[blk1][pair] + offset // count[blk2][pair]]
+        at2 = order[first[blk2][pair] + offset % count[blk2][pair]]
+        if shift == (0, 0, 0):
+            upper = at1 < at2
+            at1 = at1[upper]
+            at2 = at2[upper]
+
+        dist = geom[at1] - geom[at2]
+        r2_ij = np.einsum('ij,ij->i', dist, dist)
+        r2_thresh = bond_threshold * (radii[at1] + radii[at2])**2
+        bonded = r2_ij <= r2_thresh
+        iatoms.append(at1[bonded])
+        jatoms.append(at2[bonded])
+
+    rows = np.concatenate(iatoms + jatoms)
+    cols = np.concatenate(jatoms + iatoms)
+    sort = np.lexsort((cols, rows))
+    indptr = np.zeros(nat + 1, dtype=int)
+    np.cumsum(np.bincount(rows, minlength=nat), out=indptr[1:])
+    return indptr, cols[sort]
+
+
+def _get_components(nat, iatoms, jatoms):
+    """Label connected components of bond graph by union-find
+
+    Roots are hooked beneath the lowest-index root to which they are bonded
+    and then compressed by pointer jumping, until every bond joins atoms of
+    one root. Returns per-atom root, the lowest atom index of its component.
 
-def _get_bond_tree(radii, geom, allblocks, blocksize, bond_threshold):
-    """Create bond tree from atomic coordinates"""
-
-    bond_tree = [[] for at in range(geom.shape[0])]
-    for blk in allblocks:
-        atom_list = _get_atoms_from_blocks(_get_neighbor_blocks(blk, blocksize, allblocks), allblocks)
-        for at1 in allblocks[blk]:
-            for at2 in atom_list:
-                r2_ij = _distance2(geom[at1], geom[at2])
-                r2_thresh = bond_threshold * (radii[at1] + radii[at2])**2
-                if at1 != at2 and r2_ij <= r2_thresh:
-                    if at2 not in bond_tree[at1]:
-                        bond_tree[at1].append(at2)
-                    if at1 not in bond_tree[at2]:
-                        bond_tree[at2].append(at1)
-    return bond_tree
-
-
-def _get_neighbor_blocks(block, blocksize, allblocks):
-    """Find occupied blocks which neighbor `block`, including self"""
-
-    x, y, z = (int(block.split(',')[j]) for j in range(3))
-    neighbor_blocks = [_get_key(x + blocksize * (i - 1),
-                                y + blocksize * (j - 1),
-                                z + blocksize * (k - 1),
-                                blocksize)
-                       for i in range(3)
-                       for j in range(3)
-                       for k in range(3)]  # yapf: disable
-    active_blocks = list(set(neighbor_blocks) & set(allblocks))
-    return active_blocks
-
-
-def _get_atoms_from_blocks(blocks, master_blocks):
-    """Get list of atoms in a set of blocks"""
-
-    atoms_nested = [master_blocks[blk] for blk in blocks]
-    atoms = [at for sublist in atoms_nested for at in sublist]
-    return atoms
+    """
+    parent = np.arange(nat)
+    while True:
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+        root1 = parent[iatoms]
+        root2 = parent[jatoms]
+        split = root1 != root2
+        if not np.any(split):
+            return parent
+        np.minimum.at(parent, np.maximum(root1[split], root2[split]), np.minimum(root1[split], root2[split]))
@@ -44,6 +44,8 @@ except ImportError:
 import itertools
 from collections import OrderedDict
 
+import numpy as np
+
 from .exceptions import *
 from .molecule import Molecule
 from .modelchems import Method, BasisSet, Error, methods, bases, errors, pubs
@@ -140,6 +142,56 @@ def average_errors(*args):
     return avgerror
 
 
+def _error_statistics(linear, relative, capped, balanced, weight, mask):
+    """Form error dictionaries like WrappedDatabase.compute_statistics for
+    each column (modelchem) of the (nrxn, ncol) arrays of reaction errors
+    and weights, counting only entries where *mask*. Reactions are summed
+    in row order, so results are those of summing them in turn.
+
+    """
+    count = np.sum(mask, axis=0)
+    if mask.shape[0] == 0:
+        return [initialize_errors() for icol in range(mask.shape[1])]
+
+    def masked(arr, fill):
+        return np.where(mask, arr, fill)
+
+    def total(arr):
+        return np.cumsum(masked(arr, 0.0), axis=0)[-1]
+
+    def extrema(arr):
+        absarr = np.absolute(arr)
+        imax = np.argmax(masked(absarr, -1.0), axis=0)
+        imin = np.argmin(masked(absarr, np.inf), axis=0)
+        return (np.amax(masked(arr, -np.inf), axis=0),
+                np.amin(masked(arr, np.inf), axis=0),
+                np.take_along_axis(arr, imax[None, :], axis=0)[0],
+                np.take_along_axis(arr, imin[None, :], axis=0)[0])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Nrxn = count.astype(float)
+        columns = OrderedDict()
+        for e, arr, denom in [('e', linear, Nrxn), ('pe', relative, Nrxn), ('pbe', balanced, total(weight)),
+                              ('pce', capped, Nrxn)]:
+            s1 = total(arr)
+            s2 = total(arr * arr)
+            columns['pex' + e], columns['nex' + e], columns['max' + e], columns['min' + e] = extrema(arr)
+            columns['m' + e] = s1 / denom
+            columns['ma' + e] = total(np.absolute(arr)) / denom
+            columns['rms' + e] = np.sqrt(s2 / denom)
+            # get math domain errors w/wt in denom for balanced
+            columns['std' + e] = None if e == 'pbe' else np.sqrt((s2 - (s1 * s1) / Nrxn) / Nrxn)
+
+    columns = OrderedDict((stat, None if col is None else col.tolist()) for stat, col in columns.items())
+    errors = []
+    for icol, ncol in enumerate(count.tolist()):
+        if ncol == 0:
+            errors.append(initialize_errors())
+        else:
+            errors.append(OrderedDict((stat, None if col is None else col[icol]) for stat, col in columns.items()))
+    return errors
+
+
 def format_errors(err, mode=1):
     """From error dictionary *err*, returns a LaTeX-formatted string,
     after handling None entries.
@@ -351,6 +403,77 @@ class ReactionDatum(object):
         return text
 
 
+class ModelchemStore(object):
+    """Columnar quantum chemical data for one database project on disk, an
+    uncompressed ``.npz`` archive holding reaction names under ``_rxn``
+    and, per model chemistry label, a float column aligned with them (NaN
+    where no value). Labels under ``_mc`` and a bit-packed mask of which
+    reactions have values per label under ``_present`` answer what data is
+    available without reading any column. Columns are read from disk only
+    when asked for.
+
+    """
+
+    def __init__(self, npzfile):
+        # path to archive
+        self.npzfile = npzfile
+        # open archive, read lazily by member
+        self._handle = None
+        # model chemistry labels, in archive order
+        if '_mc' in self._archive().files:
+            self.modelchems = self._archive()['_mc'].tolist()
+        else:
+            self.modelchems = [mc for mc in self._archive().files if mc not in ['_rxn', '_mc', '_present']]
+        # reaction names aligned with columns
+        self.rxns = self._archive()['_rxn'].tolist()
+        # model chemistries turned into qcdb.ReactionDatum objects
+        self.materialized = set()
+        # mask of values present, modelchems x rxns
+        self._present = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_handle'] = None
+        return state
+
+    def _archive(self):
+        if self._handle is None:
+            self._handle = np.load(self.npzfile)
+        return self._handle
+
+    def column(self, modelchem):
+        """Returns array of *modelchem* values aligned with self.rxns."""
+        return self._archive()[modelchem]
+
+    def presence(self):
+        """Returns boolean array of whether each of self.modelchems (rows)
+        has a value for each of self.rxns (columns).
+
+        """
+        if self._present is None:
+            if '_present' in self._archive().files:
+                packed = self._archive()['_present']
+                self._present = np.unpackbits(packed, axis=1, count=len(self.rxns)).astype(bool)
+            else:
+                self._present = np.array([~np.isnan(self.column(mc)) for mc in self.modelchems],
+                                         dtype=bool).reshape(len(self.modelchems), len(self.rxns))
+        return self._present
+
+    @staticmethod
+    def write(npzfile, rxns, columns):
+        """Writes OrderedDict *columns* of model chemistry labels and arrays
+        of values aligned with *rxns* (NaN where no value) to *npzfile*.
+
+        """
+        labels = list(columns.keys())
+        present = np.array([~np.isnan(columns[mc]) for mc in labels], dtype=bool).reshape(len(labels), len(rxns))
+        np.savez(npzfile,
+                 _rxn=np.array([str(rxn) for rxn in rxns]),
+                 _mc=np.array(labels, dtype=str),
+                 _present=np.packbits(present, axis=1),
+                 **columns)
+
+
 class Subset(object):
     """Affiliated qcdb.Reaction-s
 
@@ -601,6 +724,9 @@ class WrappedDatabase(object):
     >>> asdf = qcdb.WrappedDatabase('Nbc10')
     """
 
+    #: qcdb.ModelchemStore-s of columnar data mapped but not necessarily loaded
+    qcstores = ()
+
     def __init__(self, dbname, pythonpath=None):
         """Instantiate class with case insensitive name *dbname*. Module
         search path can be prepended with *pythonpath*.
@@ -946,12 +1072,11 @@ class WrappedDatabase(object):
                                  tagl=tagl)
         print("""WrappedDatabase %s: Subset %s formed: %d""" % (self.dbse, label, len(self.sset[label].keys())))
 
-    def compute_errors(self, modelchem, benchmark='default', sset='default', failoninc=True, verbose=False):
-        """For full database or subset *sset*, computes raw reaction
-        errors between *modelchem* and *benchmark* model chemistries.
-        Returns error if model chemistries are missing for any reaction in
-        subset unless *failoninc* set to False, whereupon returns partial.
-        Returns dictionary of reaction labels and error forms.
+    def resolve_subset(self, sset):
+        """Returns OrderedDict of reaction labels and qcdb.Reaction objects
+        for subset *sset*, which may be a subset name, a function of the
+        WrappedDatabase, or an array of reaction labels. Unknown subset
+        names give an empty subset.
 
         """
         if isinstance(sset, basestring):
@@ -972,6 +1097,18 @@ class WrappedDatabase(object):
             lsset = OrderedDict()
             for rxn in lsslist:
                 lsset[rxn] = self.hrxn[rxn]
+        return lsset
+
+    def compute_errors(self, modelchem, benchmark='default', sset='default', failoninc=True, verbose=False):
+        """For full database or subset *sset*, computes raw reaction
+        errors between *modelchem* and *benchmark* model chemistries.
+        Returns error if model chemistries are missing for any reaction in
+        subset unless *failoninc* set to False, whereupon returns partial.
+        Returns dictionary of reaction labels and error forms.
+
+        """
+        self.materialize([modelchem, benchmark])
+        lsset = self.resolve_subset(sset)
 
 #        cureinfo = self.get_pec_weightinfo()
         err = {}
@@ -1036,49 +1173,9 @@ class WrappedDatabase(object):
             if verbose:
                 print("""Warning: nothing to compute.""")
         else:
-            Nrxn = float(len(err))
-            error = OrderedDict()
-            # linear (absolute) error
-            linear = [val[0] for val in err.values()]
-            error['pexe'] = max(linear)
-            error['nexe'] = min(linear)
-            error['maxe'] = max(linear, key=lambda x: abs(x))
-            error['mine'] = min(linear, key=lambda x: abs(x))
-            error['me'] = sum(linear) / Nrxn
-            error['mae'] = sum(map(abs, linear)) / Nrxn
-            error['rmse'] = math.sqrt(sum(map(lambda x: x ** 2, linear)) / Nrxn)
-            error['stde'] = math.sqrt((sum(map(lambda x: x ** 2, linear)) - (sum(linear) ** 2) / Nrxn) / Nrxn)
-            # fractional (relative) error
-            relative = [val[1] for val in err.values()]
-            error['pexpe'] = max(relative)
-            error['nexpe'] = min(relative)
-            error['maxpe'] = max(relative, key=lambda x: abs(x))
-            error['minpe'] = min(relative, key=lambda x: abs(x))
-            error['mpe'] = sum(relative) / Nrxn
-            error['mape'] = sum(map(abs, relative)) / Nrxn
-            error['rmspe'] = math.sqrt(sum(map(lambda x: x ** 2, relative)) / Nrxn)
-            error['stdpe'] = math.sqrt((sum(map(lambda x: x ** 2, relative)) - (sum(relative) ** 2) / Nrxn) / Nrxn)
-            # balanced (relative) error
-            balanced = [val[3] for val in err.values()]
-            balwt = sum([val[4] for val in err.values()])  # get the wt fn. highly irregular TODO
-            error['pexpbe'] = max(balanced)
-            error['nexpbe'] = min(balanced)
-            error['maxpbe'] = max(balanced, key=lambda x: abs(x))
-            error['minpbe'] = min(balanced, key=lambda x: abs(x))
-            error['mpbe'] = sum(balanced) / balwt #Nrxn
-            error['mapbe'] = sum(map(abs, balanced)) / balwt #Nrxn
-            error['rmspbe'] = math.sqrt(sum(map(lambda x: x ** 2, balanced)) / balwt) #Nrxn)
-            error['stdpbe'] = None  # get math domain errors w/wt in denom math.sqrt((sum(map(lambda x: x ** 2, balanced)) - (sum(balanced) ** 2) / balwt) / balwt) #/ Nrxn) / Nrxn)
-            # capped (relative) error
-            capped = [val[2] for val in err.values()]
-            error['pexpce'] = max(capped)
-            error['nexpce'] = min(capped)
-            error['maxpce'] = max(capped, key=lambda x: abs(x))
-            error['minpce'] = min(capped, key=lambda x: abs(x))
-            error['mpce'] = sum(capped) / Nrxn
-            error['mapce'] = sum(map(abs, capped)) / Nrxn
-            error['rmspce'] = math.sqrt(sum(map(lambda x: x ** 2, capped)) / Nrxn)
-            error['stdpce'] = math.sqrt((sum(map(lambda x: x ** 2, capped)) - (sum(capped) ** 2) / Nrxn) / Nrxn)
+            table = np.array(list(err.values()))
+            error = _error_statistics(*[table[:, ic:ic + 1] for ic in [0, 1, 2, 3, 4]],
+                                      mask=np.ones((len(err), 1), dtype=bool))[0]
             if verbose:
                 print("""%d systems in %s for %s vs. %s, subset %s.\n%s""" %
                       (len(err), self.dbse, modelchem, benchmark, sset, format_errors(error, mode=2)))
@@ -1087,6 +1184,75 @@ class WrappedDatabase(object):
         else:
             return error
 
+    def modelchem_matrix(self, modelchems, benchmark='default', sset='default'):
+        """For full database or subset *sset*, collects reaction values of
+        *modelchems* and *benchmark* model chemistries. Returns list of
+        reaction labels, (nrxn, nmc) array of modelchem values, and (nrxn,)
+        array of benchmark values (per-reaction benchmark if 'default'),
+        with NaN where data is missing.
+
+        """
+        self.materialize(list(modelchems) + [benchmark])
+        lsset = self.resolve_subset(sset)
+
+        values = np.full((len(lsset), len(modelchems)), np.nan)
+        bench = np.full(len(lsset), np.nan)
+        for irxn, oRxn in enumerate(lsset.values()):
+            lbench = oRxn.benchmark if benchmark == 'default' else benchmark
+            if lbench in oRxn.data:
+                bench[irxn] = oRxn.data[lbench].value
+            for imc, mc in enumerate(modelchems):
+                if mc in oRxn.data:
+                    values[irxn, imc] = oRxn.data[mc].value
+        return list(lsset.keys()), values, bench
+
+    def compute_statistics_matrix(self, modelchems, benchmark='default', ssets=('default',),
+                                  failoninc=True, verbose=False):
+        """For full database or each subset in *ssets*, computes many error
+        statistics between each of *modelchems* and *benchmark* model
+        chemistries at once. Missing data handled as in compute_statistics.
+        Returns dictionary of subsets of dictionaries of modelchems and
+        statistics dictionaries, each as from compute_statistics.
+
+        """
+        modelchems = list(modelchems)
+        rxns, values, bench = self.modelchem_matrix(modelchems, benchmark=benchmark)
+        rxnix = dict(zip(rxns, range(len(rxns))))
+
+        errors = OrderedDict()
+        for sset in ssets:
+            rows = [rxnix[rxn] for rxn in self.resolve_subset(sset)]
+            mcval = values[rows]
+            present = ~np.isnan(mcval)
+            if failoninc and not present.all():
+                imc = np.flatnonzero(~present.all(axis=0))[0]
+                irxn = np.flatnonzero(~present[:, imc])[0]
+                raise ValidationError("""Reaction %s missing datum %s.""" %
+                                      (str(rxns[rows[irxn]]), str(KeyError(modelchems[imc]))))
+
+            if benchmark == 'ZEROS':
+                mask = present
+                linear = mcval
+                relative = np.zeros_like(mcval)
+            else:
+                bmval = bench[rows][:, None]
+                for irxn in np.flatnonzero(present.any(axis=1) & np.isnan(bench[rows])):
+                    print("""Reaction %s missing benchmark""" % (str(rxns[rows[irxn]])))
+                mask = present & ~np.isnan(bmval)
+                linear = mcval - bmval
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    relative = linear / np.absolute(bmval)
+            # capped & balanced forms and weights are FAKE, as in compute_errors
+            stats = _error_statistics(linear, relative, relative, relative, np.ones_like(mcval), mask=mask)
+
+            errors[sset] = OrderedDict()
+            for imc, mc in enumerate(modelchems):
+                errors[sset][mc] = stats[imc]
+                if verbose:
+                    print("""%d systems in %s for %s vs. %s, subset %s.\n%s""" %
+                          (mask[:, imc].sum(), self.dbse, mc, benchmark, sset, format_errors(stats[imc], mode=2)))
+        return errors
+
     def load_qcdata(self, modname, funcname, pythonpath=None, failoninc=True):
         """Loads qcdb.ReactionDatums from module *modname* function
         *funcname*. Module search path can be prepended with *pythonpath*.
@@ -1182,10 +1348,74 @@ class WrappedDatabase(object):
                                                                               method=method, mode=bsse, basis=basis,
                                                                               value=df[dbrxn])
 
+    def load_qcdata_npz(self, project, path=None):
+        """Maps qcdb.ReactionDatums from columnar file at
+        path/dbse_project.npz (see qcdb.ModelchemStore). If path not given,
+        looks in qcdb/data. Values are read and ReactionDatum-s formed only
+        for the model chemistries later requested through materialize(),
+        as by compute_errors().
+
+        """
+        if path is None:
+            path = os.path.dirname(__file__) + '/../data'
+        npzfile = os.path.abspath(path) + os.sep + self.dbse + '_' + project + '.npz'
+        if not os.path.isfile(npzfile):
+            raise ValidationError("Columnar file for loading database data from file %s does not exist" % (npzfile))
+
+        self.qcstores = self.qcstores + (ModelchemStore(npzfile), )
+
+    def save_qcdata_npz(self, project, modelchems=None, path=None):
+        """Writes values of *modelchems* (default all available) to
+        columnar file at path/dbse_project.npz for load_qcdata_npz(). If
+        path not given, writes to qcdb/data.
+
+        """
+        if path is None:
+            path = os.path.dirname(__file__) + '/../data'
+        npzfile = os.path.abspath(path) + os.sep + self.dbse + '_' + project + '.npz'
+        if modelchems is None:
+            modelchems = self.available_modelchems()
+        self.materialize(modelchems)
+
+        columns = OrderedDict()
+        for mc in modelchems:
+            columns[mc] = np.array([orxn.data[mc].value if mc in orxn.data else np.nan for orxn in self.hrxn.values()])
+        ModelchemStore.write(npzfile, self.hrxn.keys(), columns)
+
+    def materialize(self, modelchems):
+        """Forms qcdb.ReactionDatum-s for *modelchems* from any mapped
+        columnar data not already loaded. Data present takes precedence.
+
+        """
+        intrxn = None
+        for store in self.qcstores:
+            for mc in modelchems:
+                if mc in store.materialized or mc not in store.modelchems:
+                    continue
+                if intrxn is None:
+                    intrxn = self.integer_reactions()
+
+                lmc = mc.split('-')  # TODO could be done better
+                method = lmc[0]
+                bsse = '_'.join(lmc[1:-1])
+                basis = lmc[-1]
+
+                column = store.column(mc)
+                for rxn, value in zip(store.rxns, column.tolist()):
+                    if math.isnan(value):
+                        continue
+                    if intrxn:
+                        rxn = int(rxn)
+                    if mc not in self.hrxn[rxn].data:
+                        self.hrxn[rxn].data[mc] = ReactionDatum.library_modelchem(dbse=self.dbse, rxn=rxn,
+                                                                                  method=method, mode=bsse,
+                                                                                  basis=basis, value=value)
+                store.materialized.add(mc)
+
     def integer_reactions(self):
         """Returns boolean of whether reaction names need to be cast to integer"""
         try:
-            next(self.hrxn.iterkeys()) + 1
+            next(iter(self.hrxn)) + 1
         except TypeError:
             return False
         else:
@@ -1216,7 +1446,11 @@ class WrappedDatabase(object):
         if *union* is False.
 
         """
-        mcs = [set(v.data) for v in self.hrxn.values()]
+        mcs = OrderedDict((str(rxn), set(orxn.data)) for rxn, orxn in self.hrxn.items())
+        for store in self.qcstores:
+            for imc, irxn in zip(*np.nonzero(store.presence())):
+                mcs[store.rxns[irxn]].add(store.modelchems[imc])
+        mcs = list(mcs.values())
         if union:
             return sorted(set.union(*mcs))
         else:
@@ -1510,6 +1744,25 @@ class Database(object):
             odb.load_qcdata_hrxn_byproject(project, path=path)
         self._intersect_modelchems()
 
+    def load_qcdata_npz(self, project, path=None):
+        """For each component database, maps qcdb.ReactionDatums from
+        columnar file at path/dbse_project.npz , to be loaded only as
+        model chemistries are requested. If path not given, looks in
+        qcdb/data.
+
+        """
+        for db, odb in self.dbdict.items():
+            odb.load_qcdata_npz(project, path=path)
+        self._intersect_modelchems()
+
+    def materialize(self, modelchems):
+        """For each component database, forms qcdb.ReactionDatums for
+        Database modelchems *modelchems* from mapped columnar data.
+
+        """
+        for dbix, odb in enumerate(self.dbdict.values()):
+            odb.materialize([self.mcs[mc][dbix] for mc in modelchems if mc in self.mcs])
+
     def available_projects(self, path=None):
         """"""
         import glob
@@ -1571,7 +1824,7 @@ class Database(object):
         """
         funcdb = {}
         for db, odb in self.dbdict.items():
-            dbix = self.dbdict.keys().index(db)
+            dbix = list(self.dbdict.keys()).index(db)
             overlapping_dbrxns = []
             for ss in sslist:
                 lss = self.sset[ss][dbix]
@@ -1629,7 +1882,7 @@ class Database(object):
                 print("""Database %s: Subset %s promoted: %s""" % (self.dbse, ss, self.sset[ss]))
         if name is None and len(self.dbdict) > 1:
             for db, odb in self.dbdict.items():
-                dbix = self.dbdict.keys().index(db)
+                dbix = list(self.dbdict.keys()).index(db)
                 ss = odb.dbse.lower()
                 if ss not in self.sset:
                     self.sset[ss] = ['default' if ix == dbix else None for ix in range(len(self.dbdict))]
@@ -1680,7 +1933,7 @@ class Database(object):
         indiv = OrderedDict()
         actvdb = []
         for db, odb in self.dbdict.items():
-            dbix = self.dbdict.keys().index(db)
+            dbix = list(self.dbdict.keys()).index(db)
             if self.sset[sset][dbix] is None:
                 errors[db], indiv[db] = (None, None)
             else:
@@ -1696,6 +1949,41 @@ class Database(object):
         else:
             return errors
 
+    def compute_statistics_matrix(self, modelchems, benchmark='default', ssets=None, failoninc=True, verbose=False):
+        """Computes summary statistics for each model chemistry in
+        *modelchems* versus *benchmark* over each subset in *ssets*
+        (default all) over all component databases at once, each component
+        database in one pass. Returns dictionary of subsets of dictionaries
+        of modelchems and errors, each as from compute_statistics.
+
+        """
+        modelchems = list(modelchems)
+        ssets = list(self.sset.keys()) if ssets is None else list(ssets)
+
+        dberrors = OrderedDict()
+        for dbix, (db, odb) in enumerate(self.dbdict.items()):
+            lssets = [self.sset[ss][dbix] for ss in ssets]
+            dberrors[db] = odb.compute_statistics_matrix([self.mcs[mc][dbix] for mc in modelchems],
+                                                         benchmark='ZEROS' if benchmark == 'ZEROS' else self.mcs[benchmark][dbix],
+                                                         ssets=[lss for lss in lssets if lss is not None],
+                                                         failoninc=failoninc, verbose=verbose)
+
+        errors = OrderedDict()
+        for ss in ssets:
+            errors[ss] = OrderedDict()
+            for mc in modelchems:
+                errors[ss][mc] = OrderedDict()
+                actvdb = []
+                for dbix, db in enumerate(self.dbdict.keys()):
+                    lss = self.sset[ss][dbix]
+                    if lss is None:
+                        errors[ss][mc][db] = None
+                    else:
+                        errors[ss][mc][db] = dberrors[db][lss][self.mcs[mc][dbix]]
+                        actvdb.append(errors[ss][mc][db])
+                errors[ss][mc][self.dbse] = average_errors(*actvdb)
+        return errors
+
     def analyze_modelchems(self, modelchem, benchmark='default', failoninc=True, verbose=False):
         """For each component database, compute and print nicely formatted
         summary error statistics for each model chemistry in array
@@ -1703,12 +1991,13 @@ class Database(object):
 
         """
         # compute errors
+        sserrors = self.compute_statistics_matrix(modelchem, benchmark=benchmark,
+                                                  failoninc=failoninc, verbose=verbose)
         errors = {}
         for mc in modelchem:
             errors[mc] = {}
             for ss in self.sset.keys():
-                errors[mc][ss] = self.compute_statistics(mc, benchmark=benchmark, sset=ss,
-                                                         failoninc=failoninc, verbose=verbose, returnindiv=False)
+                errors[mc][ss] = sserrors[ss][mc]
         # present errors
         pre, suf, mid = string_contrast(modelchem)
         text = """\n  ==> %s %s[]%s Errors <==\n""" % (self.dbse, pre, suf)
@@ -1764,13 +2053,14 @@ class Database(object):
         >>> asdf.plot_bars(['MP2-CP-adz', 'MP2-CP-adtz'], sset=['tt-5min', 'hb-5min', 'mx-5min', 'dd-5min'])
         """
         # compute errors
+        sserrors = self.compute_statistics_matrix([mc for mc in modelchem if mc is not None], benchmark=benchmark,
+                                                  ssets=sset, failoninc=failoninc, verbose=verbose)
         errors = {}
         for mc in modelchem:
             if mc is not None:
                 errors[mc] = {}
                 for ss in sset:
-                    errors[mc][ss] = self.compute_statistics(mc, benchmark=benchmark, sset=ss,
-                                                             failoninc=failoninc, verbose=verbose, returnindiv=False)
+                    errors[mc][ss] = sserrors[ss][mc]
         # repackage
         pre, suf, mid = string_contrast(modelchem)
         dbdat = []
@@ -1805,7 +2095,7 @@ class Database(object):
     #
     #     dbdat = {}
     #     for db, odb in self.dbdict.items():
-    #         #dbix = self.dbdict.keys().index(db)
+    #         #dbix = list(self.dbdict.keys()).index(db)
     #         oss = odb.oss['default']
     #         eqrxns = [rxn for rxn, rr in zip(oss.hrxn, oss.axis['Rrat']) if rr == 1.0]
     #         for rxnix, rxn in enumerate(oss.hrxn):
@@ -1830,7 +2120,7 @@ class Database(object):
             # repackage
             dbdat = []
             for db, odb in self.dbdict.items():
-                dbix = self.dbdict.keys().index(db)
+                dbix = list(self.dbdict.keys()).index(db)
                 oss = odb.oss[self.sset[sset][dbix]]
                 # TODO may need to make axis name distributable across wrappeddbs
                 # TODO not handling mc present bm absent
@@ -1913,7 +2203,7 @@ class Database(object):
                 raise ValidationError("SAPT punt module does not contain DATA" + str(modname))
             saptmc = saptdata['SAPT MODELCHEM']
 
-            dbix = self.dbdict.keys().index(db)
+            dbix = list(self.dbdict.keys()).index(db)
             for rxn, orxn in odb.hrxn.items():
                 lss = self.sset[sset][dbix]
                 if lss is not None:
@@ -2129,10 +2419,12 @@ reinitialize
         the Reaction object.
 
         """
+        self.materialize([modelchem, benchmark])
+
         dbdat = []
         rhrxn = self.get_hrxn(sset=sset)
-        for orxn in rhrxn.itervalues():
-            dbix = self.dbdict.keys().index(orxn.dbrxn.split('-')[0])
+        for orxn in rhrxn.values():
+            dbix = list(self.dbdict.keys()).index(orxn.dbrxn.split('-')[0])
             lmc = self.mcs[modelchem][dbix]
             lbm = self.mcs[benchmark][dbix]
             try:
@@ -2172,7 +2464,7 @@ reinitialize
         """
         counts = OrderedDict()
         counts[self.dbse] = [0, []]
-        soledb = True if (len(self.dbdict) == 1 and self.dbdict.items()[0][0] == self.dbse) else False
+        soledb = True if (len(self.dbdict) == 1 and next(iter(self.dbdict)) == self.dbse) else False
         if not soledb:
             for db in self.dbdict.keys():
                 counts[db] = [0, []]
@@ -2291,7 +2583,7 @@ reinitialize
         # repackage
         dbdat = []
         for db, odb in self.dbdict.items():
-            dbix = self.dbdict.keys().index(db)
+            dbix = list(self.dbdict.keys()).index(db)
             for rxn in odb.hrxn:
                 data = []
                 for ix in index:
@@ -2349,10 +2641,10 @@ reinitialize
         """
         # compute errors
         mc = modelchem
+        sserrors = self.compute_statistics_matrix([mc], benchmark=benchmark, failoninc=failoninc)
         errors = {}
         for ss in self.sset.keys():
-            errors[ss] = self.compute_statistics(mc, benchmark=benchmark, sset=ss,
-                                                 failoninc=failoninc, verbose=False, returnindiv=False)
+            errors[ss] = sserrors[ss][mc]
 
         # repackage
         dbdat = []
@@ -2423,7 +2715,8 @@ reinitialize
         is benchmark needed?
         """
         import pandas as pd
-        import numpy as np
+
+        self.materialize(list(modelchem) + [benchmark])
 
         if self.dbse not in ['ACONF', 'SCONF', 'PCONF', 'CYCONF']:
             saptdata = self.load_saptdata_frombfdb(sset=sset,
@@ -2433,7 +2726,7 @@ reinitialize
         rhrxn = self.get_hrxn(sset=sset)
         for dbrxn, orxn in rhrxn.items():
             wdb = dbrxn.split('-')[0]
-            dbix = self.dbdict.keys().index(wdb)
+            dbix = list(self.dbdict.keys()).index(wdb)
             wbm = self.mcs[benchmark][dbix]
             wss = self.sset[sset][dbix]
             woss = self.dbdict[wdb].oss[wss]
@@ -2787,18 +3080,15 @@ reinitialize
             nominal_mc = '-'.join([m, o, b])
             for oo in unify_options([o], opttarget['default']):
                 trial_mc = '-'.join([m, oo, b])
-                try:
-                    perr = self.compute_statistics(trial_mc, benchmark=benchmark, sset='default',  # prob. too restrictive by choosing subset
-                                                   failoninc=False, verbose=False, returnindiv=False)
-                except KeyError as e:
-                    continue
-                else:
+                if trial_mc in self.mcs and (benchmark == 'ZEROS' or benchmark in self.mcs):
                     mc_translator[nominal_mc] = trial_mc
                     break
             else:
                 mc_translator[nominal_mc] = None
 
-        # compute errors
+        # compute errors, all modelchems and subsets at once
+        tablemcs = sorted(set(tmc for tmc in mc_translator.values() if tmc in self.mcs))
+        sserrors = self.compute_statistics_matrix(tablemcs, benchmark=benchmark, failoninc=failoninc)
         serrors = {}
         for mc in mcs:
             serrors[mc] = {}
@@ -2806,8 +3096,7 @@ reinitialize
                 serrors[mc][ss] = {}
                 if mc_translator[mc] in self.mcs:
                     # Note: not handling when one component Wdb has one translated pattern and another another
-                    perr = self.compute_statistics(mc_translator[mc], benchmark=benchmark, sset=ss,
-                                                   failoninc=failoninc, verbose=False, returnindiv=False)
+                    perr = sserrors[ss][mc_translator[mc]]
                     serrors[mc][ss][self.dbse] = format_errors(perr[self.dbse], mode=3)
                     if not failoninc:
                         mcsscounts = self.get_missing_reactions(mc_translator[mc], sset=ss)
@@ -9,3 +9,4 @@ from .optimize import optking, geometric
 #from .driver_helpers import *
 
 from .vpt2 import vpt2
+from .wrapper_database import database
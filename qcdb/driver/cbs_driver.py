@@ -120,6 +120,7 @@ def _cbs_gufunc(func, total_method_name, molecule, **kwargs):
     cbs_kwargs['return_wfn'] = True
     cbs_kwargs['molecule'] = molecule
     cbs_kwargs['verbose'] = cbs_verbose
+    cbs_kwargs['parallel'] = kwargs.pop('parallel', 1)
 
     # Find method and basis
     pkgmtd = method_list[0].split('-', 1)
@@ -441,6 +442,14 @@ def cbs(func, label, **kwargs):
 
         The target molecule, if not the last molecule defined.
 
+    :type parallel: int
+    :param parallel: |dl| ``1`` |dr| || ``4`` || etc.
+
+        Maximum number of model chemistry computations to run concurrently,
+        in as many forked worker processes, whose options are kept apart from
+        those of this process.
+        Results are merged in the same order as for serial (``1``) execution.
+
     :examples:
 
 
@@ -464,7 +473,7 @@ def cbs(func, label, **kwargs):
     >>> cbs(name='mp2', corl_basis='aug-cc-pv[tq]z', corl_scheme=corl_xtpl_helgaker_2, delta_wfn='ccsd', delta_basis='aug-cc-pv[dt]z', delta_scheme=corl_xtpl_helgaker_2, delta2_wfn='ccsd(t)', delta2_wfn_lesser='ccsd', delta2_basis='aug-cc-pvdz')
 
     >>> # [7] cbs() coupled with database()
-    >>> TODO database('mp2', 'BASIC', subset=['h2o','nh3'], symm='on', func=cbs, corl_basis='cc-pV[tq]z', corl_scheme=corl_xtpl_helgaker_2, delta_wfn='ccsd(t)', delta_basis='sto-3g')
+    >>> database(cbs, 'BASIC', subset=['h2o','nh3'], corl_wfn='mp2', corl_basis='cc-pV[tq]z', corl_scheme=corl_xtpl_helgaker_2, delta_wfn='ccsd(t)', delta_basis='sto-3g')
 
     >>> # [8] cbs() coupled with optimize()
     >>> TODO optimize('mp2', corl_basis='cc-pV[DT]Z', corl_scheme=corl_xtpl_helgaker_2, func=cbs)
@@ -474,6 +483,7 @@ def cbs(func, label, **kwargs):
     return_wfn = kwargs.pop('return_wfn', False)
     verbose = kwargs.pop('verbose', 0)
     ptype = kwargs.pop('ptype')
+    parallel = kwargs.pop('parallel', 1)
 
     kwgs = {'accession': kwargs['accession'], 'verbose': verbose}
 
@@ -875,40 +885,23 @@ def cbs(func, label, **kwargs):
 #    core.set_local_option('SCF', 'GUESS_PERSIST', True)
 
     Njobs = 0
-    # Run necessary computations
-    for mc in JOBS:
-        kwargs['name'] = mc['f_wfn']
-
-        # Build string of title banner
-        cbsbanners = util.banner(' CBS Computation: {} / {}{} '.format(
-            mc['f_wfn'].upper(), mc['f_basis'].upper(), addlremark[ptype]))
-        print(cbsbanners)
-#        cbsbanners = ''
-#        cbsbanners += """core.print_out('\\n')\n"""
-#        cbsbanners += """p4util.banner(' CBS Computation: %s / %s%s ')\n""" % \
-#            (mc['f_wfn'].upper(), mc['f_basis'].upper(), addlremark[ptype])
-#        cbsbanners += """core.print_out('\\n')\n\n"""
-#        exec(cbsbanners)
-
-        # Build string of molecule and commands that are dependent on the database
-        pe.nu_options.require('QCDB', 'BASIS', mc['f_basis'], **kwgs)
-        pe.nu_options.require('QCDB', 'WRITER_FILE_LABEL',
-            '-'.join(filter(None,
-                [pe.nu_options.scroll['QCDB']['WRITER_FILE_LABEL'].value,
-                 mc['f_wfn'].lower(), 
-                 mc['f_basis'].lower()]
-            ))[:60], **kwgs)
-
-#        commands = '\n'
-#        commands += """\ncore.set_global_option('BASIS', '%s')\n""" % (mc['f_basis'])
-#        commands += """core.set_global_option('WRITER_FILE_LABEL', '%s')\n""" % \
-#            (user_writer_file_label + ('' if user_writer_file_label == '' else '-') + mc['f_wfn'].lower() + '-' + mc['f_basis'].lower())
-#        exec(commands)
-
-        # Make energy(), etc. call
-        safe_kwargs = {k: v for k, v in kwargs.items() if k not in ['scf_scheme', 'corl_scheme', 'delta_scheme']}
-        response, jrec = func(molecule=molecule, return_wfn=True, **safe_kwargs)
-        #response = func(molecule=molecule, **kwargs)
+    # Run necessary computations, concurrently in up to `parallel` processes
+    #   if requested. Each job re-applies its basis and label, since options
+    #   state in forked workers is per worker, not per job, and carries over
+    #   between jobs run in the same worker. Results are absorbed below in
+    #   JOBS order regardless of completion order, and the parent replays
+    #   _cbs_job_options afterwards so the options end up as after a serial run.
+    safe_kwargs = {k: v for k, v in kwargs.items() if k not in ['scf_scheme', 'corl_scheme', 'delta_scheme']}
+    responses = util.map_forked(
+        lambda mc: _cbs_compute_job(func, molecule, mc, ptype, user_writer_file_label, safe_kwargs, kwgs),
+        JOBS, nproc=parallel)
+
+    # Leave the options as serial execution would have, when jobs were forked
+    if min(parallel, len(JOBS)) > 1:
+        for mc in JOBS:
+            _cbs_job_options(mc, user_writer_file_label, kwgs)
+
+    for mc, (response, jrec) in zip(JOBS, responses):
         if ptype == 'energy':
             mc['f_energy'] = response
 
@@ -1135,6 +1128,41 @@ def cbs(func, label, **kwargs):
         return finalquantity
 
 
+def _cbs_compute_job(func, molecule, mc, ptype, user_writer_file_label, kwargs, kwgs):
+    """Run the single model chemistry `mc` of a cbs() through `func`.
+
+    Returns the `func` response and a trimmed jobrec holding only the
+    (picklable) molecule and qcvars fields needed by cbs().
+
+    """
+    addlremark = {'energy': '', 'gradient': ', GRADIENT', 'hessian': ', HESSIAN'}
+
+    # Build string of title banner
+    cbsbanners = util.banner(' CBS Computation: {} / {}{} '.format(
+        mc['f_wfn'].upper(), mc['f_basis'].upper(), addlremark[ptype]))
+    print(cbsbanners)
+
+    _cbs_job_options(mc, user_writer_file_label, kwgs)
+
+    # Make energy(), etc. call
+    kwargs = dict(kwargs, name=mc['f_wfn'])
+    response, jrec = func(molecule=molecule, return_wfn=True, **kwargs)
+
+    return response, {'molecule': jrec['molecule'], 'qcvars': jrec['qcvars']}
+
+
+def _cbs_job_options(mc, user_writer_file_label, kwgs):
+    """Set the options that are dependent on the model chemistry `mc` of a cbs() job."""
+
+    pe.nu_options.require('QCDB', 'BASIS', mc['f_basis'], **kwgs)
+    pe.nu_options.require('QCDB', 'WRITER_FILE_LABEL',
+        '-'.join(filter(None,
+            [user_writer_file_label,
+             mc['f_wfn'].lower(),
+             mc['f_basis'].lower()]
+        ))[:60], **kwgs)
+
+
 _lmh_labels = {1: ['HI'],
                2: ['LO', 'HI'],
                3: ['LO', 'MD', 'HI'],
@@ -1,5 +1,5 @@
 from ..exceptions import *
-from ..util import yes, no, der0th, der1st, der2nd, find_approximate_string_matches
+from ..util import yes, no, der0th, der1st, der2nd, find_approximate_string_matches, map_forked
 from .proc_table import procedures
 from .aids import pkgprefix
 
@@ -24,7 +24,7 @@ def kwargs_lower(kwargs):
             except (AttributeError, KeyError):
                 lvalue = value
 
-        if lkey in ['irrep', 'check_bsse', 'linkage', 'bsse_type']:
+        if lkey in ['irrep', 'check_bsse', 'linkage', 'bsse_type', 'parallel']:
             caseless_kwargs[lkey] = lvalue
 
         elif 'dertype' in lkey:
@@ -175,7 +175,7 @@ def _process_displacement(derivfunc, method, molecule, displacement, n, ndisp, *
     if molecule.symmetry_from_input():
         disp_group = clone.find_highest_point_group()
         new_bits = parent_group.bits() & disp_group.bits()
-        new_symm_string = qcdb.PointGroup.bits_to_full_name(new_bits)
+        new_symm_string = psi4.core.PointGroup.bits_to_full_name(new_bits)
         clone.reset_point_group(new_symm_string)
 
     # clean possibly necessary for n=1 if its irrep (unsorted in displacement list) different from initial G0 for freq
@@ -193,3 +193,52 @@ def _process_displacement(derivfunc, method, molecule, displacement, n, ndisp, *
     psi4.core.clean()
 
     return wfn
+
+
+def _process_displacements(derivfunc, method, molecule, findif_meta_dict, nproc=1, **kwargs):
+    """Run the reference and all displaced computations of a finite
+       difference, concurrently if requested.
+
+       Parameters
+       ----------
+       derivfunc : func
+           The function computing the target derivative.
+       method : str
+          A string specifying the method to be used for the computation.
+       molecule: psi4.core.molecule or qcdb.molecule
+          The molecule for the computation. Not modified.
+       findif_meta_dict : dict
+          Dictionary of "reference" and "displacements" as generated by
+          psi4.driver.driver_findif. The "energy" (and "gradient", for a
+          gradient `derivfunc`) of each geometry are filled in.
+       nproc : int, optional
+          Maximum number of displacements computed at once, in as many
+          forked worker processes, so that options, psi4.core state, and
+          scratch touched by them stay out of this process. Default is serial.
+
+       Returns
+       -------
+       dict
+           The job record of the reference computation, less its options.
+    """
+    displacements = [findif_meta_dict["reference"]] + list(findif_meta_dict["displacements"].values())
+    ndisp = len(displacements)
+
+    def compute(item):
+        n, displacement = item
+        kw = kwargs if n == 1 else dict(kwargs, write_orbitals=False)
+        jobrec = _process_displacement(derivfunc, method, molecule, displacement, n, ndisp, **kw)
+
+        results = {k: displacement[k] for k in ['energy', 'gradient'] if k in displacement}
+        # Only the reference job record is wanted, so spare shipping the rest back from workers
+        if n != 1:
+            return results, None
+        return results, {k: v for k, v in jobrec.items() if k != 'options'}
+
+    computed = map_forked(compute, enumerate(displacements, start=1), nproc=nproc)
+
+    # Results come back in displacement order, whatever the order of completion
+    for displacement, (results, _) in zip(displacements, computed):
+        displacement.update(results)
+
+    return computed[0][1]
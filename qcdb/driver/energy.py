@@ -43,6 +43,7 @@ from .. import moptions
 from . import driver_util
 from . import driver_helpers
 from . import cbs_driver
+from . import resultcache
 #from psi4.driver import driver_nbody
 from . proc_table import procedures
 
@@ -424,7 +425,7 @@ def energy(name, **kwargs):
     #    package = kwargs.get('package', 'psi4')
     #print('\nENE calling', 'procedures', package, lowername, 'with', lowername, molecule, pe.nu_options, kwargs)
     #jobrec = procedures['energy'][package][lowername](lowername, molecule=molecule, options=pe.active_options, **kwargs)
-    jobrec = procedures['energy'][package][lowername](lowername, molecule=molecule, options=pe.nu_options, ptype='energy', **kwargs)
+    jobrec = resultcache.run_procedure('energy', package, lowername, molecule, pe.nu_options, **kwargs)
 
 #    for postcallback in hooks['energy']['post']:
 #        postcallback(lowername, wfn=wfn, **kwargs)
@@ -543,7 +544,7 @@ def properties(*args, **kwargs):
     package = driver_util.get_package(lowername, kwargs)
 #    optstash = driver_util._set_convergence_criterion('properties', lowername, 6, 10, 6, 10, 8)
 #    wfn = procedures['properties'][lowername](lowername, **kwargs)
-    jobrec = procedures['properties'][package][lowername](lowername, molecule=molecule, options=pe.nu_options, ptype='properties', **kwargs)
+    jobrec = resultcache.run_procedure('properties', package, lowername, molecule, pe.nu_options, **kwargs)
 
     pp.pprint(jobrec)
     pe.active_qcvars = copy.deepcopy(jobrec['qcvars'])
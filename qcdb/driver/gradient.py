@@ -43,14 +43,18 @@ import copy
 import pprint
 pp = pprint.PrettyPrinter(width=120)
 
+from qcelemental import Datum
+
 from .. import moptions
 from ..exceptions import FeatureNotImplemented
 from . import pe
 from . import driver_util
 from . import driver_helpers
 from . import cbs_driver
+from . import resultcache
 #from psi4.driver import driver_nbody
 from .proc_table import procedures
+from .energy import energy
 
 
 @moptions.register_opts(pe.nu_options)
@@ -165,6 +169,7 @@ def gradient(name, **kwargs):
     # Commit to procedures[] call hereafter
   #  lowername = name.lower()
     return_wfn = kwargs.pop('return_wfn', False)
+    nproc = kwargs.pop('parallel', 1)
     package = driver_util.get_package2(lowername, kwargs.get('package', None))
 #    core.clean_variables()
 #
@@ -196,7 +201,7 @@ def gradient(name, **kwargs):
         text += """qcdb.gradient() will perform analytic gradient computation.\n"""
 
         # Perform the gradient calculation
-        jobrec = procedures['gradient'][package][lowername](lowername, molecule=molecule, options=pe.nu_options, ptype='gradient', **kwargs)
+        jobrec = resultcache.run_procedure('gradient', package, lowername, molecule, pe.nu_options, **kwargs)
 
         #print('GRADIENT() JOBREC (j@io) <<<')
         #pp.pprint(jobrec)
@@ -211,7 +216,43 @@ def gradient(name, **kwargs):
             return jobrec['qcvars']['CURRENT GRADIENT'].data
 
     else:
-        raise FeatureNotImplemented("""gradient(dertype=0)""" + package + lowername)
+        text += """qcdb.gradient() will perform gradient computation by finite difference of analytic energies.\n"""
+        print("""gradient() will perform gradient computation by finite difference of analytic energies.\n""")
+        import psi4
+
+        # Shifting the geometry so need to copy the active molecule
+        moleculeclone = psi4.core.Molecule.from_dict(molecule.to_dict())
+
+        # Obtain list of displacements
+        findif_meta_dict = psi4.driver.driver_findif.gradient_from_energies_geometries(moleculeclone)
+
+        # Record undisplaced symmetry for projection of displaced point groups
+        psi4.core.set_global_option("PARENT_SYMMETRY", moleculeclone.schoenflies_symbol())
+
+        ndisp = len(findif_meta_dict["displacements"]) + 1
+
+        print(""" %d displacements needed.""" % ndisp)
+
+        var_dict = psi4.core.variables()
+
+        # Run all energies, `nproc` at a time, assembling only once all are in
+        subjobrec = driver_util._process_displacements(energy, lowername, moleculeclone, findif_meta_dict, nproc=nproc, **kwargs)
+
+        # Reset variables
+        for key, val in var_dict.items():
+            psi4.core.set_variable(key, val)
+
+        # Assemble gradient from energies
+        G = psi4.driver.driver_findif.assemble_gradient_from_energies(findif_meta_dict)
+        subjobrec['qcvars']['CURRENT GRADIENT'] = Datum('CURRENT GRADIENT', 'Eh/a0', G)
+
+        pe.active_qcvars = copy.deepcopy(subjobrec['qcvars'])
+
+        if return_wfn:
+            return (subjobrec['qcvars']['CURRENT GRADIENT'].data, subjobrec)
+        else:
+            return subjobrec['qcvars']['CURRENT GRADIENT'].data
+
 #        core.print_out("""gradient() will perform gradient computation by finite difference of analytic energies.\n""")
 #
 #        opt_iter = kwargs.get('opt_iter', 1)
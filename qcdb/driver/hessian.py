@@ -38,6 +38,8 @@ import pprint
 pp = pprint.PrettyPrinter(width=120)
 
 import numpy as np
+
+from qcelemental import Datum
    
 from ..exceptions import *
 from ..molecule import Molecule
@@ -48,6 +50,7 @@ from . import pe
 from . import driver_util
 from . import driver_helpers
 from . import cbs_driver
+from . import resultcache
 from .proc_table import procedures
 from .gradient import gradient
 
@@ -107,6 +110,7 @@ def hessian(name, **kwargs):
         return cbs_driver._cbs_gufunc(hessian, lowername, ptype='hessian', molecule=molecule, **kwargs)
 
     return_wfn = kwargs.pop('return_wfn', False)
+    nproc = kwargs.pop('parallel', 1)
 #    core.clean_variables()
     dertype = 2
 
@@ -179,7 +183,7 @@ def hessian(name, **kwargs):
         text += """qcdb.hessian() will perform analytic frequency computation.\n"""
 
         # We have the desired method. Do it.
-        jobrec = procedures['hessian'][package][lowername](lowername, molecule=molecule, options=pe.nu_options, ptype='hessian', **kwargs)
+        jobrec = resultcache.run_procedure('hessian', package, lowername, molecule, pe.nu_options, **kwargs)
 #        wfn.set_gradient(G0)
 #        optstash.restore()
 #        optstash_conv.restore()
@@ -247,13 +251,10 @@ def hessian(name, **kwargs):
 
         print(""" %d displacements needed.""" % ndisp)
 
-        #wfn = psi4.driver._process_displacement(gradient, lowername, moleculeclone, findif_meta_dict["reference"], 1, ndisp, **kwargs)
-        subjobrec = driver_util._process_displacement(gradient, lowername, moleculeclone, findif_meta_dict["reference"], 1, ndisp, **kwargs)
         var_dict = psi4.core.variables()
 
-        for n, displacement in enumerate(findif_meta_dict["displacements"].values(), start=2):
-            #psi4.driver._process_displacement(gradient, lowername, moleculeclone, displacement, n, ndisp, write_orbitals=False, **kwargs)
-            driver_util._process_displacement(gradient, lowername, moleculeclone, displacement, n, ndisp, write_orbitals=False, **kwargs)
+        # Run all gradients, `nproc` at a time, assembling only once all are in
+        subjobrec = driver_util._process_displacements(gradient, lowername, moleculeclone, findif_meta_dict, nproc=nproc, **kwargs)
 
         # Reset variables
         for key, val in var_dict.items():
@@ -307,7 +308,7 @@ def hessian(name, **kwargs):
 #        wfn.set_hessian(H)
 #        wfn.set_gradient(G0)
 #        wfn.set_frequencies(core.get_frequencies())
-        subjobrec['qcvars']['CURRENT HESSIAN'] = QCAspect('CURRENT HESSIAN', 'Eh/a0/a0', H, '')
+        subjobrec['qcvars']['CURRENT HESSIAN'] = Datum('CURRENT HESSIAN', 'Eh/a0/a0', H)
 #
 #        # The last item in the list is the reference energy, return it
 #        core.set_variable('CURRENT ENERGY', energies[-1])
@@ -0,0 +1,227 @@
+"""Content-addressed on-disk cache of harvested QCVariables placed in front
+of the ``procedures[ptype][package][name]`` dispatch.
+
+Each entry is one pickle file named by the sha1 of the computation's
+canonical spec (program and its version, molecule, method, driver, basis,
+disputed options, and remaining kwargs) and holding the job record as the
+program returned it, less the options snapshot runners leave in it (its
+validators don't pickle). Since the options are part of the key, a hit
+gets a fresh snapshot of the caller's options in their place. Least
+recently used entries, as judged by file mtime (bumped on every hit), are
+evicted once the directory outgrows ``RESULT_CACHE_SIZE``. Writes go
+through a rename, so concurrent processes may share one cache directory.
+
+"""
+import os
+import json
+import uuid
+import logging
+import pickle
+import hashlib
+import functools
+
+import qcengine as qcng
+
+from .. import __version__
+from .proc_table import procedures
+
+# options that steer bookkeeping rather than the computed quantities
+_unkeyed = ['MEMORY', 'WRITER_FILE_LABEL', 'RESULT_CACHE', 'RESULT_CACHE_DIR', 'RESULT_CACHE_SIZE']
+
+# driver-injected kwargs that differ call-to-call for identical computations
+_unkeyed_kwargs = ['accession']
+
+# places in a job record where runners leave a snapshot of the options
+_option_slots = [('options', ), ('extras', 'qcdb:options')]
+
+logger = logging.getLogger(__name__)
+
+# here liveth the cache counters of this process
+stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+
+def reset_stats():
+    for k in stats:
+        stats[k] = 0
+
+
+def cache_dir(options):
+    """Return cache directory from `options`, else the XDG default."""
+
+    cdir = options.scroll['QCDB']['RESULT_CACHE_DIR'].value
+    if not cdir:
+        cdir = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'qcdb')
+    return os.path.abspath(os.path.expanduser(cdir))
+
+
+def changed_options(options):
+    """Return dict of the non-bookkeeping `options` changed from defaults, by package-qualified key."""
+
+    disputed = {}
+    for pkg in options.scroll:
+        for key, opt in options.changed(pkg).items():
+            if not (pkg == 'QCDB' and key in _unkeyed):
+                disputed[pkg + '::' + key] = opt.value
+
+    return disputed
+
+
+@functools.lru_cache()
+def program_version(program):
+    """Return version of the executable or module behind `program`, else '' if not determinable."""
+
+    try:
+        return qcng.get_program(program).get_version() or ''
+    except (qcng.exceptions.QCEngineException, OSError, ImportError):
+        return ''
+
+
+def cache_key(ptype, program, name, molecule, options, **kwargs):
+    """Return hex hash uniquely identifying computation `ptype` of `name` by
+    `program` on `molecule` under `options`."""
+
+    disputed = changed_options(options)
+
+    spec = {
+        'version': __version__,
+        'program': program,
+        'program_version': program_version(program),
+        'driver': ptype,
+        'method': name,
+        'basis': options.scroll['QCDB']['BASIS'].value,
+        'molecule': molecule.to_dict(np_out=False),
+        'options': disputed,
+        'kwargs': {k: v for k, v in kwargs.items() if k not in _unkeyed_kwargs},
+    }
+    text = json.dumps(spec, sort_keys=True, default=repr)
+
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _entry_path(cachedir, key):
+    return os.path.join(cachedir, key + '.pkl')
+
+
+def _strip_options(record):
+    """Return copy of job `record` without its options snapshots and the slots they held."""
+
+    record = dict(record)
+    slots = []
+    for slot in _option_slots:
+        parent = record
+        for part in slot[:-1]:
+            if not isinstance(parent.get(part), dict):
+                break
+            parent[part] = parent = dict(parent[part])
+        else:
+            if slot[-1] in parent:
+                del parent[slot[-1]]
+                slots.append(slot)
+
+    return record, slots
+
+
+def load(key, cachedir, options):
+    """Return record stored under `key` in `cachedir`, with a snapshot of
+    `options` wherever the original held one, and mark it recently used,
+    else None."""
+
+    path = _entry_path(cachedir, key)
+    try:
+        with open(path, 'rb') as handle:
+            record, slots = pickle.load(handle)
+        os.utime(path)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+
+    for slot in slots:
+        parent = record
+        for part in slot[:-1]:
+            parent = parent[part]
+        parent[slot[-1]] = options.snapshot()
+
+    return record
+
+
+def store(key, record, cachedir, maxsize):
+    """Write `record`, less options, under `key` in `cachedir`, then evict down to `maxsize` bytes."""
+
+    os.makedirs(cachedir, exist_ok=True)
+    path = _entry_path(cachedir, key)
+    tmppath = path + '.' + str(uuid.uuid4())
+    try:
+        with open(tmppath, 'wb') as handle:
+            pickle.dump(_strip_options(record), handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as err:
+        os.remove(tmppath)
+        logger.warning('Result not cached, as job record not picklable: %s', err)
+        return
+    os.replace(tmppath, path)
+    stats['stores'] += 1
+
+    evict(cachedir, maxsize)
+
+
+def evict(cachedir, maxsize):
+    """Remove least recently used entries of `cachedir` until it holds at most `maxsize` bytes."""
+
+    entries = []
+    for fl in os.scandir(cachedir):
+        if fl.name.endswith('.pkl'):
+            try:
+                st = fl.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, fl.path))
+
+    total = sum(ent[1] for ent in entries)
+    for mtime, size, path in sorted(entries):
+        if total <= maxsize:
+            break
+        try:
+            os.remove(path)
+            stats['evictions'] += 1
+        except OSError:
+            pass
+        total -= size
+
+
+def clear(cachedir):
+    """Remove all entries of `cachedir`."""
+
+    evict(cachedir, -1)
+
+
+def run_procedure(ptype, program, name, molecule, options, **kwargs):
+    """Run ``procedures[ptype][program][name]``, answering from and
+    filling the on-disk result cache when option RESULT_CACHE is on.
+
+    Returns
+    -------
+    dict
+        Job record. On a cache hit, the record of the original run,
+        provenance included, plus `cache_key`, with `options` snapshots
+        taken now.
+
+    """
+    func = procedures[ptype][program][name]
+
+    if not options.scroll['QCDB']['RESULT_CACHE'].value:
+        return func(name, molecule=molecule, options=options, ptype=ptype, **kwargs)
+
+    cachedir = cache_dir(options)
+    key = cache_key(ptype, program, name, molecule, options, **kwargs)
+
+    jobrec = load(key, cachedir, options)
+    if jobrec is not None:
+        stats['hits'] += 1
+        jobrec['cache_key'] = key
+        return jobrec
+
+    stats['misses'] += 1
+    jobrec = func(name, molecule=molecule, options=options, ptype=ptype, **kwargs)
+
+    if jobrec.get('success') is not False:
+        store(key, jobrec, cachedir, options.scroll['QCDB']['RESULT_CACHE_SIZE'].value)
+
+    return jobrec
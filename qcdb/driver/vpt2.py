@@ -34,15 +34,15 @@ Organizationally, this module isolates qcdb code from psi4 code.
 """
 import os
 import re
-import copy
 import glob
+import json
 import uuid
-import shelve
 import shutil
 import difflib
 import datetime
 import subprocess
 import pprint
+import collections
 pp = pprint.PrettyPrinter(width=120)
 from pathlib import Path
 
@@ -54,7 +54,8 @@ import qcengine as qcng
 
 from . import pe
 from .. import moptions
-from ..util import provenance_stamp
+from ..util import provenance_stamp, run_graph, yes
+from ..exceptions import ValidationError
 from ..moptions.read_options2 import RottenOptions
 from .driver_util import kwargs_lower, get_package
 from .driver_helpers import get_active_molecule
@@ -114,6 +115,19 @@ def vpt2(name, **kwargs):
         and FJOBARC files are expected to reap, so that Cfour only, not
         Cfour-through-Psi4, is needed for distributed jobs.
 
+    :type parallel: int
+    :param parallel: |dl| ``1`` |dr| || ``8`` || etc.
+
+        Maximum number of displacements computed at once, each in its own
+        forked process, when *mode* is continuous.
+
+    :type ledger: string
+    :param ledger: |dl| ``'vpt2scratch.ledger'`` |dr| || ``'path/to/dir'``
+
+        Directory of generated displacements and completed jobs, read on
+        invocation so that finished displacements are never recomputed.
+        Relative to the submission directory.
+
     .. caution:: Some features are not yet implemented. Buy a developer a coffee.
 
        - Presently uses all gradients. Could mix in analytic 2nd-derivs.
@@ -134,7 +148,7 @@ def vpt2(name, **kwargs):
 
        - Remember additional FJOBARC record TOTENER2 if EXCITE .ne. NONE
 
-       - switch C --> S/R with recovery using shelf
+       - switch C --> S/R with recovery using ledger
 
     """
     from . import endorsed_plugins
@@ -165,6 +179,8 @@ def vpt2(name, **kwargs):
 # -----
     verbose = kwargs.pop('verbose', 0)
     scratch_messy = kwargs.pop('scratch_messy', True)  # TODO
+    nproc = kwargs.pop('parallel', 1)
+    ledger_loc = kwargs.pop('ledger', 'vpt2scratch.ledger')
 
     kwgs = {'accession': kwargs['accession'], 'verbose': verbose}
 
@@ -193,9 +209,12 @@ def vpt2(name, **kwargs):
     current_directory = os.getcwd()
 #    user_basis = core.get_global_option('BASIS')
 
-    # Open data persistence shelf- vital for sowreap, checkpoint for continuouw
+    # Open data persistence ledger- vital for sowreap, checkpoint for continuous
 #    shelf = shelve.open(current_directory + '/' + os.path.splitext(core.outfile_name())[0] + '.shelf', writeback=True)
-    shelf = shelve.open(current_directory + '/vpt2scratch.shelf', writeback=True)
+    ledger = VPT2Ledger(os.path.join(current_directory, ledger_loc))
+    if 'linkage' not in ledger:
+        ledger['linkage'] = os.getpid()
+    linkage = ledger['linkage']
 
     # Cfour keywords to request vpt2 analysis through findif gradients
     c000_opts = RottenOptions()
@@ -220,17 +239,6 @@ def vpt2(name, **kwargs):
     #    P4  'c4-scf'/'cfour'CALC_LEVEL      lowername  # temporary
     #    C4  lowername                       cfour{}  # temporary
 
-    if 'status' not in shelf:
-        shelf['status'] = 'initialized'
-        shelf['linkage'] = os.getpid()
-        shelf['zmat'] = {}  # Cfour-generated ZMAT files with finite difference geometries
-        shelf['fjobarc'] = {}  # Cfour- or Psi4-generated ascii files with packaged gradient results
-        shelf['results'] = {}  # models.Result
-        shelf.sync()
-    else:
-        pass
-        # how decide whether to use. keep precedent of intco.dat in mind
-
 #    # Construct and move into directory job scratch / cfour scratch / harm
 #    psioh = core.IOManager.shared_object()
 #    psio = core.IO.shared_object()
@@ -246,14 +254,12 @@ def vpt2(name, **kwargs):
 #    os.chdir('harm')  # psi_scratch/cfour/harm
 
 #    psioh.set_specific_retention(32, True)  # temporary, to track p4 scratch
-    #shelf['status'] = 'anharm_jobs_sown'  # temporary to force backtrack
-    print('STAT', shelf['status'])  # temporary
 
     resi = ResultInput(
         **{
             'driver': 'energy',  # to prevent qcdb imposition of analytic hessian
             'extras': {
-                'qcdb:options': copy.deepcopy(c000_opts), #pe.nu_options),
+                'qcdb:options': c000_opts.snapshot(), #pe.nu_options),
             },
             'model': {
                 'method': 'c4-scf', #'hf',
@@ -266,9 +272,8 @@ def vpt2(name, **kwargs):
 
     # Generate the ZMAT input file in scratch
     cfourrec = cfourharness.qcdb_build_input(resi, config)
-    shelf['genbas'] = cfourrec['infiles']['GENBAS']
-    shelf['zmat']['000-000'] = cfourrec['infiles']['ZMAT']
-    shelf.sync()
+    ledger['genbas'] = cfourrec['infiles']['GENBAS']
+    ledger['zmat']['000-000'] = cfourrec['infiles']['ZMAT']
 
 #    with open('ZMAT', 'w') as handle:
 #        cfour_infile = write_zmat(skelname, 1)
@@ -286,133 +291,236 @@ def vpt2(name, **kwargs):
     # Reset basis after Cfour skeleton seeded
 #    core.set_global_option('BASIS', user_basis)
 
-    if shelf['status'] == 'initialized':
-        print('{:_^45}'.format('  VPT2 Setup: Harmonic  '))
+    reapkeys = ['CURRENT ENERGY', 'CURRENT DIPOLE', 'CURRENT GRADIENT']
 
-        # Generate the displacements that will form the harmonic freq
-        scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000'}
-        success, dexe = qcng.util.execute(['xjoda'], cfourrec['infiles'], [], **scrkwgs)
-        partial = dexe['stdout']
+    def run_job(job):
+        if job == 'harmonic-setup':
+            vpt2_harmonic_setup(ledger, config, scratch_messy)
 
-        scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
-        scrkwgs.update({'scratch_messy': scratch_messy})
-        success, dexe = qcng.util.execute(['xsymcor'], {}, ['zmat*'], **scrkwgs)
-        partial += dexe['stdout']
-    
-        print(partial)  # partial.out
-
-        # Read the displacements that will form the harmonic freq
-        zmats0N = ['000-' + item[-3:] for item in dexe['outfiles']['zmat*']]
-        for zm_2 in zmats0N:
-            _, zm2 = zm_2.split('-')
-            shelf['zmat'][zm_2] = dexe['outfiles']['zmat*']['zmat' + zm2]
-            shelf.sync()
-            print(f'  CFOUR scratch file zmat{zm2} for {zm_2} has been read\n')
-            #print('%s\n' % shelf['zmat'][zm_2])
-
-        # S/R: Write distributed input files for harmonic freq
-        if isSowReap:
-            os.chdir(current_directory)
-            inputSansMol = p4util.format_currentstate_for_input(gradient, lowername, allButMol=True, **kwargs)
-            for zm12 in zmats0N:
-                zm1, zm2 = zm12.split('-')
+        elif job == 'harmonic':
+            vpt2_harmonic(ledger, config, scratch_messy)
 
-                ifile = vpt2_sow_files(zm12, shelf['linkage'], isC4notP4, isC4fully,
-                    shelf['zmat'][zm12], inputSansMol, shelf['genbas'])
+        elif job.endswith('-setup'):
+            vpt2_displaced_setup(ledger, job[:3] + '-000', config, scratch_messy)
 
-                with open('VPT2-' + zm12 + '.in', 'w') as handle:
-                    handle.write(ifile)
+        elif job == 'anharmonic':
+            vpt2_anharmonic(ledger, config, scratch_messy)
 
-            msg = vpt2_instructions('harmonic', current_directory, zmats0N)
-            core.print_out(msg)
-            print(msg)
+        else:
+            # S/R: Reap only once distributed calc completed correctly
+            if isSowReap:
+                isOk, msg = sown_jobs_status(current_directory, 'VPT2', [job], reap_job_validate, linkage, reapkeys)
+                if not isOk:
+                    return
 
-        shelf['status'] = 'harm_jobs_sown'
+            print('{:_^45}'.format(f'  VPT2 Computation: {job}  '))
+            fjobarc = vpt2_reaprun_files(job, linkage, isSowReap, isC4notP4, isC4fully,
+                ledger['zmat'][job], #current_directory, psioh.get_default_path(), cfour_tmpdir,
+                lowername, kwargs, ledger['genbas'], config, package, scratch_messy=scratch_messy)
+            ledger['fjobarc'][job] = fjobarc
+            return
 
-        # S/R: Pause for distributed calculations
-        if isSowReap:
-            shelf.close()
-            return 0.0
+        ledger['stages'][job] = True
+
+    def graph():
+        return vpt2_job_graph(ledger['zmat'].keys())
+
+    def done():
+        return set(ledger['stages'].keys()) | set(ledger['fjobarc'].keys())
 
-    if shelf['status'] == 'harm_jobs_sown':
-        zmats0N = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] == '000' and item[-3:] != '000')]
+    # Run every job whose prerequisites are complete, displacements concurrently, until none remain
+    remaining = run_graph(graph, run_job, done, nproc=nproc)
 
-        # S/R: Check that distributed calcs all completed correctly
+    if remaining:
+        # S/R: Write distributed input files for the displacements awaited and pause
         if isSowReap:
-            msg = vpt2_instructions('harmonic', current_directory, zmats0N)
+            deps = graph()
+            awaited = [job for job in remaining if job in ledger['zmat'] and set(deps[job]) <= done()]
+            stage = 'harmonic' if all(job[:3] == '000' for job in awaited) else 'anharmonic'
+            zmats = [job for job in deps if job in ledger['zmat'] and (job[:3] == '000') == (stage == 'harmonic')]
+
+            os.chdir(current_directory)
+            inputSansMol = p4util.format_currentstate_for_input(gradient, lowername, allButMol=True, **kwargs)
+            for zm12 in awaited:
+                if not os.path.isfile('VPT2-' + zm12 + '.in'):
+                    ifile = vpt2_sow_files(zm12, linkage, isC4notP4, isC4fully,
+                        ledger['zmat'][zm12], inputSansMol, ledger['genbas'])
+
+                    with open('VPT2-' + zm12 + '.in', 'w') as handle:
+                        handle.write(ifile)
+
+            msg = vpt2_instructions(stage, current_directory, zmats, ledger.path)
             core.print_out(msg)
-            isOk, msg = sown_jobs_status(current_directory, 'VPT2', zmats0N, reap_job_validate,
-                shelf['linkage'], ['CURRENT ENERGY', 'CURRENT DIPOLE', 'CURRENT GRADIENT'])
+            print(msg)
+            isOk, msg = sown_jobs_status(current_directory, 'VPT2', zmats, reap_job_validate, linkage, reapkeys)
             core.print_out(msg)
             print(msg)
-            if not isOk:
-                shelf.close()
-                return 0.0
-
-        # Collect all results from gradients forming the harmonic freq
-        for zm12 in zmats0N:
-            zm1, zm2 = zm12.split('-')
-            if zm12 not in shelf['fjobarc']:
-                print('{:_^45}'.format(f'  VPT2 Computation: {zm12}  '))
-
-                fjobarc = vpt2_reaprun_files(zm12, shelf['linkage'], isSowReap, isC4notP4, isC4fully,
-                    shelf['zmat'][zm12], #current_directory, psioh.get_default_path(), cfour_tmpdir,
-                    lowername, kwargs, shelf['genbas'], config, package, scratch_messy=scratch_messy)
-                shelf['fjobarc'][zm12] = fjobarc
-                shelf.sync()
-        shelf['status'] = 'harm_jobs_reaped'
-
-    if shelf['status'] == 'harm_jobs_reaped':
-        zmats0N = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] == '000' and item[-3:] != '000')]
-
-        print('{:_^45}'.format('  VPT2 Results: Harmonic  '))
-        for k, v in shelf.items():
-            print('   {:_^20}'.format(k))
-            #pp.pprint(v)
-
-        #scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000'}
-        #scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
-        #scrkwgs.update({'scratch_messy': scratch_messy})
-
-        # Process the gradients into harmonic freq
-        scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000med'}
-        success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': shelf['zmat']['000-000'], 'GENBAS': shelf['genbas']}, [], **scrkwgs)
-        harmout = dexe['stdout']
+            return 0.0
 
-        scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
-        success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
-        print('xsymcor', success)
-        harmout += dexe['stdout']
+        raise ValidationError("""VPT2 jobs could not be completed: {}""".format(', '.join(remaining)))
 
-        for zm12 in zmats0N:
-            zm1, zm2 = zm12.split('-')
-            success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': shelf['fjobarc'][zm12]}, [], **scrkwgs)
-            print(zm12, 'xja2fja', success)
-            harmout += dexe['stdout']
 
-            success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
-            print(zm12, 'xsymcor', success)
-            harmout += dexe['stdout']
+class VPT2Ledger(object):
+    """Record of a :py:func:`vpt2` computation in directory *path*, kept so
+    that an interrupted computation resumes without repeating finished jobs.
 
-        success, dexe = qcng.util.execute(['xjoda'], {}, [], **scrkwgs)
-        print('xjoda', success)
-        harmout += dexe['stdout']
+    Each entry is a JSON file that is written through a rename, so it is
+    either complete or absent, never partial. Entries are written by
+    whichever process finishes the job, so displacements run in forked
+    processes are recorded as they complete, not when their stage does.
+    Besides plain entries like ``linkage`` and ``genbas``, the ledger has
+    sections, themselves ledgers, of ``zmat`` (Cfour ZMAT files with finite
+    difference geometries), ``fjobarc`` (Cfour- or Psi4-generated ascii
+    files with packaged gradient results), and ``stages`` (setup and
+    processing jobs completed).
 
-        for zm in Path(dexe['scratch_directory']).glob('zmat*'):
-            print('Removing', zm)
-            os.remove(zm)
+    """
+    sections = ('zmat', 'fjobarc', 'stages')
+
+    def __init__(self, path, sections=None):
+        self.path = path
+        self.sections = self.sections if sections is None else sections
+        os.makedirs(path, exist_ok=True)
+        self._sections = {sect: VPT2Ledger(os.path.join(path, sect), sections=()) for sect in self.sections}
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def __contains__(self, key):
+        return os.path.isfile(self._entry_path(key))
+
+    def __getitem__(self, key):
+        if key in self._sections:
+            return self._sections[key]
+        try:
+            with open(self._entry_path(key), 'r') as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        path = self._entry_path(key)
+        tmppath = path + '.' + str(uuid.uuid4())
+        with open(tmppath, 'w') as handle:
+            json.dump(value, handle)
+        os.replace(tmppath, path)
+
+    def keys(self):
+        return sorted(fl[:-5] for fl in os.listdir(self.path) if fl.endswith('.json'))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+
+def vpt2_job_graph(zmats):
+    """Returns the dependencies among the jobs of :py:func:`vpt2` known
+    from the displacement labels *zmats* generated so far. Gradient jobs
+    are labeled by displacement: ``000-NNN`` about the reference geometry
+    ``000-000``, forming the harmonic freq, and ``NNN-MMM`` about each
+    normal coordinate displacement ``NNN-000``, forming the anharmonic freq.
+    Setup and processing jobs are ``harmonic-setup``, ``harmonic``,
+    ``NNN-setup``, and ``anharmonic``. Since displacements enter *zmats*
+    only once the job generating them is complete, the graph grows as jobs
+    finish but never loses a prerequisite of a job that is ready.
 
-        scrkwgs.update({'scratch_messy': scratch_messy})
-        success, dexe = qcng.util.execute(['xcubic'], {}, ['zmat*'], **scrkwgs)
-        print('xcubic', success)
+    """
+    zmats0N = [item for item in sorted(zmats) if (item[:3] == '000' and item[-3:] != '000')]
+    zmatsN0 = [item for item in sorted(zmats) if (item[:3] != '000' and item[-3:] == '000')]
+    zmatsNN = [item for item in sorted(zmats) if (item[:3] != '000' and item[-3:] != '000')]
+    setupsN = [zmN0[:3] + '-setup' for zmN0 in zmatsN0]
+
+    graph = collections.OrderedDict()
+    graph['harmonic-setup'] = []
+    for zm12 in zmats0N:
+        graph[zm12] = ['harmonic-setup']
+    graph['harmonic'] = ['harmonic-setup'] + zmats0N
+    for setup in setupsN:
+        graph[setup] = ['harmonic']
+    for zm12 in zmatsNN:
+        graph[zm12] = [zm12[:3] + '-setup']
+    graph['anharmonic'] = ['harmonic'] + setupsN + zmatsNN
+
+    return graph
+
+
+def vpt2_harmonic_setup(ledger, config, scratch_messy):
+    """Generate the displacements about the reference geometry that will
+    form the harmonic freq and record them in *ledger*.
+
+    """
+    print('{:_^45}'.format('  VPT2 Setup: Harmonic  '))
+
+    # Generate the displacements that will form the harmonic freq
+    scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000'}
+    success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': ledger['zmat']['000-000'], 'GENBAS': ledger['genbas']}, [], **scrkwgs)
+    partial = dexe['stdout']
+
+    scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
+    scrkwgs.update({'scratch_messy': scratch_messy})
+    success, dexe = qcng.util.execute(['xsymcor'], {}, ['zmat*'], **scrkwgs)
+    partial += dexe['stdout']
+
+    print(partial)  # partial.out
+
+    # Read the displacements that will form the harmonic freq
+    zmats0N = ['000-' + item[-3:] for item in dexe['outfiles']['zmat*']]
+    for zm_2 in zmats0N:
+        _, zm2 = zm_2.split('-')
+        ledger['zmat'][zm_2] = dexe['outfiles']['zmat*']['zmat' + zm2]
+        print(f'  CFOUR scratch file zmat{zm2} for {zm_2} has been read\n')
+        #print('%s\n' % ledger['zmat'][zm_2])
+
+
+def vpt2_harmonic(ledger, config, scratch_messy):
+    """Process the gradients recorded in *ledger* about the reference
+    geometry into the harmonic freq and record the displacements along its
+    normal coordinates.
+
+    """
+    zmats0N = [item for item in ledger['zmat'].keys() if (item[:3] == '000' and item[-3:] != '000')]
+
+    print('{:_^45}'.format('  VPT2 Results: Harmonic  '))
+
+    # Process the gradients into harmonic freq
+    scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000med'}
+    success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': ledger['zmat']['000-000'], 'GENBAS': ledger['genbas']}, [], **scrkwgs)
+    harmout = dexe['stdout']
+
+    scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
+    success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
+    print('xsymcor', success)
+    harmout += dexe['stdout']
+
+    for zm12 in zmats0N:
+        zm1, zm2 = zm12.split('-')
+        success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': ledger['fjobarc'][zm12]}, [], **scrkwgs)
+        print(zm12, 'xja2fja', success)
         harmout += dexe['stdout']
-        #print('HARMOUT')
-        #print(harmout)
 
-        pp.pprint(shelf['zmat'].keys())    
-        pp.pprint(shelf['fjobarc'].keys())    
+        success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
+        print(zm12, 'xsymcor', success)
+        harmout += dexe['stdout']
 
+    success, dexe = qcng.util.execute(['xjoda'], {}, [], **scrkwgs)
+    print('xjoda', success)
+    harmout += dexe['stdout']
 
+    for zm in Path(dexe['scratch_directory']).glob('zmat*'):
+        print('Removing', zm)
+        os.remove(zm)
+
+    scrkwgs.update({'scratch_messy': scratch_messy})
+    success, dexe = qcng.util.execute(['xcubic'], {}, ['zmat*'], **scrkwgs)
+    print('xcubic', success)
+    harmout += dexe['stdout']
+    #print('HARMOUT')
+    #print(harmout)
 
 #        os.chdir(psioh.get_default_path() + cfour_tmpdir + '/harm')  # psi_scratch/cfour/harm
 #        harmout = run_cfour_module('xjoda')
@@ -434,36 +542,38 @@ def vpt2(name, **kwargs):
 #        with open('harm.out', 'w') as handle:
 #            handle.write(harmout)
 
-        # Generate displacements along harmonic normal modes
-        #zmatsN0 = [item[-3:] for item in sorted(shelf['zmat'].keys()) if (item[:3] == '000' and item[-3:] != '000')]
-        for fl, contents in dexe['outfiles']['zmat*'].items():
-            zmN_ = fl[-3:] + '-000'
-            shelf['zmat'][zmN_] = contents
-            shelf.sync()
-            print(f'  CFOUR scratch file {fl} for {zmN_} has been read\n')
-            #print('%s\n' % shelf['zmat'][zm12])
-
-        zmatsN0 = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] != '000' and item[-3:] == '000')]
-        for zmN0 in zmatsN0:
-            zm1, _ = zmN0.split('-')
-
-            # Collect displacements along the normal coordinates generated by the harmonic freq.
-            #   Further harmonic freqs are to be run at each of these to produce quartic force field.
-            #   To carry these out, generate displacements for findif by gradient at each displacement.
-
-            scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': f'_{zmN0}'}
-            success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': shelf['zmat'][zmN0], 'GENBAS': shelf['genbas']}, [], **scrkwgs)
-
-            scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
-            scrkwgs.update({'scratch_messy': scratch_messy})
-            success, dexe = qcng.util.execute(['xsymcor'], {}, ['zmat*'], **scrkwgs)
-
-            for fl, contents in dexe['outfiles']['zmat*'].items():
-                zm12 = zm1 + '-' + fl[-3:]
-                shelf['zmat'][zm12] = contents
-                shelf.sync()
-                print('  CFOUR scratch file %s for %s has been read\n' % (fl, zm12))
-                #print('%s\n' % shelf['zmat'][zm12])
+    # Generate displacements along harmonic normal modes
+    for fl, contents in dexe['outfiles']['zmat*'].items():
+        zmN_ = fl[-3:] + '-000'
+        ledger['zmat'][zmN_] = contents
+        print(f'  CFOUR scratch file {fl} for {zmN_} has been read\n')
+        #print('%s\n' % ledger['zmat'][zmN_])
+
+
+def vpt2_displaced_setup(ledger, zmN0, config, scratch_messy):
+    """Generate the displacements about the normal coordinate displaced
+    geometry *zmN0* that will form the harmonic freq there and record
+    them in *ledger*.
+
+    """
+    zm1, _ = zmN0.split('-')
+
+    # Collect displacements along the normal coordinates generated by the harmonic freq.
+    #   Further harmonic freqs are to be run at each of these to produce quartic force field.
+    #   To carry these out, generate displacements for findif by gradient at each displacement.
+
+    scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': f'_{zmN0}'}
+    success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': ledger['zmat'][zmN0], 'GENBAS': ledger['genbas']}, [], **scrkwgs)
+
+    scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
+    scrkwgs.update({'scratch_messy': scratch_messy})
+    success, dexe = qcng.util.execute(['xsymcor'], {}, ['zmat*'], **scrkwgs)
+
+    for fl, contents in dexe['outfiles']['zmat*'].items():
+        zm12 = zm1 + '-' + fl[-3:]
+        ledger['zmat'][zm12] = contents
+        print('  CFOUR scratch file %s for %s has been read\n' % (fl, zm12))
+        #print('%s\n' % ledger['zmat'][zm12])
 
 #        zmatsN0 = [item[-3:] for item in sorted(glob.glob('zmat*'))]
 #        os.chdir('..')  # psi_scratch/cfour
@@ -500,158 +610,101 @@ def vpt2(name, **kwargs):
 #                    core.print_out('%s\n' % shelf['zmat'][zm12])
 #            os.chdir('..')  # psi_scratch/cfour
 
-        zmatsNN = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] != '000' and item[-3:] != '000')]
 
-        # S/R: Write distributed input files for anharmonic freq
-        if isSowReap:
-            os.chdir(current_directory)
-            inputSansMol = p4util.format_currentstate_for_input(gradient, lowername, allButMol=True, **kwargs)
-            for zm12 in zmatsNN:
-                zm1, zm2 = zm12.split('-')
+def vpt2_anharmonic(ledger, config, scratch_messy):
+    """Process the gradients recorded in *ledger* about the reference and
+    normal coordinate displaced geometries into harmonic freqs and those
+    into the anharmonic freq.
 
-                ifile = vpt2_sow_files(zm12, shelf['linkage'], isC4notP4, isC4fully,
-                    shelf['zmat'][zm12], inputSansMol, shelf['genbas'])
-                # GENBAS needed here
+    """
+    zmats0N = [item for item in ledger['zmat'].keys() if (item[:3] == '000' and item[-3:] != '000')]
+    zmatsN0 = [item for item in ledger['zmat'].keys() if (item[:3] != '000' and item[-3:] == '000')]
+    zmatsNN = [item for item in ledger['zmat'].keys() if (item[:3] != '000' and item[-3:] != '000')]
 
-                with open('VPT2-' + zm12 + '.in', 'w') as handle:
-                    handle.write(ifile)
+    print('{:_^45}'.format('  VPT2 Results: Harmonic  '))
 
-            msg = vpt2_instructions('anharmonic', current_directory, zmatsNN)
-            core.print_out(msg)
-            print(msg)
+    # Process the gradients into harmonic freq
+    scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000final'}
+    success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': ledger['zmat']['000-000'], 'GENBAS': ledger['genbas']}, [], **scrkwgs)
+    anharmout = dexe['stdout']
 
-        shelf['status'] = 'anharm_jobs_sown'
+    scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
+    success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
+    anharmout += dexe['stdout']
 
-        # S/R: Pause for distributed calculations
-        if isSowReap:
-            shelf.close()
-            return 0.0
+    for zm12 in zmats0N:
+        zm1, zm2 = zm12.split('-')
+        success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': ledger['fjobarc'][zm12]}, [], **scrkwgs)
+        anharmout += dexe['stdout']
+        success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
+        anharmout += dexe['stdout']
 
-    if shelf['status'] == 'anharm_jobs_sown':
-        zmatsNN = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] != '000' and item[-3:] != '000')]
+    success, dexe = qcng.util.execute(['xjoda'], {}, [], **scrkwgs)
+    anharmout += dexe['stdout']
+    scrkwgs.update({'scratch_messy': scratch_messy})
+    success, dexe = qcng.util.execute(['xcubic'], {}, ['zmat*', 'JOBARC', 'JAINDX'], as_binary=['JOBARC', 'JAINDX'], **scrkwgs)
+    anharmout += dexe['stdout']
 
-        # S/R: Check that distributed calcs all completed correctly
-        if isSowReap:
-            msg = vpt2_instructions('anharmonic', current_directory, zmatsNN)
-            core.print_out(msg)
-            isOk, msg = sown_jobs_status(current_directory, 'VPT2', zmatsNN, 
-                reap_job_validate, shelf['linkage'], 
-                ['CURRENT ENERGY', 'CURRENT DIPOLE', 'CURRENT GRADIENT'])
-            core.print_out(msg)
-            print(msg)
-            if not isOk:
-                shelf.close()
-                return 0.0
-
-        # Collect all results from gradients forming the anharmonic freq
-        for zmNN in zmatsNN:
-            zm1, zm2 = zmNN.split('-')
-            if zmNN not in shelf['fjobarc']:
-                print('{:_^45}'.format(f'  VPT2 Computation: {zmNN}'))
-
-                fjobarc = vpt2_reaprun_files(zmNN, shelf['linkage'], isSowReap, isC4notP4, isC4fully,
-                    shelf['zmat'][zmNN],
-                    lowername, kwargs, shelf['genbas'], config, package, scratch_messy=scratch_messy)
-                shelf['fjobarc'][zmNN] = fjobarc
-                shelf.sync()
-        shelf['status'] = 'anharm_jobs_reaped'
-
-    if shelf['status'] == 'anharm_jobs_reaped':
-        zmats0N = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] == '000' and item[-3:] != '000')]
-        zmatsN0 = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] != '000' and item[-3:] == '000')]
-        zmatsNN = [item for item in sorted(shelf['zmat'].keys()) if (item[:3] != '000' and item[-3:] != '000')]
-
-        print('{:_^45}'.format('  VPT2 Results: Harmonic  '))
-
-        # Process the gradients into harmonic freq
-        scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000final'}
-        success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': shelf['zmat']['000-000'], 'GENBAS': shelf['genbas']}, [], **scrkwgs)
+    jobarc0 = dexe['outfiles']['JOBARC']
+    jaindx0 = dexe['outfiles']['JAINDX']
+
+    # Process the gradients into harmonic freq at each normco displaced point
+    fjobarcN0 = {}
+    for zm1_ in zmatsN0:
+        zm1, _ = zm1_.split('-')
+
+        scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': f'_{zm1}final'}
+        success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': ledger['zmat'][zm1_], 'GENBAS': ledger['genbas']}, [], **scrkwgs)
         anharmout = dexe['stdout']
 
         scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
         success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
         anharmout += dexe['stdout']
 
-        for zm12 in zmats0N:
-            zm1, zm2 = zm12.split('-')
-            success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': shelf['fjobarc'][zm12]}, [], **scrkwgs)
+        for zm12 in [item for item in zmatsNN if (item[:3] == zm1 and item[-3:] != '000')]:
+            _, zm2 = zm12.split('-')
+            print(zm12, ledger['fjobarc'][zm12])
+
+            success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': ledger['fjobarc'][zm12]}, [], **scrkwgs)
             anharmout += dexe['stdout']
+
             success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
             anharmout += dexe['stdout']
 
+            os.remove(Path(dexe['scratch_directory']) / 'FJOBARC')
+
         success, dexe = qcng.util.execute(['xjoda'], {}, [], **scrkwgs)
         anharmout += dexe['stdout']
+
         scrkwgs.update({'scratch_messy': scratch_messy})
-        success, dexe = qcng.util.execute(['xcubic'], {}, ['zmat*', 'JOBARC', 'JAINDX'], as_binary=['JOBARC', 'JAINDX'], **scrkwgs)
+        success, dexe = qcng.util.execute(['xja2fja'], {}, ['FJOBARC'], **scrkwgs)
         anharmout += dexe['stdout']
+        fjobarcN0[zm1_] = dexe['outfiles']['FJOBARC']
 
-        jobarc0 = dexe['outfiles']['JOBARC']
-        jaindx0 = dexe['outfiles']['JAINDX']
-
-        # Process the gradients into harmonic freq at each normco displaced point
-        os.chdir('..')  # psi_scratch/cfour
-        for zm1_ in zmatsN0:
-            zm1, _ = zm1_.split('-')
-
-            scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': f'_{zm1}final'}
-            success, dexe = qcng.util.execute(['xjoda'], {'ZMAT': shelf['zmat'][zm1_], 'GENBAS': shelf['genbas']}, [], **scrkwgs)
-            anharmout = dexe['stdout']
+        print('PARTIAL', zm1_, '\n', anharmout)
 
-            scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
-            success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
-            anharmout += dexe['stdout']
-
-            for zm12 in [item for item in zmatsNN if (item[:3] == zm1 and item[-3:] != '000')]:
-                _, zm2 = zm12.split('-')
-                print(zm12, shelf['fjobarc'][zm12])
-
-                success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': shelf['fjobarc'][zm12]}, [], **scrkwgs)
-                anharmout += dexe['stdout']
+    # Process the harmonic freqs at normco displacements into anharmonic freq
+    print('{:_^45}'.format('  VPT2 Results: Anharmonic  '))
 
-                success, dexe = qcng.util.execute(['xsymcor'], {}, [], **scrkwgs)
-                anharmout += dexe['stdout']
+    pprint.pprint(ledger['zmat'].keys())
+    pprint.pprint(ledger['fjobarc'].keys())
 
-                os.remove(Path(dexe['scratch_directory']) / 'FJOBARC')
+    scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000anharm'}
+    success, dexe = qcng.util.execute(['ls'], {'JOBARC': jobarc0, 'JAINDX': jaindx0}, [], as_binary=['JOBARC', 'JAINDX'], **scrkwgs)
+    anharmout = ''
+    scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
 
-            success, dexe = qcng.util.execute(['xjoda'], {}, [], **scrkwgs)
-            anharmout += dexe['stdout']
-
-            scrkwgs.update({'scratch_messy': scratch_messy})
-            success, dexe = qcng.util.execute(['xja2fja'], {}, ['FJOBARC'], **scrkwgs)
-            anharmout += dexe['stdout']
-            shelf['fjobarc'][zm1_] = dexe['outfiles']['FJOBARC']
-            shelf.sync()
-
-            print('PARTIAL', zm1_, '\n', anharmout)
-
-
-        # Process the harmonic freqs at normco displacements into anharmonic freq
-        print('{:_^45}'.format('  VPT2 Results: Anharmonic  '))
-
-        pprint.pprint(shelf['zmat'].keys())
-        pprint.pprint(shelf['fjobarc'].keys())
-
-        scrkwgs = {'scratch_directory': config.scratch_directory, 'scratch_messy': True, 'scratch_suffix': '_000anharm'}
-        success, dexe = qcng.util.execute(['ls'], {'JOBARC': jobarc0, 'JAINDX': jaindx0}, [], as_binary=['JOBARC', 'JAINDX'], **scrkwgs)
-        anharmout = ''
-        scrkwgs.update({'scratch_name': Path(dexe['scratch_directory']).name, 'scratch_exist_ok': True})
-
-        for zm1_ in zmatsN0:
-            zm1, _ = zm1_.split('-')
-            success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': shelf['fjobarc'][zm1_]}, [], **scrkwgs)
-            print(zm1_, 'xja2fja', success)
-            anharmout += dexe['stdout']
-
-            success, dexe = qcng.util.execute(['xcubic'], {}, [], **scrkwgs)
-            print(zm1_, 'xcubic', success)
-            anharmout += dexe['stdout']
-
-        print(anharmout)  # anharm.out
+    for zm1_ in zmatsN0:
+        zm1, _ = zm1_.split('-')
+        success, dexe = qcng.util.execute(['xja2fja'], {'FJOBARC': fjobarcN0[zm1_]}, [], **scrkwgs)
+        print(zm1_, 'xja2fja', success)
+        anharmout += dexe['stdout']
 
-        shelf['status'] = 'vpt2_completed'
+        success, dexe = qcng.util.execute(['xcubic'], {}, [], **scrkwgs)
+        print(zm1_, 'xcubic', success)
+        anharmout += dexe['stdout']
 
-    # Finish up
-    shelf.close()
+    print(anharmout)  # anharm.out
 
 
 def vpt2_sow_files(item, linkage, isC4notP4, isC4fully, zmat, inputSansMol, inputGenbas):
@@ -806,7 +859,7 @@ def vpt2_reaprun_files(item, linkage, isSowReap, isC4notP4, isC4fully, zmat, low
                 **{
                     'driver': 'gradient',
                     'extras': {
-                        'qcdb:options': copy.deepcopy(pe.nu_options),
+                        'qcdb:options': pe.nu_options.snapshot(),
                     },
                     'model': {
                         'method': lowername,
@@ -832,12 +885,12 @@ def vpt2_reaprun_files(item, linkage, isSowReap, isC4notP4, isC4fully, zmat, low
     return fjobarc
 
 
-def vpt2_instructions(stage, dir, zmats):
+def vpt2_instructions(stage, dir, zmats, ledger):
     """Stores all the instructions to the user for running
     :py:func:`~wrappers_cfour.vpt2` in sowreap mode. Depending on the
     *stage*, Pieces together instruction strings for the appropriate
-    *stage* individualized by working directory *dir* and sown inputs
-    *zmats* information.
+    *stage* individualized by working directory *dir*, sown inputs
+    *zmats*, and data persistence path *ledger* information.
 
     """
     stepFiles = ''
@@ -872,7 +925,7 @@ def vpt2_instructions(stage, dir, zmats):
 
 """ % (dir + '/' + os.path.splitext(core.outfile_name())[0] + '.in',
        dir + '/' + core.outfile_name(),
-       dir + '/' + os.path.splitext(core.outfile_name())[0] + '.shelf')
+       ledger)
     step1 = """
     (1)  Sow
     --------
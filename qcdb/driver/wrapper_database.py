@@ -0,0 +1,290 @@
+"""Driver for computing the reactions of a chemical database.
+
+Reactions are assembled from the energies of their reagents through the
+``RXNM`` stoichiometry of the database module (e.g., `S22.py` in
+``share/qcdb/databases``). Reagents sharing a geometry, whether across
+reactions or under different labels, are computed once. Each completed
+reagent energy is written to an on-disk ledger so that an interrupted
+sweep resumes without repeating finished jobs.
+
+"""
+import os
+import re
+import json
+import uuid
+import hashlib
+import collections
+
+import numpy as np
+import qcelemental as qcel
+
+from .. import __version__
+from .. import util
+from ..exceptions import *
+from . import pe
+from . import resultcache
+from .energy import energy
+
+# special subset names and their database module arrays
+_named_subsets = {'small': 'HRXN_SM', 'large': 'HRXN_LG', 'equilibrium': 'HRXN_EQ'}
+
+
+def database(name, db_name, **kwargs):
+    r"""Function to compute the reaction energies of database *db_name*
+    with the model chemistry *name*, computing each unique reagent once.
+
+    :returns: *dict* |w--w| ``reactions``, ``reference``, and ``errors``
+        (ME, MAE, RMSE) in kcal/mol, ``reagents`` in Hartrees, and ``jobs``
+        counts of ``unique``, ``computed``, and ``ledger`` reagent energies.
+
+    :type name: string or function
+    :param name: ``'scf'`` || ``'mp2/cc-pv[dt]z'`` || ``cbs`` || etc.
+
+        Computational method, passed along as the first argument of *func*.
+
+    :type db_name: string
+    :param db_name: ``'S22'`` || ``'BASIC'`` || etc.
+
+        Database module, searched for in the current directory, ``PSIPATH``,
+        and the library ``share/qcdb/databases``.
+
+    :type func: function
+    :param func: |dl| ``energy`` |dr| || etc.
+
+        Energy function called as ``func(name, molecule=reagent, **kwargs)``
+        for each unique reagent, returning a float.
+
+    :type subset: string or list
+    :param subset: |dl| ``'all'`` |dr| || ``'small'`` || ``'HB'`` || ``[1, 4, '7']`` || etc.
+
+        Name of a subset array in the database module or list of reactions.
+
+    :type cp: :ref:`boolean <op_py_boolean>`
+    :param cp: ``'on'`` || |dl| ``'off'`` |dr|
+
+        Counterpoise-correct reactions through ``ACTV_CP`` reagents.
+
+    :type rlxd: :ref:`boolean <op_py_boolean>`
+    :param rlxd: ``'on'`` || |dl| ``'off'`` |dr|
+
+        Include monomer relaxation through ``ACTV_RLX`` reagents.
+
+    :type benchmark: string
+    :param benchmark: |dl| ``'default'`` |dr| || ``'S22B'`` || etc.
+
+        Reference reaction energies ``BIND`` or ``BIND_<benchmark>``.
+
+    :type parallel: int
+    :param parallel: |dl| ``1`` |dr| || ``8`` || etc.
+
+        Maximum number of reagents computed at once, in as many forked worker processes.
+
+    :type ledger: string or :ref:`boolean <op_py_boolean>`
+    :param ledger: |dl| ``'<db_name>-<name>.ledger'`` |dr| || ``'path/to/dir'`` || ``False``
+
+        Directory of completed reagent energies, read before and written
+        during the sweep. Entries are keyed by reagent geometry, method,
+        *kwargs*, and changed options.
+
+    :examples:
+
+    >>> # [1] MP2/jun-cc-pVDZ counterpoise-corrected hydrogen-bonded S22, four reagents at once
+    >>> database('mp2/jun-cc-pvdz', 'S22', subset='HB', cp=True, parallel=4)
+
+    >>> # [2] cbs() coupled with database()
+    >>> database(cbs, 'BASIC', subset=['h2o', 'nh3'], corl_wfn='mp2', corl_basis='cc-pV[tq]z', corl_scheme=corl_xtpl_helgaker_2)
+
+    """
+    func = kwargs.pop('func', energy)
+    subset = kwargs.pop('subset', None)
+    db_cp = kwargs.pop('cp', False)
+    db_rlxd = kwargs.pop('rlxd', False)
+    benchmark = kwargs.pop('benchmark', 'default')
+    nproc = kwargs.pop('parallel', 1)
+    ledger = kwargs.pop('ledger', True)
+
+    if len(pe.nu_options.scroll) == 0:
+        pe.load_nu_options()
+
+    dbmod = _import_database(db_name)
+    dbse = dbmod.dbse
+    HRXN = _select_reactions(dbmod, subset)
+    ACTV = _select_activation(dbmod, util.yes.match(str(db_cp)), util.yes.match(str(db_rlxd)))
+    BIND = dbmod.BIND if benchmark == 'default' else getattr(dbmod, 'BIND_' + benchmark, None)
+    if BIND is None:
+        raise ValidationError("""Benchmark {} not in database {}.""".format(benchmark, dbse))
+
+    # collect reagents of all reactions and collapse those of identical geometry, up to rigid motion
+    reagents = collections.OrderedDict()  # reagent label: job key
+    jobs = collections.OrderedDict()  # job key: representative reagent label
+    mname = name.__name__ if callable(name) else name
+    for rxn in HRXN:
+        for rgt in ACTV['{}-{}'.format(dbse, rxn)]:
+            if rgt not in reagents:
+                key = _job_key(dbmod.GEOS[rgt], mname, func, pe.nu_options, kwargs)
+                reagents[rgt] = key
+                jobs.setdefault(key, rgt)
+
+    if ledger is True:
+        ledger = re.sub(r'[^\w.+-]', '_', '{}-{}.ledger'.format(dbse, mname))
+    if ledger:
+        ledger = os.path.abspath(os.path.expanduser(ledger))
+        os.makedirs(ledger, exist_ok=True)
+
+    done = {}
+    for key in jobs:
+        entry = _ledger_load(ledger, key) if ledger else None
+        if entry is not None:
+            done[key] = entry['energy']
+    todo = [(key, rgt) for key, rgt in jobs.items() if key not in done]
+
+    print("""\n  ==> Database {}: {} reactions, {} reagents, {} unique, {} in ledger <==\n""".format(
+        dbse, len(HRXN), len(reagents), len(jobs), len(done)))
+
+    def compute(job):
+        key, rgt = job
+        print(util.banner(' Database {} Computation: Reagent {} '.format(dbse, rgt)))
+        molecule = dbmod.GEOS[rgt]
+        molecule.update_geometry()
+        ene = float(func(name, molecule=molecule, **kwargs))
+        if ledger:
+            _ledger_store(ledger, key, {'reagent': rgt, 'method': mname, 'energy': ene})
+        return ene
+
+    computed = util.map_forked(compute, todo, nproc=nproc)
+    done.update(zip([key for key, rgt in todo], computed))
+
+    # assemble reactions by stoichiometry
+    record = {key: collections.OrderedDict() for key in ['reagents', 'reactions', 'reference']}
+    for rgt, key in reagents.items():
+        record['reagents'][rgt] = done[key]
+    for rxn in HRXN:
+        dbrxn = '{}-{}'.format(dbse, rxn)
+        record['reactions'][dbrxn] = qcel.constants.hartree2kcalmol * sum(
+            dbmod.RXNM[dbrxn][rgt] * record['reagents'][rgt] for rgt in ACTV[dbrxn])
+        if dbrxn in BIND:
+            record['reference'][dbrxn] = BIND[dbrxn]
+
+    errors = np.array([record['reactions'][rxn] - ref for rxn, ref in record['reference'].items()])
+    if errors.size:
+        record['errors'] = {
+            'ME': errors.mean(),
+            'MAE': np.absolute(errors).mean(),
+            'RMSE': np.sqrt(np.mean(errors * errors)),
+        }
+    else:
+        record['errors'] = {}
+    record['jobs'] = {'unique': len(jobs), 'computed': len(todo), 'ledger': len(jobs) - len(todo)}
+
+    print(_format_reactions(dbse, mname, record))
+    return record
+
+
+def _import_database(db_name):
+    libraryPath = os.sep.join([pe.data_dir, 'databases'])
+    dbPath = [os.path.abspath('.')] + \
+             [os.path.abspath(x) for x in os.environ.get('PSIPATH', '').split(':') if x] + \
+             [libraryPath]
+
+    dbmod = util.import_ignorecase(db_name, lenv=dbPath)
+    if dbmod is None:
+        raise ImportError('Python module loading problem for database ({}): {}'.format(db_name, dbPath))
+    return dbmod
+
+
+def _select_reactions(dbmod, subset):
+    """Return list of reactions of `dbmod` (elements of its HRXN) selected by `subset`."""
+
+    if subset is None or subset == 'all':
+        return list(dbmod.HRXN)
+
+    if isinstance(subset, str):
+        for attr in [_named_subsets.get(subset.lower()), subset, subset.upper(), 'HRXN_' + subset.upper()]:
+            if attr is not None and hasattr(dbmod, attr):
+                return list(getattr(dbmod, attr))
+        raise ValidationError("""Subset {} not in database {}.""".format(subset, dbmod.dbse))
+
+    lookup = {str(rxn): rxn for rxn in dbmod.HRXN}
+    lookup.update({'{}-{}'.format(dbmod.dbse, rxn): rxn for rxn in dbmod.HRXN})
+    try:
+        return [lookup[str(rxn)] for rxn in subset]
+    except KeyError as err:
+        raise ValidationError("""Reaction {} not in database {}.""".format(err, dbmod.dbse))
+
+
+def _select_activation(dbmod, cp, rlxd):
+    """Return active reagents per reaction of `dbmod` for counterpoise `cp` and relaxation `rlxd`."""
+
+    attr = 'ACTV' + ('_CP' if cp else '') + ('RLX' if cp and rlxd else '_RLX' if rlxd else '')
+    try:
+        return getattr(dbmod, attr)
+    except AttributeError:
+        raise ValidationError("""Database {} lacks {} reagent lists for cp={}, rlxd={}.""".format(
+            dbmod.dbse, attr, bool(cp), bool(rlxd)))
+
+
+def _reagent_fingerprint(molecule):
+    """Return summary of `molecule` that is the same for reagents of identical
+    computation, regardless of label, placement, or orientation. Geometry
+    enters through interatomic distances [a0], so atom order matters.
+
+    """
+    molecule.update_geometry()
+    geom = molecule.geometry(np_out=True)
+    return {
+        'elem': [molecule.symbol(at) for at in range(molecule.natom())],
+        'Z': [float(molecule.Z(at)) for at in range(molecule.natom())],
+        'dist': np.around(np.linalg.norm(geom[:, None, :] - geom[None, :, :], axis=2), 6).tolist(),
+        'molecular_charge': molecule.molecular_charge(),
+        'molecular_multiplicity': molecule.multiplicity(),
+    }
+
+
+def _job_key(molecule, mname, func, options, kwargs):
+    """Return hex hash identifying the energy of `molecule` by `mname` through `func`."""
+
+    spec = {
+        'version': __version__,
+        'func': func.__name__,
+        'method': mname,
+        'molecule': _reagent_fingerprint(molecule),
+        'options': resultcache.changed_options(options),
+        'kwargs': {k: (v.__name__ if callable(v) else v) for k, v in kwargs.items()},
+    }
+    text = json.dumps(spec, sort_keys=True, default=repr)
+
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _ledger_load(ledger, key):
+    """Return ledger entry for job `key`, else None."""
+
+    try:
+        with open(os.path.join(ledger, key + '.json'), 'r') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _ledger_store(ledger, key, entry):
+    """Write ledger entry for job `key` through a rename, so it is complete or absent."""
+
+    path = os.path.join(ledger, key + '.json')
+    tmppath = path + '.' + str(uuid.uuid4())
+    with open(tmppath, 'w') as handle:
+        json.dump(entry, handle)
+    os.replace(tmppath, path)
+
+
+def _format_reactions(dbse, mname, record):
+    text = """\n  ==> Database {} Results: {} <==\n\n""".format(dbse, mname)
+    text += """   {:<24} {:>14} {:>14} {:>14}   [kcal/mol]\n""".format('Reaction', 'Computed', 'Reference', 'Error')
+    for rxn, rxnene in record['reactions'].items():
+        if rxn in record['reference']:
+            ref = record['reference'][rxn]
+            text += """   {:<24} {:14.4f} {:14.4f} {:14.4f}\n""".format(rxn, rxnene, ref, rxnene - ref)
+        else:
+            text += """   {:<24} {:14.4f}\n""".format(rxn, rxnene)
+    for stat, val in record['errors'].items():
+        text += """   {:<24} {:>44.4f}\n""".format(stat, val)
+    return text
@@ -1,8 +1,11 @@
 import os
 import re
+import json
 import uuid
+import bisect
+import functools
 import collections
-from typing import List, Union
+from typing import Dict, List, Union
 
 import qcelemental as qcel
 
@@ -77,6 +80,98 @@ def old_format_basis_for_cfour(molrec, puream):
     return text, options
 
 
+# here liveth the GENBAS offset indices once read, process-wide. `_genbas_indices`
+#   maps a file path to its index (validated against its mtime and size), and
+#   blocks extracted by offset are memoized by `_read_genbas_block`.
+_genbas_indices = {}
+
+
+def clear_cache():
+    """Forget all GENBAS indices read and blocks extracted so far."""
+
+    _genbas_indices.clear()
+    _read_genbas_block.cache_clear()
+
+
+def _genbas_stamp(genbas_loc: str) -> tuple:
+    st = os.stat(genbas_loc)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def genbas_index(genbas_loc: str) -> Dict:
+    """Offset index of the basis blocks in GENBAS file `genbas_loc`.
+
+    Built by one scan of the file and stored alongside it as
+    ``GENBAS.index.json`` (when writable), it is rebuilt whenever the size or
+    modification time of `genbas_loc` changes.
+
+    Returns
+    -------
+    dict
+        'stamp' is the (mtime, size) of the indexed file. 'blocks' lists
+        [header line, start byte, end byte] of each distinct header in order of
+        first appearance (range of last appearance, as dict assignment would).
+        'exact' maps (ELEM, basis) to indices into 'blocks', and 'names' maps
+        ELEM to the sorted basis names available.
+
+    """
+    stamp = _genbas_stamp(genbas_loc)
+    index = _genbas_indices.get(genbas_loc)
+    if index is not None and index['stamp'] == stamp:
+        return index
+
+    index_loc = genbas_loc + '.index.json'
+    try:
+        with open(index_loc, 'r') as handle:
+            stored = json.load(handle)
+    except (OSError, ValueError):
+        stored = None
+
+    if stored is None or stored.get('stamp') != list(stamp):
+        stored = {'stamp': list(stamp), 'blocks': _scan_genbas(genbas_loc)}
+        try:
+            tmp_loc = index_loc + '.' + str(uuid.uuid4())
+            with open(tmp_loc, 'w') as handle:
+                json.dump(stored, handle)
+            os.replace(tmp_loc, index_loc)
+        except OSError:
+            pass
+
+    index = {'stamp': stamp, 'blocks': stored['blocks'], 'exact': collections.defaultdict(list)}
+    for iblk, (basline, start, end) in enumerate(index['blocks']):
+        baskey = basline.split()[0].split(':')  # ['CO', 'qz2p']
+        index['exact'][(baskey[0], baskey[1])].append(iblk)
+    index['exact'] = dict(index['exact'])
+    names = collections.defaultdict(list)
+    for el, name in index['exact']:
+        names[el].append(name)
+    index['names'] = {el: sorted(nn) for el, nn in names.items()}
+
+    _genbas_indices[genbas_loc] = index
+    return index
+
+
+def _scan_genbas(genbas_loc: str) -> List:
+    with open(genbas_loc, 'rb') as handle:
+        genbas = handle.read()
+
+    headers = [(mobj.group(0).decode(), mobj.start(), mobj.end())
+               for mobj in re.finditer(rb'^[A-Z]{1,2}:.*$', genbas, flags=re.MULTILINE)]
+    ranges = collections.OrderedDict()
+    for ihdr, (basline, hstart, hend) in enumerate(headers):
+        end = headers[ihdr + 1][1] if ihdr + 1 < len(headers) else len(genbas)
+        ranges[basline] = [hend, end]
+
+    return [[basline, start, end] for basline, (start, end) in ranges.items()]
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_genbas_block(genbas_loc: str, stamp: tuple, start: int, end: int) -> str:
+    with open(genbas_loc, 'rb') as handle:
+        handle.seek(start)
+        return handle.read(end - start).decode()
+
+
 def extract_basis_from_genbas(basis: str, elem: Union[str, List], exact: bool=True, verbose: int=1) -> str:
     """
 
@@ -104,24 +199,26 @@ def extract_basis_from_genbas(basis: str, elem: Union[str, List], exact: bool=Tr
     else:
         uelems = set(el.upper() for el in elem)
 
-    #with open('/home/psilocaluser/gits/qccddb/share/qcdb/basis/GENBAS', 'r') as handle:
-    #with open('GENBAS', 'r') as handle:
     library_genbas_loc = os.sep.join([pe.data_dir, 'basis', 'GENBAS'])
-    with open(library_genbas_loc, 'r') as handle:
-        genbas = handle.read()
-    
-    toks = re.split('(^[A-Z]{1,2}:.*$)', genbas, flags=re.MULTILINE)
-    allbas = dict(zip(toks[1::2], toks[2::2]))
+    index = genbas_index(library_genbas_loc)
 
-    wantedbas = {}
-    for basline, basblock in allbas.items():
-        baskey = basline.split()[0].split(':')  # ['CO', 'qz2p']
+    wanted = []
+    for uel in uelems:
         if exact is True:
-            if baskey[1] == basis and baskey[0] in uelems:  # perfect match
-                wantedbas[basline] = basblock
+            wanted.extend(index['exact'].get((uel, basis), []))  # perfect match
         else:
-            if baskey[1].startswith(basis[:5]) and baskey[0] in uelems:  # loose match to accomodate composing
-                wantedbas[basline] = basblock
+            # loose match to accomodate composing
+            prefix = basis[:5]
+            names = index['names'].get(uel, [])
+            for name in names[bisect.bisect_left(names, prefix):]:
+                if not name.startswith(prefix):
+                    break
+                wanted.extend(index['exact'][(uel, name)])
+
+    wantedbas = {}
+    for iblk in sorted(wanted):
+        basline, start, end = index['blocks'][iblk]
+        wantedbas[basline] = _read_genbas_block(library_genbas_loc, index['stamp'], start, end)
 
     wanted_genbas = ''.join(f'{k}\n{v}\n' for k, v in wantedbas.items())
     if verbose >= 2:
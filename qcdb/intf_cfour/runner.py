@@ -1,5 +1,4 @@
 import copy
-import inspect
 from typing import Any, Dict, Optional
 from decimal import Decimal
 
@@ -24,9 +23,9 @@ def run_cfour(name, molecule, options, **kwargs):
 
     resi = ResultInput(
         **{
-            'driver': inspect.stack()[1][3],
+            'driver': kwargs['ptype'],
             'extras': {
-                'qcdb:options': copy.deepcopy(options),
+                'qcdb:options': options.snapshot(),
             },
             'model': {
                 'method': name,
@@ -117,7 +116,7 @@ class QcdbCFOURHarness(CFOURHarness):
         # Handle driver vs input/default keyword reconciliation
 
         # Handle conversion of psi4 keyword structure into cfour format
-        skma_options = {key: ropt.value for key, ropt in sorted(ropts.scroll['CFOUR'].items()) if ropt.disputed()}
+        skma_options = {key: ropt.value for key, ropt in sorted(ropts.changed('CFOUR').items())}
         optcmd = format_keywords(skma_options)
 
         # Assemble ZMAT pieces
@@ -0,0 +1,202 @@
+"""Module with an in-process NumPy implementation of Grimme's -D3
+dispersion correction, an alternative to launching the DFTD3 executable
+through :py:func:`~qcdb.intf_dftd3.runner.dftd3_subprocess`.
+
+Two-body energies and analytic gradients of the zero-damping (``d3zero``)
+and Becke-Johnson damping (``d3bj``) variants are computed for one or a
+batch of geometries, following the DFTD3 program in coordination numbers,
+C6 interpolation, damping functions, and distance cutoffs. Functional
+parameters are those of :py:mod:`~qcdb.intf_dftd3.dashparam`. Reference
+C6 coefficients, cutoff radii, covalent radii, and <r4>/<r2> factors are
+those of the DFTD3 program, read from ``share/qcdb/dftd3/d3_reference.npz``
+as written by ``devtools/scripts/build_d3_reference.py``.
+
+"""
+import os
+import functools
+
+import numpy as np
+
+from .. import data_dir
+from ..exceptions import *
+
+# DFTD3 constants: coordination number steepness and C6 interpolation
+#   exponent, and square distance thresholds [a0^2] beyond which pairs
+#   are neglected in dispersion energy and coordination number
+_k1 = 16.0
+_k3 = -4.0
+_rthr = 9000.0
+_cnthr = 1600.0
+
+available_levels = ('d3zero', 'd3bj')
+
+
+def reference_file():
+    """Return default location of the -D3 reference parameters."""
+
+    return os.sep.join([data_dir, 'dftd3', 'd3_reference.npz'])
+
+
+def load_d3_reference(path=None):
+    """Read the -D3 reference parameters, indexed by atomic number.
+
+    Parameters
+    ----------
+    path : str, optional
+        Location of npz file. Defaults to :py:func:`reference_file`.
+
+    Returns
+    -------
+    dict of ndarray
+        ``nref`` (95,) number of C6 references per element;
+        ``cnref`` (95, 5) coordination number of each reference;
+        ``c6ref`` (95, 95, 5, 5) reference C6 coefficients [Eh a0^6], nonpositive where absent;
+        ``r0ab`` (95, 95) cutoff radii [a0]; ``rcov`` (95,) scaled covalent radii [a0];
+        ``r2r4`` (95,) sqrt(0.5 * <r4>/<r2> * sqrt(Z)) factors for C8.
+
+    """
+    return _load_d3_reference(reference_file() if path is None else os.path.abspath(path))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_d3_reference(path):
+    try:
+        with np.load(path) as npz:
+            ref = {key: npz[key] for key in ['nref', 'cnref', 'c6ref', 'r0ab', 'rcov', 'r2r4']}
+    except OSError as err:
+        raise Dftd3Error("""Reference parameters for native -D3 not found at {}. Generate them from the DFTD3 """
+                         """source with devtools/scripts/build_d3_reference.py.""".format(path)) from err
+
+    for arr in ref.values():
+        arr.setflags(write=False)
+    return ref
+
+
+def d3_dispersion(elez, geom, dashlevel, dashparams, do_gradient=True, reference=None):
+    """Compute -D3 dispersion energy and gradient of one or many geometries.
+
+    Parameters
+    ----------
+    elez : array_like of int
+        (nat,) atomic numbers of the real atoms.
+    geom : array_like of float
+        (nat, 3) geometry or (nbatch, nat, 3) batch of geometries [a0].
+    dashlevel : {'d3zero', 'd3bj'}
+        Damping function.
+    dashparams : dict
+        Parameters ``s6``, ``s8``, ``sr6``, ``alpha6`` for zero-damping or
+        ``s6``, ``s8``, ``a1``, ``a2`` [a0] for BJ-damping.
+    do_gradient : bool, optional
+        Whether to compute the gradient.
+    reference : dict, optional
+        Reference parameters as from :py:func:`load_d3_reference`, which
+        is called when absent.
+
+    Returns
+    -------
+    energy : float or ndarray
+        Dispersion energy [Eh] of `geom`, (nbatch,) when batched.
+    gradient : ndarray or None
+        (nat, 3) or (nbatch, nat, 3) gradient [Eh/a0] when `do_gradient`.
+
+    """
+    ref = load_d3_reference() if reference is None else reference
+
+    dashlevel = dashlevel.lower()
+    if dashlevel not in available_levels:
+        raise ValidationError("""-D correction level {} not available in native -D3. Choose among {}.""".format(
+            dashlevel, available_levels))
+
+    elez = np.asarray(elez, dtype=int).reshape(-1)
+    geom = np.asarray(geom, dtype=float)
+    batched = (geom.ndim == 3)
+    nat = elez.shape[0]
+    try:
+        geom = geom.reshape(-1, nat, 3)
+    except ValueError as err:
+        raise ValidationError("""Geometry of shape {} does not match {} atoms.""".format(geom.shape, nat)) from err
+    if np.any(elez < 1) or np.any(elez >= ref['nref'].shape[0]) or np.any(ref['nref'][np.clip(elez, 0, None)] == 0):
+        raise ValidationError("""Native -D3 lacks reference parameters for Z: {}""".format(elez))
+
+    offdiag = ~np.eye(nat, dtype=bool)
+    rvec = geom[:, :, None, :] - geom[:, None, :, :]
+    r2 = np.einsum('xijk,xijk->xij', rvec, rvec)
+    r = np.sqrt(np.where(offdiag, r2, 1.0))
+
+    # coordination numbers
+    rcov = ref['rcov'][elez]
+    rco = rcov[:, None] + rcov[None, :]
+    cnmask = offdiag & (r2 <= _cnthr)
+    expo = np.exp(-_k1 * (rco / r - 1.0))
+    cn = np.where(cnmask, 1.0 / (1.0 + expo), 0.0).sum(axis=2)
+
+    # C6 interpolated among references by Gaussian weights in coordination number
+    nref = ref['nref'][elez]
+    valid = np.arange(ref['cnref'].shape[1])[None, :] < nref[:, None]
+    c6ref = ref['c6ref'][elez[:, None], elez[None, :]]
+    refmask = (c6ref > 0.0) & valid[:, None, :, None] & valid[None, :, None, :]
+    c6ref = np.where(refmask, c6ref, 0.0)
+    refmask = refmask.astype(float)
+
+    dcn = cn[:, :, None] - ref['cnref'][elez][None, :, :]
+    lw = np.where(valid, np.exp(_k3 * dcn * dcn), 0.0)
+    wsum = np.einsum('xia,ijab,xjb->xij', lw, refmask, lw, optimize=True)
+    csum = np.einsum('xia,ijab,xjb->xij', lw, c6ref, lw, optimize=True)
+
+    # too far from every reference, DFTD3 takes the nearest reference C6
+    interp = wsum > 1.e-99
+    c6 = csum / np.where(interp, wsum, 1.0)
+    for xx, ii, jj in np.argwhere(~interp & offdiag):
+        dist = dcn[xx, ii, :, None]**2 + dcn[xx, jj, None, :]**2
+        dist = np.where(refmask[ii, jj] > 0.0, dist, np.inf)
+        c6[xx, ii, jj] = c6ref[ii, jj].flat[np.argmin(dist)]
+
+    # two-body dispersion as c6 * g(r) since damping is independent of c6
+    qq = 3.0 * ref['r2r4'][elez][:, None] * ref['r2r4'][elez][None, :]
+    r6 = r**6
+    r8 = r6 * r * r
+    s6 = dashparams['s6']
+    s8 = dashparams['s8']
+    if dashlevel == 'd3zero':
+        r0 = ref['r0ab'][elez[:, None], elez[None, :]]
+        alp6 = dashparams['alpha6']
+        alp8 = alp6 + 2.0
+        t6 = (dashparams['sr6'] * r0 / r)**alp6
+        t8 = (1.0 * r0 / r)**alp8
+        f6 = 1.0 / (1.0 + 6.0 * t6)
+        f8 = 1.0 / (1.0 + 6.0 * t8)
+        g = -(s6 * f6 / r6 + s8 * qq * f8 / r8)
+        if do_gradient:
+            df6 = 6.0 * alp6 * t6 * f6 * f6 / r
+            df8 = 6.0 * alp8 * t8 * f8 * f8 / r
+            dg = -(s6 * (df6 - 6.0 * f6 / r) / r6 + s8 * qq * (df8 - 8.0 * f8 / r) / r8)
+
+    elif dashlevel == 'd3bj':
+        rr0 = dashparams['a1'] * np.sqrt(qq) + dashparams['a2']
+        d6 = r6 + rr0**6
+        d8 = r8 + rr0**8
+        g = -(s6 / d6 + s8 * qq / d8)
+        if do_gradient:
+            dg = 6.0 * s6 * r6 / (r * d6 * d6) + 8.0 * s8 * qq * r8 / (r * d8 * d8)
+
+    dmask = offdiag & (r2 <= _rthr)
+    g = np.where(dmask, g, 0.0)
+    energy = 0.5 * np.einsum('xij,xij->x', c6, g)
+
+    if not do_gradient:
+        gradient = None
+    else:
+        dlw = lw * 2.0 * _k3 * dcn
+        dcsum = np.einsum('xia,ijab,xjb->xij', dlw, c6ref, lw, optimize=True)
+        dwsum = np.einsum('xia,ijab,xjb->xij', dlw, refmask, lw, optimize=True)
+        dc6dcn = np.where(interp, (dcsum - c6 * dwsum) / np.where(interp, wsum, 1.0), 0.0)
+        dedcn = np.einsum('xij,xij->xi', g, dc6dcn)
+
+        dcndr = np.where(cnmask, -_k1 * rco * expo / (r * r * (1.0 + expo)**2), 0.0)
+        dedr = np.where(dmask, c6 * dg, 0.0) + (dedcn[:, :, None] + dedcn[:, None, :]) * dcndr
+        gradient = np.einsum('xij,xijk->xik', dedr / r, rvec)
+
+    if batched:
+        return energy, gradient
+    else:
+        return energy[0], (None if gradient is None else gradient[0])
@@ -47,6 +47,7 @@ from ..exceptions import *
 from ..pdict import PreservingDict
 #from .dashparam import dash_server, dashcoeff
 from . import dashparam
+from . import native
 from .. import qcvars
 from .. import __version__
 from ..driver.driver_helpers import print_variables
@@ -155,9 +156,14 @@ def run_dftd3(molrec,
               dashlevel=None,
               dashparams=None,
               dertype=None,
-              verbose=1):
+              verbose=1,
+              engine='dftd3'):
     """
 
+    `engine` selects between launching the DFTD3 executable (``'dftd3'``)
+    and computing in-process through :py:mod:`~qcdb.intf_dftd3.native`
+    (``'numpy'``, d3zero and d3bj only).
+
     Required Input Fields
     ---------------------
     dashlevel
@@ -190,6 +196,10 @@ def run_dftd3(molrec,
         dertype=dertype)
     jobrec['molecule'] = molrec
 
+    drivers = {'dftd3': dftd3_driver, 'numpy': dftd3_native_driver}
+    if engine not in drivers:
+        raise ValidationError("""Requested -D engine ({}) not among ({})""".format(engine, list(drivers)))
+
     jobrec['error'] = ''
     jobrec['success'] = False
     jobrec['raw_output'] = None
@@ -201,7 +211,7 @@ def run_dftd3(molrec,
     jobrec['provenance'] = [prov]
 
     try:
-        dftd3_driver(jobrec)
+        drivers[engine](jobrec)
         jobrec['success'] = True
     except Exception as err:
         jobrec['success'] = False
@@ -259,6 +269,52 @@ def dftd3_driver(jobrec):
     return jobrec
 
 
+def dftd3_native_driver(jobrec):
+    """In-process counterpart to :py:func:`dftd3_driver`, computing the -D3
+    correction of `jobrec` through :py:func:`native.d3_dispersion` rather
+    than the DFTD3 executable. Updates and returns `jobrec`.
+
+    """
+    try:
+        jobrec['dashlevel']
+        jobrec['dashparams']
+        jobrec['functional']
+        jobrec['molecule']
+        jobrec['do_gradient']
+    except KeyError as err:
+        raise KeyError(
+            'Required fields missing from ({})'.format(jobrec.keys())) from err
+
+    molrec = jobrec['molecule']
+    real = np.array(molrec['real'], dtype=bool)
+    geom = np.array(molrec['geom'], dtype=float).reshape((-1, 3))
+    if molrec['units'] == 'Angstrom':
+        geom = geom * molrec.get('input_units_to_au', 1. / qcel.constants.bohr2angstroms)
+
+    ene, realgrad = native.d3_dispersion(np.array(molrec['elez'])[real], geom[real], jobrec['dashlevel'],
+                                         jobrec['dashparams'], do_gradient=jobrec['do_gradient'])
+
+    fullgrad = None
+    if realgrad is not None:
+        fullgrad = np.zeros((real.shape[0], 3))
+        fullgrad[real, :] = realgrad
+
+    calcinfo = _dftd3_qcvars(jobrec, Decimal(repr(float(ene))), fullgrad)
+
+    text = '\n  <<<  DFTD3 {} {} Results  >>>'.format('Native', jobrec['dashlevel'])
+    text += print_variables(calcinfo)
+    jobrec['raw_output'] = text
+
+    jobrec['qcvars'] = calcinfo
+    prov = {}
+    prov['creator'] = 'QCDB'
+    prov['routine'] = sys._getframe().f_code.co_name
+    prov['version'] = __version__
+    jobrec['provenance'].append(prov)
+
+    return jobrec
+
+
 def dftd3_plant(jobrec):
 
     try:
@@ -419,7 +475,6 @@ def dftd3_subprocess(dftd3rec):
     import os
     import uuid
     import shutil
-    import socket
     import subprocess
 
     try:
@@ -430,86 +485,65 @@ def dftd3_subprocess(dftd3rec):
         raise KeyError('Required fields missing from ({})'.format(
             dftd3rec.keys())) from err
 
-    current_directory = os.getcwd()
-
-    # move ~/.dftd3par.<hostname> out of the way so it won't interfere
-    defaultfile = os.path.expanduser(
-        '~') + '/.dftd3par.' + socket.gethostname()
-    defmoved = False
-    if os.path.isfile(defaultfile):
-        os.rename(defaultfile, defaultfile + '_hide')
-        defmoved = True
+    # set up unique scratch directory. never moved into, so that concurrent
+    #   jobs in this process don't trample each other's working directory
+    if 'scratch_location' in dftd3rec:
+        basedir = dftd3rec['scratch_location']
+    else:
+        basedir = os.environ['HOME'] + os.sep
+    dftd3_tmpdir = basedir + 'dftd3_' + str(uuid.uuid4())[:8]
+    if not os.path.exists(dftd3_tmpdir):
+        os.mkdir(dftd3_tmpdir)
 
     # find environment by merging PSIPATH and PATH environment variables
     # * filter out None values as subprocess will fault on them
+    # * HOME is the scratch dir so a ~/.dftd3par.<hostname> can't interfere
+    #   with the .dftd3par.local written below. (formerly, the user's file
+    #   was renamed out of the way, which isn't safe for concurrent jobs.)
     lenv = {
-        'HOME': os.environ.get('HOME'),
+        'HOME': dftd3_tmpdir,
         'PATH': ':'.join([os.path.abspath(x) for x in os.environ.get('PSIPATH', '').split(':') if x != '']) + \
                 ':' + os.environ.get('PATH'),
         'LD_LIBRARY_PATH': os.environ.get('LD_LIBRARY_PATH')
         }
     lenv = {k: v for k, v in lenv.items() if v is not None}
 
-    # set up unique scratch directory and move in
-    if 'scratch_location' in dftd3rec:
-        basedir = dftd3rec['scratch_location']
-    else:
-        basedir = os.environ['HOME'] + os.sep
-    dftd3_tmpdir = basedir + 'dftd3_' + str(uuid.uuid4())[:8]
-    if not os.path.exists(dftd3_tmpdir):
-        os.mkdir(dftd3_tmpdir)
-    os.chdir(dftd3_tmpdir)
-    print('CWD', os.getcwd())
-
     # write governing inputs
-    paramfileold = 'dftd3_parameters'  # older patched name
+    paramfileold = os.path.join(dftd3_tmpdir, 'dftd3_parameters')  # older patched name
     with open(paramfileold, 'w') as handle:
         handle.write(dftd3rec['dftd3par'])
-    paramfile = '.dftd3par.local'  # new mainline name
+    paramfile = os.path.join(dftd3_tmpdir, '.dftd3par.local')  # new mainline name
     with open(paramfile, 'w') as handle:
         handle.write(dftd3rec['dftd3par'])
-    geomfile = './dftd3_geometry.xyz'
+    geomfile = os.path.join(dftd3_tmpdir, 'dftd3_geometry.xyz')
     with open(geomfile, 'w') as handle:
         handle.write(dftd3rec['dftd3_geometry'])
 
     # call `dftd3` program
     try:
-        spcall = subprocess.Popen(
-            dftd3rec['command'], stdout=subprocess.PIPE, env=lenv)
+        spcall = subprocess.run(
+            dftd3rec['command'], cwd=dftd3_tmpdir, env=lenv, stdout=subprocess.PIPE)
     except OSError as err:
         raise OSError('Command (`{}`) failed with PATH ({})'.format(
-            ' '.join(command), lenv['PATH'])) from err
+            ' '.join(dftd3rec['command']), lenv['PATH'])) from err
 
     # recover output data
-    out, err = spcall.communicate()
-    dftd3rec['stdout'] = out.decode('utf-8')
+    dftd3rec['stdout'] = spcall.stdout.decode('utf-8')
     print('OUT', dftd3rec['stdout'])
 
     if '-grad' in dftd3rec['command']:
-        derivfile = './dftd3_gradient'
+        derivfile = os.path.join(dftd3_tmpdir, 'dftd3_gradient')
         with open(derivfile, 'r') as handle:
             dftd3rec['dftd3_gradient'] = handle.read()
 
     # clean up files and remove scratch directory
     if 'scratch_messy' not in dftd3rec or dftd3rec['scratch_messy'] is False:
-        os.unlink(paramfileold)
-        os.unlink(paramfile)
-        os.unlink(geomfile)
-        if '-grad' in dftd3rec['command']:
-            os.unlink(derivfile)
-
-        os.chdir('..')
         try:
             shutil.rmtree(dftd3_tmpdir)
         except OSError as err:
             raise OSError('Unable to remove dftd3 temporary directory: {}'.
                           format(dftd3_tmpdir)) from err
 
-    if defmoved is True:
-        os.rename(defaultfile + '_hide', defaultfile)
-
-    os.chdir(current_directory)
-
     return dftd3rec
 
 
@@ -568,6 +602,28 @@ def dftd3_harvest(jobrec, dftd3rec):
     #import sys
     #sys.exit()
 
+    calcinfo = _dftd3_qcvars(jobrec, ene, fullgrad if 'dftd3_gradient' in dftd3rec else None)
+
+    # amalgamate output
+    text = dftd3rec['stdout']
+    text += '\n  <<<  DFTD3 {} {} Results  >>>'.format('', '') #name.lower(), calledby.capitalize()))  # banner()
+    text += print_variables(calcinfo)
+    jobrec['raw_output'] = text
+
+    jobrec['qcvars'] = calcinfo
+    prov = {}
+    prov['creator'] = 'DFTD3'
+    prov['routine'] = sys._getframe().f_code.co_name
+    prov['version'] = version
+    jobrec['provenance'].append(prov)
+
+    return jobrec
+
+
+def _dftd3_qcvars(jobrec, ene, fullgrad=None):
+    """Return certified QCVariables for -D energy `ene` and, when not None,
+    gradient `fullgrad`, labeled by the functional and level of `jobrec`."""
+
     formal = {'d2p4': 'd2',
               'd2gr': 'd2',
               'd3zero': 'd3',
@@ -584,32 +640,17 @@ def dftd3_harvest(jobrec, dftd3rec):
         elif fctl == 'lcwpbe':
             fctl = 'wpbe'
         qcvkey = '-'.join([fctl, dash]).upper()
-    
+
     dftd3var = {}
     dftd3var['DISPERSION CORRECTION ENERGY'] =  ene
     dftd3var['{} DISPERSION CORRECTION ENERGY'.format(qcvkey)] =  ene
-    if 'dftd3_gradient' in dftd3rec:
+    if fullgrad is not None:
         dftd3var['DISPERSION CORRECTION GRADIENT'] = fullgrad
         dftd3var['{} DISPERSION CORRECTION GRADIENT'.format(qcvkey)] = fullgrad
 
     progvars = PreservingDict(dftd3var)
     qcvars.build_out(progvars)
-    calcinfo = qcvars.certify(progvars)
-
-    # amalgamate output
-    text = dftd3rec['stdout']
-    text += '\n  <<<  DFTD3 {} {} Results  >>>'.format('', '') #name.lower(), calledby.capitalize()))  # banner()
-    text += print_variables(calcinfo)
-    jobrec['raw_output'] = text
-
-    jobrec['qcvars'] = calcinfo
-    prov = {}
-    prov['creator'] = 'DFTD3'
-    prov['routine'] = sys._getframe().f_code.co_name
-    prov['version'] = version
-    jobrec['provenance'].append(prov)
-
-    return jobrec
+    return qcvars.certify(progvars)
 
 
 def _validate_and_fill_dertype(dertype=None):
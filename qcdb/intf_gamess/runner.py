@@ -119,9 +119,9 @@ def run_gamess(name, molecule, options, **kwargs):
 
     resi = ResultInput(
         **{
-            'driver': inspect.stack()[1][3],
+            'driver': kwargs['ptype'],
             'extras': {
-                'qcdb:options': copy.deepcopy(options),
+                'qcdb:options': options.snapshot(),
             },
             'model': {
                 'method': name,
@@ -216,7 +216,7 @@ class QcdbGAMESSHarness(GAMESSHarness):
 
 
         # Handle conversion of psi4 keyword structure into cfour format
-        skma_options = {key: ropt.value for key, ropt in sorted(ropts.scroll['GAMESS'].items()) if ropt.disputed()}
+        skma_options = {key: ropt.value for key, ropt in sorted(ropts.changed('GAMESS').items())}
 
         #optcmd = format_keywords(skma_options)
         optcmd = format_options_for_gamess(skma_options)
@@ -16,97 +16,276 @@ from ..moptions.options import conv_float2negexp
 #from . import nwc_movecs
 
 
+NUMBER = "((?:[-+]?\\d*\\.\\d+(?:[DdEe][-+]?\\d+)?)|(?:[-+]?\\d+\\.\\d*(?:[DdEe][-+]?\\d+)?))"
+
+# coupled-cluster method name and ground-state symmetry are not yet
+#   themselves harvested, so patterns built around them expect them blank
+cc_name = ''
+gssym = ''
+
+# Quantities harvested from a pass of NWChem output, compiled once here.
+#   Each is (name, lead, findall, pattern), where `lead` is the text with
+#   which the line of the match start begins (after whitespace) and
+#   `findall` selects all matches rather than the first. A `lead` of None
+#   means that the pattern may match wherever `_midline_cue` appears.
+_quantities = [
+    ('version', 'Northwest', False, re.compile(
+        r'^\s+' + r'Northwest Computational Chemistry Package (NWChem)' + r'\s+' + r'(?:<version>\d+.\d+)' + r'\s*$',
+        re.MULTILINE)),
+    ('scf failed', 'Calculation', False, re.compile(
+        r'^\s+' + r'(?:Calculation failed to converge)' + r'\s*$', re.MULTILINE)),
+    ('scf', 'Total', False, re.compile(
+        r'^\s+' + r'(?:Total SCF energy)' + r'\s+=\s*' + NUMBER + r's*$', re.MULTILINE)),
+    ('nre', 'Effective', False, re.compile(
+        r'^\s+' + r'Effective nuclear repulsion energy \(a\.u\.\)' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('dft', 'Total', False, re.compile(
+        r'^\s+' + r'(?:Total DFT energy)' + r'\s+=\s*' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('sodft', 'Total', False, re.compile(
+        r'^\s+' + r'Total SO-DFT energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Nuclear repulsion energy' +
+        r'\s+' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('mcscf', 'Total', True, re.compile(
+        r'^\s+' + r'Total SCF energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'One-electron energy' +
+        r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Two-electron energy' + r'\s+' + NUMBER + r'\s*' +
+        r'^\s+' + r'Total MCSCF energy' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE | re.DOTALL)),
+    ('scf-mp2', 'SCF', False, re.compile(
+        r'^\s+' + r'SCF energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Correlation energy' + r'\s+' + NUMBER +
+        r'\s*' + r'^\s+' + r'Singlet pairs' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Triplet pairs' + r'\s+' +
+        NUMBER + r'\s*' + r'^\s+' + r'Total MP2 energy' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('scs-mp2', 'Same', False, re.compile(
+        r'^\s+' + r'Same spin pairs' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Same spin scaling factor' + r'\s+' +
+        NUMBER + r'\s*' + r'^\s+' + r'Opposite spin pairs' + r'\s+' + NUMBER + r'\s*' + r'^\s+' +
+        r'Opposite spin scaling fact.' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'SCS-MP2 correlation energy' +
+        r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Total SCS-MP2 energy' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('dft-mp2', 'DFT', False, re.compile(
+        r'^\s+' + r'DFT energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Unscaled MP2 energy' + r'\s+' + NUMBER +
+        r'\s*' + r'^\s+' + r'Total DFT+MP2 energy' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('cc-mp2', 'MP2', False, re.compile(
+        r'^\s+' + r'MP2 Energy \(coupled cluster initial guess\)' + r'\s*' + r'^\s+' +
+        r'------------------------------------------' + r'\s*' + r'^\s+' + r'Reference energy:' + r'\s+' + NUMBER +
+        r'\s*' + r'^\s+' + r'MP2 Corr\. energy:' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Total MP2 energy:' +
+        r'\s+' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('tce', 'Iterations', True, re.compile(
+        r'^\s+' + r'Iterations converged' + r'\s*' + r'^\s+' + r'(.*?)' + r' correlation energy / hartree' +
+        r'\s+=\s*' + NUMBER + r'\s*' + r'^\s+' + r'(.*?)' + r' total energy / hartree' + r'\s+=\s*' + NUMBER +
+        r'\s*$', re.MULTILINE | re.DOTALL)),
+    ('tce correction', cc_name + '(', False, re.compile(
+        r'^\s+' + cc_name + r'\(' + r'(.*?)' + r'\)' + r'\s+' + r'correction energy / hartree' + r'\s+=\s*' +
+        NUMBER + r'\s*' + r'^\s+' + cc_name + r'\(' + r'(.*?)' + r'\)' + r'\s+' + r'correlation energy / hartree' +
+        r'\s+=\s*' + NUMBER + r'\s*' + r'^\s+' + cc_name + r'\(' + r'(.*?)' + r'\)' + r'\s+' +
+        r'total energy / hartree' + r'\s+=\s*' + NUMBER + r'\s*$', re.MULTILINE)),
+    ('ccsd', '-', False, re.compile(
+        r'^\s+' + r'-----------' + r'\s*' + r'^\s+' + r'CCSD Energy' + r'\s*' + r'^\s+' + r'-----------' + r'\s*' +
+        r'^\s+' + r'Reference energy:' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'CCSD corr\. energy:' + r'\s+' +
+        NUMBER + r'\s*' + r'^\s+' + r'Total CCSD energy:' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE | re.DOTALL)),
+    ('ccsd(t)', '-', False, re.compile(
+        r'^\s+' + r'--------------' + r'\s*' + r'^\s+' + r'CCSD\(T\) Energy' + r'\s*' + r'^\s+' + r'--------------'
+        + r'\s*' + r'(?:.*?)' + r'^\s+' + r'\(T\) corr\. energy:' + r'\s+' + NUMBER + r'\s*' + r'^\s+' +
+        r'Total CCSD\(T\) energy:' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE | re.DOTALL)),
+    ('scs-ccsd', 'Spin', False, re.compile(
+        r'^\s+' + r'Spin Component Scaled (SCS) CCSD' + r'\s*' + r'(?:.*?)' + r'^\s+' + r'Same spin contribution' +
+        r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Same spin scaling factor' + r'\s+' + NUMBER + r'\s*'
+        r'^\s+' + r'Opposite spin contribution' + r'\s+' + NUMBER + r'\s*' + r'^\s+' +
+        r'Opposite spin scaling factor' + r'\s+' + NUMBER + r'\s*'
+        r'\^s+' + r'SCS-CCSD correlation energy' + r'\s+' + NUMBER + r'\s*' + r'\^s+' + r'Total SCS-CCSD energy' +
+        r'\s+' + NUMBER + r'\s*$', re.MULTILINE | re.DOTALL)),
+    ('eom', 'Excited-state', True, re.compile(
+        r'^\s+' + r'Excited-state calculation' + r'\s+' + r'\((.*?)\)' + r'\s*' +
+        r'^\s+' + r'EOM-' + cc_name + r'\s+right-hand side iterations' + r'\s*'+  #capture cc_name
+        r'^\s+' + r'Iterations converged' + r'\s*' + #skip to excitation
+        r'^\s+' + r'Excited state root\s+\d{1,2}\s*'+
+        r'^\s+' + r'Excitation energy / hartree' + r'\s+=\s+' + NUMBER + r'\s*' +
+        r'^\s+' + r'/ eV\s+' + r'\s+=\s+' + NUMBER + r'\s*$', re.MULTILINE | re.DOTALL)),
+    ('ground-state symmetry', 'Ground-state', False, re.compile(
+        r'^\s+' + r'Ground-state symmetry is' + gssym + r'\s*$', re.MULTILINE)),
+    ('tddft', '-', True, re.compile(
+        r'^\s+' + r'----------------------------------------------------------------------------' + r'\s*' +
+        r'^\s+' + r'Root' + r'\s+' + r'(\d+)' + r'\s+' + r'(\w+)' + r'\s+' + r'(.*?)' + r'\s+' + NUMBER +
+        r'\s+a\.u\.\s+' + NUMBER + r'\s+eV\s*' + r'^\s+' +
+        r'----------------------------------------------------------------------------' + r'\s*' + r'^\s+' +
+        r'Transition Moments' + r'\s+X\s+' + NUMBER + r'\s+Y\s+' + NUMBER + r'\s+Z\s+' + NUMBER + r'\s*' + r'^\s+'
+        + r'Transition Moments' + r'\s+XX\s+' + NUMBER + r'\s+XY\s+' + NUMBER + r'\s+XZ\s+' + NUMBER + r'\s*' +
+        r'^\s+' + r'Transition Moments' + r'\s+YY\s+' + NUMBER + r'\s+YZ\s+' + NUMBER + r'\s+ZZ\s+' + NUMBER +
+        r'\s*$', re.MULTILINE)),
+    ('tddft spin forbidden', '-', True, re.compile(
+        r'^\s+' + r'----------------------------------------------------------------------------' + r'\s*' +
+        r'^\s+' + r'Root' + r'\s+' + r'(\d+)' + r'\s+' + r'(\w+)' + r'\s+' + r'(.*?)' + r'\s+' + NUMBER +
+        r'\s+a\.u\.\s+' + NUMBER + r'\s+eV\s*' + r'^\s+' +
+        r'----------------------------------------------------------------------------' + r'\s*' + r'^\s+' +
+        r'Transition Moments' + r'\s+Spin forbidden\s*$', re.MULTILINE)),
+    ('scf charge', 'charge', False, re.compile(
+        r'^\s+' + r'charge          =' + r'\s+' + NUMBER + r'\s*$', re.MULTILINE | re.IGNORECASE)),
+    ('charge', 'charge', False, re.compile(
+        r'^\s+' + r'Charge           :' + r'\s+' + r'(-?\d+)' + r'\s*$', re.MULTILINE | re.IGNORECASE)),
+    ('scf open shells', 'open', False, re.compile(
+        r'^\s+' + r'open shells     =' + r'\s+' + r'(\d+)' + r'\s*$', re.MULTILINE | re.IGNORECASE)),
+    ('scf electrons', 'alpha', False, re.compile(
+        r'^\s+' + r'alpha electrons =' + r'\s+' + r'(\d+)' + r'\s*' + r'^\s+' + r'beta  electrons =' + r'\s+' +
+        r'(\d+)' + r'\s*$', re.MULTILINE | re.IGNORECASE)),
+    ('multiplicity', 'Spin', False, re.compile(
+        r'^\s+' + r'Spin multiplicity:' + r'\s+' + r'(\d+)' + r'\s*$', re.MULTILINE | re.IGNORECASE)),
+    ('geometry', 'Geometry', False, re.compile(
+        r'^\s+' + r'Geometry' + r'.*' + r'\s*' + r'^\s+' + r'(?:-+)\s*' + r'\s+' + r'\n' + r'^\s' +
+        r'Output coordinates in ' + r'(.*?)' + r'\s' + r'\(scale by' + r'.*' + r'\s' + r'to convert to a\.u\.\)' +
+        r'\s+' + r'\n' + r'^\s+' + r'No\.\       Tag          Charge          X              Y              Z' +
+        r'\s*' + r'^\s+' + r'---- ---------------- ---------- -------------- -------------- --------------' +
+        r'\s*' +
+        r'((?:\s+([1-9][0-9]*)+\s+([A-Z][a-z]*)+\s+\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s*\n)+)'
+        + r'\s*$', re.MULTILINE | re.IGNORECASE)),
+    ('gradient', None, False, re.compile(
+        r'^\s+' + r'.*' + r'ENERGY GRADIENTS' + r'\s*' + r'\s+' + r'\n' + r'^\s+' +
+        r'atom               coordinates                        gradient' + r'\s*' + r'^\s+' +
+        r'x          y          z           x          y          z' + r'\s*' +
+        r'((?:\s+([1-9][0-9]*)+\s+([A-Z][a-x]*)+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s*\n)+)'
+        + r'\s*$', re.MULTILINE)),
+    ('dipole', 'Dipole', False, re.compile(
+        r'^\s+' + r'Dipole moment' + r'\s+' + NUMBER + r'\s' + r'A\.U\.' + r'\s*' + r'^\s+' + r'DMX' + r'\s+' +
+        NUMBER + r'.*' + r'\s*' + r'^\s+' + r'DMY' + r'\s+' + NUMBER + r'.*' + r'\s*' + r'^\s+' + r'DMZ' + r'\s+' +
+        NUMBER + r'.' + r'\s*' + r'^\s+' + r'.*' + r'\s*' + r'^\s+' + r'Total dipole' + r'\s+' + NUMBER + r'\s' +
+        r'A\.U\.' + r'\s*' + r'^\s+' + r'Dipole moment' + r'\s+' + NUMBER + r'\s' + r'Debye\(s\)' + r'\s*' +
+        r'^\s+' + r'DMX' + r'\s+' + NUMBER + r'.*' + r'\s*' + r'^\s+' + r'DMY' + r'\s+' + NUMBER + r'.*' + r'\s*' +
+        r'^\s+' + r'DMZ' + r'\s+' + NUMBER + r'.*' + r'\s*' + r'^\s+' + r'.*' + r'\s*' + r'^\s+' + r'Total dipole'
+        + r'\s+' + NUMBER + r'\s' + r'DEBYE\(S\)' + r'\s*$', re.MULTILINE)),
+    ('error', 'current', False, re.compile(
+        r'^\s+' + r'current input line \:' + r'\s*' + r'^\s+' + r'([1-9][0-9]*)' + r'\:' + r'\s+' + r'(.*)' +
+        r'\s*' + r'^\s+'
+        r'------------------------------------------------------------------------' + r'\s*' + r'^\s+'
+        r'------------------------------------------------------------------------' + r'\s*' + r'^\s+' +
+        r'There is an error in the input file' + r'\s*$', re.MULTILINE)),
+]
+
+_midline_cue = 'ENERGY GRADIENTS'
+
+
+def _compile_scan(quantities):
+    """Returns a pattern matching, at any line start, the whitespace and
+    lead of lines at which any of `quantities` may begin to match (the
+    lead identified by group name), and the quantities to try at each.
+
+    """
+    groups = {}
+    dispatch = {}
+    for name, lead, findall, pattern in quantities:
+        if lead is not None and lead.lower() not in groups:
+            groups[lead.lower()] = 'lead{}'.format(len(groups))
+            dispatch[groups[lead.lower()]] = []
+    dispatch['midline'] = []
+    for name, lead, findall, pattern in quantities:
+        for group in ([groups[lead.lower()]] if lead is not None else dispatch):
+            dispatch[group].append((name, findall, pattern))
+
+    alternatives = ['(?P<{}>{})'.format(group, re.escape(lead)) for lead, group in groups.items()]
+    alternatives.append(r'(?P<midline>[^\n]*?' + re.escape(_midline_cue) + ')')
+    scan = re.compile(r'^\s+(?:' + '|'.join(alternatives) + ')', re.MULTILINE | re.IGNORECASE)
+    return scan, dispatch
+
+
+_scan_pattern, _dispatch = _compile_scan(_quantities)
+
+
+def _findall_item(mobj):
+    groups = mobj.groups(default='')
+    if not groups:
+        return mobj.group(0)
+    return groups[0] if len(groups) == 1 else groups
+
+
+def _scan(outtext):
+    """Match all `_quantities` against `outtext` in a single scan, trying
+    each only at line starts with its lead. Returns, by name, what
+    ``pattern.search(outtext)`` would for first-match quantities and what
+    ``pattern.findall(outtext)`` would for findall ones.
+
+    """
+    found = {name: ([] if findall else None) for name, lead, findall, pattern in _quantities}
+    resume = {}
+
+    for cue in _scan_pattern.finditer(outtext):
+        start = cue.start()
+        lead = cue.start(cue.lastgroup)
+        for name, findall, pattern in _dispatch[cue.lastgroup]:
+            if not findall:
+                if found[name] is None:
+                    found[name] = pattern.match(outtext, start)
+                continue
+
+            # findall matches don't overlap, so resume at the first line
+            #   start after the previous match that still precedes the lead
+            pos = max(start, resume.get(name, 0))
+            if pos > start and outtext[pos - 1] != '\n':
+                pos = outtext.find('\n', pos, lead) + 1 or lead + 1
+            if pos > lead:
+                continue
+            mobj = pattern.match(outtext, pos)
+            if mobj:
+                found[name].append(_findall_item(mobj))
+                resume[name] = mobj.end()
+
+    return found
+
+
 def harvest_output(outtext):
     """Function to separate portions of a NWChem output file *outtext*,
-    divided by " Line search:".
+    divided by " Line search:", and harvest the last portion, or the one
+    before it if the last holds no coordinates.
 
     """
-    pass_psivar = []
-    pass_coord = []
-    pass_grad = []
-    print(pass_coord)
-    for outpass in re.split(r' Line search:', outtext, re.MULTILINE):
-        psivar, nwcoord, nwgrad, version, error = harvest_outfile_pass(outpass)
-        pass_psivar.append(psivar)
-        pass_coord.append(nwcoord)
-        pass_grad.append(nwgrad)
-
-
-#       print ('\n\nXXXXXXXXXXXXXXXXXXXXXXXXXX\n\n')
-        #print (outpass)
-        #print (psivar, nwcoord, nwgrad)
-        #print (psivar, nwgrad)
-#       print ('\n\nxxxxxxxxxxxxxxxxxxxxxxxxxx\n\n')
-
-    retindx = -1 if pass_coord[-1] else -2
-
-    #    print ('    <<<  NW PSIVAR  >>>')
-    #    for item in pass_psivar[retindx]:
-    #       print('       %30s %16.8f' % (item, pass_psivar[retindx][item]))
-    #    print ('    <<<  NW COORD   >>>')
-    #    for item in pass_coord[retindx]:
-    #    print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-    #    print ('    <<<   NW GRAD   >>>')
-    #    for item in pass_grad[retindx]:
-    #       print('       %16.8f %16.8f %16.8f' % (item[0], item[1], item[2]))
-
-    return pass_psivar[retindx], pass_coord[retindx], pass_grad[retindx], version, error
+    # only the final two portions are ever needed
+    passes = outtext.rsplit(' Line search:', 2)
+
+    psivar, nwcoord, nwgrad, version, error = harvest_outfile_pass(passes[-1])
+    if not nwcoord:
+        psivar, nwcoord, nwgrad, _, _ = harvest_outfile_pass(passes[-2])
+
+    return psivar, nwcoord, nwgrad, version, error
 
 def harvest_outfile_pass(outtext):
     """Function to read NWChem output file *outtext* and parse important 
     quantum chemical information from it in
 
     """
-    psivar = PreservingDict()
+    psivar = PreservingDict(defer=True)
     psivar_coord = None
     psivar_grad = None
     version = ''
     error = ''
 
-    NUMBER = "((?:[-+]?\\d*\\.\\d+(?:[DdEe][-+]?\\d+)?)|(?:[-+]?\\d+\\.\\d*(?:[DdEe][-+]?\\d+)?))"
+    found = _scan(outtext)
 
     # Process version
-    mobj = re.search(
-        r'^\s+' + r'Northwest Computational Chemistry Package (NWChem)' + r'\s+' + r'(?:<version>\d+.\d+)' + r'\s*$',
-        outtext, re.MULTILINE)
+    mobj = found['version']
     if mobj:
         print('matched version')
         version = mobj.group('version')
 
     #Process SCF
     #1)Fail to converge
-    mobj = re.search(r'^\s+' + r'(?:Calculation failed to converge)' + r'\s*$', outtext, re.MULTILINE)
+    mobj = found['scf failed']
     if mobj:
         print('failed to converge')
 
     #2)Calculation converged
     else:
-        mobj = re.search(r'^\s+' + r'(?:Total SCF energy)' + r'\s+=\s*' + NUMBER + r's*$', outtext, re.MULTILINE)
+        mobj = found['scf']
         if mobj:
             print('matched HF')
             psivar['HF TOTAL ENERGY'] = mobj.group(1)
 
     #Process Effective nuclear repulsion energy (a.u.)
-        mobj = re.search(r'^\s+' + r'Effective nuclear repulsion energy \(a\.u\.\)' + r'\s+' + NUMBER + r'\s*$',
-                         outtext, re.MULTILINE)
+        mobj = found['nre']
         if mobj:
             print('matched NRE')
             #print (mobj.group(1))
             psivar['NUCLEAR REPULSION ENERGY'] = mobj.group(1)
 
         #Process DFT (RDFT, RODFT,UDFT, SODFT [SODFT for nwchem versions before nwchem 6.8])
-        mobj = re.search(
-                r'^\s+' + r'(?:Total DFT energy)' + r'\s+=\s*' + NUMBER + r'\s*$',
-                outtext, re.MULTILINE)
+        mobj = found['dft']
         if mobj:
             print('matched DFT')
             print (mobj.group(1))
             psivar['DFT TOTAL ENERGY'] = mobj.group(1)
 
         #SODFT [for nwchem 6.8+]
-        mobj = re.search(
-            r'^\s+' + r'Total SO-DFT energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Nuclear repulsion energy' +
-            r'\s+' + NUMBER + r'\s*$', outtext, re.MULTILINE)
+        mobj = found['sodft']
         if mobj:
             print('matched DFT')
             #print (mobj.group(1))
@@ -115,11 +294,7 @@ def harvest_outfile_pass(outtext):
 
         #MCSCF
         sym = []
-        mobj = re.findall(
-                r'^\s+' + r'Total SCF energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'One-electron energy' +
-                r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Two-electron energy' + r'\s+' + NUMBER + r'\s*' +
-                r'^\s+' + r'Total MCSCF energy' + r'\s+' + NUMBER + r'\s*$', 
-                outtext, re.MULTILINE | re.DOTALL)
+        mobj = found['mcscf']
 
         #for mobj_list in mobj:
 
@@ -140,22 +315,14 @@ def harvest_outfile_pass(outtext):
 
         #Process MP2 (Restricted, Unrestricted(RO n/a))
         #1)SCF-MP2
-        mobj = re.search(
-            r'^\s+' + r'SCF energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Correlation energy' + r'\s+' + NUMBER +
-            r'\s*' + r'^\s+' + r'Singlet pairs' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Triplet pairs' + r'\s+' +
-            NUMBER + r'\s*' + r'^\s+' + r'Total MP2 energy' + r'\s+' + NUMBER + r'\s*$', outtext, re.MULTILINE)  #MP2
+        mobj = found['scf-mp2']
         if mobj:
             print('matched scf-mp2')
             psivar['HF TOTAL ENERGY'] = mobj.group(1)
             psivar['MP2 CORRELATION ENERGY'] = mobj.group(2)
             psivar['MP2 TOTAL ENERGY'] = mobj.group(5)
         #SCS-MP2
-        mobj = re.search(
-            r'^\s+' + r'Same spin pairs' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Same spin scaling factor' + r'\s+' +
-            NUMBER + r'\s*' + r'^\s+' + r'Opposite spin pairs' + r'\s+' + NUMBER + r'\s*' + r'^\s+' +
-            r'Opposite spin scaling fact.' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'SCS-MP2 correlation energy' +
-            r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Total SCS-MP2 energy' + r'\s+' + NUMBER + r'\s*$', outtext,
-            re.MULTILINE)
+        mobj = found['scs-mp2']
         if mobj:
             print('matched scs-mp2')
             psivar['MP2 SAME-SPIN CORRELATION ENERGY'] = Decimal(mobj.group(1)) * Decimal(mobj.group(2))
@@ -169,9 +336,7 @@ def harvest_outfile_pass(outtext):
             print(mobj.group(6))  #scs-mp2
 
         #2) DFT-MP2
-        mobj = re.search(
-            r'^\s+' + r'DFT energy' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Unscaled MP2 energy' + r'\s+' + NUMBER +
-            r'\s*' + r'^\s+' + r'Total DFT+MP2 energy' + r'\s+' + NUMBER + r'\s*$', outtext, re.MULTILINE)
+        mobj = found['dft-mp2']
         if mobj:
             print('matched dft-mp2')
             psivar['DFT TOTAL ENERGY'] = mobj.group(1)
@@ -179,11 +344,7 @@ def harvest_outfile_pass(outtext):
             psivar['MP2 TOTAL ENERGY'] = mobj.group(3)
 
         #3) MP2 with CCSD or CCSD(T) calculation (through CCSD(T) directive)
-        mobj = re.search(
-            r'^\s+' + r'MP2 Energy \(coupled cluster initial guess\)' + r'\s*' + r'^\s+' +
-            r'------------------------------------------' + r'\s*' + r'^\s+' + r'Reference energy:' + r'\s+' + NUMBER +
-            r'\s*' + r'^\s+' + r'MP2 Corr\. energy:' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Total MP2 energy:' +
-            r'\s+' + NUMBER + r'\s*$', outtext, re.MULTILINE)
+        mobj = found['cc-mp2']
 
         if mobj:
             print('matched coupled cluster-mp2')
@@ -196,10 +357,7 @@ def harvest_outfile_pass(outtext):
 
         #Process calculation through tce [dertype] command
         cc_name = ''
-        mobj = re.findall(
-            r'^\s+' + r'Iterations converged' + r'\s*' + r'^\s+' + r'(.*?)' + r' correlation energy / hartree' +
-            r'\s+=\s*' + NUMBER + r'\s*' + r'^\s+' + r'(.*?)' + r' total energy / hartree' + r'\s+=\s*' + NUMBER +
-            r'\s*$', outtext, re.MULTILINE | re.DOTALL) 
+        mobj = found['tce']
         
         #mobj now lists, not groups
         for mobj_list in mobj:
@@ -211,11 +369,7 @@ def harvest_outfile_pass(outtext):
            psivar['%s TOTAL ENERGY' % mobj_list[2]] = mobj_list[3]
             
         # Process CC '()' correction part through tce [dertype] command
-        mobj = re.search(
-            r'^\s+' + cc_name + r'\(' + r'(.*?)' + r'\)' + r'\s+' + r'correction energy / hartree' + r'\s+=\s*' +
-            NUMBER + r'\s*' + r'^\s+' + cc_name + r'\(' + r'(.*?)' + r'\)' + r'\s+' + r'correlation energy / hartree' +
-            r'\s+=\s*' + NUMBER + r'\s*' + r'^\s+' + cc_name + r'\(' + r'(.*?)' + r'\)' + r'\s+' +
-            r'total energy / hartree' + r'\s+=\s*' + NUMBER + r'\s*$', outtext, re.MULTILINE)
+        mobj = found['tce correction']
 
         if mobj:
             print('matched %s(%s)' % (cc_name, mobj.group(1)))
@@ -229,21 +383,14 @@ def harvest_outfile_pass(outtext):
             psivar['%s(%s) TOTAL ENERGY' % (cc_name, mobj.group(1))] = mobj.group(6)
 
         #Process CCSD/CCSD(T) using nwchem CCSD/CCSD(T) [dertype] command
-        mobj = re.search(
-            r'^\s+' + r'-----------' + r'\s*' + r'^\s+' + r'CCSD Energy' + r'\s*' + r'^\s+' + r'-----------' + r'\s*' +
-            r'^\s+' + r'Reference energy:' + r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'CCSD corr\. energy:' + r'\s+' +
-            NUMBER + r'\s*' + r'^\s+' + r'Total CCSD energy:' + r'\s+' + NUMBER + r'\s*$', outtext,
-            re.MULTILINE | re.DOTALL)
+        mobj = found['ccsd']
 
         if mobj:
             print('matched ccsd')
             psivar['CCSD CORRELATION ENERGY'] = mobj.group(2)
             psivar['CCSD TOTAL ENERGY'] = mobj.group(3)
 
-        mobj = re.search(
-            r'^\s+' + r'--------------' + r'\s*' + r'^\s+' + r'CCSD\(T\) Energy' + r'\s*' + r'^\s+' + r'--------------'
-            + r'\s*' + r'(?:.*?)' + r'^\s+' + r'\(T\) corr\. energy:' + r'\s+' + NUMBER + r'\s*' + r'^\s+' +
-            r'Total CCSD\(T\) energy:' + r'\s+' + NUMBER + r'\s*$', outtext, re.MULTILINE | re.DOTALL)
+        mobj = found['ccsd(t)']
 
         if mobj:
             print('matched ccsd(t)')
@@ -251,13 +398,7 @@ def harvest_outfile_pass(outtext):
             psivar['CCSD(T) CORRELATION ENERGY'] = Decimal(mobj.group(2)) - psivar['HF TOTAL ENERGY']
             psivar['CCSD(T) TOTAL ENERGY'] = mobj.group(2)
 
-        mobj = re.search(
-            r'^\s+' + r'Spin Component Scaled (SCS) CCSD' + r'\s*' + r'(?:.*?)' + r'^\s+' + r'Same spin contribution' +
-            r'\s+' + NUMBER + r'\s*' + r'^\s+' + r'Same spin scaling factor' + r'\s+' + NUMBER + r'\s*'
-            r'^\s+' + r'Opposite spin contribution' + r'\s+' + NUMBER + r'\s*' + r'^\s+' +
-            r'Opposite spin scaling factor' + r'\s+' + NUMBER + r'\s*'
-            r'\^s+' + r'SCS-CCSD correlation energy' + r'\s+' + NUMBER + r'\s*' + r'\^s+' + r'Total SCS-CCSD energy' +
-            r'\s+' + NUMBER + r'\s*$', outtext, re.MULTILINE | re.DOTALL)
+        mobj = found['scs-ccsd']
         #SCS-CCSD included
         if mobj:
             print('matched scs-ccsd')
@@ -276,24 +417,7 @@ def harvest_outfile_pass(outtext):
         # Parsed information: each symmetry, root excitation energy in eV and total energy in hartree
         # psivar name might need to be fixed
         # each root excitation energy is extracted from the last iteration of right hand side
-        mobj = re.findall(
-            #r'^\s+' + r'Excited-state calculation' + r'\s+' + r'\(\s+' + r'(.*?)' + r'\s+' + r'symmetry\)' + r'\s*' +
-            #r'^\s+' + r'=========================================' + r'\s*' + r'(?:.*?)'
-            #+  #Skip to line before right-hand side iterations
-            #r'^\s+' + r'EOM-' + cc_name + r' right-hand side iterations' + r'\s*' + r'(?:.*?)' + r'^\s+' + r'Iteration'
-            #+ r'\s+\d+\s+' + r'using' + r'\s+\d+\s+' + r'trial vectors' + r'\s*' +
-            #r'((?:\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+(?:(\s+\d+\.\d+\s+\d+\.\d+)?)\s*\n)+)' + r'^\s+' +
-            #r'--------------------------------------------------------------' + r'\s*' + r'^\s+' +
-            #r'Iterations converged' + r'\s*$',
-            #outtext,
-            #re.MULTILINE | re.DOTALL)
-            r'^\s+' + r'Excited-state calculation' + r'\s+' + r'\((.*?)\)' + r'\s*' +
-            r'^\s+' + r'EOM-' + cc_name + r'\s+right-hand side iterations' + r'\s*'+  #capture cc_name
-            r'^\s+' + r'Iterations converged' + r'\s*' + #skip to excitation
-            r'^\s+' + r'Excited state root\s+\d{1,2}\s*'+
-            r'^\s+' + r'Excitation energy / hartree' + r'\s+=\s+' + NUMBER + r'\s*' +
-            r'^\s+' + r'/ eV\s+' + r'\s+=\s+' + NUMBER + r'\s*$',
-            outtext, re.MULTILINE | re.DOTALL)
+        mobj = found['eom']
         
         if mobj:
             ext_energy = {}  #dic
@@ -328,8 +452,7 @@ def harvest_outfile_pass(outtext):
                         psivar ['EOM-%s ROOT 0 -> ROOT %d TOTAL ENERGY - %s SYMMETRY' %(cc_name, nroot+1, symm)] = \
                             psivar['%s TOTAL ENERGY' %(cc_name)] + Decimal(ext_energy_list[nroot]) #in hartree
         gssym = ''
-        gs = re.search(
-            r'^\s+' + r'Ground-state symmetry is' + gssym + r'\s*$', outtext, re.MULTILINE)
+        gs = found['ground-state symmetry']
         
         if gs:
             print('matched ground-state symmetry')
@@ -337,15 +460,7 @@ def harvest_outfile_pass(outtext):
 
 #Process TDDFT
 #       1) Spin allowed
-        mobj = re.findall(
-            r'^\s+' + r'----------------------------------------------------------------------------' + r'\s*' +
-            r'^\s+' + r'Root' + r'\s+' + r'(\d+)' + r'\s+' + r'(\w+)' + r'\s+' + r'(.*?)' + r'\s+' + NUMBER +
-            r'\s+a\.u\.\s+' + NUMBER + r'\s+eV\s*' + r'^\s+' +
-            r'----------------------------------------------------------------------------' + r'\s*' + r'^\s+' +
-            r'Transition Moments' + r'\s+X\s+' + NUMBER + r'\s+Y\s+' + NUMBER + r'\s+Z\s+' + NUMBER + r'\s*' + r'^\s+'
-            + r'Transition Moments' + r'\s+XX\s+' + NUMBER + r'\s+XY\s+' + NUMBER + r'\s+XZ\s+' + NUMBER + r'\s*' +
-            r'^\s+' + r'Transition Moments' + r'\s+YY\s+' + NUMBER + r'\s+YZ\s+' + NUMBER + r'\s+ZZ\s+' + NUMBER +
-            r'\s*$', outtext, re.MULTILINE)
+        mobj = found['tddft']
 
         if mobj:
             print('matched TDDFT with transition moments')
@@ -372,12 +487,7 @@ def harvest_outfile_pass(outtext):
 
 
 #       2) Spin forbidden
-        mobj = re.findall(
-            r'^\s+' + r'----------------------------------------------------------------------------' + r'\s*' +
-            r'^\s+' + r'Root' + r'\s+' + r'(\d+)' + r'\s+' + r'(\w+)' + r'\s+' + r'(.*?)' + r'\s+' + NUMBER +
-            r'\s+a\.u\.\s+' + NUMBER + r'\s+eV\s*' + r'^\s+' +
-            r'----------------------------------------------------------------------------' + r'\s*' + r'^\s+' +
-            r'Transition Moments' + r'\s+Spin forbidden\s*$', outtext, re.MULTILINE)
+        mobj = found['tddft spin forbidden']
 
         if mobj:
             print('matched TDDFT - spin forbidden')
@@ -393,16 +503,14 @@ def harvest_outfile_pass(outtext):
         #Process geometry
         # 1) CHARGE
         # Read charge from SCF module
-        mobj = re.search(r'^\s+' + r'charge          =' + r'\s+' + NUMBER + r'\s*$', outtext,
-                         re.MULTILINE | re.IGNORECASE)
+        mobj = found['scf charge']
 
         if mobj:
             print('matched charge')
             out_charge = int(float(mobj.group(1)))
 
         # Read charge from General information (not scf module)
-        mobj = re.search(r'^\s+' + r'Charge           :' + r'\s+' + r'(-?\d+)' + r'\s*$', outtext,
-                         re.MULTILINE | re.IGNORECASE)
+        mobj = found['charge']
 
         if mobj:
             print('matched charge')
@@ -410,39 +518,28 @@ def harvest_outfile_pass(outtext):
 
         # 2) MULTIPLICITY
         # Read multiplicity from SCF module
-        mobj = re.search(r'^\s+' + r'open shells     =' + r'\s+' + r'(\d+)' + r'\s*$', outtext,
-                         re.MULTILINE | re.IGNORECASE)
+        mobj = found['scf open shells']
 
         if mobj:
             print('matched multiplicity')
             out_mult = int(mobj.group(1)) + 1
 
         # Read multiplicity from SCF module through alpha, beta electrons
-        mobj = re.search(
-            r'^\s+' + r'alpha electrons =' + r'\s+' + r'(\d+)' + r'\s*' + r'^\s+' + r'beta  electrons =' + r'\s+' +
-            r'(\d+)' + r'\s*$', outtext, re.MULTILINE | re.IGNORECASE)
+        mobj = found['scf electrons']
 
         if mobj:
             print('matched multiplicity')
             out_mult = int(mobj.group(1)) - int(mobj.group(2)) + 1  #nopen + 1
 
         # Read multiplicity from General information (not scf module)
-        mobj = re.search(r'^\s+' + r'Spin multiplicity:' + r'\s+' + r'(\d+)' + r'\s*$', outtext,
-                         re.MULTILINE | re.IGNORECASE)
+        mobj = found['multiplicity']
 
         if mobj:
             print('matched multiplicity')
             out_mult = int(mobj.group(1))
 
         #3) Initial geometry
-        mobj = re.search(
-            r'^\s+' + r'Geometry' + r'.*' + r'\s*' + r'^\s+' + r'(?:-+)\s*' + r'\s+' + r'\n' + r'^\s' +
-            r'Output coordinates in ' + r'(.*?)' + r'\s' + r'\(scale by' + r'.*' + r'\s' + r'to convert to a\.u\.\)' +
-            r'\s+' + r'\n' + r'^\s+' + r'No\.\       Tag          Charge          X              Y              Z' +
-            r'\s*' + r'^\s+' + r'---- ---------------- ---------- -------------- -------------- --------------' +
-            r'\s*' +
-            r'((?:\s+([1-9][0-9]*)+\s+([A-Z][a-z]*)+\s+\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s*\n)+)'
-            + r'\s*$', outtext, re.MULTILINE | re.IGNORECASE)
+        mobj = found['geometry']
 
         if mobj:
             print('matched geom')
@@ -466,12 +563,7 @@ def harvest_outfile_pass(outtext):
                 psivar_coord = Molecule.from_string(molxyz, dtype='xyz+', fix_com=True, fix_orientation=True)
 
         #Process gradient
-        mobj = re.search(
-            r'^\s+' + r'.*' + r'ENERGY GRADIENTS' + r'\s*' + r'\s+' + r'\n' + r'^\s+' +
-            r'atom               coordinates                        gradient' + r'\s*' + r'^\s+' +
-            r'x          y          z           x          y          z' + r'\s*' +
-            r'((?:\s+([1-9][0-9]*)+\s+([A-Z][a-x]*)+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s+[-+]?\d+\.\d+\s*\n)+)'
-            + r'\s*$', outtext, re.MULTILINE)
+        mobj = found['gradient']
 
         if mobj:
             print('matched molgrad')
@@ -487,14 +579,7 @@ def harvest_outfile_pass(outtext):
                     psivar_grad.append([float(lline[-3]), float(lline[-2]), float(lline[-1])])
 
         #Process dipole
-        mobj = re.search(
-            r'^\s+' + r'Dipole moment' + r'\s+' + NUMBER + r'\s' + r'A\.U\.' + r'\s*' + r'^\s+' + r'DMX' + r'\s+' +
-            NUMBER + r'.*' + r'\s*' + r'^\s+' + r'DMY' + r'\s+' + NUMBER + r'.*' + r'\s*' + r'^\s+' + r'DMZ' + r'\s+' +
-            NUMBER + r'.' + r'\s*' + r'^\s+' + r'.*' + r'\s*' + r'^\s+' + r'Total dipole' + r'\s+' + NUMBER + r'\s' +
-            r'A\.U\.' + r'\s*' + r'^\s+' + r'Dipole moment' + r'\s+' + NUMBER + r'\s' + r'Debye\(s\)' + r'\s*' +
-            r'^\s+' + r'DMX' + r'\s+' + NUMBER + r'.*' + r'\s*' + r'^\s+' + r'DMY' + r'\s+' + NUMBER + r'.*' + r'\s*' +
-            r'^\s+' + r'DMZ' + r'\s+' + NUMBER + r'.*' + r'\s*' + r'^\s+' + r'.*' + r'\s*' + r'^\s+' + r'Total dipole'
-            + r'\s+' + NUMBER + r'\s' + r'DEBYE\(S\)' + r'\s*$', outtext, re.MULTILINE)
+        mobj = found['dipole']
 
         if mobj:
             print('matched total dipole')
@@ -508,12 +593,7 @@ def harvest_outfile_pass(outtext):
             # total?
 
             #Process error code
-            mobj = re.search(
-                r'^\s+' + r'current input line \:' + r'\s*' + r'^\s+' + r'([1-9][0-9]*)' + r'\:' + r'\s+' + r'(.*)' +
-                r'\s*' + r'^\s+'
-                r'------------------------------------------------------------------------' + r'\s*' + r'^\s+'
-                r'------------------------------------------------------------------------' + r'\s*' + r'^\s+' +
-                r'There is an error in the input file' + r'\s*$', outtext, re.MULTILINE)
+            mobj = found['error']
             if mobj:
                 print('matched error')
             #print (mobj.group(1)) #error line number
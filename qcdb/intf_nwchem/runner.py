@@ -1,5 +1,4 @@
 import sys
-import copy
 import pprint
 pp = pprint.PrettyPrinter(width=120)
 import inspect
@@ -41,9 +40,9 @@ def run_nwchem(name, molecule, options, **kwargs):
 
     jobrec['molecule'] = molecule.to_dict(np_out=False)
     jobrec['method'] = name
-    jobrec['dertype'] = ['energy', 'gradient', 'hessian'].index(inspect.stack()[1][3])
+    jobrec['dertype'] = ['energy', 'gradient', 'hessian'].index(kwargs['ptype'])
 
-    jobrec['options'] = copy.deepcopy(options)
+    jobrec['options'] = options.snapshot()
 
     #print('comin in')
     #print(jobrec['options'])
@@ -85,6 +84,8 @@ def nwchem_driver(jobrec):
 #    print('>>>\n')
 
     nwchem_subprocess(nwchemrec)  # updates nwchemrec
+    if nwchemrec['fatal'] is not None:
+        raise ValidationError('NWChem job stopped upon fatal error: {}'.format(nwchemrec['fatal']))
 
 #    print('[3] NWCHEMREC POST-SUBPROCESS (e@io) <<<')
 #    pp.pprint(nwchemrec)
@@ -145,7 +146,7 @@ def nwchem_plant(jobrec):  # jobrec@i -> engine@i
 
     # Handle conversion of qcdb keyword structure into nwchem format
 #OLD    optcmd = moptions.prepare_options_for_nwchem(jobrec['options'])
-    resolved_options = {k: v.value for k, v in jobrec['options'].scroll['NWCHEM'].items() if v.disputed()}
+    resolved_options = {k: v.value for k, v in jobrec['options'].changed('NWCHEM').items()}
     optcmd = format_options_for_nwchem(resolved_options)
 
     # Handle text to be passed untouched to cfour
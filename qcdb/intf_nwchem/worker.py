@@ -1,7 +1,14 @@
 import os
 import uuid
 import shutil
-import subprocess
+
+from ..util import run_streaming, FatalScanner
+
+# lines of NWChem output after which the job can only end in failure
+fatal_patterns = [
+    r'There is an error in the input file',
+    r'For further details see manual section',
+]
 
 
 def nwchem_subprocess(nwchemrec):  # enginerec@i -> enginerec@io
@@ -22,11 +29,20 @@ def nwchem_subprocess(nwchemrec):  # enginerec@i -> enginerec@io
         Note that this IS ACTUAL (not PARENT) dir.
     executable_path
         Additional path (':'-separated if multiplie) to be prepended to `PATH` for subprocess execution
+    fatal_patterns : list of str, optional
+        Regular expressions for lines of output upon which the job is
+        killed without waiting for it to finish. Default `fatal_patterns`.
+    progress : callable, optional
+        Called as output arrives with running totals `progress(nlines, nbytes)`.
 
     Output Fields
     -------------
     stdout : str
         Main output file that gets written to stdout.
+    returncode : int
+        Exit code of the NWChem process.
+    fatal : str or None
+        First line of output matching `fatal_patterns`, if any.
     output_grd : str, optional
         GRD file contents.
     output_fcmfinal : str, optional
@@ -41,8 +57,6 @@ def nwchem_subprocess(nwchemrec):  # enginerec@i -> enginerec@io
         raise KeyError('Required fields missing from ({})'.format(
             nwchemrec.keys())) from err
 
-    current_directory = os.getcwd()
-
     # find environment by merging PSIPATH and PATH environment variables
     # * `path` kwarg gets precedence
     # * filter out None values as subprocess will fault on them
@@ -60,38 +74,34 @@ def nwchem_subprocess(nwchemrec):  # enginerec@i -> enginerec@io
         lenv['PATH'] = nwchemrec['executable_path'] + ':' + lenv['PATH']
     lenv = {k: v for k, v in lenv.items() if v is not None}
 
-    # set up unique scratch directory and move in
+    # set up unique scratch directory. never moved into, so that concurrent
+    #   jobs in this process don't trample each other's working directory
     if 'scratch_location' in nwchemrec:
         nwchem_tmpdir = nwchemrec['scratch_location']
     else:
         nwchem_tmpdir = os.environ['HOME'] + os.sep + 'nwchem_' + str(uuid.uuid4())
     if not os.path.exists(nwchem_tmpdir):
         os.mkdir(nwchem_tmpdir)
-    os.chdir(nwchem_tmpdir)
 
     # write governing inputs
-    with open('nwchem.nw', 'w') as handle:
+    with open(os.path.join(nwchem_tmpdir, 'nwchem.nw'), 'w') as handle:
         handle.write(nwchemrec['nwchem.nw'])
 #    with open('GENBAS', 'w') as handle:
 #        handle.write(nwchemrec['genbas'])
 
-    # call `xnwchem` program or subprogram
+    # call `xnwchem` program or subprogram, watching output for failure
+    scanner = FatalScanner(nwchemrec.get('fatal_patterns', fatal_patterns))
     try:
-        spcall = subprocess.Popen(nwchemrec['command'], bufsize=0, stdout=subprocess.PIPE, env=lenv)
+        returncode, stdout, _ = run_streaming(nwchemrec['command'], cwd=nwchem_tmpdir, env=lenv,
+                                              scanner=scanner, progress=nwchemrec.get('progress'))
     except OSError as err:
         raise OSError('Command (`{}`) failed with PATH ({})'.format(
             ' '.join(nwchemrec['command']), lenv['PATH'])) from err
 
     # recover output data
-    spcallstdout = ''
-    while True:
-        data = spcall.stdout.readline()
-        data = data.decode('utf-8')
-        if not data:
-            break
-#        print(data)
-        spcallstdout += data
-    nwchemrec['stdout'] = spcallstdout
+    nwchemrec['stdout'] = stdout
+    nwchemrec['returncode'] = returncode
+    nwchemrec['fatal'] = scanner.fatal
 
 #    for fl in ['GRD', 'FCMFINAL', 'DIPOL']:
 #        fullpath = nwchem_tmpdir + os.sep + fl
@@ -104,13 +114,10 @@ def nwchem_subprocess(nwchemrec):  # enginerec@i -> enginerec@io
     # clean up files and remove scratch directory
     # NOTE used to keep scr arond if path in kwargs
     if 'scratch_messy' not in nwchemrec or nwchemrec['scratch_messy'] is False:
-        os.chdir('..')
         try:
             shutil.rmtree(nwchem_tmpdir)
         except OSError as err:
-            raise OSError('Unable to remove CFOUR temporary directory: {}'.
+            raise OSError('Unable to remove NWChem temporary directory: {}'.
                           format(nwchem_tmpdir)) from err
 
-    os.chdir(current_directory)
-
     return nwchemrec
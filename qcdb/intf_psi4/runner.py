@@ -1,5 +1,4 @@
 import sys
-import copy
 import pprint
 pp = pprint.PrettyPrinter(width=120)
 import inspect
@@ -41,7 +40,7 @@ def run_psi4(name, molecule, options, **kwargs):
     jobrec['method'] = name
     jobrec['driver'] = kwargs['ptype']
     jobrec['kwargs'] = kwargs
-    jobrec['options'] = copy.deepcopy(options)
+    jobrec['options'] = options.snapshot()
     jobrec['hooks'] = kwargs.get('hooks', {})
 
     jobrec = psi4_driver(jobrec)
@@ -122,13 +121,12 @@ def psi4_plant(jobrec):  # jobrec@i -> psi4@i
     #    psi4rec['json']['infile_' + 'grid.dat'] = opts.scroll['PSI4']['GRIDDAT'].value
     
     popts = {}
-    for k, v in opts.scroll['QCDB'].items():
-        if v.disputed():
+    for k, v in opts.changed('QCDB').items():
+        if not k.startswith('RESULT_CACHE'):  # qcdb-side only
             popts[k] = v.value
 
-    for k, v in opts.scroll['PSI4'].items():
-        if v.disputed():
-            popts[k] = v.value
+    for k, v in opts.changed('PSI4').items():
+        popts[k] = v.value
     psi4rec['json']['keywords'] = popts
     if 'BASIS' in psi4rec['json']['keywords']:
         psi4rec['json']['model']['basis'] =  psi4rec['json']['keywords']['BASIS']
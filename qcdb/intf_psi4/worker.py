@@ -36,8 +36,6 @@ def psi4_subprocess(psi4rec):  # psi4rec@i -> psi4rec@io
 #    output_dipol : str, optional
 
     """
-    import bson
-
     try:
         psi4rec['command']
         psi4rec['json']
@@ -45,10 +43,10 @@ def psi4_subprocess(psi4rec):  # psi4rec@i -> psi4rec@io
         raise KeyError('Required fields missing from ({})'.format(
             psi4rec.keys())) from err
 
-    current_directory = os.getcwd()
     jobuuid = str(uuid.uuid4())
 
-    # set up unique scratch directory and move in
+    # set up unique scratch directory. never moved into, so that concurrent
+    #   jobs in this process don't trample each other's working directory
     if 'scratch_location' in psi4rec:
         tmpdir = psi4rec['scratch_location']
     else:
@@ -56,7 +54,6 @@ def psi4_subprocess(psi4rec):  # psi4rec@i -> psi4rec@io
 #    tmpdir = '/scratch/psilocaluser/psi4_' + jobuuid
     if not os.path.exists(tmpdir):
         os.mkdir(tmpdir)
-    os.chdir(tmpdir)
 
     # find environment by merging PSIPATH and PATH environment variables
     # * `path` kwarg gets precedence
@@ -78,41 +75,32 @@ def psi4_subprocess(psi4rec):  # psi4rec@i -> psi4rec@io
         lenv['PATH'] = psi4rec['executable_path'] + ':' + lenv['PATH']
     lenv = {k: v for k, v in lenv.items() if v is not None}
 
-
     # write governing inputs
     inputjson = jobuuid + '.json'
-    with open(inputjson, 'w') as handle:
+    with open(os.path.join(tmpdir, inputjson), 'w') as handle:
         json.dump(psi4rec['json'], handle)
     #with open(inputjson, 'wb') as handle:
     #    handle.write(bson.dumps(psi4rec['json']))
-    psi4rec['command'].append(inputjson)
+    command = psi4rec['command'] + [inputjson]
 
     for fl in psi4rec['json'].keys():
         if fl.startswith('infile_'):
-            with open(fl[7:], 'w') as handle:
+            with open(os.path.join(tmpdir, fl[7:]), 'w') as handle:
                 handle.write(psi4rec['json'][fl])
 
     # call `psi4` program
     try:
-        spcall = subprocess.Popen(psi4rec['command'], bufsize=0, stdout=subprocess.PIPE, env=lenv)
+        spcall = subprocess.run(command, cwd=tmpdir, env=lenv, stdout=subprocess.PIPE)
     except OSError as err:
         raise OSError('Command (`{}`) failed with PATH ({})'.format(
-            ' '.join(psi4rec['command']), lenv['PATH'])) from err
+            ' '.join(command), lenv['PATH'])) from err
 
     # recover output data
-    spcallstdout = ''
-    while True:
-        data = spcall.stdout.readline()
-        data = data.decode('utf-8')
-        if not data:
-            break
-        #print(data)
-        spcallstdout += data
-    psi4rec['stdout'] = spcallstdout
+    psi4rec['stdout'] = spcall.stdout.decode('utf-8')
 
     #with open(inputjson, 'rb') as handle:
     #    psi4rec['json'] = bson.loads(handle.read())
-    with open(inputjson, 'r') as handle:
+    with open(os.path.join(tmpdir, inputjson), 'r') as handle:
         psi4rec['json'] = json.load(handle)
 
     for fl in ['grid_esp.dat']:
@@ -120,19 +108,16 @@ def psi4_subprocess(psi4rec):  # psi4rec@i -> psi4rec@io
         try:
             with open(fullpath, 'r') as handle:
                 psi4rec['json']['outfile_' + fl.lower()] = handle.read()
-                print(handle.read())
         except IOError:
             pass
 
     # clean up files and remove scratch directory
     # NOTE used to keep scr arond if path in kwargs
     if 'scratch_messy' not in psi4rec or psi4rec['scratch_messy'] is False:
-        os.chdir('..')
         try:
             shutil.rmtree(tmpdir)
         except OSError as err:
             raise OSError('Unable to remove Psi4 temporary directory: {}'.
                           format(tmpdir)) from err
 
-    os.chdir(current_directory)
-
+    return psi4rec
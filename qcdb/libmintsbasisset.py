@@ -50,6 +50,11 @@ if sys.version_info >= (3,0):
 
 basishorde = {}
 
+# here liveth the sha1 of every one-atom basis yet constructed, process-wide,
+#   keyed by (basis, atom label, basis source, puream forcing, decontraction)
+_oneatom_hashes = {}
+oneatom_stats = {'hits': 0, 'misses': 0}
+
 class BasisSet(object):
     """Basis set container class
     Reads the basis set from a checkpoint file object. Also reads the molecule
@@ -454,7 +459,6 @@ class BasisSet(object):
                     self.uexponents[tst:tsp],
                     'Pure' if self.puream else 'Cartesian',
                     center, self.xyz, bf_count, pt='Unnormalized', rpowers=None)
-                self.shells[shell_count].pyprint()
                 for thisbf in range(shell.nfunction()):
                     self.function_to_shell[bf_count] = shell_count
                     self.function_center[bf_count] = center
@@ -775,6 +779,7 @@ class BasisSet(object):
         ecp_atom_basis_shell = collections.OrderedDict()
         ecp_atom_basis_ncore = collections.OrderedDict()
         names = {}
+        hashkeys = {}
         summary = []
         bastitles = []
 
@@ -841,26 +846,25 @@ class BasisSet(object):
                 # -- First seek bas string in input file strings
                 if filename[:-4] in seek['strings']:
                     index = 'inputblock %s' % (filename[:-4])
-                    # Store contents
-                    if index not in names:
-                        names[index] = basstrings[filename[:-4]].split('\n')
+                    source = {'text': basstrings[filename[:-4]]}
+                    stamp = ('inputblock', source['text'])
                 else:
                     # -- Else seek bas.gbs file in path
-                    fullfilename = search_file(filename, seek['path'])
+                    if (filename, seek['path']) not in names:
+                        names[(filename, seek['path'])] = search_file(filename, seek['path'])
+                    fullfilename = names[(filename, seek['path'])]
                     if fullfilename is None:
                         # -- Else skip to next bas
                         continue
-                    # Store contents so not reloading files
                     index = 'file %s' % (fullfilename)
-                    if index not in names:
-                        names[index] = parser.load_file(fullfilename)
-
-                lines = names[index]
+                    source = {'filename': fullfilename}
+                    stamp = os.stat(fullfilename)
+                    stamp = (fullfilename, stamp.st_mtime_ns, stamp.st_size)
 
                 for entry in seek['entry']:
 
-                    # Seek entry in lines, else skip to next entry
-                    shells, msg, ecp_shells, ecp_msg, ecp_ncore = parser.parse(entry, lines)
+                    # Seek entry in (process-wide cached) library, else skip to next entry
+                    shells, msg, ecp_shells, ecp_msg, ecp_ncore = parser.lookup(entry, **source)
                     if shells is None:
                         continue
 
@@ -877,6 +881,8 @@ class BasisSet(object):
                     if key == 'BASIS':
                         ecp_atom_basis_ncore[label] = ecp_ncore
                     mol.set_basis_by_number(at, bastitle, role=key)
+                    hashkeys[at] = (bastitle.upper(), label, stamp, parser.force_puream_or_cartesian,
+                                    parser.forced_is_puream, postfunc is not None)
                     bastitles.append(bastitle.upper())
                     if ecp_msg:
                         summary.append("""entry %-10s %s (ECP: %s) %s %s""" % (entry, msg, ecp_msg, index, fmsg))
@@ -912,9 +918,18 @@ class BasisSet(object):
 
         # Construct all the one-atom BasisSet-s for mol's CoordEntry-s
         atom_basis_list = []
+        #   one-atom BasisSet-s carry their atom's position, so only needed
+        #   fresh for return_atomlist; their hashes depend on shells alone
         for at in range(mol.natom()):
-            oneatombasis = BasisSet(basisset, at)
-            oneatombasishash = hashlib.sha1(oneatombasis.print_detail(numbersonly=True).encode('utf-8')).hexdigest()
+            oneatombasishash = _oneatom_hashes.get(hashkeys[at])
+            if oneatombasishash is None or return_atomlist:
+                oneatombasis = BasisSet(basisset, at)
+            if oneatombasishash is None:
+                oneatom_stats['misses'] += 1
+                oneatombasishash = hashlib.sha1(oneatombasis.print_detail(numbersonly=True).encode('utf-8')).hexdigest()
+                _oneatom_hashes[hashkeys[at]] = oneatombasishash
+            else:
+                oneatom_stats['hits'] += 1
             if return_atomlist:
                 oneatombasis.molecule.set_shell_by_number(0, oneatombasishash, role=key)
                 atom_basis_list.append(oneatombasis)
@@ -0,0 +1,194 @@
+import math
+
+import numpy as np
+
+# Generic direction onto which positions are projected and sorted. Any
+#   direction serves; this one is unlikely to have atoms of symmetric
+#   molecules tie in projection, so search windows hold ~one atom.
+_PROJECTION = np.array([0.7548776662466927, 0.5698402909980532, 0.3247179572447460])
+_PROJECTION /= np.linalg.norm(_PROJECTION)
+
+# number of atoms to map before committing to mapping all of them
+_PROBE = 8
+
+
+class AtomLocator():
+    """Vectorized lookup of atoms by position for testing candidate
+    symmetry elements against a whole geometry at once. Positions are
+    sorted along one projection so that each lookup is a binary search,
+    and candidate axes and planes that are not principal axes of the
+    geometry's second moment (within what `tol` allows) are rejected
+    before any atoms are mapped.
+
+    Parameters
+    ----------
+    geom : array-like of float
+        (nat, 3) Cartesian positions [a0].
+    labels : array-like of int
+        (nat,) Equivalence class of each atom. An operation maps the
+        molecule onto itself only if each atom lands on one of its class.
+    tol : float
+        Atoms are located at distances strictly less than `tol`.
+
+    """
+
+    def __init__(self, geom, labels, tol):
+        self.geom = np.asarray(geom, dtype=float).reshape(-1, 3)
+        self.labels = np.asarray(labels, dtype=int)
+        self.tol = tol
+
+        proj = self.geom.dot(_PROJECTION)
+        self.order = np.argsort(proj, kind='stable')
+        self.sorted_proj = proj[self.order]
+        # projection window, padded for roundoff
+        self.window = tol + 1.e-12 * (1.0 + np.max(np.abs(self.geom), initial=0.0))
+
+        self._distinct = None
+        self._moments = {}
+
+    @property
+    def distinct(self):
+        """Whether no two equivalent atoms lie within 2 tol of each other, so
+        that operations map atoms one-to-one (what moment screening relies upon).
+
+        """
+        if self._distinct is None:
+            span = 2.0 * self.window
+            self._distinct = True
+            for offset in range(1, self.geom.shape[0]):
+                near = np.nonzero(self.sorted_proj[offset:] - self.sorted_proj[:-offset] <= span)[0]
+                if near.size == 0:
+                    break
+                at1 = self.order[near]
+                at2 = self.order[near + offset]
+                dist2 = np.sum(np.square(self.geom[at1] - self.geom[at2]), axis=1)
+                if np.any((self.labels[at1] == self.labels[at2]) & (dist2 <= span * span)):
+                    self._distinct = False
+                    break
+        return self._distinct
+
+    def locate(self, points):
+        """Returns index of the atom nearest each of `points` if within tol, else -1.
+        Agrees with :py:func:`~qcdb.molecule.Molecule.atom_at_position`.
+
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        npt = points.shape[0]
+        found = np.full(npt, -1, dtype=int)
+        if npt == 0 or self.geom.shape[0] == 0:
+            return found
+
+        proj = points.dot(_PROJECTION)
+        lo = np.searchsorted(self.sorted_proj, proj - self.window, side='left')
+        hi = np.searchsorted(self.sorted_proj, proj + self.window, side='right')
+        best = np.full(npt, self.tol * self.tol)
+
+        for offset in range(int(np.max(hi - lo))):
+            live = np.nonzero(lo + offset < hi)[0]
+            cand = self.order[lo[live] + offset]
+            dist2 = np.sum(np.square(self.geom[cand] - points[live]), axis=1)
+            prev = found[live]
+            # lowest index wins ties, as in np.argmin
+            better = (dist2 < best[live]) | ((dist2 == best[live]) & (prev >= 0) & (cand < prev))
+            best[live[better]] = dist2[better]
+            found[live[better]] = cand[better]
+
+        return found
+
+    def is_symmetric(self, images):
+        """Whether `images`, the (nat, 3) positions of all atoms under some
+        operation, each land on an atom equivalent to the original.
+
+        """
+        images = np.asarray(images, dtype=float).reshape(-1, 3)
+        for sl in [slice(None, _PROBE), slice(_PROBE, None)]:
+            found = self.locate(images[sl])
+            if np.any(found < 0) or np.any(self.labels[found] != self.labels[sl]):
+                return False
+        return True
+
+    def moment(self, origin):
+        """Returns second moment of positions about `origin` and the largest
+        change to it (2-norm) that mapping within tol can account for.
+
+        """
+        key = tuple(origin)
+        if key not in self._moments:
+            rel = self.geom - np.asarray(origin)
+            mom = rel.T.dot(rel)
+            dist = np.sqrt(np.sum(np.square(rel), axis=1))
+            slack = np.sum(2.0 * dist * self.tol + self.tol * self.tol)
+            slack += 1.e-12 * (1.0 + np.trace(mom))
+            self._moments[key] = (mom, slack)
+        return self._moments[key]
+
+    def admissible(self, origin, directions, order=2):
+        """Screens unit `directions` as axes of rotation by 2 pi / `order`
+        (or, for `order` 2, as normals to mirror planes) through `origin`.
+        Any such symmetry element leaves the second moment invariant, so
+        its direction must be an eigenvector thereof, to within tolerance.
+
+        Returns
+        -------
+        ndarray of bool
+            False where the direction can be rejected without mapping atoms.
+
+        """
+        directions = np.asarray(directions, dtype=float).reshape(-1, 3)
+        if not self.distinct:
+            return np.ones(directions.shape[0], dtype=bool)
+
+        mom, slack = self.moment(origin)
+        image = directions.dot(mom)
+        image -= np.sum(image * directions, axis=1)[:, None] * directions
+        residual = np.sqrt(np.sum(np.square(image), axis=1))
+        return 2.0 * math.sin(math.pi / order) * residual <= slack
+
+    def has_axis(self, origin, axis, order):
+        """Whether `axis` through `origin` is a rotation axis of order `order`."""
+
+        axis = np.asarray(axis, dtype=float)
+        unit = axis / np.linalg.norm(axis)
+        if not self.admissible(origin, unit, order)[0]:
+            return False
+
+        rel = self.geom - np.asarray(origin)
+        cross = np.cross(unit, rel)
+        along = np.outer(rel.dot(unit), unit)
+        for j in range(1, order):
+            theta = j * 2.0 * math.pi / order
+            image = math.cos(theta) * (rel - along) + math.sin(theta) * cross + along + origin
+            if not self.is_symmetric(image):
+                return False
+        return True
+
+    def has_plane(self, origin, uperp):
+        """Whether the plane through `origin` normal to `uperp` is a mirror plane."""
+
+        uperp = np.asarray(uperp, dtype=float)
+        if abs(np.dot(uperp, uperp) - 1.0) < 1.e-10:
+            if not self.admissible(origin, uperp, 2)[0]:
+                return False
+
+        rel = self.geom - np.asarray(origin)
+        image = rel - 2.0 * np.outer(rel.dot(uperp), uperp) + origin
+        return self.is_symmetric(image)
+
+    def has_inversion(self, origin):
+        """Whether `origin` is a center of inversion."""
+
+        return self.is_symmetric(2.0 * np.asarray(origin) - self.geom)
+
+
+def equidistant_pairs(rel, labels, tol, inclusive):
+    """Yields, for each atom *i* in turn, the array of atoms *j* with
+    j < i (j <= i if `inclusive`) that share the label of *i* and lie the
+    same distance from the origin of positions `rel`, within `tol`. These
+    are the atom pairs from which candidate symmetry elements are built.
+
+    """
+    sqnorm = np.sum(np.square(rel), axis=1)
+    for i in range(rel.shape[0]):
+        js = np.arange(i + 1 if inclusive else i)
+        js = js[(labels[js] == labels[i]) & (np.abs(sqnorm[i] - sqnorm[js]) <= tol)]
+        yield i, js
@@ -40,6 +40,7 @@ from ..vecutil import *
 from ..exceptions import *
 from .libmintscoordentry import NumberValue, VariableValue, CartesianEntry, ZMatrixEntry
 from .libmintspointgrp import SymmOps, similar, SymmetryOperation, PointGroup
+from .atomlocator import AtomLocator, equidistant_pairs
 
 
 LINEAR_A_TOL = 1.0E-2  # When sin(a) is below this, we consider the angle to be linear
@@ -117,8 +118,9 @@ class LibmintsMolecule():
         # A listing of the variables used to define the geometries
         self.geometry_variables = {}
 
-        # Limited lifetime efficiency boost
-        self.wholegeom = None
+        # Geometry arrays in Bohr ('atoms', 'full_atoms') of current coordinates. Cleared
+        #   by _invalidate_geometry() on any change to coordinates, units, or atom lists
+        self._geometry_cache = {}
 
         # <<< Fragmentation >>>
 
@@ -326,6 +328,7 @@ class LibmintsMolecule():
             self.PYinput_units_to_au = 1.0
         else:
             raise ValidationError("""Molecule::set_units: argument must be 'Angstrom' or 'Bohr'.""")
+        self._invalidate_geometry()
 
     def input_units_to_au(self):
         """Gets the geometry unit conversion."""
@@ -336,6 +339,7 @@ class LibmintsMolecule():
 
         if abs(conv - self.PYinput_units_to_au) < 0.05:
             self.PYinput_units_to_au = conv
+            self._invalidate_geometry()
         else:
             raise ValidationError("""No big perturbations to physical constants!""")
 
@@ -391,7 +395,7 @@ class LibmintsMolecule():
         3.17549201425
 
         """
-        return self.input_units_to_au() * self.atoms[atom].compute()[0]
+        return float(self._cached_geometry()[atom, 0])
 
     def y(self, atom):
         """y position of atom (0-indexed) in Bohr
@@ -400,7 +404,7 @@ class LibmintsMolecule():
         -0.706268134631
 
         """
-        return self.input_units_to_au() * self.atoms[atom].compute()[1]
+        return float(self._cached_geometry()[atom, 1])
 
     def z(self, atom):
         """z position of atom (0-indexed) in Bohr
@@ -409,7 +413,7 @@ class LibmintsMolecule():
         -1.43347254509
 
         """
-        return self.input_units_to_au() * self.atoms[atom].compute()[2]
+        return float(self._cached_geometry()[atom, 2])
 
     def xyz(self, atom, np_out=False):
         """Returns a Vector3 with x, y, z position of atom (0-indexed)
@@ -419,7 +423,7 @@ class LibmintsMolecule():
         [3.175492014248769, -0.7062681346308132, -1.4334725450878665]
 
         """
-        xyz = self.input_units_to_au() * np.asarray(self.atoms[atom].compute())
+        xyz = self._cached_geometry()[atom].copy()
         if np_out:
             return xyz
         else:
@@ -619,34 +623,40 @@ class LibmintsMolecule():
     def activate_all_fragments(self):
         """Sets all fragments in the molecule to be active."""
         self.lock_frame = False
+        self._invalidate_geometry()
         for fr in range(self.nfragments()):
             self.fragment_types[fr] = 'Real'
 
     def set_active_fragment(self, fr):
         """Tags fragment index *fr* as composed of real atoms."""
         self.lock_frame = False
+        self._invalidate_geometry()
         self.fragment_types[fr - 1] = 'Real'
 
     def set_active_fragments(self, reals):
         """Tags the fragments in array *reals* as composed of real atoms."""
         self.lock_frame = False
+        self._invalidate_geometry()
         for fr in reals:
             self.fragment_types[fr - 1] = 'Real'
 
     def set_ghost_fragment(self, fr):
         """Tags fragment index *fr* as composed of ghost atoms."""
         self.lock_frame = False
+        self._invalidate_geometry()
         self.fragment_types[fr - 1] = 'Ghost'
 
     def set_ghost_fragments(self, ghosts):
         """Tags the fragments in array *ghosts* as composed of ghost atoms."""
         self.lock_frame = False
+        self._invalidate_geometry()
         for fr in ghosts:
             self.fragment_types[fr - 1] = 'Ghost'
 
     def deactivate_all_fragments(self):
         """Sets all fragments in the molecule to be inactive."""
         self.lock_frame = False
+        self._invalidate_geometry()
         for fr in range(self.nfragments()):
             self.fragment_types[fr] = 'Absent'
 
@@ -1032,6 +1042,7 @@ class LibmintsMolecule():
 
         """
         self.lock_frame = False
+        self._invalidate_geometry()
         self.set_has_cartesian(True)
 
         if label == '':
@@ -1049,6 +1060,7 @@ class LibmintsMolecule():
     # For use with atoms defined with ZMAT or variable values, i.e., not Cartesian and NumberValue
     def add_unsettled_atom(self, Z, anchor, symbol, mass=0.0, charge=0.0, label='', A=-1):
         self.lock_frame = False
+        self._invalidate_geometry()
         numEntries = len(anchor)
         currentAtom = len(self.full_atoms)
 
@@ -1162,10 +1174,7 @@ class LibmintsMolecule():
         if self.natom() == 0:
             return -1
 
-        if self.wholegeom is not None:
-            current_geom = self.wholegeom
-        else:
-            current_geom = self.geometry(np_out=True)
+        current_geom = self._cached_geometry()
         shifted_geom = current_geom - np.asarray(b)
         dist2 = np.sum(np.square(shifted_geom), axis=1)
         distminidx = np.argmin(dist2)
@@ -1202,12 +1211,14 @@ class LibmintsMolecule():
         """
         self.lock_frame = False
         self.geometry_variables[vstr.upper()] = val
+        self._invalidate_geometry()
         print("""Setting geometry variable %s to %f""" % (vstr.upper(), val))
         try:
             self.update_geometry()
         except IncompleteAtomError:
             # Update geometry might have added some atoms, delete them to be safe.
             self.atoms = []
+            self._invalidate_geometry()
         # TODO outfile
 
     def set_geometry_variable(self, vstr, val):
@@ -1239,10 +1250,9 @@ class LibmintsMolecule():
         [[-2.930978460188563, -0.21641143673806384, 0.0], [-3.655219780069251, 1.4409218455037016, 0.0], [-1.1332252981904638, 0.0769345303220403, 0.0], [2.5523113582286716, 0.21064588230662976, 0.0], [3.175492014248769, -0.7062681346308132, -1.4334725450878665], [3.175492014248769, -0.7062681346308132, 1.4334725450878665]]
 
         """
-        geom = np.asarray([self.atoms[at].compute() for at in range(self.natom())])
-        geom *= self.input_units_to_au()
+        geom = self._cached_geometry()
         if np_out:
-            return geom
+            return geom.copy()
         else:
             return geom.tolist()
 
@@ -1253,13 +1263,34 @@ class LibmintsMolecule():
         [[-2.930978460188563, -0.21641143673806384, 0.0], [-3.655219780069251, 1.4409218455037016, 0.0], [-1.1332252981904638, 0.0769345303220403, 0.0], [0.0, 0.0, 0.0], [2.5523113582286716, 0.21064588230662976, 0.0], [3.175492014248769, -0.7062681346308132, -1.4334725450878665], [3.175492014248769, -0.7062681346308132, 1.4334725450878665]]
 
         """
-        geom = np.asarray([self.full_atoms[at].compute() for at in range(self.nallatom())])
-        geom *= self.input_units_to_au()
+        geom = self._cached_geometry(full=True)
         if np_out:
-            return geom
+            return geom.copy()
         else:
             return geom.tolist()
 
+    def _cached_geometry(self, full=False):
+        """Returns read-only (dummies included if *full*) geometry array in
+        Bohr, computed from the CoordEntry-s only when not already at hand.
+
+        """
+        key = 'full_atoms' if full else 'atoms'
+        geom = self._geometry_cache.get(key)
+        if geom is None:
+            atoms = self.full_atoms if full else self.atoms
+            geom = np.array([atom.compute() for atom in atoms], dtype=float).reshape(-1, 3)
+            geom *= self.input_units_to_au()
+            geom.flags.writeable = False
+            self._geometry_cache[key] = geom
+        return geom
+
+    def _invalidate_geometry(self):
+        """Forgets cached geometry arrays. Called on any change to
+        coordinates, units, fragments, or atom lists.
+
+        """
+        self._geometry_cache = {}
+
     def set_geometry(self, geom):
         """Sets the geometry, given a N X 3 array of coordinates *geom* in Bohr.
 
@@ -1271,6 +1302,7 @@ class LibmintsMolecule():
             self.atoms[at].set_coordinates(geom[at][0] / self.input_units_to_au(),
                                            geom[at][1] / self.input_units_to_au(),
                                            geom[at][2] / self.input_units_to_au())
+        self._invalidate_geometry()
 
     def set_full_geometry(self, geom):
         """Sets the full geometry (dummies included), given a N X 3 array of coordinates *geom* in Bohr.
@@ -1283,6 +1315,7 @@ class LibmintsMolecule():
             self.full_atoms[at].set_coordinates(geom[at][0] / self.input_units_to_au(),
                                                 geom[at][1] / self.input_units_to_au(),
                                                 geom[at][2] / self.input_units_to_au())
+        self._invalidate_geometry()
 
     def distance_matrix(self):
         """Computes a matrix depicting distances between atoms. Prints
@@ -1299,7 +1332,8 @@ class LibmintsMolecule():
           [6]         3.32935     3.86422     2.43843     0.95895     1.51712     0.00000
 
         """
-        distm = qcel.util.distance_matrix(self.geometry(np_out=True), self.geometry(np_out=True))
+        geom = self.geometry(np_out=True)
+        distm = qcel.util.distance_matrix(geom, geom)
         distm *= qcel.constants.bohr2angstroms
 
         text = "        Interatomic Distances (Angstroms)\n\n          "
@@ -1312,7 +1346,7 @@ class LibmintsMolecule():
                 if j > i:
                     continue
                 else:
-                    text += '%10.5f  ' % (distm(i, j))
+                    text += '%10.5f  ' % (distm[i, j])
             text += "\n"
         text += "\n\n"
         print(text)
@@ -1505,6 +1539,7 @@ class LibmintsMolecule():
                 self.full_atoms[at].set_ghosted(self.fragment_types[fr] == 'Ghost')
                 if self.full_atoms[at].symbol() != 'X':
                     self.atoms.append(self.full_atoms[at])
+        self._invalidate_geometry()
 
         # TODO: This is a hack to ensure that set_multiplicity and set_molecular_charge
         #   work for single-fragment molecules.
@@ -1550,7 +1585,6 @@ class LibmintsMolecule():
             self.move_to_com()
         #print("after com:")
         #self.print_full()
-        self.wholegeom = self.geometry(np_out=True)
 
         # If the no_reorient command was given, don't reorient
         if not self.PYfix_orientation:
@@ -1563,12 +1597,10 @@ class LibmintsMolecule():
             self.rotate_full(frame)
             #print("after rotate:")
             #self.print_full()
-            self.wholegeom = self.geometry(np_out=True)
 
         # Recompute point group of the molecule, so the symmetry info is updated to the new frame
         self.set_point_group(self.find_point_group())
         self.set_full_point_group()
-        self.wholegeom = self.geometry(np_out=True)
 
         # Disabling symmetrize for now if orientation is fixed, as it is not
         #   correct.  We may want to fix this in the future, but in some cases of
@@ -1578,7 +1610,6 @@ class LibmintsMolecule():
         #print("after symmetry:")
         #self.print_full()
 
-        self.wholegeom = None
         self.lock_frame = True
 
     # <<< Methods for Miscellaneous >>>
@@ -1588,6 +1619,33 @@ class LibmintsMolecule():
         self.lock_frame = False
         self.atoms = []
         self.full_atoms = []
+        self._invalidate_geometry()
+
+    def _nuclear_pairs(self):
+        """Pairwise arrays over atoms for nuclear repulsion and its derivatives.
+        Ghosts carry zero charge and absent fragments no atoms, so pairs
+        involving either (and self pairs) drop out through a zero `ZZ`.
+
+        Returns
+        -------
+        dxyz : ndarray
+            (nat, nat, 3) displacements r_i - r_j in Bohr.
+        rinv : ndarray
+            (nat, nat) inverse distances, zero where `ZZ` is zero.
+        ZZ : ndarray
+            (nat, nat) nuclear charge products, zero on the diagonal.
+
+        """
+        geom = self.geometry(np_out=True)
+        Z = np.array([self.Z(at) for at in range(self.natom())], dtype=float)
+
+        dxyz = geom[:, None, :] - geom[None, :, :]
+        ZZ = np.outer(Z, Z)
+        np.fill_diagonal(ZZ, 0.0)
+        dist = np.sqrt(np.einsum('ijk,ijk->ij', dxyz, dxyz))
+        rinv = np.divide(1.0, dist, out=np.zeros_like(dist), where=(ZZ != 0.0))
+
+        return dxyz, rinv, ZZ
 
     def nuclear_repulsion_energy(self):
         """Computes nuclear repulsion energy.
@@ -1596,40 +1654,45 @@ class LibmintsMolecule():
         36.6628478528
 
         """
-        e = 0.0
-        for at1 in range(self.natom()):
-            for at2 in range(self.natom()):
-                if at2 < at1:
-                    Zi = self.Z(at1)
-                    Zj = self.Z(at2)
-                    dist = distance(self.xyz(at1), self.xyz(at2))
-                    e += Zi * Zj / dist
-        return e
+        dxyz, rinv, ZZ = self._nuclear_pairs()
+        return 0.5 * float(np.sum(ZZ * rinv))
 
-    def nuclear_repulsion_energy_deriv1(self):
-        """Computes nuclear repulsion energy derivatives
+    def nuclear_repulsion_energy_deriv1(self, np_out=False):
+        """Computes nuclear repulsion energy derivatives as (nat, 3) array
 
         >>> print(H2OH2O.nuclear_repulsion_energy_deriv1())
         [[3.9020946901323774, 2.76201566471991, 0.0], [1.3172905807089021, -2.3486366050337293, 0.0], [-1.8107598525022435, -0.32511212499256564, 0.0], [-1.217656141385739, -2.6120090867576717, 0.0], [-1.0954846384766488, 1.2618710760320282, 2.1130743287465603], [-1.0954846384766488, 1.2618710760320282, -2.1130743287465603]]
 
         """
-        de = []
-        for i in range(self.natom()):
-            entry = [0.0, 0.0, 0.0]
-            for j in range(self.natom()):
-                if i != j:
-                    temp = distance(self.xyz(i), self.xyz(j)) ** 3.0
-                    Zi = self.Z(i)
-                    Zj = self.Z(j)
-                    entry[0] -= (self.x(i) - self.x(j)) * Zi * Zj / temp
-                    entry[1] -= (self.y(i) - self.y(j)) * Zi * Zj / temp
-                    entry[2] -= (self.z(i) - self.z(j)) * Zi * Zj / temp
-            de.append(entry)
-        return de
-
-    def nuclear_repulsion_energy_deriv2(self):
-        """ **NYI** Computes nuclear repulsion energy second derivatives"""
-        raise FeatureNotImplemented('Molecule::nuclear_repulsion_energy_deriv2')  # FINAL
+        dxyz, rinv, ZZ = self._nuclear_pairs()
+        de = -np.einsum('ij,ijk->ik', ZZ * rinv**3, dxyz)
+        if np_out:
+            return de
+        else:
+            return de.tolist()
+
+    def nuclear_repulsion_energy_deriv2(self, np_out=False):
+        """Computes nuclear repulsion energy second derivatives as (3 * nat, 3 * nat) array
+
+        >>> print(H2OH2O.nuclear_repulsion_energy_deriv2(np_out=True).shape)
+        (18, 18)
+
+        """
+        nat = self.natom()
+        dxyz, rinv, ZZ = self._nuclear_pairs()
+
+        # pair blocks d2(ZiZj/r)/dri dri = ZiZj (3 r r^T / r^5 - 1 / r^3)
+        T = 3.0 * np.einsum('ij,ija,ijb->ijab', ZZ * rinv**5, dxyz, dxyz)
+        T -= np.einsum('ij,ab->ijab', ZZ * rinv**3, np.eye(3))
+
+        H = -T
+        H[np.arange(nat), np.arange(nat)] = T.sum(axis=1)
+        H = H.transpose(0, 2, 1, 3).reshape(3 * nat, 3 * nat)
+
+        if np_out:
+            return H
+        else:
+            return H.tolist()
 
     def set_basis_all_atoms(self, name, role="BASIS"):
         """Assigns basis *name* to all atoms."""
@@ -1723,6 +1786,7 @@ class LibmintsMolecule():
             temp = add(temp, r)
             temp = scale(temp, 1.0 / self.input_units_to_au())
             self.full_atoms[at].set_coordinates(temp[0], temp[1], temp[2])
+        self._invalidate_geometry()
 
     def center_of_mass(self):
         """Computes center of mass of molecule (does not translate molecule).
@@ -1944,6 +2008,7 @@ class LibmintsMolecule():
                     self.full_atoms[at].set_ghosted(self.fragment_types[fr] == 'Ghost')
                     if self.full_atoms[at].symbol() != 'X':
                         self.atoms.append(self.full_atoms[at])
+            self._invalidate_geometry()
         else:  # release orientation to be free
             self.PYfix_orientation = False
 
@@ -2302,46 +2367,41 @@ class LibmintsMolecule():
                     self.PYfull_pg_n = Cn_z
         return
 
+    def _atom_locator(self, tol):
+        """Returns AtomLocator over the current geometry, with atoms
+        labeled by equivalence class, at tolerance *tol*.
+
+        """
+        labels = []
+        representatives = []
+        for at in range(self.natom()):
+            for label, rep in enumerate(representatives):
+                if self.atoms[rep].is_equivalent_to(self.atoms[at]):
+                    labels.append(label)
+                    break
+            else:
+                labels.append(len(representatives))
+                representatives.append(at)
+
+        return AtomLocator(self._cached_geometry(), labels, tol)
+
     def has_inversion(self, origin, tol=DEFAULT_SYM_TOL):
         """Does the molecule have an inversion center at origin
 
         """
-        geom = self.geometry(np_out=True)
-        inverted = 2. * np.asarray(origin) - geom
-        for at in range(self.natom()):
-            atom = self.atom_at_position(inverted[at], tol)
-            if atom < 0 or not self.atoms[atom].is_equivalent_to(self.atoms[at]):
-                return False
-        return True
+        return self._atom_locator(tol).has_inversion(origin)
 
     def is_plane(self, origin, uperp, tol=DEFAULT_SYM_TOL):
         """Is a plane?
 
         """
-        for i in range(self.natom()):
-            A = sub(self.xyz(i), origin)
-            Apar = scale(uperp, dot(uperp, A))
-            Aperp = sub(A, Apar)
-            A = add(sub(Aperp, Apar), origin)
-            atom = self.atom_at_position(A, tol)
-            if atom < 0 or not self.atoms[atom].is_equivalent_to(self.atoms[i]):
-                return False
-        return True
+        return self._atom_locator(tol).has_plane(origin, uperp)
 
     def is_axis(self, origin, axis, order, tol=DEFAULT_SYM_TOL):
         """Is *axis* an axis of order *order* with respect to *origin*?
 
         """
-        for i in range(self.natom()):
-            A = sub(self.xyz(i), origin)
-            for j in range(1, order):
-                R = A
-                R = rotate(R, j * 2.0 * math.pi / order, axis)
-                R = add(R, origin)
-                atom = self.atom_at_position(R, tol)
-                if atom < 0 or not self.atoms[atom].is_equivalent_to(self.atoms[i]):
-                    return False
-        return True
+        return self._atom_locator(tol).has_axis(origin, axis, order)
 
     def is_linear_planar(self, tol=DEFAULT_SYM_TOL):
         """Is the molecule linear, or planar?
@@ -2498,29 +2558,16 @@ class LibmintsMolecule():
             SymmetryOperation.sigma_yz]
 
         symop = SymmetryOperation()
-        matching_atom = -1
+        locator = self._atom_locator(tol)
 
         # Only needs to detect the 8 symmetry operations
         for g in range(7):
 
             # Call the function pointer
             symm_func[g](symop)
-            found = True
-
-            for at in range(self.natom()):
-                op = [symop[0][0], symop[1][1], symop[2][2]]
-                pos = naivemult(self.xyz(at), op)
+            op = [symop[0][0], symop[1][1], symop[2][2]]
 
-                matching_atom = self.atom_at_position(pos, tol)
-                if matching_atom >= 0:
-                    if not self.atoms[at].is_equivalent_to(self.atoms[matching_atom]):
-                        found = False
-                        break
-                else:
-                    found = False
-                    break
-
-            if found:
+            if locator.is_symmetric(locator.geom * op):
                 pg_bits |= symm_bit[g]
 
         return PointGroup(pg_bits)
@@ -2534,12 +2581,9 @@ class LibmintsMolecule():
 
         """
         com = self.center_of_mass()
-        if self.wholegeom is not None:
-            current_geom = self.wholegeom
-        else:
-            current_geom = self.geometry(np_out=True)
-        shifted_geom = current_geom - np.asarray(com)
-        shifted_geom = shifted_geom.tolist()
+        locator = self._atom_locator(tol)
+        shifted = locator.geom - np.asarray(com)
+        shifted_geom = shifted.tolist()
 
         worldxaxis = [1.0, 0.0, 0.0]
         worldyaxis = [0.0, 1.0, 0.0]
@@ -2551,7 +2595,7 @@ class LibmintsMolecule():
         c2axisperp = [0.0, 0.0, 0.0]
 
         linear, planar = self.is_linear_planar(tol)
-        have_inversion = self.has_inversion(com, tol)
+        have_inversion = locator.has_inversion(com)
 
         # check for C2 axis
         have_c2axis = False
@@ -2581,24 +2625,18 @@ class LibmintsMolecule():
                     break
 
         else:
-            # loop through pairs of atoms to find c2 axis candidates
-            for i in range(self.natom()):
-                A = shifted_geom[i]
-                AdotA = dot(A, A)
-                for j in range(i + 1):
-                    # the atoms must be identical
-                    if not self.atoms[i].is_equivalent_to(self.atoms[j]):
-                        continue
-                    B = shifted_geom[j]
-                    # the atoms must be the same distance from the com
-                    if math.fabs(AdotA - dot(B, B)) > tol:
-                        continue
-                    axis = add(A, B)
-                    # atoms colinear with the com don't work
-                    if norm(axis) < tol:
-                        continue
-                    axis = normalize(axis)
-                    if self.is_axis(com, axis, 2, tol):
+            # loop through pairs of identical atoms the same distance from
+            #   the com to find c2 axis candidates
+            for i, js in equidistant_pairs(shifted, locator.labels, tol, inclusive=True):
+                axes = shifted[i] + shifted[js]
+                norms = np.linalg.norm(axes, axis=1)
+                # atoms colinear with the com don't work
+                keep = norms >= tol
+                js = js[keep]
+                js = js[locator.admissible(com, axes[keep] / norms[keep, None], 2)]
+                for j in js:
+                    axis = normalize(add(shifted_geom[i], shifted_geom[j]))
+                    if locator.has_axis(com, axis, 2):
                         have_c2axis = True
                         c2axis = copy.deepcopy(axis)
                         break
@@ -2625,33 +2663,22 @@ class LibmintsMolecule():
                     c2axisperp = perp_unit(c2axis, [0.0, 0.0, 1.0])
 
             else:
-                # loop through paris of atoms to find c2 axis candidates
-                for i in range(self.natom()):
-                    A = sub(self.xyz(i), com)
-                    AdotA = dot(A, A)
-                    for j in range(i):
-                        # the atoms must be identical
-                        if not self.atoms[i].is_equivalent_to(self.atoms[j]):
-                            continue
-                        B = sub(self.xyz(j), com)
-                        # the atoms must be the same distance from the com
-                        if math.fabs(AdotA - dot(B, B)) > tol:
-                            continue
-                        axis = add(A, B)
-                        # atoms colinear with the com don't work
-                        if norm(axis) < tol:
-                            continue
-                        axis = normalize(axis)
-                        # if axis is not perp continue
-                        if math.fabs(dot(axis, c2axis)) > tol:
-                            continue
-                        if self.is_axis(com, axis, 2, tol):
+                # loop through paris of atoms to find c2 axis candidates.
+                #   only the first candidate perp to c2axis is tried
+                for i, js in equidistant_pairs(shifted, locator.labels, tol, inclusive=False):
+                    axes = shifted[i] + shifted[js]
+                    norms = np.linalg.norm(axes, axis=1)
+                    # atoms colinear with the com don't work
+                    keep = norms >= tol
+                    js = js[keep]
+                    # if axis is not perp continue
+                    js = js[np.abs((axes[keep] / norms[keep, None]).dot(c2axis)) <= tol]
+                    if js.size:
+                        axis = normalize(add(shifted_geom[i], shifted_geom[js[0]]))
+                        if locator.has_axis(com, axis, 2):
                             have_c2axisperp = True
                             c2axisperp = copy.deepcopy(axis)
                         break
-                    else:
-                        continue
-                    break
 
         # symmframe found c2axisperp
         if have_c2axisperp:
@@ -2694,29 +2721,23 @@ class LibmintsMolecule():
                     sigmav = perp_unit(c2axis, [0.0, 0.0, 1.0])
             else:
                 # loop through pairs of atoms to find sigma v plane candidates
-                for i in range(self.natom()):
-                    A = sub(self.xyz(i), com)
-                    AdotA = dot(A, A)
-                    # the second atom can equal i because i might be in the plane
-                    for j in range(i + 1):
-                        # the atoms must be identical
-                        if not self.atoms[i].is_equivalent_to(self.atoms[j]):
-                            continue
-                        B = sub(self.xyz(j), com)
-                        # the atoms must be the same distance from the com
-                        if math.fabs(AdotA - dot(B, B)) > tol:
-                            continue
-                        inplane = add(B, A)
-                        norm_inplane = norm(inplane)
-                        if norm_inplane < tol:
-                            continue
-                        inplane = scale(inplane, 1.0 / norm_inplane)
+                #   the second atom can equal i because i might be in the plane
+                for i, js in equidistant_pairs(shifted, locator.labels, tol, inclusive=True):
+                    inplanes = shifted[js] + shifted[i]
+                    norms = np.linalg.norm(inplanes, axis=1)
+                    keep = norms >= tol
+                    js = js[keep]
+                    perps = np.cross(c2axis, inplanes[keep] / norms[keep, None])
+                    norms = np.linalg.norm(perps, axis=1)
+                    keep = norms >= tol
+                    js = js[keep]
+                    js = js[locator.admissible(com, perps[keep] / norms[keep, None], 2)]
+                    for j in js:
+                        inplane = add(shifted_geom[j], shifted_geom[i])
+                        inplane = scale(inplane, 1.0 / norm(inplane))
                         perp = cross(c2axis, inplane)
-                        norm_perp = norm(perp)
-                        if norm_perp < tol:
-                            continue
-                        perp = scale(perp, 1.0 / norm_perp)
-                        if self.is_plane(com, perp, tol):
+                        perp = scale(perp, 1.0 / norm(perp))
+                        if locator.has_plane(com, perp):
                             have_sigmav = True
                             sigmav = copy.deepcopy(perp)
                             break
@@ -2754,24 +2775,16 @@ class LibmintsMolecule():
                         break
             else:
                 # loop through pairs of atoms to contruct trial planes
-                for i in range(self.natom()):
-                    A = sub(self.xyz(i), com)
-                    AdotA = dot(A, A)
-                    for j in range(i):
-                        # the atoms must be identical
-                        if not self.atoms[i].is_equivalent_to(self.atoms[j]):
-                            continue
-                        B = sub(self.xyz(j), com)
-                        BdotB = dot(B, B)
-                        # the atoms must be the same distance from the com
-                        if math.fabs(AdotA - BdotB) > tol:
-                            continue
-                        perp = sub(B, A)
-                        norm_perp = norm(perp)
-                        if norm_perp < tol:
-                            continue
-                        perp = scale(perp, 1.0 / norm_perp)
-                        if self.is_plane(com, perp, tol):
+                for i, js in equidistant_pairs(shifted, locator.labels, tol, inclusive=False):
+                    perps = shifted[js] - shifted[i]
+                    norms = np.linalg.norm(perps, axis=1)
+                    keep = norms >= tol
+                    js = js[keep]
+                    js = js[locator.admissible(com, perps[keep] / norms[keep, None], 2)]
+                    for j in js:
+                        perp = sub(shifted_geom[j], shifted_geom[i])
+                        perp = scale(perp, 1.0 / norm(perp))
+                        if locator.has_plane(com, perp):
                             have_sigma = True
                             sigma = copy.deepcopy(perp)
                             break
@@ -2884,41 +2897,40 @@ class LibmintsMolecule():
         self.equiv.append([0])
 
         ct = self.point_group().char_table()
-        so = SymmetryOperation()
-        np3 = [0.0, 0.0, 0.0]
 
-        current_geom = self.geometry(np_out=False)
+        current_geom = self._cached_geometry()
         current_Z = [self.Z(at) for at in range(self.natom())]
         current_mass = [self.mass(at) for at in range(self.natom())]
+
+        # Apply all symmetry ops in the group to all atoms and locate the images
+        locator = AtomLocator(current_geom, [0] * self.natom(), tol)
+        images = []
+        for g in range(ct.order()):
+            so = ct.symm_operation(g)
+            so = np.array([[so[ii][jj] for jj in range(3)] for ii in range(3)])
+            images.append(locator.locate(current_geom.dot(so.T)))
+        unique_of = [None] * self.natom()
+        unique_of[0] = 0
+
         # Find the equivalent atoms
         for i in range(1, self.natom()):
-            ac = current_geom[i]
             i_is_unique = True
             i_equiv = 0
 
-            # Apply all symmetry ops in the group to the atom
+            # See if each transformed atom is equivalent to a unique atom
             for g in range(ct.order()):
-                so = ct.symm_operation(g)
-                for ii in range(3):
-                    np3[ii] = 0
-                    for jj in range(3):
-                        np3[ii] += so[ii][jj] * ac[jj]
-
-                # See if the transformed atom is equivalent to a unique atom
-                for j in range(self.PYnunique):
-                    unique = self.equiv[j][0]
-                    aj = current_geom[unique]
-                    if current_Z[unique] == current_Z[i] and \
-                        abs(current_mass[unique] - current_mass[i]) < tol and \
-                        distance(np3, aj) < tol:
-                        i_is_unique = False
-                        i_equiv = j
-                        break
+                unique = images[g][i]
+                if unique >= 0 and unique_of[unique] is not None and \
+                    current_Z[unique] == current_Z[i] and \
+                    abs(current_mass[unique] - current_mass[i]) < tol:
+                    i_is_unique = False
+                    i_equiv = unique_of[unique]
 
             if i_is_unique:
                 self.nequiv.append(1)
                 self.PYatom_to_unique[i] = self.PYnunique
                 self.equiv.append([i])
+                unique_of[i] = self.PYnunique
                 self.PYnunique += 1
 
             else:
@@ -2978,7 +2990,6 @@ class LibmintsMolecule():
 
         """
         #raise FeatureNotImplemented('Molecule::symmetrize')  # FINAL SYMM
-        temp = zero(self.natom(), 3)
         ct = self.point_group().char_table()
 
         # Obtain atom mapping of atom * symm op to atom
@@ -2988,22 +2999,18 @@ class LibmintsMolecule():
         else:
             atom_map = compute_atom_map(self)
 
-        # Symmetrize the molecule to remove any noise
-        for at in range(self.natom()):
-            for g in range(ct.order()):
-                Gatom = atom_map[at][g]
-                so = ct.symm_operation(g)
-
-                # Full so must be used if molecule is not in standard orientation
-                temp[at][0] += so[0][0] * self.x(Gatom) / ct.order()
-                temp[at][0] += so[0][1] * self.y(Gatom) / ct.order()
-                temp[at][0] += so[0][2] * self.z(Gatom) / ct.order()
-                temp[at][1] += so[1][0] * self.x(Gatom) / ct.order()
-                temp[at][1] += so[1][1] * self.y(Gatom) / ct.order()
-                temp[at][1] += so[1][2] * self.z(Gatom) / ct.order()
-                temp[at][2] += so[2][0] * self.x(Gatom) / ct.order()
-                temp[at][2] += so[2][1] * self.y(Gatom) / ct.order()
-                temp[at][2] += so[2][2] * self.z(Gatom) / ct.order()
+        # Symmetrize the molecule to remove any noise, all atoms at once
+        geom = self._cached_geometry()
+        atom_map = np.asarray(atom_map, dtype=int).reshape(-1, ct.order())
+        temp = np.zeros((self.natom(), 3))
+        for g in range(ct.order()):
+            Ggeom = geom[atom_map[:, g]]
+            so = ct.symm_operation(g)
+
+            # Full so must be used if molecule is not in standard orientation
+            for ii in range(3):
+                for jj in range(3):
+                    temp[:, ii] += so[ii][jj] * Ggeom[:, jj] / ct.order()
 
         # Set the geometry to ensure z-matrix variables get updated
         self.set_geometry(temp)
@@ -3016,26 +3023,14 @@ class LibmintsMolecule():
         """Check if current geometry fits current point group
 
         """
-        np3 = [0.0, 0.0, 0.0]
         ct = self.point_group().char_table()
 
-        # loop over all centers
-        for at in range(self.natom()):
-            ac = self.xyz(at)
-
-            # For each operation in the pointgroup, transform the coordinates of
-            #   center "at" and see which atom it maps into
-            for g in range(ct.order()):
-                so = ct.symm_operation(g)
-
-                for ii in range(3):
-                    np3[ii] = 0
-                    for jj in range(3):
-                        np3[ii] += so[ii][jj] * ac[jj]
-
-                if self.atom_at_position(np3, tol) < 0:
-                    return False
-        return True
+        # transform the coordinates of all centers by all operations in the
+        #   pointgroup at once and see whether each maps into an atom
+        geom = self._cached_geometry()
+        images = symmetry_images(geom, [ct.symm_operation(g) for g in range(ct.order())])
+        locator = AtomLocator(geom, [0] * self.natom(), tol)
+        return bool(np.all(locator.locate(images.reshape(-1, 3)) >= 0))
 
     # provide a more transparent name for this utility
     is_symmetric = valid_atom_map
@@ -3262,35 +3257,39 @@ def compute_atom_map(mol, tol=0.05):
 
     natom = mol.natom()
     ng = ct.order()
-    atom_map = [0] * natom
-    for i in range(natom):
-        atom_map[i] = [0] * ng
 
-    np3 = [0.0, 0.0, 0.0]
-    so = SymmetryOperation()
+    # transform the coordinates of all centers by all symops in the pointgroup
+    #   at once and see which atom each maps into
+    geom = mol._cached_geometry()
+    images = symmetry_images(geom, [ct.symm_operation(g) for g in range(ng)])
+    atom_map = AtomLocator(geom, [0] * natom, tol).locate(images.reshape(-1, 3)).reshape(natom, ng)
 
-    # loop over all centers
-    for i in range(natom):
-        ac = mol.xyz(i)
+    unmapped = np.argwhere(atom_map < 0)
+    if unmapped.size:
+        i, g = unmapped[0]
+        np3 = images[i, g]
+        print("""  Molecule:\n""")
+        mol.print_out()
+        print("""  attempted to find atom at\n""")
+        print("""    %lf %lf %lf\n""" % (np3[0], np3[1], np3[2]))
+        raise ValidationError("ERROR: Symmetry operation %d did not map atom %d to another atom:\n" % (g, i + 1))
 
-        # then for each symop in the pointgroup, transform the coordinates of
-        #   center "i" and see which atom it maps into
-        for g in range(ng):
-            so = ct.symm_operation(g)
+    return atom_map.tolist()
 
-            for ii in range(3):
-                np3[ii] = 0
-                for jj in range(3):
-                    np3[ii] += so[ii][jj] * ac[jj]
-            atom_map[i][g] = mol.atom_at_position(np3, tol)
-            if atom_map[i][g] < 0:
-                print("""  Molecule:\n""")
-                mol.print_out()
-                print("""  attempted to find atom at\n""")
-                print("""    %lf %lf %lf\n""" % (np3[0], np3[1], np3[2]))
-                raise ValidationError("ERROR: Symmetry operation %d did not map atom %d to another atom:\n" % (g, i + 1))
-
-    return atom_map
+
+def symmetry_images(geom, symmops):
+    """Returns (nat, ng, 3) array of the positions (nat, 3) `geom` under
+    each of the SymmetryOperation-s `symmops`, summed term by term as in
+    applying one operation to one atom at a time.
+
+    """
+    geom = np.asarray(geom, dtype=float).reshape(-1, 3)
+    ops = np.array([so.d for so in symmops], dtype=float).reshape(-1, 3, 3)
+
+    images = np.zeros((geom.shape[0], ops.shape[0], 3))
+    for jj in range(3):
+        images += ops[None, :, :, jj] * geom[:, None, None, jj]
+    return images
 
 
 
@@ -290,11 +290,7 @@ class Molecule(LibmintsMolecule):
         instance.fragment_charges.append(instance.molecular_charge())
         instance.fragment_multiplicities.append(instance.multiplicity())
         # Set the units properly
-        instance.PYunits = fileUnits
-        if fileUnits == 'Bohr':
-            instance.PYinput_units_to_au = 1.0
-        elif fileUnits == 'Angstrom':
-            instance.PYinput_units_to_au = 1.0 / qcel.constants.bohr2angstroms
+        instance.set_units(fileUnits)
 
         instance.update_geometry()
         return instance
@@ -1325,7 +1321,7 @@ class Molecule(LibmintsMolecule):
             prec=prec)
         return smol
 
-    def run_dftd3(self, func=None, dashlvl=None, dashparam=None, dertype=None, verbose=1):
+    def run_dftd3(self, func=None, dashlvl=None, dashparam=None, dertype=None, verbose=1, engine='dftd3'):
         """Compute dispersion correction via Grimme's DFTD3 program.
 
         Parameters
@@ -1350,6 +1346,10 @@ class Molecule(LibmintsMolecule):
             efficient. Influences return values, see below.
         verbose : int, optional
             Amount of printing.
+        engine : {'dftd3', 'numpy'}, optional
+            Whether to run the DFTD3 executable through QCEngine or to
+            compute in-process through :py:mod:`qcdb.intf_dftd3.native`
+            (d3zero and d3bj only), avoiding a process launch per call.
 
         Returns
         -------
@@ -1368,23 +1368,42 @@ class Molecule(LibmintsMolecule):
         else:
             derint, derdriver = parse_dertype(dertype, max_derivative=1)
 
-        resinp = {
-            'schema_name': 'qcschema_input',
-            'schema_version': 1,
-            'molecule': self.to_schema(dtype=2),
-            'driver': derdriver,
-            'model': {
-                'method': func,
-                'basis': '(auto)',
-            },
-            'keywords': {
-                'level_hint': dashlvl,
-                'params_tweaks': dashparam,
-                'verbose': verbose,
-            },
-        }
-        jobrec = qcng.compute(resinp, 'dftd3', raise_error=True)
-        jobrec = jobrec.dict()
+        if engine == 'numpy':
+            from ..intf_dftd3 import runner
+
+            # split combined name like blyp-d3(bj) and resolve formal levels like d3(bj)
+            if dashlvl is None and func is not None and '-' in func:
+                func, _, dashlvl = func.rpartition('-')
+            dashlvl = {'d3': 'd3zero', 'd3(bj)': 'd3bj'}.get(str(dashlvl).lower(), str(dashlvl).lower())
+
+            jobrec = runner.run_dftd3(self.to_dict(np_out=False), functional=func, dashlevel=dashlvl,
+                                      dashparams=dashparam, dertype=(None if derint == -1 else derint),
+                                      verbose=verbose, engine='numpy')
+            if not jobrec['success']:
+                raise Dftd3Error(jobrec['error'])
+            jobrec = {'extras': {'qcvars': {k: qca.data for k, qca in jobrec['qcvars'].items()}}}
+
+        elif engine == 'dftd3':
+            resinp = {
+                'schema_name': 'qcschema_input',
+                'schema_version': 1,
+                'molecule': self.to_schema(dtype=2),
+                'driver': derdriver,
+                'model': {
+                    'method': func,
+                    'basis': '(auto)',
+                },
+                'keywords': {
+                    'level_hint': dashlvl,
+                    'params_tweaks': dashparam,
+                    'verbose': verbose,
+                },
+            }
+            jobrec = qcng.compute(resinp, 'dftd3', raise_error=True)
+            jobrec = jobrec.dict()
+
+        else:
+            raise ValidationError("""Requested -D engine ({}) not among ('dftd3', 'numpy')""".format(engine))
 
         # hack as not checking type GRAD
         for k, qca in jobrec['extras']['qcvars'].items():
@@ -159,6 +159,27 @@ def load_qcdb_defaults(options):
         default='',
         validator=lambda x: x.lower(),
         glossary= """Select alternate implementations."""))
+
+    options.add('qcdb', RottenOption(
+            keyword='result_cache',
+            default=False,
+            validator=parsers.boolean,
+            glossary="""Do look up and store harvested QCVariables in the on-disk result cache
+      so that a repeated molecule/method/basis/options computation is not rerun?"""))
+
+    options.add('qcdb', RottenOption(
+            keyword='result_cache_dir',
+            default='',
+            validator=lambda x: x,
+            glossary="""Directory of the on-disk result cache. If empty, ``$XDG_CACHE_HOME/qcdb``
+      or ``~/.cache/qcdb``."""))
+
+    options.add('qcdb', RottenOption(
+            keyword='result_cache_size',
+            default='1 gb',
+            validator=parsers.parse_memory_nomin,
+            glossary="""Size bound of the on-disk result cache. Least recently used entries are
+      evicted beyond it."""))
       #/*- Convergence criterion for geometry optmization: rms force
       #(internal coordinates, atomic units). -*/
       #options.add_double("RMS_FORCE_G_CONVERGENCE", 3.0e-4);
@@ -211,6 +232,8 @@ class RottenOptions(object):
 
     def __init__(self):
         self.scroll = collections.defaultdict(dict)
+        # here liveth the keywords of each package whose history reaches beyond the default
+        self._changed = collections.defaultdict(dict)
 
     def __str__(self):
         text = []
@@ -238,9 +261,42 @@ class RottenOptions(object):
     def add(self, package, opt):
         up = package.upper()
         if up in ['QCDB', 'PSI4', 'CFOUR', 'DFTD3', 'NWCHEM', 'GAMESS', 'RESP']:
-            self.scroll[up][opt.keyword] = opt
+            self._adopt(up, opt)
         else:
             raise ValidationError('Domain not supported: {}'.format(package))
+
+    def _adopt(self, package, opt):
+        opt._registry = (self, package, len(self.scroll[package]))
+        self.scroll[package][opt.keyword] = opt
+        opt._touch()
+
+    def _note(self, package, opt):
+        """Files `opt` in or out of the changed-options index."""
+
+        if opt.disputed():
+            self._changed[package][opt.keyword] = opt
+        else:
+            self._changed[package].pop(opt.keyword, None)
+
+    def changed(self, package):
+        """Returns {keyword: RottenOption} of the options in `package` set beyond their
+        defaults (those `disputed()`), in order of addition, without visiting the rest.
+
+        """
+        up = package.upper()
+        return {opt.keyword: opt for opt in sorted(self._changed[up].values(), key=lambda opt: opt._registry[2])}
+
+    def snapshot(self):
+        """Returns copy of `self` that may be set or unwound independently,
+        at a small fraction of the cost of `copy.deepcopy`. Option histories
+        are shared until set, as setting replaces rather than extends them.
+
+        """
+        twin = RottenOptions()
+        for pkg, opts in self.scroll.items():
+            for opt in opts.values():
+                twin._adopt(pkg, opt._twin())
+        return twin
     
     def require(self, package, option, value, accession, verbose=1):
         self._set(True, package, option, value, accession, verbose)
@@ -265,7 +321,8 @@ class RottenOptions(object):
     def unwind_by_accession(self, accession):
         for pkg in self.scroll:
             for ropt, oropt in self.scroll[pkg].items():
-               oropt.history = [entry for entry in oropt.history if entry[3] != accession]
+                if any(entry[3] == accession for entry in oropt.history):
+                    oropt.history = [entry for entry in oropt.history if entry[3] != accession]
             
 
 class RottenOption(object):
@@ -276,6 +333,7 @@ class RottenOption(object):
         self.keyword = keyword.upper()
         self.glossary = glossary
         self.validator = validator
+        self._registry = None  # (RottenOptions, package, rank) once added
         self.history = []  # list of quads (value, required, overlap, accession)
         self.suggest(default, accession=self.mark_of_the_default, verbose=0)
         self.has_changed = False
@@ -302,10 +360,43 @@ class RottenOption(object):
                                         '(' + str(self.history[0][0]) + ')'))
         return '\n'.join(text)
 
-    #@property
-    #def value(self):
+    @property
+    def history(self):
+        return self._history
+
+    @history.setter
+    def history(self, history):
+        self._history = history
+        self._touch()
+
+    def _twin(self):
+        """Returns shallow copy of `self`, history shared."""
+
+        twin = object.__new__(RottenOption)
+        twin.__dict__.update(self.__dict__)
+        return twin
+
+    def _touch(self):
+        """Forgets resolved value and refiles `self` in its RottenOptions' changed index.
+        Called whenever `self.history` is replaced.
+
+        """
+        self._resolved = None
+        if self._registry is not None:
+            options, package, _ = self._registry
+            if options.scroll[package].get(self.keyword) is self:
+                options._note(package, self)
+
     def _compute(self):
-        """The all-important `self.value` is read-only and computed on-the-fly from `self.history`."""
+        """The all-important `self.value` is read-only and computed from
+        `self.history` on first access after the history last changed.
+
+        """
+        if self._resolved is None:
+            self._resolved = self._resolve()
+        return self._resolved
+
+    def _resolve(self):
 
         scores = [cand[2] + 100 * int(cand[1]) for cand in self.history]
         max_score = max(scores)
@@ -387,7 +478,8 @@ class RottenOption(object):
         if accession is None:
             accession = uuid.uuid4()
 
-        self.history.append((self._check(value), imperative, overlap, accession))
+        # replace rather than append so histories shared by snapshots stay put
+        self.history = self.history + [(self._check(value), imperative, overlap, accession)]
 
         if verbose >= 1:
             added = self.history[-1]
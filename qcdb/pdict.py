@@ -13,6 +13,7 @@
 
 from __future__ import absolute_import
 from __future__ import print_function
+import contextlib
 from decimal import Decimal, ROUND_FLOOR, ROUND_CEILING
 
 import numpy as np
@@ -29,12 +30,23 @@ class PreservingDict(dict):
     the same within a plausible rounding error. Allows consistency checks
     when parsing output files without loss of precision.
 
-    works in decimal.Decimal (scalar) and np.ndarray (non-scalar)
+    works in decimal.Decimal (scalar) and np.ndarray (non-scalar). Arrays
+    are stored as given, without copying.
+
+    When `defer` is True (keyword to the constructor, or within a
+    :py:meth:`deferred` block), values set are only staged, and they are
+    converted and validated together upon :py:meth:`reconcile`, which any
+    read of the dictionary calls first. The stored values and any
+    ParsingValidationError are those of setting the values one by one.
 
     """
+    verbose = 1
+    defer = False
+    _staged = None
 
     def __init__(self, *args, **kwargs):
         self.verbose = kwargs.get('verbose', 1)
+        self.defer = kwargs.pop('defer', False)
         self.update(*args, **kwargs)
 
     def __setitem__(self, key, value, accept_places=11):
@@ -43,59 +55,139 @@ class PreservingDict(dict):
         except AttributeError:
             raise AttributeError('Keys stored as upper-case strings: %s unsuitable' % (key))
 
-        if isinstance(value, (list, np.ndarray)):
-            # non-scalar
-            value = np.array(value)
-
-            if key in self.keys() and not 'CURRENT' in key:
-                if np.allclose(self[key], value, atol=1.e-5, rtol=1e-3):
-                    best_value = value  # no way to choose, really
-                else:
-                    raise ParsingValidationError(
-                        """Output file yielded both {} and {} as values for quantity {}.""".
-                            format(self[key], value, key))
-                if self.verbose >= 2:
-                    print("""Resetting array {} to {}""".format(key, best_value))
+        if self.defer:
+            if self._staged is None:
+                self._staged = {}
+            self._staged.setdefault(key, []).append((value, accept_places))
+        else:
+            if self._staged:
+                self.reconcile()
+            self._settle(key, [(value, accept_places)])
+
+    def _settle(self, key, candidates):
+        """Store for `key` the best of its current value (if any) and of
+        `candidates`, a list of (value, accept_places) in order of setting.
+
+        """
+        validate = 'CURRENT' not in key
+        if not validate and self.verbose < 2:
+            # last value set wins without comparison
+            candidates = candidates[-1:]
+
+        best = dict.get(self, key)
+        indx = 0
+        while indx < len(candidates):
+            value, accept_places = candidates[indx]
+
+            if isinstance(value, (list, np.ndarray)):
+                # non-scalar, checked in runs to compare all at once
+                run = [np.asarray(value)]
+                indx += 1
+                while indx < len(candidates) and isinstance(candidates[indx][0], (list, np.ndarray)):
+                    run.append(np.asarray(candidates[indx][0]))
+                    indx += 1
+                best = self._best_array(key, best, run, validate)
+
             else:
-                best_value = value
-                if self.verbose >= 2:
-                    print("""Setting   array {} to {}""".format(key, best_value))
+                # scalar. a value set again unchanged cannot alter the best
+                indx += 1
+                while (indx < len(candidates) and self.verbose < 2 and isinstance(value, str)
+                       and candidates[indx] == (value, accept_places)):
+                    indx += 1
+                best = self._best_scalar(key, best, value, accept_places, validate)
 
-        else:
-            # scalar
-            value = Decimal(value)
-            if abs(float(value)) < 1.e-16:
-                value = Decimal('0')
-
-            if key in self.keys() and not 'CURRENT' in key:
-                # Validate choosing more detailed value for variable
-                existing_exp = self[key].as_tuple().exponent  # 0.1111 --> -4
-                candidate_exp = value.as_tuple().exponent
-                if existing_exp > candidate_exp:  # candidate has more digits
-                    places = Decimal(10) ** (existing_exp + 1)  # exp+1 permits slack in rounding
-                    best_value = value
-                else:                             # existing has more digits
-                    places = Decimal(10) ** (candidate_exp + 1)
-                    best_value = self[key]
-                # Validate values are the same
-                #places = max(places, Decimal('1E-11'))  # for computed psivars
-                places = max(places, Decimal('1E-{}'.format(accept_places)))  # for computed psivars
-                #print('FLOOR: ', self[key].quantize(places, rounding=ROUND_FLOOR) - value.quantize(places, rounding=ROUND_FLOOR))
-                #print('CEIL:  ', self[key].quantize(places, rounding=ROUND_CEILING) - value.quantize(places, rounding=ROUND_CEILING))
-                if ((self[key].quantize(places, rounding=ROUND_CEILING).compare(
-                         value.quantize(places, rounding=ROUND_CEILING)) != 0) and
-                    (self[key].quantize(places, rounding=ROUND_FLOOR).compare(
-                         value.quantize(places, rounding=ROUND_FLOOR)) != 0)):
-                    raise ParsingValidationError(
-                        f"""Output file yielded both {self[key].to_eng_string()} ({candidate_exp}) and {value.to_eng_string()} ({existing_exp}) as values for quantity {key}.""")
-                if self.verbose >= 2:
-                    print("""Resetting variable {} to {}""".format(key, best_value.to_eng_string()))
+        super(PreservingDict, self).__setitem__(key, best)
+
+    def _best_array(self, key, existing, run, validate):
+        """Check successive arrays of `run` against `existing` (or None) and each other."""
+
+        chain = [existing] + run if (validate and existing is not None) else run
+        ok = [True] * (len(chain) - 1)
+        if validate and len(chain) > 1:
+            if all(isinstance(arr, np.ndarray) and arr.shape == chain[0].shape for arr in chain):
+                stack = np.stack(chain)
+                close = np.isclose(stack[:-1], stack[1:], atol=1.e-5, rtol=1e-3)
+                ok = np.all(close.reshape(len(chain) - 1, -1), axis=1)
             else:
-                best_value = value
-                if self.verbose >= 2:
-                    print("""Setting   variable {} to {}""".format(key, best_value.to_eng_string()))
+                ok = [np.allclose(prev, arr, atol=1.e-5, rtol=1e-3) for prev, arr in zip(chain[:-1], chain[1:])]
+
+        for indx in range(1, len(chain)):
+            if not ok[indx - 1]:
+                raise ParsingValidationError(
+                    """Output file yielded both {} and {} as values for quantity {}.""".
+                        format(chain[indx - 1], chain[indx], key))
+        if self.verbose >= 2:
+            for indx, arr in enumerate(run):
+                reset = (existing is not None or indx > 0) and validate
+                print("""{} array {} to {}""".format('Resetting' if reset else 'Setting  ', key, arr))
 
-        super(PreservingDict, self).__setitem__(key, best_value)
+        return run[-1]  # no way to choose, really
+
+    def _best_scalar(self, key, existing, value, accept_places, validate):
+        """Choose between `existing` (or None) and scalar `value` the one of more digits."""
+
+        value = Decimal(value)
+        if abs(float(value)) < 1.e-16:
+            value = Decimal('0')
+
+        if existing is None or not validate:
+            if self.verbose >= 2:
+                print("""Setting   variable {} to {}""".format(key, value.to_eng_string()))
+            return value
+
+        # Validate choosing more detailed value for variable
+        existing_exp = existing.as_tuple().exponent  # 0.1111 --> -4
+        candidate_exp = value.as_tuple().exponent
+        if existing_exp > candidate_exp:  # candidate has more digits
+            places = Decimal(10) ** (existing_exp + 1)  # exp+1 permits slack in rounding
+            best_value = value
+        else:                             # existing has more digits
+            places = Decimal(10) ** (candidate_exp + 1)
+            best_value = existing
+        # Validate values are the same
+        #places = max(places, Decimal('1E-11'))  # for computed psivars
+        places = max(places, Decimal('1E-{}'.format(accept_places)))  # for computed psivars
+        if value != existing and (
+                (existing.quantize(places, rounding=ROUND_CEILING).compare(
+                     value.quantize(places, rounding=ROUND_CEILING)) != 0) and
+                (existing.quantize(places, rounding=ROUND_FLOOR).compare(
+                     value.quantize(places, rounding=ROUND_FLOOR)) != 0)):
+            raise ParsingValidationError(
+                f"""Output file yielded both {existing.to_eng_string()} ({candidate_exp}) and {value.to_eng_string()} ({existing_exp}) as values for quantity {key}.""")
+        if self.verbose >= 2:
+            print("""Resetting variable {} to {}""".format(key, best_value.to_eng_string()))
+
+        return best_value
+
+    def reconcile(self):
+        """Convert and validate all staged values, key by key in order of first setting."""
+
+        staged, self._staged = self._staged, None
+        if staged:
+            for key, candidates in staged.items():
+                self._settle(key, candidates)
+
+    @contextlib.contextmanager
+    def deferred(self):
+        """Context in which values set are staged, to be reconciled at its close."""
+
+        previous = self.defer
+        self.defer = True
+        try:
+            yield self
+        finally:
+            self.defer = previous
+        if not previous:
+            self.reconcile()
+
+    def bulk_update(self, items):
+        """Set all of `items`, an iterable of (key, value) pairs in which
+        keys may repeat, validating them together.
+
+        """
+        with self.deferred():
+            for key, value in items:
+                self[key] = value
 
     def update(self, *args, **kwargs):
         if args:
@@ -103,16 +195,98 @@ class PreservingDict(dict):
                 raise TypeError("update expected at most 1 arguments, "
                                 "got %d" % len(args))
             other = dict(args[0])
-            for key in other:
-                self[key] = other[key]
-        for key in kwargs:
-            self[key] = kwargs[key]
+            self.bulk_update(other.items())
+        self.bulk_update(kwargs.items())
 
     def setdefault(self, key, value=None):
         if key not in self:
             self[key] = value
         return self[key]
 
+    # reads see staged values
+
+    def __getitem__(self, key):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).__getitem__(key)
+
+    def __contains__(self, key):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).__contains__(key)
+
+    def __iter__(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).__iter__()
+
+    def __len__(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).__len__()
+
+    def __repr__(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).__repr__()
+
+    def get(self, key, default=None):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).get(key, default)
+
+    def keys(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).keys()
+
+    def values(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).values()
+
+    def items(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).items()
+
+    def pop(self, *args):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).pop(*args)
+
+    def copy(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).copy()
+
+    def popitem(self):
+        if self._staged:
+            self.reconcile()
+        return super(PreservingDict, self).popitem()
+
+    def __delitem__(self, key):
+        if self._staged:
+            self.reconcile()
+        super(PreservingDict, self).__delitem__(key)
+
+    def clear(self):
+        self._staged = None
+        super(PreservingDict, self).clear()
+
+    def __eq__(self, other):
+        if self._staged:
+            self.reconcile()
+        if isinstance(other, PreservingDict) and other._staged:
+            other.reconcile()
+        return super(PreservingDict, self).__eq__(other)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
 
 if __name__ == '__main__':
     c4info = PreservingDict()
@@ -1,2 +1,3 @@
 from .validator import certify, build_out, get_variable_details
+from .graph import QCVarGraph, wfn_graph, sapt_graph
 from .whatprovides import VARH
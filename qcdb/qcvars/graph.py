@@ -0,0 +1,171 @@
+import heapq
+import functools
+import collections
+
+from .psivardefs import wfn_psivars, sapt_psivars
+
+
+class QCVarGraph():
+    """Rules for deriving QCVariables from one another, compiled once into
+    a graph linking each variable to the rules that consume it and to the
+    rules that form it.
+
+    Parameters
+    ----------
+    rules : list of dict
+        Each with 'form', the variable formed; 'args', the variables (str)
+        and constants it is formed from; and 'func', a function of the
+        list of argument values. As returned by :py:func:`wfn_psivars`.
+
+    """
+
+    def __init__(self, rules):
+        self.rules = [(rule['form'], rule['func'], rule['args']) for rule in rules]
+        self.consumers = collections.defaultdict(list)
+        self.producers = collections.defaultdict(list)
+        self._nargs = []
+
+        for irule, (form, func, args) in enumerate(self.rules):
+            self.producers[form].append(irule)
+            variables = set(arg for arg in args if isinstance(arg, str))
+            for var in variables:
+                self.consumers[var].append(irule)
+            self._nargs.append(len(variables))
+
+    def evaluate(self, qcvars, verbose=1):
+        """Form in `qcvars` every variable derivable from those present.
+
+        Only rules all of whose arguments become available are visited.
+        First, rules are applied in order of listing, each if available
+        by its turn, as a single sweep through the list would. Then, any
+        rules made available only by later ones are applied, so that the
+        result is complete regardless of the order of listing.
+
+        Parameters
+        ----------
+        qcvars : PreservingDict
+            Variables present, updated with those derived.
+        verbose : int, optional
+            Controls print level. Per-var printing with >=2.
+
+        """
+        nmissing = list(self._nargs)
+        ready = [irule for irule, nargs in enumerate(nmissing) if nargs == 0]
+        for var in list(qcvars):
+            for irule in self.consumers.get(var, []):
+                nmissing[irule] -= 1
+                if nmissing[irule] == 0:
+                    ready.append(irule)
+        heapq.heapify(ready)
+
+        late = []
+        last = -1
+        while ready:
+            irule = heapq.heappop(ready)
+            if irule < last:
+                late.append(irule)
+                continue
+            last = irule
+            self._apply(irule, qcvars, ready, nmissing, verbose)
+
+        ready = late
+        heapq.heapify(ready)
+        while ready:
+            self._apply(heapq.heappop(ready), qcvars, ready, nmissing, verbose)
+
+        if verbose >= 2:
+            for irule, (form, func, args) in enumerate(self.rules):
+                if nmissing[irule]:
+                    missing = next(arg for arg in args if isinstance(arg, str) and arg not in qcvars)
+                    print("""building {} {}EMPTY, missing {}""".format(form, '.' * (50 - len(form)), missing))
+
+    def _apply(self, irule, qcvars, ready, nmissing, verbose):
+        form, func, args = self.rules[irule]
+        result = func([qcvars[arg] if isinstance(arg, str) else arg for arg in args])
+
+        newly = form not in qcvars
+        # with data coming from file --> variable, looks more precise than it is. hack
+        qcvars.__setitem__(form, result, 6)
+        if verbose >= 1:
+            print("""building {} {}SUCCESS""".format(form, '.' * (50 - len(form))))
+
+        if newly:
+            for iconsumer in self.consumers.get(form, []):
+                nmissing[iconsumer] -= 1
+                if nmissing[iconsumer] == 0:
+                    heapq.heappush(ready, iconsumer)
+
+    def requires(self, qcvar, available=(), depth=2):
+        """Which variables suffice to derive `qcvar`.
+
+        Parameters
+        ----------
+        qcvar : str
+            Variable to derive.
+        available : iterable of str, optional
+            Variables already at hand, omitted from the answer.
+        depth : int, optional
+            Number of rules to chain in deriving `qcvar`.
+
+        Returns
+        -------
+        list of set
+            Alternative sets of variables, each of which together with
+            `available` suffices, none containing another, smallest first.
+            Empty if `qcvar` can't be derived within `depth` rules.
+
+        Examples
+        --------
+        >>> wfn_graph().requires('SCS-MP2 TOTAL ENERGY', depth=1)
+        [{'HF TOTAL ENERGY', 'SCS-MP2 CORRELATION ENERGY'}]
+
+        """
+        available = frozenset(available)
+        alternatives = set()
+        for irule in self.producers.get(qcvar, []):
+            alternatives |= self._rule_requires(irule, available, frozenset([qcvar]), depth - 1)
+
+        minimal = [alt for alt in alternatives if not any(other < alt for other in alternatives)]
+        return [set(alt) for alt in sorted(minimal, key=lambda alt: (len(alt), sorted(alt)))]
+
+    def _rule_requires(self, irule, available, path, depth):
+        alternatives = {frozenset()}
+        for arg in self.rules[irule][2]:
+            if not isinstance(arg, str) or arg in available:
+                continue
+            if arg in path:
+                return set()
+            options = {frozenset([arg])}
+            if depth > 0:
+                for iproducer in self.producers.get(arg, []):
+                    options |= self._rule_requires(iproducer, available, path | {arg}, depth - 1)
+            alternatives = {alt | opt for alt in alternatives for opt in options}
+        return alternatives
+
+    def inputs(self, qcvar):
+        """Set of all variables from which `qcvar` may in any way be derived."""
+
+        seen = set()
+        stack = [qcvar]
+        while stack:
+            for irule in self.producers.get(stack.pop(), []):
+                for arg in self.rules[irule][2]:
+                    if isinstance(arg, str) and arg not in seen:
+                        seen.add(arg)
+                        stack.append(arg)
+        seen.discard(qcvar)
+        return seen
+
+
+@functools.lru_cache()
+def wfn_graph():
+    """Graph of :py:func:`wfn_psivars` rules, compiled upon first use."""
+
+    return QCVarGraph(wfn_psivars())
+
+
+@functools.lru_cache()
+def sapt_graph():
+    """Graph of :py:func:`sapt_psivars` rules, compiled upon first use."""
+
+    return QCVarGraph([dict(action, form=form) for form, action in sapt_psivars().items()])
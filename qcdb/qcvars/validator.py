@@ -5,7 +5,7 @@ from qcelemental import Datum
 from ..exceptions import *
 from ..pdict import PreservingDict
 from .glossary import qcvardefs
-from .psivardefs import wfn_psivars
+from .graph import wfn_graph
 
 
 def certify(dicary, plump=False, nat=None):
@@ -33,7 +33,9 @@ def certify(dicary, plump=False, nat=None):
 
 
 def build_out(rawvars, verbose=1):
-    """
+    """Derive in `rawvars` every QCVariable the :py:func:`wfn_psivars`
+    rules can build from those present, visiting only rules reachable from
+    them (see :py:meth:`QCVarGraph.evaluate`).
 
     Parameters
     ----------
@@ -46,29 +48,7 @@ def build_out(rawvars, verbose=1):
         But input dictionary `rawvars` is updated.
 
     """
-    for action in wfn_psivars():
-        pvar = action['form']
-        buildline = """building {} {}""".format(pvar, '.' * (50 - len(pvar)))
-
-        data_rich_args = []
-
-        for pv in action['args']:
-            if isinstance(pv, str):
-                if pv in rawvars:
-                    data_rich_args.append(rawvars[pv])
-                else:
-                    if verbose >= 2:
-                        print("""{}EMPTY, missing {}""".format(buildline, pv))
-                    break
-            else:
-                data_rich_args.append(pv)
-        else:
-            result = action['func'](data_rich_args)
-            #rawvars[pvar] = result
-            # with data coming from file --> variable, looks more precise than it is. hack
-            rawvars.__setitem__(pvar, result, 6)
-            if verbose >= 1:
-                print("""{}SUCCESS""".format(buildline))
+    wfn_graph().evaluate(rawvars, verbose=verbose)
 
 
 def expand_qcvars(qcvars, qvdefs, verbose=1):
@@ -0,0 +1,107 @@
+import uuid
+import multiprocessing
+import concurrent.futures
+
+# here liveth the (function, tasks) of each `map_forked` call while its pool
+#   is alive. forked workers inherit this table, so neither the function nor
+#   the tasks ever need to be pickled -- only the returned results do.
+_pending = {}
+
+
+def _run_pending(token, indx):
+    fn, tasks = _pending[token]
+    return fn(tasks[indx])
+
+
+def map_forked(fn, tasks, nproc=1):
+    """Evaluate `fn(task)` for every item of `tasks`, concurrently in up to
+    `nproc` forked processes.
+
+    Each worker process starts as a copy of the parent interpreter, so any
+    module state touched by `fn` (e.g., the options in `driver.pe`) is a
+    per-worker snapshot that is never returned to the parent. Workers are
+    reused, however, so such state does carry over between tasks that run
+    in the same worker, just as it does between tasks run serially; `fn`
+    must set up whatever state it relies on rather than assume a fresh copy.
+
+    Parameters
+    ----------
+    fn : callable
+        Function of a single task. Its return value must be picklable when `nproc` > 1.
+    tasks : list
+        Items to be passed one at a time to `fn`.
+    nproc : int, optional
+        Maximum number of concurrent processes. When 1 (default) or when
+        there is only one task, tasks are run serially in this process.
+
+    Returns
+    -------
+    list
+        Return values of `fn`, in order of `tasks` regardless of completion order.
+
+    """
+    tasks = list(tasks)
+    nproc = min(int(nproc), len(tasks))
+
+    if nproc <= 1:
+        return [fn(task) for task in tasks]
+
+    token = str(uuid.uuid4())
+    _pending[token] = (fn, tasks)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=nproc, mp_context=multiprocessing.get_context('fork')) as executor:
+            futures = [executor.submit(_run_pending, token, indx) for indx in range(len(tasks))]
+            return [fut.result() for fut in futures]
+    finally:
+        _pending.pop(token)
+
+
+def run_graph(graph, fn, done, nproc=1):
+    """Evaluate `fn(job)` for every job of a dependency graph, in waves of
+    the jobs whose prerequisites are all complete, each wave concurrently
+    in up to `nproc` forked processes through :py:func:`map_forked`.
+
+    Completion is not judged from the return of `fn` but from `done`, so
+    that the record of a finished job may be kept anywhere `fn` leaves it
+    (e.g., on disk, where it also survives an interruption of the graph).
+    Both `graph` and `done` are consulted anew before each wave, so that
+    jobs may add further jobs to the graph as they complete.
+
+    Parameters
+    ----------
+    graph : callable
+        Function returning dict of every job presently known to its
+        collection of prerequisite jobs. Jobs run in the order of this dict.
+    fn : callable
+        Function of a single job. It is called in a forked process when
+        `nproc` > 1 and a wave has more than one job, otherwise in this
+        process, so its effects must be recorded outside the interpreter
+        (see :py:func:`map_forked`).
+    done : callable
+        Function returning the set of completed jobs.
+    nproc : int, optional
+        Maximum number of concurrent processes.
+
+    Returns
+    -------
+    list
+        Jobs of the graph left incomplete, in graph order. Empty when all
+        ran successfully; otherwise, the graph stalled because the last
+        wave completed none of its jobs.
+
+    """
+    while True:
+        deps = graph()
+        complete = set(done())
+        ready = [job for job, prereqs in deps.items() if job not in complete and set(prereqs) <= complete]
+        if not ready:
+            break
+
+        map_forked(fn, ready, nproc=nproc)
+
+        if not (set(ready) & set(done())):
+            break
+
+    complete = set(done())
+    return [job for job in graph() if job not in complete]
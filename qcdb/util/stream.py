@@ -0,0 +1,110 @@
+import re
+import codecs
+import tempfile
+import subprocess
+
+
+class FatalScanner():
+    """Incremental parser of program output that watches, line by line,
+    for any of `patterns` announcing that the job has failed.
+
+    Parameters
+    ----------
+    patterns : list of str
+        Regular expressions, each matched against single lines.
+
+    Attributes
+    ----------
+    fatal : str or None
+        First line matching a pattern, once seen.
+
+    """
+
+    def __init__(self, patterns):
+        self.pattern = re.compile('|'.join('(?:{})'.format(pat) for pat in patterns)) if patterns else None
+        self.fatal = None
+
+    def feed(self, line):
+        """Scans `line`. Returns True if the job should be stopped."""
+
+        if self.pattern is not None and self.fatal is None and self.pattern.search(line):
+            self.fatal = line.strip()
+        return self.fatal is not None
+
+
+def run_streaming(command, cwd=None, env=None, scanner=None, progress=None, chunksize=65536, spool=8 * 1024 * 1024):
+    """Run `command`, spooling its stdout (to memory, then to a temporary
+    file past `spool` bytes) a chunk at a time so that memory held while
+    it runs stays flat whatever the length of the output.
+
+    Parameters
+    ----------
+    command : list of str
+        Program and arguments.
+    cwd : str, optional
+        Working directory for `command`.
+    env : dict, optional
+        Environment for `command`.
+    scanner : object, optional
+        Incremental parser with a `feed(line)` method called on each
+        complete line of output. When it returns True, `command` is killed
+        and streaming stops. A :py:class:`FatalScanner` serves.
+    progress : callable, optional
+        Called after every chunk as `progress(nlines, nbytes)` with running
+        totals of lines and bytes of output.
+    chunksize : int, optional
+        Bytes read from the pipe at a time.
+    spool : int, optional
+        Bytes of output held in memory before spilling to a temporary file.
+
+    Returns
+    -------
+    returncode : int
+        Exit code of `command` (negative for a signal, as when killed).
+    stdout : str
+        All output received, decoded as UTF-8.
+    killed : bool
+        Whether `command` was stopped early at the request of `scanner`.
+
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    nlines = 0
+    nbytes = 0
+    partial = ''
+    killed = False
+
+    with tempfile.SpooledTemporaryFile(max_size=spool) as handle:
+        with subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.PIPE) as proc:
+            while True:
+                data = proc.stdout.read1(chunksize)
+                if not data:
+                    break
+                handle.write(data)
+                nbytes += len(data)
+
+                lines = (partial + decoder.decode(data)).split('\n')
+                partial = lines.pop()
+                nlines += len(lines)
+                if scanner is not None:
+                    killed = any(scanner.feed(line) for line in lines)
+                if progress is not None:
+                    progress(nlines, nbytes)
+                if killed:
+                    proc.kill()
+                    break
+
+            if not killed:
+                partial += decoder.decode(b'', final=True)
+                if partial:
+                    nlines += 1
+                    if scanner is not None:
+                        scanner.feed(partial)
+                    if progress is not None:
+                        progress(nlines, nbytes)
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        handle.seek(0)
+        stdout = handle.read().decode('utf-8', errors='replace')
+
+    return returncode, stdout, killed
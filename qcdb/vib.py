@@ -1,5 +1,4 @@
 import sys
-import math
 import itertools
 import collections
 
@@ -7,6 +6,7 @@ import numpy as np
 
 import qcelemental as qcel
 from qcelemental import Datum
+from qcelemental.util import blockwise_expand, blockwise_contract
 
 #from .psiutil import *
 from .util import *
@@ -119,29 +119,23 @@ def hessian_symmetrize(hess, mol):
     # Obtain atom mapping of atom * symm op to atom
     atom_map = compute_atom_map(mol)
 
-    syms = []
-    smap = []
-    for g in range(ct.order()):
-        syms.append(np.asarray(ct.symm_operation(g).d))
-        smap.append([atom_map[at][g] for at in range(mol.natom())])
-
     np.set_printoptions(formatter={'float': '{: 16.12f}'.format})
     b_hess = blockwise_expand(hess, (3, 3), False)
 
-    bDG = []
+    # Accumulate each operation's image of the Hessian, (nat, nat, 3, 3) at a
+    #   time, rather than per-atom-pair copies of the whole block array
+    tot = None
     nat = b_hess.shape[0]
-    for iat in range(nat):
-        for jat in range(nat):
-            for sym in range(len(syms)):
-                bDG.append(np.zeros_like(b_hess))
-                bDG[sym][iat, jat] = syms[sym].dot(b_hess[iat, jat].dot(syms[sym]))
-                # Note that tested syms all diagonal, so above may be off by some transposes
-
-    for sym in range(len(syms)):
-        bDG[sym] = bDG[sym][:, smap[sym]]
-        bDG[sym] = bDG[sym][smap[sym], :]
-    tot = np.sum(bDG, axis=0)
-    tot = np.divide(tot, len(syms))
+    for g in range(ct.order()):
+        sym = np.asarray(ct.symm_operation(g).d)
+        smap = [atom_map[at][g] for at in range(nat)]
+        bDG = np.matmul(sym, np.matmul(b_hess[np.ix_(smap, smap)], sym))
+        # Note that tested syms all diagonal, so above may be off by some transposes
+        if tot is None:
+            tot = bDG
+        else:
+            tot += bDG
+    tot = np.divide(tot, ct.order())
 
     print('symmetrization diff:', np.linalg.norm(tot - b_hess))
     m_tot = blockwise_contract(tot)
@@ -243,37 +237,21 @@ def _check_degen_modes(arr, freq, verbose=1):
 
 
 def _phase_cols_to_max_element(arr, tol=1.e-2, verbose=1):
-    """Returns copy of 2D `arr` scaled such that, within cols, max(fabs)
-    element is positive. If max(fabs) is pos/neg pair, scales so first
-    element (within `tol`) is positive.
+    """Returns copy of 2D (or stacked 2D) `arr` scaled such that, within
+    cols, max(fabs) element is positive. If max(fabs) is pos/neg pair,
+    scales so first element (within `tol`) is positive.
 
     """
-    arr2 = np.copy(arr)
-
-    rephasing = []
-    for v in range(arr.shape[1]):
-        vextreme = 0.0
-        iextreme = None
-
-        # find most extreme value
-        for varr in arr[:, v]:
-            vextreme = max(np.absolute(varr), vextreme)
-
-        # find the first index whose fabs equals that value, w/i tolerance
-        for iarr, varr in enumerate(arr[:, v]):
-            if (vextreme - np.absolute(varr)) < tol:
-                iextreme = iarr
-                break
-
-        sign = np.sign(arr[iextreme, v])
-        if sign == -1.:
-            rephasing.append(str(v))
-        arr2[:, v] *= sign
+    # first index whose fabs equals the most extreme value, w/i tolerance
+    absarr = np.absolute(arr)
+    iextreme = np.argmax((np.amax(absarr, axis=-2, keepdims=True) - absarr) < tol, axis=-2)
+    sign = np.sign(np.take_along_axis(arr, iextreme[..., None, :], axis=-2))
 
+    rephasing = [str(v) for v in np.nonzero(np.any(sign.reshape(-1, arr.shape[-1]) == -1., axis=0))[0]]
     if rephasing and verbose >= 2:
         print('Negative modes rephased:', ', '.join(rephasing))
 
-    return arr2
+    return arr * sign
 
 
 def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, project_trans=True, project_rot=True):
@@ -347,8 +325,6 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
     >>> vibonly = filter_nonvib(vibinfo)
 
     """
-    from psi4 import core
-
     if (mass.shape[0] == geom.shape[0] == (hess.shape[0] // 3) == (hess.shape[1] // 3)) and (geom.shape[1] == 3):
         pass
     else:
@@ -361,36 +337,19 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
         ivrt = a.shape[0] - np.linalg.matrix_rank(a, tol=stol)
         return """  {:32} Symmetric? {}   Hermitian? {}   Lin Dep Dim? {:2}""".format(lbl + ':', symm, herm, ivrt)
 
-    def vec_in_space(vec, space, tol=1.0e-4):
-        merged = np.vstack((space, vec))
-        u, s, v = np.linalg.svd(merged)
-        return (s[-1] < tol)
-
     vibinfo = {}
     text = []
 
     nat = len(mass)
     text.append("""\n\n  ==> Harmonic Vibrational Analysis <==\n""")
 
-    if nat == 1:
-        nrt_expected = 3
-    elif np.linalg.matrix_rank(geom) == 1:
-        nrt_expected = 5
-    else:
-        nrt_expected = 6
+    nrt_expected = int(_expected_nrt(geom))
 
     nmwhess = hess.copy()
     text.append(mat_symm_info(nmwhess, lbl='non-mass-weighted Hessian') + ' (0)')
 
     # get SALC object, possibly w/o trans & rot
-    mints = core.MintsHelper(basisset)
-    cdsalcs = mints.cdsalcs(0xFF, project_trans, project_rot)
-
-    Uh = collections.OrderedDict()
-    for h, lbl in enumerate(irrep_labels):
-        tmp = np.asarray(cdsalcs.matrix_irrep(h))
-        if tmp.size > 0:
-            Uh[lbl] = tmp
+    Uh = _salc_spaces(basisset, irrep_labels, project_trans, project_rot)
 
     # form projector of translations and rotations
     space = ('T' if project_trans else '') + ('R' if project_rot else '')
@@ -406,18 +365,11 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
     text.append(mat_symm_info(P, lbl='total projector') + f' ({nrt})')
 
     # mass-weight & solve
-    sqrtmmm = np.repeat(np.sqrt(mass), 3)
-    sqrtmmminv = np.divide(1.0, sqrtmmm)
-    mwhess = np.einsum('i,ij,j->ij', sqrtmmminv, nmwhess, sqrtmmminv)
+    mwhess, sqrtmmminv = _mass_weight(nmwhess, mass)
     text.append(mat_symm_info(mwhess, lbl='mass-weighted Hessian') + ' (0)')
 
-    pre_force_constant_au = np.linalg.eigvalsh(mwhess)
-
-    idx = np.argsort(pre_force_constant_au)
-    pre_force_constant_au = pre_force_constant_au[idx]
-    uconv_cm_1 = (np.sqrt(qcel.constants.na * qcel.constants.hartree2J * 1.0e19) /
-                  (2 * np.pi * qcel.constants.c * qcel.constants.bohr2angstroms))
-    pre_frequency_cm_1 = np.lib.scimath.sqrt(pre_force_constant_au) * uconv_cm_1
+    pre_force_constant_au = np.sort(np.linalg.eigvalsh(mwhess))
+    pre_frequency_cm_1 = _wavenumbers(pre_force_constant_au)
 
     pre_lowfreq = np.where(np.real(pre_frequency_cm_1) < 100.0)[0]
     pre_lowfreq = np.append(pre_lowfreq, np.arange(nrt_expected))  # catch at least nrt modes
@@ -433,50 +385,13 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
     mwhess_proj = np.dot(P.T, mwhess).dot(P)
     text.append(mat_symm_info(mwhess_proj, lbl='projected mass-weighted Hessian') + f' ({nrt})')
 
-    #print('projhess = ', np.array_repr(mwhess_proj))
-    force_constant_au, qL = np.linalg.eigh(mwhess_proj)
-
-    # expected order for vibrations is steepest downhill to steepest uphill
-    idx = np.argsort(force_constant_au)
-    force_constant_au = force_constant_au[idx]
-    qL = qL[:, idx]
-    qL = _phase_cols_to_max_element(qL)
-    vibinfo['q'] = Datum('normal mode', 'a0 u^1/2', qL, comment='normalized mass-weighted')
-
-    # frequency, LAB II.17
-    frequency_cm_1 = np.lib.scimath.sqrt(force_constant_au) * uconv_cm_1
-    vibinfo['omega'] = Datum('frequency', 'cm^-1', frequency_cm_1)
-
-    # degeneracies
-    ufreq, uinv, ucts = np.unique(np.around(frequency_cm_1, 2), return_inverse=True, return_counts=True)
-    vibinfo['degeneracy'] = Datum('degeneracy', '', ucts[uinv])
-
-    # look among the symmetry subspaces h for one to which the normco
-    #   of vib does *not* add an extra dof to the vector space
-    active = []
-    irrep_classification = []
-    for idx, vib in enumerate(frequency_cm_1):
-
-        if vec_in_space(qL[:, idx], TRspace, 1.0e-4):
-            active.append('TR')
-            irrep_classification.append(None)
+    force_constant_au, qL = _solve_projected(mwhess_proj)
+    frequency_cm_1 = _wavenumbers(force_constant_au)
+    active, irrep_classification = _classify_modes(qL, frequency_cm_1, TRspace, Uh)
+    active = active.tolist()
 
-        else:
-            active.append('V')
-
-            for h in Uh.keys():
-                if vec_in_space(qL[:, idx], Uh[h], 1.0e-4):
-                    irrep_classification.append(h)
-                    break
-            else:
-                irrep_classification.append(None)
-
-                # catch partial Hessians
-                if np.linalg.norm(vib) < 1.e-3:
-                    active[-1] = '-'
-
-    vibinfo['TRV'] = Datum('translation/rotation/vibration', '', active)
-    vibinfo['gamma'] = Datum('irreducible representation', '', irrep_classification)
+    _fill_vibinfo(vibinfo, force_constant_au, qL, sqrtmmminv[:, None], TRV=active, gamma=irrep_classification.tolist(),
+                  dipder=dipder)
 
     lowfreq = np.where(np.real(frequency_cm_1) < 100.0)[0]
     lowfreq = np.append(lowfreq, np.arange(nrt_expected))  # catch at least nrt modes
@@ -493,37 +408,238 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
         text.append(
             f'  Note that "Vibration"s include {nrt_expected} un-projected rotation-like and translation-like modes.')
 
+    return vibinfo, '\n'.join(text)
+
+
+def harmonic_analysis_batch(hess, geom, mass, basisset=None, irrep_labels=None, dipder=None, project_trans=True,
+                            project_rot=True):
+    """Harmonic vibrational analysis of many Hessians and/or mass vectors
+    at once, as for a conformer ensemble or an isotopologue scan. Any of
+    `hess`, `geom`, `mass`, and `dipder` may carry a leading batch axis;
+    those that don't are shared by every analysis. Translation/rotation
+    projectors are formed once when geometry and masses are shared, and all
+    diagonalizations are done in one batched call.
+
+    Parameters
+    ----------
+    hess : ndarray of float
+        (3*nat, 3*nat) or (nb, 3*nat, 3*nat) non-mass-weighted Hessians in atomic units, [Eh/a0/a0].
+    geom : ndarray of float
+        (nat, 3) or (nb, nat, 3) geometries [a0] at which Hessians computed.
+    mass : ndarray of float
+        (nat,) or (nb, nat) atomic masses [u].
+    basisset : psi4.core.BasisSet, optional
+        Basis set object (can be dummy, e.g., STO-3G) for SALCs. Only for
+        shared `geom`. If None, vibrations are not classified by irrep.
+    irrep_labels : list of str, optional
+        Irreducible representation labels. Required with `basisset`.
+    dipder : ndarray of float, optional
+        (3, 3 * nat) or (nb, 3, 3 * nat) dipole derivatives in atomic units, [Eh a0/u] or [(e a0/a0)^2/u]
+    project_trans : bool, optional
+        Idealized translations projected out of final vibrational analysis.
+    project_rot : bool, optional
+        Idealized rotations projected out of final vibrational analysis.
+
+    Returns
+    -------
+    dict, text
+        Returns dictionary of vibration Datum objects with the fields of
+        :py:func:`harmonic_analysis`, each with leading (nb,) axis.
+        Also returns text suitable for printing.
+
+    Examples
+    --------
+    # frequencies of H2O and D2O from one Hessian
+    >>> vibinfo, text = harmonic_analysis_batch(hess, geom, np.array([[15.995, 1.008, 1.008], [15.995, 2.014, 2.014]]))
+    >>> vibinfo['omega'].data[1]
+
+    """
+    hess = np.asarray(hess, dtype=float)
+    geom = np.asarray(geom, dtype=float)
+    mass = np.asarray(mass, dtype=float)
+    if dipder is not None and np.array(dipder).size == 0:
+        dipder = None
+    if dipder is not None:
+        dipder = np.asarray(dipder, dtype=float)
+
+    batched = [arr.shape[0] for arr, nd in [(hess, 3), (geom, 3), (mass, 2), (dipder, 3)] if arr is not None and arr.ndim == nd]
+    if len(set(batched)) > 1:
+        raise ValidationError(f"""Batch size mismatch among Hessian, geometry, mass, and dipole derivatives ({batched})""")
+    nb = batched[0] if batched else 1
+
+    nat = mass.shape[-1]
+    if not (geom.shape[-2:] == (nat, 3) and hess.shape[-2:] == (3 * nat, 3 * nat)):
+        raise ValidationError(
+            f"""Dimension mismatch among mass ({mass.shape}), geometry ({geom.shape}), and Hessian ({hess.shape})""")
+    if basisset is not None and geom.ndim == 3:
+        raise ValidationError("""SALCs from `basisset` require a geometry shared by all analyses""")
+
+    text = []
+    text.append(f"""\n\n  ==> Harmonic Vibrational Analysis of {nb} <==\n""")
+
+    nrt_expected = np.broadcast_to(_expected_nrt(geom), (nb, ))
+
+    Uh = collections.OrderedDict()
+    if basisset is not None:
+        Uh = _salc_spaces(basisset, irrep_labels, project_trans, project_rot)
+
+    # form projectors of translations and rotations, once for each distinct geometry & masses
+    space = ('T' if project_trans else '') + ('R' if project_rot else '')
+    TRspace, nrt = _get_TR_space_batch(mass.reshape((-1, nat)), geom.reshape((-1, nat, 3)), space=space, tol=LINEAR_A_TOL)
+    P = np.identity(3 * nat) - np.matmul(TRspace, TRspace.swapaxes(-1, -2))
+    nrt = np.broadcast_to(nrt, (nb,))
+    text.append(
+        f'  projection of translations ({project_trans}) and rotations ({project_rot}) removed {set(nrt.tolist())} degrees of freedom ({set(nrt_expected.tolist())})'
+    )
+
+    # mass-weight, project & solve
+    mwhess, sqrtmmminv = _mass_weight(hess.reshape((-1, 3 * nat, 3 * nat)), mass.reshape((-1, nat)))
+    mwhess_proj = np.matmul(P.swapaxes(-1, -2), np.matmul(mwhess, P))
+
+    force_constant_au, qL = _solve_projected(mwhess_proj)
+    frequency_cm_1 = _wavenumbers(force_constant_au)
+
+    active = np.full(frequency_cm_1.shape, 'V', dtype='<U2')
+    irrep_classification = np.full(frequency_cm_1.shape, None, dtype=object)
+    for ib in range(nb):
+        TRrows = TRspace[ib % TRspace.shape[0], :, :nrt[ib]].T
+        active[ib], irrep_classification[ib] = _classify_modes(qL[ib], frequency_cm_1[ib], TRrows, Uh)
+
+    vibinfo = {}
+    _fill_vibinfo(vibinfo, force_constant_au, qL, sqrtmmminv[:, :, None], TRV=active, gamma=irrep_classification,
+                  dipder=dipder)
+
+    for ib in range(nb):
+        text.append(f'  post-proj  all modes ({ib}):' + str(_format_omega(frequency_cm_1[ib], 4)))
+    text.append('')
+
+    return vibinfo, '\n'.join(text)
+
+
+def _expected_nrt(geom):
+    """Returns number of translations and rotations of (stacked) geometry `geom`."""
+
+    if geom.shape[-2] == 1:
+        return np.full(geom.shape[:-2], 3)
+    return np.where(np.linalg.matrix_rank(geom) == 1, 5, 6)
+
+
+def _salc_spaces(basisset, irrep_labels, project_trans, project_rot):
+    """Returns OrderedDict of irrep label to array of Cartesian displacement
+    SALCs (rows) of that irrep, from psi4.core.BasisSet `basisset`.
+
+    """
+    from psi4 import core
+
+    mints = core.MintsHelper(basisset)
+    cdsalcs = mints.cdsalcs(0xFF, project_trans, project_rot)
+
+    Uh = collections.OrderedDict()
+    for h, lbl in enumerate(irrep_labels):
+        tmp = np.asarray(cdsalcs.matrix_irrep(h))
+        if tmp.size > 0:
+            Uh[lbl] = tmp
+    return Uh
+
+
+def _mass_weight(hess, mass):
+    """Returns (stacked) mass-weighted Hessian and inverse square roots of masses per Cartesian."""
+
+    sqrtmmminv = np.divide(1.0, np.repeat(np.sqrt(mass), 3, axis=-1))
+    mwhess = sqrtmmminv[..., :, None] * hess * sqrtmmminv[..., None, :]
+    return mwhess, sqrtmmminv
+
+
+def _solve_projected(mwhess_proj):
+    """Returns force constants [Eh/a0^2/u] and phased normal modes (columns)
+    of (stacked) projected mass-weighted Hessian, in the order expected for
+    vibrations, steepest downhill to steepest uphill.
+
+    """
+    force_constant_au, qL = np.linalg.eigh(mwhess_proj)
+
+    idx = np.argsort(force_constant_au, axis=-1)
+    force_constant_au = np.take_along_axis(force_constant_au, idx, axis=-1)
+    qL = np.take_along_axis(qL, idx[..., None, :], axis=-1)
+    return force_constant_au, _phase_cols_to_max_element(qL)
+
+
+def _wavenumbers(force_constant_au):
+    """Returns frequencies [cm^-1] of mass-weighted force constants [Eh/a0^2/u], LAB II.17,
+    imaginary for negative force constants."""
+
+    uconv_cm_1 = (np.sqrt(qcel.constants.na * qcel.constants.hartree2J * 1.0e19) /
+                  (2 * np.pi * qcel.constants.c * qcel.constants.bohr2angstroms))
+    return np.lib.scimath.sqrt(force_constant_au) * uconv_cm_1
+
+
+def _classify_modes(qL, frequency_cm_1, TRspace, Uh):
+    """Returns arrays labeling each normal mode (column of `qL`) as
+    translation/rotation 'TR', vibration 'V', or partial '-', and by irrep
+    of `Uh` (None if unclassifiable). A mode belongs to the subspace (rows
+    of `TRspace` or of an irrep's SALCs) to which it does *not* add an
+    extra dof.
+
+    """
+    qLT = qL.T
+    tr = _vecs_in_space(qLT, TRspace, 1.0e-4)
+    active = np.where(tr, 'TR', 'V').astype('<U2')
+    irrep_classification = np.full(tr.shape, None, dtype=object)
+
+    unclassified = ~tr
+    for h, salcs in Uh.items():
+        if not unclassified.any():
+            break
+        inh = np.zeros_like(tr)
+        inh[unclassified] = _vecs_in_space(qLT[unclassified], salcs, 1.0e-4)
+        irrep_classification[inh] = h
+        unclassified &= ~inh
+
+    # catch partial Hessians
+    active[unclassified & (np.absolute(frequency_cm_1) < 1.e-3)] = '-'
+    return active, irrep_classification
+
+
+def _fill_vibinfo(vibinfo, force_constant_au, qL, sqrtmmminv, TRV, gamma, dipder=None):
+    """Sets into `vibinfo` the Datum-s of :py:func:`harmonic_analysis` from
+    (stacked) sorted force constants [Eh/a0^2/u], normal modes `qL`, inverse
+    square roots of masses per Cartesian `sqrtmmminv` (column-broadcastable
+    against `qL`), mode labels, and optional dipole derivatives.
+
+    """
+    vibinfo['q'] = Datum('normal mode', 'a0 u^1/2', qL, comment='normalized mass-weighted')
+
+    # frequency, LAB II.17
+    frequency_cm_1 = _wavenumbers(force_constant_au)
+    vibinfo['omega'] = Datum('frequency', 'cm^-1', frequency_cm_1)
+
+    # degeneracies
+    rfreq = np.around(frequency_cm_1, 2)
+    vibinfo['degeneracy'] = Datum('degeneracy', '', np.sum(rfreq[..., :, None] == rfreq[..., None, :], axis=-1))
+
+    vibinfo['TRV'] = Datum('translation/rotation/vibration', '', TRV, numeric=False)
+    vibinfo['gamma'] = Datum('irreducible representation', '', gamma, numeric=False)
+
     # general conversion factors, LAB II.11
-    uconv_K = (qcel.constants.h * qcel.constants.na * 1.0e21) / (8 * np.pi * np.pi * qcel.constants.c)
     uconv_S = np.sqrt((qcel.constants.c * (2 * np.pi * qcel.constants.bohr2angstroms)**2) /
                       (qcel.constants.h * qcel.constants.na * 1.0e21))
 
     # normco & reduced mass, LAB II.14 & II.15
-    wL = np.einsum('i,ij->ij', sqrtmmminv, qL)
+    wL = sqrtmmminv * qL
     vibinfo['w'] = Datum('normal mode', 'a0', wL, comment='un-mass-weighted')
 
-    reduced_mass_u = np.divide(1.0, np.linalg.norm(wL, axis=0)**2)
+    reduced_mass_u = np.divide(1.0, np.linalg.norm(wL, axis=-2)**2)
     vibinfo['mu'] = Datum('reduced mass', 'u', reduced_mass_u)
 
-    xL = np.sqrt(reduced_mass_u) * wL
+    xL = np.sqrt(reduced_mass_u)[..., None, :] * wL
     vibinfo['x'] = Datum('normal mode', 'a0', xL, comment='normalized un-mass-weighted')
 
     # IR intensities, CCQC Proj. Eqns. 15-16
     uconv_kmmol = (qcel.constants.get("Avogadro constant") * np.pi * 1.e-3 * qcel.constants.get("electron mass in u") *
                    qcel.constants.get("fine-structure constant")**2 * qcel.constants.get("atomic unit of length") / 3)
-    uconv_D2A2u = (qcel.constants.get('atomic unit of electric dipole mom.') * 1.e11 /
-                   qcel.constants.get('hertz-inverse meter relationship') /
-                   qcel.constants.get('atomic unit of length'))**2
     if not (dipder is None or np.array(dipder).size == 0):
-        qDD = dipder.dot(wL)
-        ir_intensity = np.zeros(qDD.shape[1])
-        for i in range(qDD.shape[1]):
-            ir_intensity[i] = qDD[:, i].dot(qDD[:, i])
-        # working but not needed
-        #vibinfo['IR_intensity'] = Datum('infrared intensity', 'Eh a0/u', ir_intensity)
-        #ir_intensity_D2A2u = ir_intensity * uconv_D2A2u
-        #vibinfo['IR_intensity'] = Datum('infrared intensity', '(D/AA)^2/u', ir_intens_D2A2u)
-        ir_intensity_kmmol = ir_intensity * uconv_kmmol
+        qDD = np.matmul(dipder, wL)
+        ir_intensity_kmmol = np.sum(qDD * qDD, axis=-2) * uconv_kmmol
         vibinfo['IR_intensity'] = Datum('infrared intensity', 'km/mol', ir_intensity_kmmol)
 
     # force constants, LAB II.16 (real compensates for earlier sqrt)
@@ -531,9 +647,6 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
     force_constant_mdyne_a = reduced_mass_u * (frequency_cm_1 * frequency_cm_1).real * uconv_mdyne_a
     vibinfo['k'] = Datum('force constant', 'mDyne/A', force_constant_mdyne_a)
 
-    force_constant_cm_1_bb = reduced_mass_u * (frequency_cm_1 * frequency_cm_1).real * uconv_S * uconv_S
-    Datum('force constant', 'cm^-1/a0^2', force_constant_cm_1_bb, comment="Hooke's Law")
-
     # turning points, LAB II.20 (real & zero since turning point silly for imag modes)
     nu = 0
     turning_point_rnc = np.sqrt(2.0 * nu + 1.0)
@@ -557,7 +670,14 @@ def harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=None, pro
     vib_temperature_K = frequency_cm_1.real * uconv_K
     vibinfo['theta_vib'] = Datum('char temp', 'K', vib_temperature_K)
 
-    return vibinfo, '\n'.join(text)
+
+def _vecs_in_space(vecs, space, tol=1.0e-4):
+    """Whether each row of `vecs` lies in the span of rows of `space`,
+    judged by the smallest singular value of `space` with the row appended."""
+
+    merged = np.concatenate((np.broadcast_to(space, (vecs.shape[0], ) + space.shape), vecs[:, None, :]), axis=1)
+    s = np.linalg.svd(merged, compute_uv=False)
+    return s[:, -1] < tol
 
 
 def _br(string):
@@ -811,9 +931,9 @@ def thermo(vibinfo, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, ro
         The rotational or external symmetry number determined from the point group.
     rotor_type : str
         The rotor type for rotational stat mech purposes: RT_ATOM, RT_LINEAR, other.
-    T : float
+    T : float or ndarray of float
         Temperature in [K]. Psi default 298.15. Note that 273.15 is IUPAC STP.
-    P : float
+    P : float or ndarray of float
         Pressure in [Pa]. Psi default 101325. Note that 100000 is IUPAC STP.
 
     Returns
@@ -822,8 +942,14 @@ def thermo(vibinfo, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, ro
         First is every thermochemistry component in atomic units along with input conditions.
         Second is formatted presentation of analysis.
 
+    Notes
+    -----
+    For `vibinfo` from :py:func:`harmonic_analysis_batch` or for arrays of
+    `T` and/or `P`, every component is an array over analyses and
+    conditions (see :py:func:`_thermo_batch`).
+
     """
-    sm = collections.defaultdict(float)
+    batched = np.ndim(vibinfo['omega'].data) > 1 or np.ndim(T) or np.ndim(P)
 
     # conditions
     therminfo = {}
@@ -833,91 +959,21 @@ def thermo(vibinfo, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, ro
     therminfo['T'] = Datum('temperature', 'K', T)
     therminfo['P'] = Datum('pressure', 'Pa', P)
 
-    # electronic
-    q_elec = multiplicity
-    sm[('S', 'elec')] = math.log(q_elec)
-
-    # translational
-    beta = 1 / (qcel.constants.kb * T)
-    q_trans = (2.0 * np.pi * molecular_mass * qcel.constants.amu2kg /
-               (beta * qcel.constants.h * qcel.constants.h))**1.5 * qcel.constants.na / (beta * P)
-    sm[('S', 'trans')] = 5 / 2 + math.log(q_trans / qcel.constants.na)
-    sm[('Cv', 'trans')] = 3 / 2
-    sm[('Cp', 'trans')] = 5 / 2
-    sm[('E', 'trans')] = 3 / 2 * T
-    sm[('H', 'trans')] = 5 / 2 * T
-
-    # rotational
-    if rotor_type == "RT_ATOM":
-        pass
-    elif rotor_type == "RT_LINEAR":
-        q_rot = 1. / (beta * sigma * 100 * qcel.constants.c * qcel.constants.h * rot_const[1])
-        sm[('S', 'rot')] = 1.0 + math.log(q_rot)
-        sm[('Cv', 'rot')] = 1
-        sm[('Cp', 'rot')] = 1
-        sm[('E', 'rot')] = T
+    vibdata = [np.asarray(vibinfo[asp].data) for asp in ['omega', 'TRV', 'theta_vib']]
+    if batched:
+        sm = _thermo_batch(*vibdata, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, rotor_type=rotor_type)
     else:
-        phi_A, phi_B, phi_C = rot_const * 100 * qcel.constants.c * qcel.constants.h / qcel.constants.kb
-        q_rot = math.sqrt(math.pi) * T**1.5 / (sigma * math.sqrt(phi_A * phi_B * phi_C))
-        sm[('S', 'rot')] = 3 / 2 + math.log(q_rot)
-        sm[('Cv', 'rot')] = 3 / 2
-        sm[('Cp', 'rot')] = 3 / 2
-        sm[('E', 'rot')] = 3 / 2 * T
-    sm[('H', 'rot')] = sm[('E', 'rot')]
-
-    # vibrational
-    vibonly = filter_nonvib(vibinfo)
-    ZPE_cm_1 = 1 / 2 * np.sum(vibonly['omega'].data.real)
-    omega_str = _format_omega(vibonly['omega'].data, decimals=4)
-
-    imagfreqidx = np.where(vibonly['omega'].data.imag > vibonly['omega'].data.real)[0]
-    if len(imagfreqidx):
-        print("Warning: thermodynamics relations excluded imaginary frequencies: {}".format(omega_str[imagfreqidx]))
-
-    filtered_theta_vib = np.delete(vibonly['theta_vib'].data, imagfreqidx, None)
-    filtered_omega_str = np.delete(omega_str, imagfreqidx, None)
-    rT = filtered_theta_vib / T  # reduced temperature
-
-    lowfreqidx = np.where(filtered_theta_vib < 900.)[0]
-    if len(lowfreqidx):
-        print("Warning: used thermodynamics relations inappropriate for low-frequency modes: {}".format(
-            filtered_omega_str[lowfreqidx]))
-
-    sm[('S', 'vib')] = np.sum(rT / np.expm1(rT) - np.log(1 - np.exp(-rT)))
-    sm[('Cv', 'vib')] = np.sum(np.exp(rT) * (rT / np.expm1(rT))**2)
-    sm[('Cp', 'vib')] = sm[('Cv', 'vib')]
-    sm[('ZPE', 'vib')] = np.sum(rT) * T / 2
-    sm[('E', 'vib')] = sm[('ZPE', 'vib')] + np.sum(rT * T / np.expm1(rT))
-    sm[('H', 'vib')] = sm[('E', 'vib')]
-
-    assert (abs(ZPE_cm_1 - sm[('ZPE', 'vib')] * qcel.constants.R * qcel.constants.hartree2wavenumbers * 0.001 /
-                qcel.constants.hartree2kJmol) < 0.1)
-
-    #real_vibs = np.ma.masked_where(vibinfo['omega'].data.imag > vibinfo['omega'].data.real, vibinfo['omega'].data)
-
-    # compute Gibbs
-    for term in ['elec', 'trans', 'rot', 'vib']:
-        sm[('G', term)] = sm[('H', term)] - T * sm[('S', term)]
-
-    # convert to atomic units
-    for term in ['elec', 'trans', 'rot', 'vib']:
-        # terms above are unitless (S, Cv, Cp) or in units of temperature (ZPE, E, H, G) as expressions are divided by R.
-        # R [Eh/K], computed as below, slightly diff in 7th sigfig from 3.1668114e-6 (k_B in [Eh/K])
-        #    value listed https://en.wikipedia.org/wiki/Boltzmann_constant
-        uconv_R_EhK = qcel.constants.R / qcel.constants.hartree2kJmol
-        for piece in ['S', 'Cv', 'Cp']:
-            sm[(piece, term)] *= uconv_R_EhK  # [mEh/K] <-- []
-        for piece in ['ZPE', 'E', 'H', 'G']:
-            sm[(piece, term)] *= uconv_R_EhK * 0.001  # [Eh] <-- [K]
-
-    # sum corrections and totals
-    for piece in ['S', 'Cv', 'Cp']:
-        for term in ['elec', 'trans', 'rot', 'vib']:
-            sm[(piece, 'tot')] += sm[(piece, term)]
-    for piece in ['ZPE', 'E', 'H', 'G']:
-        for term in ['elec', 'trans', 'rot', 'vib']:
-            sm[(piece, 'corr')] += sm[(piece, term)]
-        sm[(piece, 'tot')] = E0 + sm[(piece, 'corr')]
+        # a batch of one analysis at one condition
+        sm = _thermo_batch(*[arr[None, ...] for arr in vibdata],
+                           T,
+                           P,
+                           np.atleast_1d(multiplicity),
+                           np.atleast_1d(molecular_mass),
+                           np.atleast_1d(E0),
+                           np.atleast_1d(sigma),
+                           np.atleast_2d(rot_const),
+                           rotor_type=rotor_type)
+        sm = collections.OrderedDict((entry, val[0]) for entry, val in sm.items())
 
     terms = collections.OrderedDict()
     terms['elec'] = '  Electronic'
@@ -936,7 +992,25 @@ def thermo(vibinfo, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, ro
         therminfo['_'.join(entry)] = Datum(terms[entry[1]].strip().lower() + ' ' + entry[0], unit, sm[entry])
 
     # display
-    format_S_Cv_Cp = """\n  {:19} {:11.3f} [cal/(mol K)]  {:11.3f} [J/(mol K)]  {:15.8f} [mEh/K]"""
+    if batched:
+        shape = therminfo['G_tot'].data.shape
+        Tfull = np.broadcast_to(T, shape)
+        Pfull = np.broadcast_to(P, shape)
+
+        text = """\n  ==> Thermochemistry Totals <==\n"""
+        text += """\n  {:>12} {:>9} {:>12} {:>15} {:>15} {:>15} {:>15}""".format(
+            'analysis', 'T [K]', 'P [Pa]', 'ZPE [Eh]', 'E [Eh]', 'H [Eh]', 'G [Eh]')
+        for idx in np.ndindex(*shape):
+            text += """\n  {:>12} {:9.2f} {:12.2f} {:15.8f} {:15.8f} {:15.8f} {:15.8f}""".format(
+                str(idx), Tfull[idx], Pfull[idx], *[sm[(piece, 'tot')][idx] for piece in ['ZPE', 'E', 'H', 'G']])
+        text += '\n'
+
+        return therminfo, text
+
+    # S, Cv, Cp have no correction, only a total
+    sm = collections.defaultdict(float, sm)
+
+    format_S_Cv_Cp ="""\n  {:19} {:11.3f} [cal/(mol K)]  {:11.3f} [J/(mol K)]  {:15.8f} [mEh/K]"""
     format_ZPE_E_H_G = """\n  {:19} {:11.3f} [kcal/mol]  {:11.3f} [kJ/mol]  {:15.8f} [Eh]"""
     uconv = np.asarray([qcel.constants.hartree2kcalmol, qcel.constants.hartree2kJmol, 1.])
 
@@ -999,6 +1073,118 @@ def thermo(vibinfo, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, ro
     return therminfo, text
 
 
+def _thermo_batch(omega, TRV, theta_vib, T, P, multiplicity, molecular_mass, E0, sigma, rot_const, rotor_type=None):
+    """Thermochemistry components of :py:func:`thermo` in atomic units over
+    a batch of analyses and/or arrays of conditions. `omega`, `TRV`, and
+    `theta_vib` are (nb, 3 * nat) from :py:func:`harmonic_analysis_batch`.
+    Results have shape of the batch (nb,) followed by the broadcast shape
+    of `T` and `P`. The molecular arguments `E0`, `molecular_mass`,
+    `multiplicity`, and `sigma` may be scalars or (nb,), and `rot_const`
+    (3,) or (nb, 3).
+
+    """
+    batch = omega.shape[:-1]
+    T = np.asarray(T, dtype=float)
+    P = np.asarray(P, dtype=float)
+    cond = np.broadcast(T, P).shape
+
+    def per_molecule(arr):
+        arr = np.asarray(arr, dtype=float)
+        return arr.reshape(arr.shape + (1, ) * len(cond))
+
+    sm = collections.defaultdict(float)
+
+    E0 = per_molecule(E0)
+    sigma = per_molecule(sigma)
+    molecular_mass = per_molecule(molecular_mass)
+
+    # electronic
+    sm[('S', 'elec')] = np.log(per_molecule(multiplicity))
+
+    # translational
+    beta = 1 / (qcel.constants.kb * T)
+    q_trans = (2.0 * np.pi * molecular_mass * qcel.constants.amu2kg /
+               (beta * qcel.constants.h * qcel.constants.h))**1.5 * qcel.constants.na / (beta * P)
+    sm[('S', 'trans')] = 5 / 2 + np.log(q_trans / qcel.constants.na)
+    sm[('Cv', 'trans')] = 3 / 2
+    sm[('Cp', 'trans')] = 5 / 2
+    sm[('E', 'trans')] = 3 / 2 * T
+    sm[('H', 'trans')] = 5 / 2 * T
+
+    # rotational
+    rot_const = np.asarray(rot_const, dtype=float)
+    if rotor_type == "RT_ATOM":
+        pass
+    elif rotor_type == "RT_LINEAR":
+        q_rot = 1. / (beta * sigma * 100 * qcel.constants.c * qcel.constants.h * per_molecule(rot_const[..., 1]))
+        sm[('S', 'rot')] = 1.0 + np.log(q_rot)
+        sm[('Cv', 'rot')] = 1
+        sm[('Cp', 'rot')] = 1
+        sm[('E', 'rot')] = T
+    else:
+        phi_A, phi_B, phi_C = (per_molecule(rot_const[..., i]) * 100 * qcel.constants.c * qcel.constants.h /
+                               qcel.constants.kb for i in range(3))
+        q_rot = np.sqrt(np.pi) * T**1.5 / (sigma * np.sqrt(phi_A * phi_B * phi_C))
+        sm[('S', 'rot')] = 3 / 2 + np.log(q_rot)
+        sm[('Cv', 'rot')] = 3 / 2
+        sm[('Cp', 'rot')] = 3 / 2
+        sm[('E', 'rot')] = 3 / 2 * T
+    sm[('H', 'rot')] = sm[('E', 'rot')]
+
+    # vibrational, over real vibrations of each analysis, modes last
+    vib = (TRV == 'V')
+    imag = vib & (omega.imag > omega.real)
+    real_vib = vib & ~imag
+    if np.any(imag):
+        print("Warning: thermodynamics relations excluded imaginary frequencies: {}".format(
+            _format_omega(omega[imag], decimals=4)))
+    lowfreq = real_vib & (theta_vib < 900.)
+    if np.any(lowfreq):
+        print("Warning: used thermodynamics relations inappropriate for low-frequency modes: {}".format(
+            _format_omega(omega[lowfreq], decimals=4)))
+
+    modes = batch + (1, ) * len(cond) + omega.shape[-1:]
+    real_vib = real_vib.reshape(modes)
+    rT = np.where(real_vib, theta_vib.reshape(modes), 1.) / T[..., None]  # reduced temperature
+
+    sm[('S', 'vib')] = np.sum(real_vib * (rT / np.expm1(rT) - np.log(1 - np.exp(-rT))), axis=-1)
+    sm[('Cv', 'vib')] = np.sum(real_vib * np.exp(rT) * (rT / np.expm1(rT))**2, axis=-1)
+    sm[('Cp', 'vib')] = sm[('Cv', 'vib')]
+    sm[('ZPE', 'vib')] = np.sum(real_vib * rT, axis=-1) * T / 2
+    sm[('E', 'vib')] = sm[('ZPE', 'vib')] + np.sum(real_vib * rT * T[..., None] / np.expm1(rT), axis=-1)
+    sm[('H', 'vib')] = sm[('E', 'vib')]
+
+    ZPE_cm_1 = 1 / 2 * np.sum(real_vib * omega.real.reshape(modes), axis=-1)
+    assert np.all(
+        np.abs(ZPE_cm_1 - sm[('ZPE', 'vib')] * qcel.constants.R * qcel.constants.hartree2wavenumbers * 0.001 /
+               qcel.constants.hartree2kJmol) < 0.1)
+
+    # compute Gibbs
+    for term in ['elec', 'trans', 'rot', 'vib']:
+        sm[('G', term)] = sm[('H', term)] - T * sm[('S', term)]
+
+    # convert to atomic units
+    for term in ['elec', 'trans', 'rot', 'vib']:
+        # terms above are unitless (S, Cv, Cp) or in units of temperature (ZPE, E, H, G) as expressions are divided by R.
+        # R [Eh/K], computed as below, slightly diff in 7th sigfig from 3.1668114e-6 (k_B in [Eh/K])
+        #    value listed https://en.wikipedia.org/wiki/Boltzmann_constant
+        uconv_R_EhK = qcel.constants.R / qcel.constants.hartree2kJmol
+        for piece in ['S', 'Cv', 'Cp']:
+            sm[(piece, term)] = sm[(piece, term)] * uconv_R_EhK  # [mEh/K] <-- []
+        for piece in ['ZPE', 'E', 'H', 'G']:
+            sm[(piece, term)] = sm[(piece, term)] * uconv_R_EhK * 0.001  # [Eh] <-- [K]
+
+    # sum corrections and totals
+    for piece in ['S', 'Cv', 'Cp']:
+        sm[(piece, 'tot')] = sum(sm[(piece, term)] for term in ['elec', 'trans', 'rot', 'vib'])
+    for piece in ['ZPE', 'E', 'H', 'G']:
+        sm[(piece, 'corr')] = sum(sm[(piece, term)] for term in ['elec', 'trans', 'rot', 'vib'])
+        sm[(piece, 'tot')] = E0 + sm[(piece, 'corr')]
+
+    shape = batch + cond
+    return collections.OrderedDict((entry, np.broadcast_to(val, shape).copy()) for entry, val in sm.items())
+
+
 def filter_nonvib(vibinfo, remove=None):
     """From a dictionary of vibration Datum, remove normal coordinates.
 
@@ -1033,7 +1219,11 @@ def filter_nonvib(vibinfo, remove=None):
             axis = 1
         else:
             axis = 0
-        work[asp] = Datum(oasp.label, oasp.units, np.delete(oasp.data, remove, axis=axis), comment=oasp.comment)
+        work[asp] = Datum(oasp.label,
+                          oasp.units,
+                          np.delete(oasp.data, remove, axis=axis),
+                          comment=oasp.comment,
+                          numeric=oasp.numeric)
 
     return work
 
@@ -1091,55 +1281,49 @@ def _get_TR_space(m, geom, space='TR', tol=None, verbose=1):
         assert(_get_TR_space(m3, gnoisy, tol=10*tol).shape == (5, 9))
 
     """
-    sqrtmmm = np.repeat(np.sqrt(m), 3)
-    xxx = np.repeat(geom[:, 0], 3)
-    yyy = np.repeat(geom[:, 1], 3)
-    zzz = np.repeat(geom[:, 2], 3)
+    TRindep, num = _get_TR_space_batch(np.asarray(m, dtype=float)[None, :], np.asarray(geom, dtype=float)[None, :, :],
+                                       space=space, tol=tol)
+    TRindep = TRindep[0, :, :num[0]].T
 
-    z = np.zeros_like(m)
-    i = np.ones_like(m)
-    ux = np.ravel([i, z, z], order='F')
-    uy = np.ravel([z, i, z], order='F')
-    uz = np.ravel([z, z, i], order='F')
+    if verbose >= 2:
+        print(TRindep.shape)
+        print(np.linalg.norm(TRindep, axis=1))
+        print('-' * 80)
 
-    # form translation and rotation unit vectors
-    T1 = sqrtmmm * ux
-    T2 = sqrtmmm * uy
-    T3 = sqrtmmm * uz
-    R4 = sqrtmmm * (yyy * uz - zzz * uy)
-    R5 = sqrtmmm * (zzz * ux - xxx * uz)
-    R6 = sqrtmmm * (xxx * uy - yyy * ux)
+    return TRindep
+
+
+def _get_TR_space_batch(m, geom, space='TR', tol=None):
+    """Batched :py:func:`_get_TR_space` over masses `m` (nm, nat) and
+    geometries `geom` (ng, nat, 3), one of nm and ng 1 or both equal.
+    Returns orthonormal TR columns in an array of shape (nb, 3 * nat, ntr),
+    each analysis' columns beyond its number of independent dof zeroed, and
+    an array of those numbers of shape (nb,).
+
+    """
+    nat = m.shape[-1]
+    sqrtmmm = np.repeat(np.sqrt(m), 3, axis=-1)[:, None, :]
+    xxx = np.repeat(geom[:, :, 0], 3, axis=-1)
+    yyy = np.repeat(geom[:, :, 1], 3, axis=-1)
+    zzz = np.repeat(geom[:, :, 2], 3, axis=-1)
+
+    ux, uy, uz = np.tile(np.identity(3), nat)
 
+    # form translation and rotation unit vectors
     TRspace = []
     if 'T' in space:
-        TRspace.append([T1, T2, T3])
+        TRspace.append(np.broadcast_to([ux, uy, uz], (len(xxx), 3, 3 * nat)))
     if 'R' in space:
-        TRspace.append([R4, R5, R6])
+        TRspace.append(np.stack([yyy * uz - zzz * uy, zzz * ux - xxx * uz, xxx * uy - yyy * ux], axis=1))
     if not TRspace:
-        # not sure about this, but it runs
-        ZZ = np.zeros_like(T1)
-        TRspace.append([ZZ])
-
-    TRspace = np.vstack(TRspace)
-
-    def orth(A, tol=tol):
-        u, s, vh = np.linalg.svd(A, full_matrices=False)
-        if verbose >= 2:
-            print(s)
-        M, N = A.shape
-        eps = np.finfo(float).eps
-        if tol is None:
-            tol = max(M, N) * np.amax(s) * eps
-        num = np.sum(s > tol, dtype=int)
-        Q = u[:, :num]
-        return Q
-
-    TRindep = orth(TRspace.T)
-    TRindep = TRindep.T
+        TRspace.append(np.zeros((1, 1, 3 * nat)))
 
-    if verbose >= 2:
-        print(TRindep.shape, '<--', TRspace.shape)
-        print(np.linalg.norm(TRindep, axis=1))
-        print('-' * 80)
+    TRspace = sqrtmmm * np.concatenate(TRspace, axis=1)
 
-    return TRindep
+    u, s, vh = np.linalg.svd(TRspace.swapaxes(-1, -2), full_matrices=False)
+    if tol is None:
+        tol = max(TRspace.shape[-2:]) * np.amax(s, axis=-1, keepdims=True) * np.finfo(float).eps
+    num = np.sum(s > tol, axis=-1)
+    TRindep = u * (np.arange(u.shape[-1]) < num[:, None])[:, None, :]
+
+    return TRindep, num
@@ -7,3 +7,40 @@ def set_up():
     qcdb.driver.pe.clean_nu_options()
 #    psi4.set_output_file("pytest_output.dat", True)
 
+
+
+_helium_dimer_db = '''
+import qcdb
+
+dbse = '{dbse}'
+HRXN = list(range(1, {nrxn} + 1))
+{subsets}TAGL = {{'dbse': 'synthetic helium dimers'}}
+GEOS = {{}}
+ACTV = {{}}
+RXNM = {{}}
+for rxn in HRXN:
+    dbrxn = '%s-%s' % (dbse, rxn)
+    GEOS['%s-dimer' % dbrxn] = qcdb.Molecule("""\\nHe 0 0 0\\n--\\nHe 0 0 %d\\n""" % (3 + rxn))
+    ACTV[dbrxn] = ['%s-dimer' % dbrxn]
+    RXNM[dbrxn] = {{'%s-dimer' % dbrxn: +1}}
+    TAGL[dbrxn] = 'He2 at %d' % (3 + rxn)
+    TAGL['%s-dimer' % dbrxn] = 'He2'
+BIND_TSTA = {{'%s-%s' % (dbse, rxn): -0.1 * rxn + {shift!r} for rxn in HRXN}}
+BIND = BIND_TSTA
+'''
+
+
+@pytest.fixture
+def helium_dimer_db(tmp_path):
+    """Factory writing to `tmp_path` a database module `dbse` of `nrxn`
+    helium dimers with benchmark TSTA of -0.1 * rxn + `shift` and subsets
+    HRXN_`name` for each (name, rxns) item of `subsets`.
+
+    """
+    def write(dbse, nrxn, subsets=None, shift=0.0):
+        lines = ''.join('HRXN_{} = {!r}\n'.format(ss.upper(), list(rxns)) for ss, rxns in (subsets or {}).items())
+        text = _helium_dimer_db.format(dbse=dbse, nrxn=nrxn, subsets=lines, shift=shift)
+        (tmp_path / (dbse + '.py')).write_text(text)
+        return str(tmp_path)
+
+    return write
@@ -0,0 +1,85 @@
+import pytest
+from .utils import *
+
+import qcdb
+from qcdb import libmintsbasissetparser
+
+#! Basis files are read, indexed, and parsed into ShellInfo-s once per process,
+#! and re-read only upon change on disk.
+
+smol = """
+C    0.0  0.0 0.0
+O    1.4  0.0 0.0
+H_r -0.5 -0.7 0.0
+H_l -0.5  0.7 0.0
+"""
+
+mybas = """spherical
+****
+H     0
+S   1   1.00
+      {}              1.0000000
+****
+"""
+
+
+def test_repeat_construct_hits():
+    libmintsbasissetparser.clear_cache()
+
+    wert1 = qcdb.BasisSet.pyconstruct(qcdb.Molecule(smol), 'BASIS', 'cc-pvdz')
+    misses = libmintsbasissetparser.stats['misses']
+    hits = libmintsbasissetparser.stats['hits']
+    wert2 = qcdb.BasisSet.pyconstruct(qcdb.Molecule(smol), 'BASIS', 'cc-pvdz')
+
+    assert compare_integers(misses, libmintsbasissetparser.stats['misses'], tnm() + ' no new parses')
+    assert compare_integers(hits + 6, libmintsbasissetparser.stats['hits'], tnm() + ' hits')
+    assert compare_strings(wert1.print_detail(numbersonly=True), wert2.print_detail(numbersonly=True), tnm())
+    assert compare_integers(38, wert2.nbf(), tnm() + ' nbf()')
+
+
+def test_index_matches_scan():
+    parser = qcdb.libmintsbasisset.Gaussian94BasisSetParser()
+    lines = parser.load_file(qcdb.util.search_file('6-31gs.gbs', qcdb.driver.pe.data_dir + '/basis'))
+    entries = parser.index(lines)
+
+    assert compare_strings('Cartesian', entries['C'][0][1], tnm() + ' declared type')
+    shells = parser.parse('C', lines)[0]
+    assert compare_integers(6, len(shells), tnm() + ' C shells')
+    assert compare_strings('C', lines[entries['C'][0][0] - 1].split()[0], tnm() + ' entry line')
+
+
+def test_file_changed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    mol = qcdb.Molecule("""H\nH 1 0.74""")
+
+    (tmp_path / 'mybas.gbs').write_text(mybas.format('1.0'))
+    wert = qcdb.BasisSet.pyconstruct(mol, 'BASIS', 'mybas')
+    assert compare_values(1.0, wert.shell(0).exp(0), 6, tnm() + ' original')
+
+    (tmp_path / 'mybas.gbs').write_text(mybas.format('2.50'))
+    wert = qcdb.BasisSet.pyconstruct(mol, 'BASIS', 'mybas')
+    assert compare_values(2.5, wert.shell(0).exp(0), 6, tnm() + ' edited')
+
+
+def test_oneatom_hash_hits():
+    mol = qcdb.Molecule(smol)
+    qcdb.BasisSet.pyconstruct(mol, 'BASIS', 'cc-pvdz')
+    hashes = [mol.atoms[at].shell(key='BASIS') for at in range(mol.natom())]
+    hits = qcdb.libmintsbasisset.oneatom_stats['hits']
+
+    mol2 = qcdb.Molecule(smol)
+    qcdb.BasisSet.pyconstruct(mol2, 'BASIS', 'cc-pvdz')
+
+    assert compare_integers(hits + 4, qcdb.libmintsbasisset.oneatom_stats['hits'], tnm() + ' hits')
+    assert compare(hashes, [mol2.atoms[at].shell(key='BASIS') for at in range(mol2.natom())], tnm() + ' hashes')
+    assert compare(True, hashes[2] == hashes[3], tnm() + ' H_r == H_l')
+
+
+def test_oneatom_atomlist_positions():
+    mol = qcdb.Molecule(smol)
+    qcdb.BasisSet.pyconstruct(mol, 'BASIS', 'cc-pvdz')
+    atbs = qcdb.BasisSet.pyconstruct(mol, 'BASIS', 'cc-pvdz', return_atomlist=True)
+
+    for at in range(mol.natom()):
+        assert compare_arrays(mol.xyz(at), atbs[at].molecule.xyz(0), 8, tnm() + ' position')
+        assert compare_strings(mol.atoms[at].shell(key='BASIS'), atbs[at].molecule.atoms[0].shell(key='BASIS'), tnm())
@@ -1,3 +1,5 @@
+import numpy as np
+import pytest
 from .utils import *
 
 import qcelemental as qcel
@@ -102,3 +104,78 @@ def test_numpy_BFS():
 
     ref_fragmentation = [[0, 2, 4, 6, 8], [1, 3, 5, 7, 9]]
     assert compare_integers(True, ans == ref_fragmentation, 'BFS from np.array')
+
+
+def _pairwise_BFS(geom, elem, seed_atoms, bond_threshold=1.20):
+    """Former atom-by-atom BFS over bonds from all pairwise distances."""
+
+    from qcdb.bfs import _get_covalent_radii
+
+    radii = _get_covalent_radii(elem)
+    nat = geom.shape[0]
+    bond_tree = [[at2 for at2 in range(nat) if at2 != at1 and
+                  np.sum((geom[at1] - geom[at2])**2) <= bond_threshold * (radii[at1] + radii[at2])**2]
+                 for at1 in range(nat)]
+
+    allfragments = [list(fr) for fr in seed_atoms]
+    new_list = [list(fr) for fr in seed_atoms]
+    break_list = [at for fr in seed_atoms for at in fr]
+    unfound_list = [at for at in range(nat) if at not in break_list]
+    while len(unfound_list) > 0:
+        for ifr, fr in enumerate(new_list):
+            while len(fr) > 0:
+                for at1 in reversed(fr):
+                    for at2 in bond_tree[at1]:
+                        if at2 in unfound_list and at2 not in break_list:
+                            allfragments[ifr].append(at2)
+                            new_list[ifr].append(at2)
+                            unfound_list.remove(at2)
+                    new_list[ifr].remove(at1)
+        if len(unfound_list) > 0:
+            allfragments.append([unfound_list[0]])
+            new_list.append([unfound_list[0]])
+            unfound_list.remove(unfound_list[0])
+
+    return [sorted(fr) for fr in allfragments]
+
+
+@pytest.mark.parametrize('seed_atoms', [
+    [],
+    [[5]],
+    [[40, 3], [7]],
+    [[1], [0], [2]],
+    [[12, 13, 90], [14], [100, 101]],
+])  # yapf: disable
+def test_BFS_vs_pairwise(seed_atoms):
+    from qcdb.bfs import BFS
+
+    # jumbled waters and chains of carbons and chlorines, some bonded across molecules
+    rs = np.random.RandomState(11)
+    centers = rs.uniform(-12., 12., (40, 3))
+    water = np.array([[0., 0., 0.], [1.43, 1.11, 0.], [-1.43, 1.11, 0.]])
+    geom = np.concatenate([c + water for c in centers[:30]] + [c + rs.normal(0., 2., (3, 3)) for c in centers[30:]])
+    elem = np.array(['O', 'H', 'H'] * 30 + ['C', 'Cl', 'C'] * 10)
+    perm = rs.permutation(geom.shape[0])
+    geom = geom[perm]
+    elem = elem[perm]
+
+    ans = BFS(geom, elem, seed_atoms=seed_atoms)
+    ref = _pairwise_BFS(geom, elem, seed_atoms)
+    assert compare_integers(True, ans == ref, tnm() + ' fragments')
+    assert compare(sorted(range(geom.shape[0])), sorted(at for fr in ans for at in fr), tnm() + ' partition')
+
+    ans = BFS(geom, np.array([qcel.periodictable.to_Z(el) for el in elem]), seed_atoms=seed_atoms, bond_threshold=2.0)
+    ref = _pairwise_BFS(geom, elem, seed_atoms, bond_threshold=2.0)
+    assert compare_integers(True, ans == ref, tnm() + ' fragments by Z at larger threshold')
+
+
+def test_BFS_seed_error():
+    from qcdb.bfs import BFS
+
+    geom = np.array([[0., 0., 0.], [0., 0., 1.4], [0., 0., 10.]])
+    elem = np.array(['H', 'H', 'He'])
+    assert compare_integers(True, BFS(geom, elem) == [[0, 1], [2]], tnm() + ' unseeded')
+    assert compare_integers(True, BFS(geom, elem, seed_atoms=[[0], [1]]) == [[0], [1], [2]], tnm() + ' seeds break bond')
+    for seeds in [[[0], [0, 1]], [[3]]]:
+        with pytest.raises(qcdb.ValidationError):
+            BFS(geom, elem, seed_atoms=seeds)
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+from qcelemental import Datum
+
+from .utils import *
+
+import qcdb
+from qcdb.driver import pe
+
+
+def _zeta_energies(basis):
+    """Model HF and MP2 total energies depending only on zeta level of `basis`."""
+
+    zeta = 'DTQ5'.index(basis[-2]) + 2
+    ehf = -1.1 - 0.01 / zeta**3
+    emp2 = ehf - 0.03 - 0.02 / zeta**3
+    return ehf, emp2
+
+
+def fake_energy(name, molecule, return_wfn, **kwargs):
+    """Stand-in for `qcdb.energy` that reads the basis from the option scroll."""
+
+    basis = pe.nu_options.scroll['QCDB']['BASIS'].value
+    label = pe.nu_options.scroll['QCDB']['WRITER_FILE_LABEL'].value
+    assert label == '-'.join([name, basis.lower()])
+
+    ehf, emp2 = _zeta_energies(basis)
+    qcvars = {
+        'HF TOTAL ENERGY': Datum('HF TOTAL ENERGY', 'Eh', ehf),
+        'MP2 TOTAL ENERGY': Datum('MP2 TOTAL ENERGY', 'Eh', emp2),
+        'CURRENT ENERGY': Datum('CURRENT ENERGY', 'Eh', emp2 if name == 'mp2' else ehf),
+    }
+    jobrec = {'molecule': molecule.to_dict(np_out=False), 'qcvars': qcvars}
+
+    return float(qcvars['CURRENT ENERGY'].data), jobrec
+
+
+def _run_cbs(parallel):
+    pe.load_nu_options()
+    h2 = qcdb.Molecule("""\nH\nH 1 0.74\n""")
+
+    return qcdb.cbs(fake_energy, 'fake', ptype='energy', molecule=h2, return_wfn=True,
+                    scf_basis='cc-pvqz', corl_wfn='mp2', corl_basis='cc-pv[dt]z', parallel=parallel)
+
+
+def test_cbs_parallel_matches_serial():
+    ehfq, _ = _zeta_energies('CC-PVQZ')
+    ehfd, emp2d = _zeta_energies('CC-PVDZ')
+    ehft, emp2t = _zeta_energies('CC-PVTZ')
+    ecorl = qcdb.corl_xtpl_helgaker_2('', 2, emp2d - ehfd, 3, emp2t - ehft)
+    ref = ehfq + ecorl
+
+    eserial, _ = _run_cbs(parallel=1)
+    assert compare_values(ref, eserial, 10, tnm() + ' serial')
+
+    pe.clean_nu_options()
+    eparallel, jrec = _run_cbs(parallel=3)
+    assert compare_values(ref, eparallel, 10, tnm() + ' parallel')
+    assert compare_integers(3, jrec['qcvars']['CBS NUMBER'].data, tnm() + ' njobs')
+
+
+def _changed_options():
+    return {key: (opt.value, [entry[:3] for entry in opt.history])
+            for key, opt in pe.nu_options.changed('QCDB').items()}
+
+
+def test_cbs_parallel_options_match_serial():
+    _run_cbs(parallel=1)
+    serial = _changed_options()
+    assert compare_strings('CC-PVTZ', serial['BASIS'][0], tnm() + ' serial')
+
+    pe.clean_nu_options()
+    _run_cbs(parallel=3)
+
+    # concurrent jobs set BASIS in their own copies, so parent catches up after
+    assert compare(serial, _changed_options(), tnm())
+
+
+def test_map_forked_order():
+    pids = qcdb.util.map_forked(lambda x: (x, os.getpid()), range(8), nproc=4)
+
+    assert [p[0] for p in pids] == list(range(8))
+    assert os.getpid() not in [p[1] for p in pids]
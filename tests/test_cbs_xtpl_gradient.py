@@ -131,6 +131,16 @@ def test_1d():
     assert 'CFOUR' == jrec['provenance']['creator'], "[1d] prov"
 
 
+@using_psi4
+def test_2a():
+    system2()
+    qcdb.set_options({'basis': 'cc-pVDZ'})
+
+    scf_dz, jrec = qcdb.gradient('SCF', return_wfn=True, dertype=0, parallel=4)
+    assert compare_arrays(ref_scf_dz_y, scf_dz, 6, "[2a] SCF/cc-pVDZ Gradient, dertype=0, parallel")
+    assert compare_arrays(ref_scf_dz_y, qcdb.get_variable('CURRENT GRADIENT'), 6, "[2a] SCF/cc-pVDZ Gradient, dertype=0, parallel")
+
+
 #def hide_test_2():
 #    system1()
 #
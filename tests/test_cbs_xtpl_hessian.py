@@ -310,6 +310,18 @@ def test_2d():
     print(jrec['provenance'])
 
 
+@using_psi4
+def test_2e():
+    system2()
+    qcdb.set_options({'basis': 'cc-pVDZ'})
+    lbl = "[2e] SCF/cc-pVDZ, Psi4, dertype=1, parallel"
+
+    scf_dz, jrec = qcdb.hessian('SCF', return_wfn=True, dertype=1, parallel=4)
+    assert compare_arrays(ref_hess_scf_dz_y, scf_dz, 6, lbl)
+    assert compare_arrays(ref_hess_scf_dz_y, qcdb.get_variable('CURRENT HESSIAN'), 6, lbl)
+    assert compare_arrays(ref_scf_dz_y, jrec['qcvars']['CURRENT GRADIENT'].data, 6, lbl)
+
+
 ##def hide_test_2():
 ##    system1()
 ##
@@ -0,0 +1,95 @@
+import os
+import re
+
+from .utils import *
+
+import qcdb
+from qcdb.intf_cfour import bas
+
+#! GENBAS basis blocks plucked through the stored offset index, against a
+#! scan of the whole file, for exact and prefix lookups.
+
+_genbas = """H:STO-3G
+STO-3G minimal basis
+
+  1
+  0
+  1
+  1
+
+ 3.4252509 0.6239137 0.1688554
+
+ 0.1543290
+ 0.5353281
+ 0.4446345
+
+O:STO-3G
+O sto first
+
+  2
+
+H:STO-3GX
+H sto extended
+
+  1
+
+H:STO-3G
+STO-3G redefined
+
+  1
+
+HE:STO-3G
+He minimal
+
+  1
+"""
+
+
+def _scan(genbas_loc, basis, elem, exact=True):
+    """Whole-file split and filter, as extract_basis_from_genbas once did."""
+
+    uelems = set(el.upper() for el in elem)
+    with open(genbas_loc, 'r') as handle:
+        genbas = handle.read()
+    toks = re.split('(^[A-Z]{1,2}:.*$)', genbas, flags=re.MULTILINE)
+    wanted = {}
+    for basline, basblock in dict(zip(toks[1::2], toks[2::2])).items():
+        baskey = basline.split()[0].split(':')
+        if baskey[0] in uelems and (baskey[1] == basis if exact else baskey[1].startswith(basis[:5])):
+            wanted[basline] = basblock
+    return ''.join(f'{k}\n{v}\n' for k, v in wanted.items())
+
+
+def test_genbas_index(tmp_path):
+    genbas_loc = str(tmp_path / 'GENBAS')
+    with open(genbas_loc, 'w') as handle:
+        handle.write(_genbas)
+    bas.clear_cache()
+
+    index = bas.genbas_index(genbas_loc)
+    assert os.path.isfile(genbas_loc + '.index.json'), tnm() + ' stored'
+    assert compare(['H:STO-3G', 'O:STO-3G', 'H:STO-3GX', 'HE:STO-3G'], [blk[0] for blk in index['blocks']],
+                   tnm() + ' first appearance')
+    assert compare(['STO-3G', 'STO-3GX'], index['names']['H'], tnm() + ' names')
+
+    basline, start, end = index['blocks'][0]
+    assert compare_strings('\nSTO-3G redefined\n\n  1\n\n', _genbas.encode()[start:end].decode(),
+                           tnm() + ' last appearance')
+
+    bas.clear_cache()
+    assert compare(index['blocks'], bas.genbas_index(genbas_loc)['blocks'], tnm() + ' reloaded')
+
+    with open(genbas_loc, 'a') as handle:
+        handle.write('C:STO-3G\nC minimal\n')
+    assert compare_integers(5, len(bas.genbas_index(genbas_loc)['blocks']), tnm() + ' rebuilt on change')
+
+
+def test_extract_basis_from_genbas():
+    library_genbas_loc = os.sep.join([qcdb.driver.pe.data_dir, 'basis', 'GENBAS'])
+
+    for basis, elem, exact in [('cc-pVTZ', ['C', 'h', 'H'], True), ('cc-pVTZ', ['O', 'H'], False),
+                               ('6-31G*', ['H', 'N'], False), ('PVDZ', ['B', 'C'], True), ('nonesuch', ['H'], False)]:
+        ref = _scan(library_genbas_loc, basis, elem, exact=exact)
+        assert compare_strings(ref, bas.extract_basis_from_genbas(basis, elem, exact=exact), tnm() + ' ' + basis)
+    assert compare_strings(_scan(library_genbas_loc, 'qz2p', ['co']), bas.extract_basis_from_genbas('qz2p', 'co'),
+                           tnm() + ' str elem')
@@ -0,0 +1,74 @@
+import struct
+
+import numpy as np
+import pytest
+from .utils import *
+
+from qcdb.intf_cfour import jajo, harvester
+
+#! JOBARC records are located through JAINDX and returned as views, from
+#! file contents or memory-mapped paths, without CFOUR present.
+
+
+def _jobarc(records, srcints, srcrecs):
+    labels, slot2, lens, body = [], [], [], b''
+    for label, rectype, data in records:
+        if rectype == 'CHARACTER':
+            raw = data
+            nwords = len(data) // 8
+        else:
+            raw = np.asarray(data, dtype='=f8' if rectype == 'DOUBLE' else '=i{}'.format(srcints)).tobytes()
+            nwords = len(data)
+        slot2.append(sum(lens) + 1)
+        labels.append(label)
+        lens.append(nwords)
+        body += raw
+
+    nfill = jajo.nopt - len(labels)
+    ifmt = '=' + {4: 'i', 8: 'q'}[srcints]
+    rfmt = '=' + {4: 'i', 8: 'q'}[srcrecs]
+    jaindx = b''.join([
+        struct.pack(rfmt, 1),
+        b''.join(labels + [b'OPENSLOT'] * nfill),
+        b''.join(struct.pack(ifmt, v) for v in slot2 + [0] * nfill),
+        b''.join(struct.pack(ifmt, v) for v in lens + [0] * nfill),
+        struct.pack(ifmt, 1),
+        struct.pack(rfmt, 1),
+    ])
+    return body, jaindx
+
+
+_h2o = [
+    (b'NATOMS  ', 'INTEGER', [3]),
+    (b'AOOVRLAP', 'DOUBLE', np.linspace(0., 1., 24 * 24)),
+    (b'COORD   ', 'DOUBLE', [0., 0., -0.124, 0., -1.431, 0.986, 0., 1.431, 0.986]),
+    (b'TITLE   ', 'CHARACTER', b'water in c2v    '),
+    (b'ATOMCHRG', 'INTEGER', [8, 1, 1]),
+    (b'MAP2ZMAT', 'INTEGER', [1, 2, 3]),
+]
+
+
+@pytest.mark.parametrize('srcints,srcrecs', [(4, 4), (4, 8), (8, 4), (8, 8)])
+def test_getrec(srcints, srcrecs):
+    bjobarc, bjaindx = _jobarc(_h2o, srcints, srcrecs)
+    recs = jajo.getrec([b'COORD   ', b'ATOMCHRG', b'TITLE   ', b'NATOMS  '], bjobarc, bjaindx)
+
+    assert compare_integers(4, len(recs), tnm() + ' nrec')
+    assert compare_arrays(_h2o[2][2], recs[b'COORD   '], 12, tnm() + ' DOUBLE')
+    assert compare_integers([8, 1, 1], recs[b'ATOMCHRG'].tolist(), tnm() + ' INTEGER')
+    assert compare_integers(3, recs[b'NATOMS  '][0], tnm() + ' NATOMS')
+    assert compare_strings('water in c2v', recs[b'TITLE   '][0].decode().strip(), tnm() + ' CHARACTER')
+    assert compare(False, recs[b'COORD   '].flags.writeable, tnm() + ' view')
+
+
+def test_getrec_paths(tmp_path):
+    bjobarc, bjaindx = _jobarc(_h2o, 4, 4)
+    (tmp_path / 'JOBARC').write_bytes(bjobarc)
+    (tmp_path / 'JAINDX').write_bytes(bjaindx)
+
+    recs = jajo.getrec([b'AOOVRLAP', b'COORD   ', b'ATOMCHRG', b'MAP2ZMAT'], str(tmp_path / 'JOBARC'), tmp_path / 'JAINDX')
+    assert compare_arrays(_h2o[1][2], recs[b'AOOVRLAP'], 12, tnm() + ' mmap')
+
+    mol = harvester.jajo2mol(recs)
+    assert compare_integers(3, len(mol.symbols), tnm() + ' jajo2mol')
+    assert compare_strings('O', mol.symbols[0], tnm() + ' jajo2mol elem')
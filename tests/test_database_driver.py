@@ -0,0 +1,76 @@
+import sys
+import collections
+
+import pytest
+import qcelemental as qcel
+from .utils import *
+
+import qcdb
+
+#! database() over S22 computes each unique reagent geometry once, resumes
+#! from its ledger after an interruption, and assembles reactions by RXNM.
+
+_calls = []
+_fail_after = [None]
+
+
+def _enuc(name, molecule, **kwargs):
+    """Stand-in energy function: a scaled nuclear repulsion energy."""
+
+    _calls.append(molecule.name())
+    if _fail_after[0] is not None and len(_calls) > _fail_after[0]:
+        raise RuntimeError('interrupted')
+    return -1.e-3 * molecule.nuclear_repulsion_energy()
+
+
+def _reference(cp):
+    s22 = sys.modules['S22']
+    actv = s22.ACTV_CP if cp else s22.ACTV
+    rxns = collections.OrderedDict()
+    for rxn in s22.HRXN:
+        dbrxn = 'S22-{}'.format(rxn)
+        rxns[dbrxn] = sum(s22.RXNM[dbrxn][rgt] * -1.e-3 * s22.GEOS[rgt].nuclear_repulsion_energy()
+                          for rgt in actv[dbrxn])
+    return rxns
+
+
+@pytest.mark.parametrize('cp,nunique', [(False, 61), (True, 66)])
+def test_database_s22(tmp_path, cp, nunique):
+    del _calls[:]
+    rec = qcdb.database('enuc', 'S22', func=_enuc, cp=cp, ledger=str(tmp_path / 'ledger'))
+
+    assert compare_integers(nunique, rec['jobs']['unique'], tnm() + ' unique reagents')
+    assert compare_integers(nunique, len(_calls), tnm() + ' computed once')
+    for rxn, ene in _reference(cp).items():
+        assert compare_values(qcel.constants.hartree2kcalmol * ene, rec['reactions'][rxn], 8, tnm() + ' ' + rxn)
+    assert compare_values(sys.modules['S22'].BIND['S22-2'], rec['reference']['S22-2'], 6, tnm() + ' reference')
+
+
+def test_database_resume(tmp_path):
+    ledger = str(tmp_path / 'ledger')
+
+    del _calls[:]
+    _fail_after[0] = 10
+    try:
+        with pytest.raises(RuntimeError):
+            qcdb.database('enuc', 'S22', func=_enuc, subset='HB', ledger=ledger)
+    finally:
+        _fail_after[0] = None
+
+    del _calls[:]
+    rec = qcdb.database('enuc', 'S22', func=_enuc, subset='HB', ledger=ledger)
+    assert compare_integers(10, rec['jobs']['ledger'], tnm() + ' from ledger')
+    assert compare_integers(rec['jobs']['unique'] - 10, len(_calls), tnm() + ' only remainder computed')
+
+    del _calls[:]
+    again = qcdb.database('enuc', 'S22', func=_enuc, subset=[1, '2', 'S22-3'], ledger=ledger)
+    assert compare_integers(0, len(_calls), tnm() + ' nothing computed')
+    assert compare_values(rec['reactions']['S22-3'], again['reactions']['S22-3'], 12, tnm() + ' S22-3')
+
+
+def test_database_parallel(tmp_path):
+    serial = qcdb.database('enuc', 'S22', func=_enuc, subset='small', ledger=False)
+    parallel = qcdb.database('enuc', 'S22', func=_enuc, subset='small', ledger=False, parallel=3)
+    assert compare(['S22-2', 'S22-8', 'S22-16'], list(parallel['reactions']), tnm() + ' subset')
+    for rxn, ene in serial['reactions'].items():
+        assert compare_values(ene, parallel['reactions'][rxn], 12, tnm() + ' ' + rxn)
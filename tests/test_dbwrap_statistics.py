@@ -0,0 +1,74 @@
+import io
+import contextlib
+
+import numpy as np
+import pytest
+from .utils import *
+
+from qcdb import dbwrap
+from qcdb.exceptions import ValidationError
+
+#! Error statistics for many model chemistries and subsets at once from the
+#! reactions x modelchems matrix, against one modelchem and subset at a time.
+
+_mcs = ['MP2-CP-adz', 'SCSMP2-CP-adz', 'B3LYP-CP-adz', 'HF-CP-adz']
+
+
+def _database(tmp_path, helium_dimer_db, complete=False):
+    helium_dimer_db('STATDB', 20, subsets={'near': [3, 7, 11, 12], 'even': range(2, 21, 2)}, shift=-0.0137)
+    rs = np.random.RandomState(7)
+    rxns = list(range(1, 21))
+    columns = {}
+    for mc in _mcs:
+        columns[mc] = -0.1 * np.array(rxns) + rs.normal(0., 0.05, len(rxns))
+        if not complete:
+            columns[mc][rs.uniform(size=len(rxns)) < 0.15] = np.nan
+    dbwrap.ModelchemStore.write(str(tmp_path / 'STATDB_mcs.npz'), rxns, columns)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = dbwrap.Database('STATDB', pythonpath=str(tmp_path))
+        db.load_qcdata_npz('mcs', path=str(tmp_path))
+    return db
+
+
+@pytest.mark.parametrize('benchmark', ['default', 'ZEROS', 'MP2-CP-adz'])
+def test_statistics_matrix_wrapped(tmp_path, helium_dimer_db, benchmark):
+    wdb = _database(tmp_path, helium_dimer_db).dbdict['STATDB']
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        errors = wdb.compute_statistics_matrix(_mcs, benchmark=benchmark, ssets=['default', 'near', 'even'],
+                                               failoninc=False)
+        for ss in ['default', 'near', 'even']:
+            for mc in _mcs:
+                err = wdb.compute_errors(mc, benchmark=benchmark, sset=ss, failoninc=False)
+                ref = wdb.compute_statistics(mc, benchmark=benchmark, sset=ss, failoninc=False)
+                linear = [val[0] for val in err.values()]
+                assert compare_values(sum(map(abs, linear)) / len(linear), ref['mae'], 12, tnm() + ' mae')
+                assert compare_values(max(linear, key=abs), ref['maxe'], 12, tnm() + ' maxe')
+                assert list(ref.items()) == list(errors[ss][mc].items()), tnm() + ' ' + ss + ' ' + mc
+
+
+def test_statistics_matrix_database(tmp_path, helium_dimer_db):
+    db = _database(tmp_path, helium_dimer_db, complete=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        errors = db.compute_statistics_matrix(_mcs)
+        for ss in db.sset.keys():
+            for mc in _mcs:
+                ref = db.compute_statistics(mc, sset=ss)
+                assert list(ref['STATDB'].items()) == list(errors[ss][mc]['STATDB'].items()), tnm() + ' ' + mc
+                assert compare_values(ref['STATDB']['mae'], errors[ss][mc]['STATDB']['mae'], 12, tnm() + ' average')
+
+
+def test_statistics_matrix_incomplete(tmp_path, helium_dimer_db):
+    wdb = _database(tmp_path, helium_dimer_db).dbdict['STATDB']
+
+    with pytest.raises(ValidationError) as e:
+        for mc in _mcs:
+            wdb.compute_errors(mc)
+    with pytest.raises(ValidationError) as e_matrix:
+        wdb.compute_statistics_matrix(_mcs)
+    assert compare_strings(str(e.value), str(e_matrix.value), tnm())
+
+    errors = wdb.compute_statistics_matrix(['CCSD-CP-adz'], failoninc=False)
+    assert errors['default']['CCSD-CP-adz'] == dbwrap.initialize_errors(), tnm() + ' empty'
@@ -0,0 +1,76 @@
+import pickle
+
+import numpy as np
+from .utils import *
+
+from qcdb import dbwrap
+
+#! Columnar npz store of database results, mapped lazily and turned into
+#! ReactionDatum-s only for model chemistries touched by statistics.
+
+
+def _ndatum(wdb):
+    return sum(len(orxn.data) for orxn in wdb.hrxn.values())
+
+
+def test_npz_store_lazy(tmp_path, helium_dimer_db):
+    helium_dimer_db('TSTDB', 4)
+
+    eager = dbwrap.WrappedDatabase('TSTDB', pythonpath=str(tmp_path))
+    for rxn in eager.hrxn:
+        eager.add_ReactionDatum('TSTDB', rxn, 'MP2', 'CP', 'adz', -0.1 * rxn + 0.01 * rxn * rxn)
+        if rxn < 3:
+            eager.add_ReactionDatum('TSTDB', rxn, 'MP2', 'CP', 'atz', -0.1 * rxn + 0.002)
+    eager.save_qcdata_npz('pt2', path=str(tmp_path))
+
+    lazy = dbwrap.WrappedDatabase('TSTDB', pythonpath=str(tmp_path))
+    lazy.load_qcdata_npz('pt2', path=str(tmp_path))
+    assert compare_integers(4, _ndatum(lazy), tnm() + ' only benchmark loaded')
+
+    def column_unread(mc):
+        raise AssertionError('column {} read'.format(mc))
+
+    lazy.qcstores[0].column = column_unread
+    assert compare(['MP2-CP-adz', 'MP2-CP-atz', 'TSTA'], lazy.available_modelchems(), tnm() + ' union')
+    assert compare(['MP2-CP-adz', 'TSTA'], lazy.available_modelchems(union=False), tnm() + ' intersection')
+    del lazy.qcstores[0].column
+
+    for mc in ['MP2-CP-adz', 'MP2-CP-atz']:
+        ref = eager.compute_statistics(mc, failoninc=False)
+        err = lazy.compute_statistics(mc, failoninc=False)
+        for stat in ['mae', 'rmse', 'maxe', 'mape']:
+            assert compare_values(ref[stat], err[stat], 12, tnm() + ' ' + mc + ' ' + stat)
+    assert compare_integers(10, _ndatum(lazy), tnm() + ' touched loaded')
+    assert compare_values(0.04, lazy.hrxn[2].data['MP2-CP-adz'].value - lazy.hrxn[2].data['TSTA'].value, 12,
+                          tnm() + ' value')
+
+    store = pickle.loads(pickle.dumps(lazy.qcstores[0]))
+    column = store.column('MP2-CP-atz')
+    assert compare_arrays([-0.098, -0.198], column[:2], 12, tnm() + ' column')
+    assert compare(True, bool(np.isnan(column[2:]).all()), tnm() + ' column missing')
+
+
+def test_npz_store_columns_only(tmp_path):
+    rxns = [1, 2, 3, 4]
+    columns = {'MP2-CP-adz': np.array([-0.1, np.nan, -0.3, -0.4]), 'MP2-CP-atz': np.full(4, np.nan)}
+    np.savez(str(tmp_path / 'TSTDB_old.npz'), _rxn=np.array([str(rxn) for rxn in rxns]), **columns)
+    dbwrap.ModelchemStore.write(str(tmp_path / 'TSTDB_new.npz'), rxns, columns)
+
+    old = dbwrap.ModelchemStore(str(tmp_path / 'TSTDB_old.npz'))
+    new = dbwrap.ModelchemStore(str(tmp_path / 'TSTDB_new.npz'))
+    assert compare(old.modelchems, new.modelchems, tnm() + ' labels')
+    assert compare(old.presence().tolist(), new.presence().tolist(), tnm() + ' presence')
+    assert compare([[True, False, True, True], [False] * 4], new.presence().tolist(), tnm() + ' mask')
+
+
+def test_npz_store_database(tmp_path, helium_dimer_db):
+    helium_dimer_db('TSTDB', 4)
+    columns = {'SCSMP2-CP-atz': np.array([-0.1, -0.2, -0.3, np.nan])}
+    dbwrap.ModelchemStore.write(str(tmp_path / 'TSTDB_scs.npz'), [1, 2, 3, 4], columns)
+
+    db = dbwrap.Database('TSTDB', pythonpath=str(tmp_path))
+    db.load_qcdata_npz('scs', path=str(tmp_path))
+    assert 'SCSMP2-CP-atz' in db.mcs, tnm() + ' mapped modelchem'
+
+    db.materialize(['TSTA'])
+    assert compare_integers(4, _ndatum(db.dbdict['TSTDB']), tnm() + ' benchmark only')
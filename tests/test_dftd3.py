@@ -2,6 +2,7 @@ import sys
 import copy
 import pprint
 
+import numpy as np
 import pytest
 
 from .utils import *
@@ -11,6 +12,7 @@ import qcelemental as qcel
 
 import qcdb
 from qcdb.intf_dftd3 import runner as dftd3
+from qcdb.intf_dftd3 import native
 
 
 eneyne = """
@@ -171,3 +173,170 @@ def test_11_b():
     assert compare_values(ref_d3bj[1], jrec['qcvars']['DISPERSION CORRECTION ENERGY'].data, 7, tnm)
     assert compare_values(ref_d3bj[1], jrec['qcvars']['B3LYP-D3(BJ) DISPERSION CORRECTION ENERGY'].data, 7, tnm)
 
+
+
+#! In-process NumPy -D3 of intf_dftd3.native against a transcription of the DFTD3
+#! pair loops and finite differences (toy reference parameters), and against the
+#! DFTD3 executable and its reference energies (library reference parameters).
+
+
+def _toy_d3_reference():
+    """H, He, and C reference parameters of made-up values in the layout of native.load_d3_reference.
+    He has a lone reference so far in coordination number that its C6 are the nearest reference's."""
+
+    ref = {
+        'nref': np.zeros(95, dtype=int),
+        'cnref': np.zeros((95, 5)),
+        'c6ref': np.full((95, 95, 5, 5), -1.0),
+        'r0ab': np.zeros((95, 95)),
+        'rcov': np.zeros(95),
+        'r2r4': np.zeros(95),
+    }
+    ref['nref'][[1, 2, 6]] = [2, 1, 3]
+    ref['cnref'][1, :2] = [0.9118, 0.0]
+    ref['cnref'][2, :1] = [8.0]
+    ref['cnref'][6, :3] = [0.0, 1.9985, 3.9844]
+    for (z1, z2), c6 in {
+        (1, 1): [[3.0267, 7.5916], [7.5916, 12.1406]],
+        (1, 2): [[2.8], [4.1]],
+        (1, 6): [[7.2, 6.4, 5.9], [11.5, 10.1, 9.2]],
+        (2, 2): [[1.46]],
+        (2, 6): [[9.0, 8.0, 7.0]],
+        (6, 6): [[49.1, 43.2, 38.0], [43.2, 35.9, 29.4], [38.0, 29.4, 25.6]],
+    }.items():
+        c6 = np.array(c6)
+        ref['c6ref'][z1, z2, :c6.shape[0], :c6.shape[1]] = c6
+        ref['c6ref'][z2, z1, :c6.shape[1], :c6.shape[0]] = c6.T
+    for (z1, z2), r0 in {(1, 1): 4.0, (1, 2): 4.3, (1, 6): 4.8, (2, 2): 4.6, (2, 6): 5.1, (6, 6): 5.4}.items():
+        ref['r0ab'][z1, z2] = ref['r0ab'][z2, z1] = r0
+    ref['rcov'][[1, 2, 6]] = [0.806, 1.159, 1.923]
+    ref['r2r4'][[1, 2, 6]] = [2.007, 1.566, 3.105]
+    return ref
+
+
+def _loop_d3(elez, geom, dashlevel, params, ref):
+    """Energy by the pair loops of DFTD3's ncoord, getc6, and edisp."""
+
+    nat = len(elez)
+    cn = np.zeros(nat)
+    for i in range(nat):
+        for j in range(nat):
+            r2 = np.sum((geom[i] - geom[j])**2)
+            if i != j and r2 <= 1600.:
+                rco = ref['rcov'][elez[i]] + ref['rcov'][elez[j]]
+                cn[i] += 1. / (1. + np.exp(-16. * (rco / np.sqrt(r2) - 1.)))
+
+    ene = 0.
+    for i in range(nat - 1):
+        for j in range(i + 1, nat):
+            zi, zj = elez[i], elez[j]
+            c6mem, rsave, rsum, csum = -1.e99, 1.e99, 0., 0.
+            for a in range(ref['nref'][zi]):
+                for b in range(ref['nref'][zj]):
+                    c6ref = ref['c6ref'][zi, zj, a, b]
+                    if c6ref > 0:
+                        dist = (ref['cnref'][zi, a] - cn[i])**2 + (ref['cnref'][zj, b] - cn[j])**2
+                        if dist < rsave:
+                            rsave, c6mem = dist, c6ref
+                        tmp = np.exp(-4. * dist)
+                        rsum += tmp
+                        csum += tmp * c6ref
+            c6 = csum / rsum if rsum > 1.e-99 else c6mem
+            c8 = 3. * c6 * ref['r2r4'][zi] * ref['r2r4'][zj]
+
+            r = np.sqrt(np.sum((geom[i] - geom[j])**2))
+            if dashlevel == 'd3zero':
+                rr = ref['r0ab'][zi, zj] / r
+                damp6 = 1. / (1. + 6. * (params['sr6'] * rr)**params['alpha6'])
+                damp8 = 1. / (1. + 6. * rr**(params['alpha6'] + 2.))
+                ene -= params['s6'] * c6 * damp6 / r**6 + params['s8'] * c8 * damp8 / r**8
+            else:
+                r0 = params['a1'] * np.sqrt(c8 / c6) + params['a2']
+                ene -= params['s6'] * c6 / (r**6 + r0**6) + params['s8'] * c8 / (r**8 + r0**8)
+    return ene
+
+
+def _eneyne_arrays(extra=''):
+    molrec = qcel.molparse.from_string(seneyne + extra)['qm']
+    return np.array(molrec['elez']), np.array(molrec['geom']).reshape(-1, 3) / qcel.constants.bohr2angstroms
+
+
+@pytest.mark.parametrize('dashlevel,params', [
+    ('d3zero', {'s6': 1.0, 's8': 1.703, 'sr6': 1.261, 'alpha6': 14.0}),
+    ('d3bj', {'s6': 1.0, 's8': 1.9889, 'a1': 0.3981, 'a2': 4.4211}),
+])
+def test_native_toy(dashlevel, params):
+    ref = _toy_d3_reference()
+    elez, geom = _eneyne_arrays(extra='\nHe 0.0 2.5 0.3\nHe 0.3 4.5 0.0\n')
+
+    ene, grad = native.d3_dispersion(elez, geom, dashlevel, params, reference=ref)
+    assert compare_values(_loop_d3(elez, geom, dashlevel, params, ref), ene, 12, tnm() + ' energy')
+
+    fd = np.zeros_like(geom)
+    for at in range(len(elez)):
+        for xyz in range(3):
+            step = np.zeros_like(geom)
+            step[at, xyz] = 1.e-4
+            fd[at, xyz] = (native.d3_dispersion(elez, geom + step, dashlevel, params, do_gradient=False, reference=ref)[0] -
+                           native.d3_dispersion(elez, geom - step, dashlevel, params, do_gradient=False, reference=ref)[0]) / 2.e-4
+    assert compare_arrays(fd, grad, 9, tnm() + ' gradient')
+    assert compare_values(0.0, np.sum(grad), 12, tnm() + ' translation')
+
+    rs = np.random.RandomState(4)
+    batch = geom[None, :, :] + rs.normal(0., 0.05, (5,) + geom.shape)
+    benes, bgrads = native.d3_dispersion(elez, batch, dashlevel, params, reference=ref)
+    for ib in range(5):
+        e1, g1 = native.d3_dispersion(elez, batch[ib], dashlevel, params, reference=ref)
+        assert compare_values(e1, benes[ib], 12, tnm() + ' batch energy')
+        assert compare_arrays(g1, bgrads[ib], 12, tnm() + ' batch gradient')
+
+
+def test_native_run_dftd3(tmp_path, monkeypatch):
+    np.savez(str(tmp_path / 'd3_reference.npz'), **_toy_d3_reference())
+    monkeypatch.setattr(native, 'reference_file', lambda: str(tmp_path / 'd3_reference.npz'))
+
+    sys = qcel.molparse.from_string('@He 0 0 -4\n' + seneyne)['qm']
+    jrec = dftd3.run_dftd3(molrec=sys, functional='b3lyp', dashlevel='d3bj', engine='numpy')
+    assert jrec['success'], jrec['error']
+    assert compare_strings('B3LYP-D3BJ', compute_key(jrec), 'key')
+
+    elez, geom = _eneyne_arrays()
+    ene, grad = native.d3_dispersion(elez, geom, 'd3bj', db3lypd3bj['dashparams'], reference=_toy_d3_reference())
+    assert compare_values(ene, jrec['qcvars']['B3LYP-D3(BJ) DISPERSION CORRECTION ENERGY'].data, 12, tnm() + ' energy')
+    assert compare_arrays(np.vstack([np.zeros((1, 3)), grad]), jrec['qcvars']['DISPERSION CORRECTION GRADIENT'].data,
+                          12, tnm() + ' ghost gradient')
+
+    eneyne = qcdb.Molecule(seneyne)
+    eneyne.update_geometry()
+    E, G = eneyne.run_dftd3('b3lyp-d3(bj)', engine='numpy')
+    assert compare_values(ene, E, 10, tnm() + ' Molecule energy')
+    assert compare_values(ene, eneyne.run_dftd3('b3lyp', 'd3bj', dertype=0, engine='numpy'), 10, tnm() + ' energy only')
+
+    with pytest.raises(qcdb.ValidationError):
+        native.d3_dispersion(elez, geom, 'd3mzero', {}, reference=_toy_d3_reference())
+    assert not dftd3.run_dftd3(molrec=sys, functional='b3lyp', dashlevel='d2', engine='numpy')['success']
+
+
+@pytest.mark.parametrize('fctl,dashlevel,refs', [
+    ('b3lyp', 'd3zero', ref_d3zero),
+    ('b3lyp', 'd3bj', ref_d3bj),
+    ('pbe', 'd3zero', ref_pbe_d3zero),
+    ('pbe', 'd3bj', ref_pbe_d3bj),
+])
+def test_native_library(fctl, dashlevel, refs):
+    eneyne = qcdb.Molecule(seneyne)
+    eneyne.update_geometry()
+    for mol, refene in zip([eneyne, eneyne.extract_subsets(1), eneyne.extract_subsets(2)], refs):
+        assert compare_values(refene, mol.run_dftd3(fctl, dashlevel, dertype=0, engine='numpy'), 7, tnm())
+
+
+@using_dftd3
+@pytest.mark.parametrize('dashlevel', ['d3zero', 'd3bj'])
+def test_native_vs_executable(dashlevel):
+    eneyne = qcdb.Molecule(seneyne)
+    eneyne.update_geometry()
+
+    E, G = eneyne.run_dftd3('b3lyp', dashlevel)
+    nE, nG = eneyne.run_dftd3('b3lyp', dashlevel, engine='numpy')
+    assert compare_values(E, nE, 9, tnm() + ' energy')
+    assert compare_arrays(G, nG, 8, tnm() + ' gradient')
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+from qcelemental import Datum
+
+from .utils import *
+
+from qcdb.driver import driver_util
+
+#! Finite-difference displacements run concurrently fill in the same
+#! energies and gradients, and return the same reference record, as serially.
+
+
+def fake_process_displacement(derivfunc, method, molecule, displacement, n, ndisp, **kwargs):
+    """Stand-in for `driver_util._process_displacement` with a model energy of the displaced geometry."""
+
+    geom = np.asarray(displacement['geometry'])
+    displacement['energy'] = float(np.dot(geom, geom))
+    displacement['gradient'] = 2. * geom
+
+    jobrec = {
+        'qcvars': {'CURRENT ENERGY': Datum('CURRENT ENERGY', 'Eh', displacement['energy'])},
+        'options': 'not returned',
+        'n': n,
+        'pid': os.getpid(),
+        'write_orbitals': kwargs.get('write_orbitals', True),
+    }
+    if n != 1:
+        # unpicklable, so displaced records must stay in their workers
+        jobrec['local'] = lambda: None
+
+    return jobrec
+
+
+def _findif_meta_dict():
+    rs = np.random.RandomState(5)
+    return {
+        'reference': {'geometry': rs.uniform(-1., 1., 6)},
+        'displacements': {'{}: {}'.format(i, s): {'geometry': rs.uniform(-1., 1., 6)} for i in range(4) for s in [-1, 1]},
+    }
+
+
+def test_parallel_matches_serial(monkeypatch):
+    monkeypatch.setattr(driver_util, '_process_displacement', fake_process_displacement)
+
+    serial = _findif_meta_dict()
+    sjobrec = driver_util._process_displacements(None, 'fake', None, serial, nproc=1)
+    parallel = _findif_meta_dict()
+    pjobrec = driver_util._process_displacements(None, 'fake', None, parallel, nproc=3)
+
+    for asp in ['energy', 'gradient']:
+        assert compare_values(serial['reference'][asp], parallel['reference'][asp], 12, tnm() + ' ref ' + asp)
+        for key, disp in serial['displacements'].items():
+            assert compare_values(disp[asp], parallel['displacements'][key][asp], 12, tnm() + ' ' + key + ' ' + asp)
+
+    for jobrec in [sjobrec, pjobrec]:
+        assert compare_integers(1, jobrec['n'], tnm() + ' reference record')
+        assert 'options' not in jobrec, tnm() + ' options'
+        assert compare(True, jobrec['write_orbitals'], tnm() + ' reference orbitals')
+    assert compare_values(serial['reference']['energy'], pjobrec['qcvars']['CURRENT ENERGY'].data, 12,
+                          tnm() + ' reference energy')
+    assert compare_integers(os.getpid(), sjobrec['pid'], tnm() + ' serial')
+    assert os.getpid() != pjobrec['pid'], tnm() + ' forked'
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from .utils import *
+
+import qcdb
+
+#! Cached geometry arrays are private to the Molecule and refreshed upon
+#! any change to coordinates, variables, units, or fragment activity.
+
+zmat = """
+O
+H 1 roh
+H 1 roh 2 aoh
+roh = 0.96
+aoh = 104.5
+no_reorient
+no_com
+"""
+
+
+@pytest.fixture
+def mol():
+    mol = qcdb.Molecule(zmat)
+    mol.update_geometry()
+    return mol
+
+
+def _reference(mol):
+    return np.asarray([mol.atoms[at].compute() for at in range(mol.natom())]) * mol.input_units_to_au()
+
+
+def test_returned_copy(mol):
+    geom = mol.geometry(np_out=True)
+    geom[0, 0] = 100.
+    assert compare_arrays(_reference(mol), mol.geometry(np_out=True), 10, tnm() + ' geometry')
+    assert compare_arrays(_reference(mol)[1], mol.xyz(1), 10, tnm() + ' xyz')
+
+
+def test_set_geometry(mol):
+    geom = mol.geometry(np_out=True)
+    geom[2] += [0.1, 0.2, 0.3]
+    mol.set_geometry(geom)
+    assert compare_arrays(geom, mol.geometry(np_out=True), 10, tnm())
+
+
+def test_translate(mol):
+    geom = mol.geometry(np_out=True)
+    mol.translate([1.0, 0.0, -1.0])
+    assert compare_arrays(geom + [1.0, 0.0, -1.0], mol.geometry(np_out=True), 10, tnm())
+
+
+def test_set_variable(mol):
+    mol.set_variable('roh', 1.06)
+    assert compare_values(1.06 * mol.input_units_to_au(), np.linalg.norm(mol.xyz(1, np_out=True)), 8, tnm())
+    assert compare_arrays(_reference(mol), mol.geometry(np_out=True), 10, tnm() + ' geometry')
+
+
+def test_fragments():
+    dimer = qcdb.Molecule("""\nNe 0 0 0\n--\nAr 0 0 3\nno_com\nno_reorient\n""")
+    dimer.update_geometry()
+    assert compare_integers(2, dimer.natom(), tnm() + ' both')
+    dimer.deactivate_all_fragments()
+    dimer.set_active_fragment(2)
+    dimer.update_geometry()
+    assert compare_integers(1, dimer.geometry(np_out=True).shape[0], tnm() + ' active')
+    assert compare_integers(2, dimer.full_geometry(np_out=True).shape[0], tnm() + ' full')
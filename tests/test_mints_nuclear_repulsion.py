@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from .utils import *
+
+import qcdb
+
+#! Nuclear repulsion energy and its first and second derivatives, with
+#! ghosted and deactivated fragments, against pair loops and finite differences.
+
+s22_2 = """
+0 1
+O  -1.551007  -0.114520   0.000000
+H  -1.934259   0.762503   0.000000
+H  -0.599677   0.040712   0.000000
+--
+0 1
+O   1.350625   0.111469   0.000000
+H   1.680398  -0.373741  -0.758561
+H   1.680398  -0.373741   0.758561
+--
+He 4 4 4
+"""
+
+
+def _loop_nre(mol):
+    e = 0.0
+    for at1 in range(mol.natom()):
+        for at2 in range(at1):
+            ZZ = mol.Z(at1) * mol.Z(at2)
+            if ZZ:
+                e += ZZ / np.linalg.norm(mol.xyz(at1, np_out=True) - mol.xyz(at2, np_out=True))
+    return e
+
+
+def _fd(mol, fn, h=1.e-4):
+    geom = mol.geometry(np_out=True)
+    fd = []
+    for k in range(geom.size):
+        val = []
+        for step in [h, -h]:
+            dgeom = geom.copy()
+            dgeom.flat[k] += step
+            mol.set_geometry(dgeom)
+            val.append(np.ravel(fn()))
+        fd.append((val[0] - val[1]) / (2 * h))
+    mol.set_geometry(geom)
+    return np.array(fd).T
+
+
+@pytest.fixture(params=['whole', 'ghost', 'absent'])
+def mol(request):
+    mol = qcdb.Molecule(s22_2)
+    if request.param == 'ghost':
+        mol.set_ghost_fragment(2)
+    elif request.param == 'absent':
+        mol.deactivate_all_fragments()
+        mol.set_active_fragments([2, 3])
+    mol.update_geometry()
+    return mol
+
+
+def test_nre(mol):
+    assert compare_values(_loop_nre(mol), mol.nuclear_repulsion_energy(), 10, tnm())
+
+
+def test_nre_deriv1(mol):
+    de = mol.nuclear_repulsion_energy_deriv1(np_out=True)
+    fd = _fd(mol, mol.nuclear_repulsion_energy)
+
+    assert compare_integers(mol.natom(), de.shape[0], tnm() + ' shape')
+    assert compare_arrays(fd.reshape(-1, 3), de, 6, tnm())
+    assert compare_arrays(np.zeros(3), de.sum(axis=0), 10, tnm() + ' translation')
+
+
+def test_nre_deriv2(mol):
+    hess = mol.nuclear_repulsion_energy_deriv2(np_out=True)
+    fd = _fd(mol, lambda: mol.nuclear_repulsion_energy_deriv1(np_out=True))
+
+    assert compare_arrays(fd, hess, 6, tnm())
+    assert compare_arrays(hess.T, hess, 12, tnm() + ' symmetric')
+    assert compare_arrays(np.zeros(3 * mol.natom()), hess.sum(axis=0), 10, tnm() + ' translation')
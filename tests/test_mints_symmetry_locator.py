@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from .utils import *
+
+import qcdb
+from qcdb.molecule.atomlocator import AtomLocator
+
+#! Vectorized atom lookup and symmetry element screening agree with
+#! atom-by-atom lookup, and reorient large symmetric clusters.
+
+
+def _d2h_cluster(nuniq, seed=5):
+    rs = np.random.RandomState(seed)
+    octant = np.abs(rs.randn(nuniq, 3) * 3) + 0.2
+    pts = np.vstack([octant * [sx, sy, sz] for sx in [1, -1] for sy in [1, -1] for sz in [1, -1]])
+    rot, _ = np.linalg.qr(rs.randn(3, 3))
+    pts = pts.dot(rot.T) + [0.3, -0.2, 0.1]
+    elem = ['C', 'N', 'O']
+    return '\n'.join('{} {:.14f} {:.14f} {:.14f}'.format(elem[i % nuniq % 3], *xyz)
+                     for i, xyz in enumerate(pts)) + '\nunits bohr\n'
+
+
+def test_locate_matches_atom_at_position():
+    mol = qcdb.Molecule(_d2h_cluster(10))
+    geom = mol.geometry(np_out=True)
+    locator = AtomLocator(geom, np.zeros(mol.natom()), 0.05)
+
+    rs = np.random.RandomState(3)
+    points = np.vstack([geom + rs.uniform(-0.03, 0.03, geom.shape), rs.uniform(-5, 5, (40, 3))])
+    ref = [mol.atom_at_position(pt, 0.05) for pt in points]
+
+    assert compare_integers(ref, locator.locate(points).tolist(), tnm())
+
+
+def test_admissible_keeps_true_elements():
+    mol = qcdb.Molecule(_d2h_cluster(10))
+    locator = mol._atom_locator(1.e-8)
+
+    keep = locator.admissible([0, 0, 0], np.eye(3), 2)
+    assert compare_integers([1, 1, 1], keep.astype(int).tolist(), tnm() + ' C2 and sigma')
+    keep = locator.admissible([0, 0, 0], [[0.6, 0.8, 0.0]], 2)
+    assert compare_integers(0, int(keep[0]), tnm() + ' off-axis')
+
+
+def test_large_cluster_frame():
+    mol = qcdb.Molecule(_d2h_cluster(60))
+
+    assert compare_strings('d2h', mol.schoenflies_symbol(), tnm() + ' pg')
+    assert compare_integers(60, mol.nunique(), tnm() + ' nunique')
+    assert compare_arrays(np.eye(3), np.abs(mol.symmetry_frame()), 10, tnm() + ' frame')
+
+
+def test_admissible_large_cluster():
+    mol = qcdb.Molecule(_d2h_cluster(200))
+    locator = mol._atom_locator(0.01)
+
+    assert compare(True, locator.distinct, tnm() + ' distinct')
+    keep = locator.admissible([0, 0, 0], [[0.6, 0.8, 0.0]], 2)
+    assert compare_integers(0, int(keep[0]), tnm() + ' off-axis')
+
+    geom = mol.geometry(np_out=True)
+    geom[1] = geom[0] + [0.015, 0.0, 0.0]
+    assert compare(False, AtomLocator(geom, np.zeros(mol.natom()), 0.01).distinct, tnm() + ' close pair')
+    labels = np.zeros(mol.natom())
+    labels[1] = 1
+    assert compare(True, AtomLocator(geom, labels, 0.01).distinct, tnm() + ' close pair inequivalent')
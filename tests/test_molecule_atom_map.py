@@ -0,0 +1,92 @@
+import io
+import contextlib
+
+import numpy as np
+import pytest
+from .utils import *
+
+import qcdb
+from qcdb.molecule.libmintsmolecule import compute_atom_map
+
+#! Atom maps under the point group from all operations applied at once,
+#! against applying each operation to each atom and scanning for its image.
+
+
+def _atomwise_atom_map(mol, tol):
+    ct = mol.point_group().char_table()
+    atom_map = []
+    for at in range(mol.natom()):
+        ac = mol.xyz(at)
+        row = []
+        for g in range(ct.order()):
+            so = ct.symm_operation(g)
+            row.append(mol.atom_at_position([sum(so[ii][jj] * ac[jj] for jj in range(3)) for ii in range(3)], tol))
+        atom_map.append(row)
+    return atom_map
+
+
+def _d2h_cloud(nunique, rs):
+    pts = rs.uniform(0.5, 6., (nunique, 3))
+    signs = np.array([[a, b, c] for a in (1, -1) for b in (1, -1) for c in (1, -1)])
+    xyz = (pts[:, None, :] * signs[None, :, :]).reshape(-1, 3)
+    return '\n'.join(['C {:.10f} {:.10f} {:.10f}'.format(*row) for row in xyz] + ['units bohr'])
+
+
+_c2h4 = """
+C 0 0  0.6695
+C 0 0 -0.6695
+H 0  0.9289  1.2321
+H 0 -0.9289  1.2321
+H 0  0.9289 -1.2321
+H 0 -0.9289 -1.2321
+"""
+
+_nh3 = """
+N  0     0     0.1
+H  0.94  0    -0.3
+H -0.47  0.81 -0.3
+H -0.47 -0.81 -0.3
+"""
+
+
+@pytest.mark.parametrize('geom', [_c2h4, _nh3, 'He 0 0 0', _d2h_cloud(12, np.random.RandomState(5))])
+def test_atom_map(geom):
+    mol = qcdb.Molecule(geom)
+    mol.update_geometry()
+
+    for tol in [0.05, 0.5]:
+        assert compare(_atomwise_atom_map(mol, tol), compute_atom_map(mol, tol), tnm() + ' map')
+    assert compare(True, mol.valid_atom_map(), tnm() + ' valid')
+
+    if mol.natom() > 1:
+        shift = np.zeros((mol.natom(), 3))
+        shift[0] = [0.02, 0.03, 0.04]
+        shifted = mol.clone()
+        shifted.fix_orientation(True)
+        shifted.fix_com(True)
+        shifted.set_geometry(mol.geometry(np_out=True) + shift)
+        assert compare(False, shifted.valid_atom_map(0.01), tnm() + ' invalid')
+        with contextlib.redirect_stdout(io.StringIO()):
+            with pytest.raises(qcdb.ValidationError):
+                compute_atom_map(shifted, 0.01)
+
+
+def test_symmetrize():
+    mol = qcdb.Molecule(_d2h_cloud(6, np.random.RandomState(6)))
+    mol.update_geometry()
+    mol.fix_orientation(True)
+    mol.fix_com(True)
+    noisy = mol.geometry(np_out=True) + np.random.RandomState(7).normal(0., 1.e-3, (mol.natom(), 3))
+    mol.set_geometry(noisy)
+    assert compare(False, mol.valid_atom_map(1.e-6), tnm() + ' noisy')
+
+    ct = mol.point_group().char_table()
+    atom_map = _atomwise_atom_map(mol, 0.05)
+    ref = np.zeros_like(noisy)
+    for at in range(mol.natom()):
+        for g in range(ct.order()):
+            ref[at] += np.asarray(ct.symm_operation(g).d).dot(noisy[atom_map[at][g]]) / ct.order()
+
+    mol.symmetrize(0.05)
+    assert compare_arrays(ref, mol.geometry(np_out=True), 12, tnm() + ' symmetrized')
+    assert compare(True, mol.valid_atom_map(1.e-6), tnm() + ' symmetric')
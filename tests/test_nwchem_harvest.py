@@ -0,0 +1,90 @@
+import pytest
+from .utils import *
+
+from qcdb.intf_nwchem import harvester
+
+#! Single-scan harvest of NWChem output agrees with matching each quantity's
+#! pattern separately, and takes the final step of long optimizations.
+
+_step = """
+                             Geometry "geometry" -> ""
+                             -------------------------
+
+ Output coordinates in a.u. (scale by  1.000000000 to convert to a.u.)
+
+  No.       Tag          Charge          X              Y              Z
+ ---- ---------------- ---------- -------------- -------------- --------------
+    1 O                    8.0000     0.00000000     0.00000000     {oz:.8f}
+    2 H                    1.0000     0.00000000     1.43042809    -0.88572213
+    3 H                    1.0000     0.00000000    -1.43042809    -0.88572213
+
+          Charge           :     0
+          Spin multiplicity:     1
+
+      Effective nuclear repulsion energy (a.u.)       9.1681932964
+
+         Total SCF energy =    {escf:.12f}
+
+                         RHF ENERGY GRADIENTS
+
+    atom               coordinates                        gradient
+                 x          y          z           x          y          z
+   1 O       0.000000   0.000000   0.418444    0.000000   0.000000  {gz:.6f}
+   2 H       0.000000   2.703142  -1.673776    0.000000   0.002170   0.013515
+   3 H       0.000000  -2.703142  -1.673776    0.000000  -0.002170   0.013515
+
+"""
+
+_mp2_ccsd = """
+          -------------------------------------------
+          SCF energy         -76.026632730183
+          Correlation energy  -0.201321323412
+          Singlet pairs       -0.151321323412
+          Triplet pairs       -0.050000000000
+          Total MP2 energy   -76.227954053595
+          -------------------------------------------
+
+ -----------
+ CCSD Energy
+ -----------
+ Reference energy:            -76.026632730183
+ CCSD corr. energy:            -0.210950829934
+ Total CCSD energy:           -76.237583560117
+
+  ----------------------------------------------------------------------------
+  Root   2 triplet a2             0.369141740 a.u.               10.0448 eV
+  ----------------------------------------------------------------------------
+     Transition Moments                    Spin forbidden
+
+  ----------------------------------------------------------------------------
+  Root   3 triplet b1             0.469141740 a.u.               12.0448 eV
+  ----------------------------------------------------------------------------
+     Transition Moments                    Spin forbidden
+"""
+
+
+def _opt_log(nstep):
+    steps = [_step.format(oz=0.2214 + 0.001 * i, escf=-76.0266 - 0.0001 * i, gz=-0.02 + 0.001 * i) for i in range(nstep + 1)]
+    return ' Line search:\n      step= 1.00 grad=-1.2D-03 energy=    -76.026633 mode=accept\n'.join(steps)
+
+
+def test_scan_agrees_per_pattern():
+    outtext = _opt_log(0) + _mp2_ccsd + '\n\n' + _mp2_ccsd.replace('\n', '\n\n', 7)
+    found = harvester._scan(outtext)
+
+    for name, lead, findall, pattern in harvester._quantities:
+        if findall:
+            assert compare(pattern.findall(outtext), found[name], tnm() + ' ' + name)
+        else:
+            ref = pattern.search(outtext)
+            assert compare(ref and ref.groups(), found[name] and found[name].groups(), tnm() + ' ' + name)
+    assert compare_integers(4, len(found['tddft spin forbidden']), tnm() + ' findall')
+
+
+@pytest.mark.parametrize('nstep', [0, 3, 12])
+def test_final_step(nstep):
+    psivar, mol, grad, version, error = harvester.harvest_output(_opt_log(nstep))
+
+    assert compare_values(-76.0266 - 0.0001 * nstep, psivar['CURRENT ENERGY'], 9, tnm() + ' energy')
+    assert compare_values(0.2214 + 0.001 * nstep, mol.geometry()[0][2], 8, tnm() + ' geometry')
+    assert compare_values(-0.02 + 0.001 * nstep, grad[0][2], 6, tnm() + ' gradient')
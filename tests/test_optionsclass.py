@@ -226,3 +226,56 @@ def test_24():
     energy()
     assert subjects.scroll['QCDB']['SCF_E_CONV'].value == 1.e-5
 
+
+
+def test_25_resolved_value_refreshed():
+    subjects = RottenOptions()
+    subjects.add('qcdb', RottenOption(keyword='scf_e_conv', default=5, validator=parsers.parse_convergence))
+    subject = subjects.scroll['QCDB']['SCF_E_CONV']
+
+    assert subject.value == 1.e-5
+    subjects.require('qcdb', 'scf_e_conv', 7, 1234)
+    assert subject.value == 1.e-7
+    subjects.suggest('qcdb', 'scf_e_conv', 8, 1235)
+    assert subject.value == 1.e-7
+    subjects.unwind_by_accession(1234)
+    assert subject.value == 1.e-8
+    subjects.unwind_by_accession(1235)
+    assert subject.value == 1.e-5
+
+
+def test_26_changed_index():
+    subjects = RottenOptions()
+    for kw in ['opt_c', 'opt_a', 'opt_b']:
+        subjects.add('qcdb', RottenOption(keyword=kw, default=6, validator=validator))
+
+    assert subjects.changed('qcdb') == {}
+    subjects.require('qcdb', 'opt_b', 7, 1234)
+    subjects.require('qcdb', 'opt_c', 8, 1235)
+    assert list(subjects.changed('qcdb')) == ['OPT_C', 'OPT_B']
+
+    subjects.scroll['QCDB']['OPT_A'].require(9)
+    assert list(subjects.changed('QCDB')) == ['OPT_C', 'OPT_A', 'OPT_B']
+
+    subjects.unwind_by_accession(1235)
+    assert list(subjects.changed('qcdb')) == ['OPT_A', 'OPT_B']
+    assert subjects.changed('qcdb') == {k: v for k, v in subjects.scroll['QCDB'].items() if v.disputed()}
+
+
+def test_27_snapshot_independent():
+    subjects = RottenOptions()
+    subjects.add('qcdb', RottenOption(keyword='opt_a', default=6, validator=validator))
+    subjects.add('qcdb', RottenOption(keyword='opt_b', default=6, validator=validator))
+    subjects.require('qcdb', 'opt_a', 7, 1234)
+
+    twin = subjects.snapshot()
+    twin.require('qcdb', 'opt_b', 8, 1235)
+    twin.unwind_by_accession(1234)
+    subjects.require('qcdb', 'opt_a', 9, 1236)
+
+    assert subjects.scroll['QCDB']['OPT_A'].value == 9
+    assert subjects.scroll['QCDB']['OPT_B'].value == 6
+    assert list(subjects.changed('qcdb')) == ['OPT_A']
+    assert twin.scroll['QCDB']['OPT_A'].value == 6
+    assert twin.scroll['QCDB']['OPT_B'].value == 8
+    assert list(twin.changed('qcdb')) == ['OPT_B']
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from .utils import *
+
+from qcdb.exceptions import ParsingValidationError
+from qcdb.pdict import PreservingDict
+
+#! PreservingDict keeps the most precise of agreeing values, whether set
+#! one at a time or staged and reconciled together.
+
+
+def _sets(psivar):
+    psivar['scf total energy'] = '-76.0266327'
+    psivar['scf total energy'] = '-76.02663273010'
+    psivar['scf total energy'] = '-76.026633'
+    psivar['current energy'] = '-1.0'
+    psivar['current energy'] = '-76.1'
+    psivar['gradient'] = np.ones((2, 3))
+    psivar['gradient'] = np.ones((2, 3)) + 1.e-7
+
+
+@pytest.mark.parametrize('defer', [False, True])
+def test_precision(defer):
+    psivar = PreservingDict(defer=defer)
+    _sets(psivar)
+
+    assert compare_strings('-76.02663273010', str(psivar['SCF TOTAL ENERGY']), tnm() + ' most digits')
+    assert compare_strings('-76.1', str(psivar['CURRENT ENERGY']), tnm() + ' current')
+    assert compare_arrays(np.ones((2, 3)) + 1.e-7, psivar['GRADIENT'], 9, tnm() + ' array')
+    assert compare_integers(3, len(psivar), tnm() + ' len')
+
+
+def test_deferred_validation():
+    psivar = PreservingDict()
+    with pytest.raises(ParsingValidationError):
+        with psivar.deferred():
+            psivar['mp2 total energy'] = '-76.2000'
+            psivar['mp2 total energy'] = '-76.3000'
+            assert compare_integers(0, dict.__len__(psivar), tnm() + ' staged')
+
+    psivar = PreservingDict()
+    with pytest.raises(ParsingValidationError):
+        psivar.bulk_update([('grad', np.zeros(3)), ('grad', np.ones(3))])
+
+
+def test_read_reconciles():
+    psivar = PreservingDict(defer=True)
+    psivar['hf total energy'] = '-76.02'
+    assert 'HF TOTAL ENERGY' in psivar
+    psivar['hf total energy'] = '-76.0200001'
+    assert compare_strings('-76.0200001', str(psivar['HF TOTAL ENERGY']), tnm())
+
+
+def test_mutators_reconcile():
+    psivar = PreservingDict(defer=True)
+    psivar['x'] = '1.0'
+    assert compare(True, psivar == PreservingDict({'X': '1.0'}), tnm() + ' eq')
+    assert compare(False, psivar != PreservingDict({'X': '1.0'}), tnm() + ' ne')
+
+    other = PreservingDict(defer=True)
+    other['x'] = '1.0'
+    assert compare(True, PreservingDict({'X': '1.0'}) == other, tnm() + ' eq staged other')
+
+    del psivar['X']
+    assert compare_integers(0, len(psivar), tnm() + ' del')
+
+    psivar['y'] = '2.0'
+    assert compare_strings('Y', psivar.popitem()[0], tnm() + ' popitem')
+
+    psivar['z'] = '3.0'
+    psivar.clear()
+    assert compare_integers(0, len(psivar), tnm() + ' clear')
+
+
+def test_array_not_copied():
+    grad = np.arange(6.).reshape(2, 3)
+    psivar = PreservingDict({'current gradient': grad})
+    assert psivar['CURRENT GRADIENT'] is grad
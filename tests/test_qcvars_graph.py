@@ -0,0 +1,74 @@
+import random
+
+from .utils import *
+
+from qcdb.pdict import PreservingDict
+from qcdb.qcvars import build_out, wfn_graph, sapt_graph
+from qcdb.qcvars.psivardefs import wfn_psivars
+
+#! QCVariable rules compiled into a graph build the same or more variables
+#! as one pass through wfn_psivars() and answer what a variable needs.
+
+
+def _sweep(rawvars):
+    """One pass through the rules in order of listing, as build_out once did."""
+
+    for action in wfn_psivars():
+        if all(pv in rawvars for pv in action['args'] if isinstance(pv, str)):
+            args = [rawvars[pv] if isinstance(pv, str) else pv for pv in action['args']]
+            rawvars.__setitem__(action['form'], action['func'](args), 6)
+
+
+_hf = '-76.02663273'
+_mp2corr = '-0.20399178'
+_mp3corr = '-0.20791893'
+
+
+def test_build_out_matches_sweep():
+    rs = random.Random(3)
+    variables = sorted(set(pv for action in wfn_psivars() for pv in action['args'] if isinstance(pv, str)))
+
+    nagree = 0
+    for trial in range(200):
+        vals = {k: '{:.8f}'.format(rs.uniform(-2., -0.001)) for k in rs.sample(variables, rs.randint(1, 12))}
+        ref = PreservingDict(vals)
+        try:
+            _sweep(ref)
+        except Exception:
+            continue
+        qcvars = PreservingDict(vals)
+        build_out(qcvars, verbose=0)
+        assert all(qcvars[k] == v for k, v in ref.items()), tnm()
+        nagree += 1
+
+    assert nagree > 100, tnm()
+
+
+def test_build_out_order_independent():
+    vals = {
+        'MP3 TOTAL ENERGY': '-76.23455166',
+        'MP3 CORRELATION ENERGY': _mp3corr,
+        'MP2 CORRELATION ENERGY': _mp2corr,
+    }
+    ref = PreservingDict(vals)
+    _sweep(ref)
+    assert 'MP2 TOTAL ENERGY' not in ref, tnm() + ' sweep'
+
+    qcvars = PreservingDict(vals)
+    build_out(qcvars, verbose=0)
+    assert compare_values(float(_hf), qcvars['HF TOTAL ENERGY'], 8, tnm() + ' HF')
+    assert compare_values(float(_hf) + float(_mp2corr), qcvars['MP2 TOTAL ENERGY'], 8, tnm() + ' MP2')
+
+
+def test_requires():
+    graph = wfn_graph()
+    assert graph.requires('SCS-MP2 TOTAL ENERGY', depth=1) == [{'HF TOTAL ENERGY', 'SCS-MP2 CORRELATION ENERGY'}]
+
+    alts = graph.requires('SCS-MP2 TOTAL ENERGY', available=['HF TOTAL ENERGY'])
+    assert {'SCS-MP2 CORRELATION ENERGY'} in alts, tnm()
+    assert {'MP2 CORRELATION ENERGY', 'MP2 SAME-SPIN CORRELATION ENERGY', 'MP2 SINGLES ENERGY'} in alts, tnm()
+    assert not any(a < b for a in alts for b in alts), tnm() + ' minimal'
+
+    assert 'MP2 SAME-SPIN CORRELATION ENERGY' in graph.inputs('SCS-MP2 TOTAL ENERGY'), tnm()
+    assert graph.requires('NOT A QCVARIABLE') == [], tnm()
+    assert 'SAPT EXCH10 ENERGY' in sapt_graph().inputs('SAPT EXCHSCAL'), tnm()
@@ -0,0 +1,147 @@
+import os
+import pytest
+from qcelemental import Datum
+
+from .utils import *
+
+import qcdb
+from qcdb.driver import pe, resultcache
+from qcdb.driver.proc_table import procedures
+
+#! Repeated computations are answered from the on-disk result cache
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    """Register a counting stand-in program and point the cache at `tmp_path`."""
+
+    calls = []
+
+    def run_fake(name, molecule, options, **kwargs):
+        calls.append(options.scroll['QCDB']['BASIS'].value)
+        ene = -1.0 - 0.01 * len(calls)
+        return {
+            'molecule': molecule.to_dict(np_out=False),
+            'qcvars': {'CURRENT ENERGY': Datum('CURRENT ENERGY', 'Eh', ene)},
+            'provenance': [{'creator': 'fake', 'version': '0', 'routine': 'run_fake'}],
+            'raw_output': 'fake output',
+            'success': True,
+        }
+
+    monkeypatch.setitem(procedures['energy'], 'fakepkg', {'fake': run_fake})
+    pe.load_nu_options()
+    qcdb.set_options({'result_cache': True, 'result_cache_dir': str(tmp_path / 'cache'), 'basis': 'cc-pvdz'})
+    resultcache.reset_stats()
+
+    return calls
+
+
+def h2(r=0.74):
+    return qcdb.Molecule("""\nH\nH 1 {}\n""".format(r))
+
+
+def test_hit(fake):
+    e1, jrec1 = qcdb.energy('fake', package='fakepkg', molecule=h2(), return_wfn=True)
+    e2, jrec = qcdb.energy('fake', package='fakepkg', molecule=h2(), return_wfn=True)
+
+    assert compare_values(e1, e2, 12, tnm() + ' energy')
+    assert compare_integers(1, len(fake), tnm() + ' runs')
+    assert compare_integers(1, resultcache.stats['hits'], tnm() + ' hits')
+    assert compare_integers(1, resultcache.stats['misses'], tnm() + ' misses')
+    assert compare(jrec1['provenance'], jrec['provenance'], tnm() + ' provenance')
+    assert compare_strings('fake output', jrec['raw_output'], tnm() + ' record')
+
+
+@pytest.mark.parametrize('slot', ['options', 'extras'])
+def test_hit_with_options(fake, monkeypatch, slot):
+    """Records carrying an options snapshot, as the psi4/nwchem or cfour/gamess runners leave, are cached."""
+
+    run_fake = procedures['energy']['fakepkg']['fake']
+
+    def run_snapshotting(name, molecule, options, **kwargs):
+        jobrec = run_fake(name, molecule, options, **kwargs)
+        if slot == 'options':
+            jobrec['options'] = options.snapshot()
+        else:
+            jobrec['extras'] = {'qcdb:options': options.snapshot()}
+        return jobrec
+
+    monkeypatch.setitem(procedures['energy'], 'fakepkg', {'fake': run_snapshotting})
+    e1 = qcdb.energy('fake', package='fakepkg', molecule=h2())
+    e2, jrec = qcdb.energy('fake', package='fakepkg', molecule=h2(), return_wfn=True)
+
+    assert compare_values(e1, e2, 12, tnm() + ' energy')
+    assert compare_integers(1, len(fake), tnm() + ' runs')
+    assert compare_integers(1, resultcache.stats['stores'], tnm() + ' stores')
+    assert compare_integers(1, resultcache.stats['hits'], tnm() + ' hits')
+    opts = jrec['options'] if slot == 'options' else jrec['extras']['qcdb:options']
+    assert compare_strings('CC-PVDZ', opts.scroll['QCDB']['BASIS'].value, tnm() + ' options')
+
+
+def test_miss_on_program_version(fake, monkeypatch):
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+    monkeypatch.setattr(resultcache, 'program_version', lambda program: '2.0')
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+
+    assert compare_integers(2, len(fake), tnm() + ' runs')
+    assert compare_integers(0, resultcache.stats['hits'], tnm() + ' hits')
+
+
+@pytest.mark.parametrize('change', [
+    lambda: qcdb.set_options({'basis': 'cc-pvtz'}),
+    lambda: qcdb.set_options({'scf_type': 'df'}),
+])
+def test_miss_on_options(fake, change):
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+    change()
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+
+    assert compare_integers(2, len(fake), tnm() + ' runs')
+    assert compare_integers(0, resultcache.stats['hits'], tnm() + ' hits')
+
+
+def test_miss_on_geometry(fake):
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.74))
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.75))
+
+    assert compare_integers(2, len(fake), tnm() + ' runs')
+
+
+def test_unkeyed_options(fake):
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+    qcdb.set_options({'writer_file_label': 'elsewhere', 'memory': '2 gb'})
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+
+    assert compare_integers(1, len(fake), tnm() + ' runs')
+
+
+@pytest.mark.parametrize('optout', [
+    lambda: qcdb.set_options({'result_cache': False}),
+    pe.load_nu_options,  # off by default
+])
+def test_opt_out(fake, optout):
+    optout()
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+    qcdb.energy('fake', package='fakepkg', molecule=h2())
+
+    assert compare_integers(2, len(fake), tnm() + ' runs')
+    assert compare_integers(0, resultcache.stats['misses'], tnm() + ' untouched')
+
+
+def test_lru_eviction(fake):
+    cachedir = resultcache.cache_dir(pe.nu_options)
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.70))
+    entry = next(iter(os.scandir(cachedir)))
+    qcdb.set_options({'result_cache_size': 2.5 * entry.stat().st_size})
+
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.71))
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.70))  # hit refreshes 0.70 over 0.71
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.72))  # evicts 0.71
+    assert compare_integers(1, resultcache.stats['evictions'], tnm() + ' evictions')
+
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.70))
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.72))
+    assert compare_integers(3, len(fake), tnm() + ' runs')
+
+    qcdb.energy('fake', package='fakepkg', molecule=h2(0.71))
+    assert compare_integers(4, len(fake), tnm() + ' rerun')
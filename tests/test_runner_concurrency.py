@@ -0,0 +1,120 @@
+import os
+import sys
+import socket
+import concurrent.futures
+
+import pytest
+
+from qcdb.intf_psi4.worker import psi4_subprocess
+from qcdb.intf_nwchem.worker import nwchem_subprocess
+from qcdb.intf_dftd3.runner import dftd3_subprocess
+
+#! Many stub-program jobs at once from threads of one process mustn't see each other's files
+
+njobs = 16
+
+stub_nwchem = """
+import os, time
+with open('nwchem.nw') as handle:
+    nw = handle.read()
+time.sleep(0.05)
+print('CWD', os.getcwd())
+print(nw)
+"""
+
+stub_psi4 = """
+import sys, json, time
+with open(sys.argv[-1]) as handle:
+    rec = json.load(handle)
+time.sleep(0.05)
+rec['raw_output'] = 'echo ' + rec['marker']
+with open(sys.argv[-1], 'w') as handle:
+    json.dump(rec, handle)
+"""
+
+stub_dftd3 = """
+import os, sys, time, socket
+with open('.dftd3par.local') as handle:
+    par = handle.read()
+with open(sys.argv[1]) as handle:
+    geom = handle.read()
+time.sleep(0.05)
+print('USERPAR', os.path.exists(os.path.expanduser('~/.dftd3par.' + socket.gethostname())))
+print(par + geom)
+if '-grad' in sys.argv:
+    with open('dftd3_gradient', 'w') as handle:
+        handle.write(par)
+"""
+
+
+@pytest.fixture
+def stubs(tmp_path, monkeypatch):
+    bindir = tmp_path / 'bin'
+    bindir.mkdir()
+    for prog, text in [('nwchem', stub_nwchem), ('psi4', stub_psi4), ('dftd3', stub_dftd3)]:
+        exe = bindir / prog
+        exe.write_text('#!' + sys.executable + '\n' + text)
+        exe.chmod(0o755)
+
+    home = tmp_path / 'home'
+    home.mkdir()
+    monkeypatch.setenv('HOME', str(home))
+    monkeypatch.setenv('PSIPATH', str(bindir))
+    return home
+
+
+def _run_concurrently(fn, recs):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(recs)) as executor:
+        return list(executor.map(fn, recs))
+
+
+def _check_clean(home, cwd):
+    assert os.getcwd() == cwd
+    assert [fl.name for fl in home.iterdir() if not fl.name.startswith('.dftd3par')] == []
+
+
+def test_nwchem_concurrent(stubs):
+    cwd = os.getcwd()
+    recs = [{'command': ['nwchem'], 'nwchem.nw': 'job {}'.format(ijob)} for ijob in range(njobs)]
+
+    done = _run_concurrently(nwchem_subprocess, recs)
+
+    cwds = set()
+    for ijob, rec in enumerate(done):
+        lines = rec['stdout'].splitlines()
+        assert lines[1] == 'job {}'.format(ijob)
+        cwds.add(lines[0])
+    assert len(cwds) == njobs
+    _check_clean(stubs, cwd)
+
+
+def test_psi4_concurrent(stubs):
+    cwd = os.getcwd()
+    recs = [{'command': ['psi4', '--json'], 'json': {'marker': 'job {}'.format(ijob)}} for ijob in range(njobs)]
+
+    done = _run_concurrently(psi4_subprocess, recs)
+
+    for ijob, rec in enumerate(done):
+        assert rec['json']['raw_output'] == 'echo job {}'.format(ijob)
+        assert rec['command'] == ['psi4', '--json']
+    _check_clean(stubs, cwd)
+
+
+def test_dftd3_concurrent(stubs):
+    cwd = os.getcwd()
+    userpar = stubs / ('.dftd3par.' + socket.gethostname())
+    userpar.write_text('user params')
+
+    recs = [{
+        'command': ['dftd3', './dftd3_geometry.xyz', '-grad'],
+        'dftd3par': 'params {}\n'.format(ijob),
+        'dftd3_geometry': 'geom {}\n'.format(ijob),
+    } for ijob in range(njobs)]
+
+    done = _run_concurrently(dftd3_subprocess, recs)
+
+    for ijob, rec in enumerate(done):
+        assert rec['stdout'] == 'USERPAR False\nparams {}\ngeom {}\n\n'.format(ijob, ijob)
+        assert rec['dftd3_gradient'] == 'params {}\n'.format(ijob)
+    assert userpar.read_text() == 'user params'
+    _check_clean(stubs, cwd)
@@ -0,0 +1,63 @@
+import sys
+import time
+
+import pytest
+from .utils import *
+
+from qcdb.util import run_streaming, FatalScanner
+from qcdb.intf_nwchem.worker import nwchem_subprocess
+
+#! Program output is spooled a chunk at a time, with progress reported
+#! and the program killed as soon as a fatal line appears.
+
+_program = """
+import sys, time
+for i in range(2000):
+    print('line', i, 'x' * 60)
+print('{fatal}')
+sys.stdout.flush()
+time.sleep(30)
+print('never seen')
+"""
+
+
+def test_run_to_completion():
+    calls = []
+    rc, out, killed = run_streaming([sys.executable, '-c', 'print("a\\nb", end="")'],
+                                    progress=lambda nl, nb: calls.append((nl, nb)))
+
+    assert compare_integers(0, rc, tnm() + ' rc')
+    assert compare_strings('a\nb', out, tnm() + ' out')
+    assert compare(False, killed, tnm() + ' killed')
+    assert compare_integers(2, calls[-1][0], tnm() + ' lines')
+    assert compare_integers(3, calls[-1][1], tnm() + ' bytes')
+
+
+def test_fatal_kills_early():
+    scanner = FatalScanner([r'error in the input'])
+    calls = []
+    t0 = time.time()
+    rc, out, killed = run_streaming([sys.executable, '-c', _program.format(fatal='There is an error in the input file')],
+                                    scanner=scanner, chunksize=1024, spool=4096,
+                                    progress=lambda nl, nb: calls.append((nl, nb)))
+
+    assert time.time() - t0 < 20.
+    assert compare(True, killed, tnm() + ' killed')
+    assert compare(True, rc != 0, tnm() + ' rc')
+    assert compare_strings('There is an error in the input file', scanner.fatal, tnm() + ' fatal')
+    assert compare(True, out.startswith('line 0 '), tnm() + ' out')
+    assert compare(True, 'never seen' not in out, tnm() + ' out tail')
+    assert compare(True, calls[-1][0] >= 2000, tnm() + ' lines')
+    assert compare(True, [c[1] for c in calls] == sorted(c[1] for c in calls), tnm() + ' bytes')
+
+
+def test_nwchem_worker(tmp_path):
+    nwchemrec = {
+        'command': [sys.executable, '-c', _program.format(fatal='There is an error in the input file')],
+        'nwchem.nw': 'echo\n',
+        'scratch_location': str(tmp_path / 'scr'),
+    }
+    nwchem_subprocess(nwchemrec)
+
+    assert compare_strings('There is an error in the input file', nwchemrec['fatal'], tnm() + ' fatal')
+    assert compare(True, len(nwchemrec['stdout'].splitlines()) > 2000, tnm() + ' stdout')
@@ -0,0 +1,164 @@
+import io
+import contextlib
+
+import numpy as np
+from qcelemental import Datum
+from .utils import *
+from .addons import *
+
+from qcdb import vib
+
+#! Batched harmonic analysis over stacked Hessians and masses, and batched
+#! thermochemistry over analyses and conditions, against the one-at-a-time paths.
+
+
+def _spring_hessian(geom, rs):
+    """Hessian of harmonic springs between all atom pairs (free of T & R)."""
+
+    nat = len(geom)
+    hess = np.zeros((3 * nat, 3 * nat))
+    for i in range(nat):
+        for j in range(i + 1, nat):
+            e = geom[i] - geom[j]
+            blk = rs.uniform(0.1, 0.6) * np.outer(e, e) / np.dot(e, e)
+            for a, b, sign in [(i, i, 1), (j, j, 1), (i, j, -1), (j, i, -1)]:
+                hess[3 * a:3 * a + 3, 3 * b:3 * b + 3] += sign * blk
+    return hess
+
+
+def test_isotopologues_diatomic():
+    geom = np.array([[0., 0., -0.7], [0., 0., 0.7]])
+    hess = _spring_hessian(geom, np.random.RandomState(1))
+    mass = np.array([[1.007825, 1.007825], [2.014102, 2.014102], [1.007825, 2.014102]])
+
+    vibinfo, text = vib.harmonic_analysis_batch(hess, geom, mass)
+
+    assert compare_integers(3, len(vibinfo['omega'].data), tnm() + ' nb')
+    assert compare_strings('TR TR TR TR TR V', ' '.join(vibinfo['TRV'].data[1]), tnm() + ' TRV')
+
+    omega = vibinfo['omega'].data[:, -1].real
+    mu = vibinfo['mu'].data[:, -1]
+    assert compare_values(np.sqrt(2.014102 / 1.007825), omega[0] / omega[1], 6, tnm() + ' H2/D2')
+    assert compare_values(1.007825, mu[0], 6, tnm() + ' H2 mu')
+    assert compare_values(1.007825 * 2.014102 * (1.007825 + 2.014102) / (1.007825**2 + 2.014102**2), mu[2], 6,
+                          tnm() + ' HD mu')
+
+
+def test_ensemble_matches_singles():
+    rs = np.random.RandomState(2)
+    geoms = np.stack([rs.uniform(-2., 2., (4, 3)) for _ in range(3)])
+    hesss = np.stack([_spring_hessian(geom, rs) for geom in geoms])
+    mass = rs.uniform(1., 16., 4)
+    dipder = rs.uniform(-1., 1., (3, 3, 12))
+
+    vibinfo, text = vib.harmonic_analysis_batch(hesss, geoms, mass, dipder=dipder)
+
+    for ib in range(3):
+        single, _ = vib.harmonic_analysis_batch(hesss[ib], geoms[ib], mass, dipder=dipder[ib])
+        v = single['TRV'].data[0] == 'V'
+        for asp in ['omega', 'mu', 'k', 'IR_intensity', 'theta_vib']:
+            assert compare_arrays(single[asp].data[0][v], vibinfo[asp].data[ib][v], 8, tnm() + ' ' + asp)
+        assert compare_arrays(single['x'].data[0][:, v], vibinfo['x'].data[ib][:, v], 8, tnm() + ' x')
+
+
+@using_psi4
+def test_batch_of_one_matches_harmonic_analysis():
+    import psi4
+
+    mol = psi4.geometry("""
+O
+H 1 0.96
+H 1 0.96 2 104.5
+""")
+    mol.update_geometry()
+    geom = np.asarray(mol.geometry())
+    mass = np.array([mol.mass(at) for at in range(mol.natom())])
+    irrep_labels = mol.irrep_labels()
+    basisset = psi4.core.Wavefunction.build(mol, "STO-3G").basisset()
+
+    rs = np.random.RandomState(4)
+    hess = _spring_hessian(geom, rs)
+    dipder = rs.uniform(-1., 1., (3, 9))
+
+    ref, _ = vib.harmonic_analysis(hess, geom, mass, basisset, irrep_labels, dipder=dipder)
+    vibinfo, _ = vib.harmonic_analysis_batch(hess, geom, mass, basisset, irrep_labels, dipder=dipder)
+
+    v = np.asarray(ref['TRV'].data) == 'V'
+    assert compare_strings(' '.join(ref['TRV'].data), ' '.join(vibinfo['TRV'].data[0]), tnm() + ' TRV')
+    assert compare_strings(' '.join(str(g) for g in ref['gamma'].data),
+                           ' '.join(str(g) for g in vibinfo['gamma'].data[0]), tnm() + ' gamma')
+    for asp in ['omega', 'mu', 'k', 'DQ0', 'Qtp0', 'Xtp0', 'theta_vib', 'IR_intensity']:
+        assert compare_arrays(ref[asp].data[v], vibinfo[asp].data[0][v], 8, tnm() + ' ' + asp)
+    for asp in ['q', 'w', 'x']:
+        assert compare_arrays(ref[asp].data[:, v], vibinfo[asp].data[0][:, v], 8, tnm() + ' ' + asp)
+
+
+def test_thermo_batch():
+    rs = np.random.RandomState(3)
+    geom = rs.uniform(-2., 2., (4, 3))
+    hess = _spring_hessian(geom, rs)
+    mass = np.stack([rs.uniform(1., 16., 4) for _ in range(2)])
+    vibinfo, _ = vib.harmonic_analysis_batch(hess, geom, mass)
+
+    T = np.array([200., 298.15, 500.])
+    P = np.array([[101325.], [100000.]])
+    E0 = np.array([-76.02, -76.03])
+    rot_const = np.array([[10., 8., 2.], [9., 7., 1.5]])
+    kwargs = {'multiplicity': 1, 'sigma': 2, 'rotor_type': 'RT_ASYMMETRIC_TOP'}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        therminfo, text = vib.thermo(vibinfo, T, P, molecular_mass=mass.sum(axis=1), E0=E0, rot_const=rot_const,
+                                     **kwargs)
+    assert compare_integers(2 * 2 * 3, therminfo['G_tot'].data.size, tnm() + ' shape')
+
+    for ib in range(2):
+        single = {asp: Datum(d.label, d.units, d.data[ib], numeric=d.numeric) for asp, d in vibinfo.items()}
+        with contextlib.redirect_stdout(io.StringIO()):
+            ref, _ = vib.thermo(single, T[1], P[1, 0], molecular_mass=mass[ib].sum(), E0=E0[ib],
+                                rot_const=rot_const[ib], **kwargs)
+        for piece in ['ZPE_vib', 'S_tot', 'Cp_tot', 'H_tot', 'G_tot']:
+            assert compare_values(ref[piece].data, therminfo[piece].data[ib, 1, 1], 10, tnm() + ' ' + piece)
+
+
+def test_thermo_single():
+    rs = np.random.RandomState(4)
+    geom = rs.uniform(-2., 2., (4, 3))
+    hess = _spring_hessian(geom, rs)
+    mass = rs.uniform(1., 16., 4)
+    vibinfo, _ = vib.harmonic_analysis_batch(hess, geom, mass)
+    single = {asp: Datum(d.label, d.units, d.data[0], numeric=d.numeric) for asp, d in vibinfo.items()}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        therminfo, text = vib.thermo(single, 298.15, 101325., molecular_mass=mass.sum(), E0=-76.02, multiplicity=2,
+                                     sigma=2, rot_const=np.array([10., 8., 2.]), rotor_type='RT_ASYMMETRIC_TOP')
+
+    # reference from the scalar thermo() before it was computed through _thermo_batch
+    ref = {
+        'S_elec': 0.002195065763563795,
+        'S_trans': 0.05891695182686151,
+        'S_rot': 0.021668379494682217,
+        'S_vib': 0.002510875405837487,
+        'S_tot': 0.08529127249094501,
+        'Cv_tot': 0.014137796693609886,
+        'Cp_tot': 0.01730460718512852,
+        'ZPE_vib': 0.02350544610349517,
+        'ZPE_tot': -75.9964945538965,
+        'E_corr': 0.026859917194643243,
+        'E_tot': -75.99314008280535,
+        'H_trans': 0.002360461370115701,
+        'H_tot': -75.99219589825731,
+        'G_elec': -0.0006544588574065455,
+        'G_rot': -0.005044150524270083,
+        'G_corr': 0.002374508849514269,
+        'G_tot': -76.01762549115048,
+    }
+    for piece, val in ref.items():
+        assert compare_values(val, therminfo[piece].data, 12, tnm() + ' ' + piece)
+    assert compare_integers(0, len([k for k in therminfo if k.endswith('_corr') and k[0] in 'SC']), tnm() + ' no S corr')
+
+    for line in [
+            """  Correction S              0.000 [cal/(mol K)]        0.000 [J/(mol K)]       0.00000000 [mEh/K]""",
+            """    Vibrational ZPE        14.750 [kcal/mol]       61.714 [kJ/mol]       0.02350545 [Eh]        5158.849 [cm^-1]""",
+            """  Total G, Free enthalpy at  298.15 [K]                                -76.01762549 [Eh]""",
+    ]:
+        assert compare_integers(1, text.count(line + '\n'), tnm() + ' ' + line.split('[')[0].strip())
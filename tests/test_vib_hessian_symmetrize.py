@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from .utils import *
+
+import qcdb
+from qcdb import vib
+from qcdb.molecule.libmintsmolecule import compute_atom_map
+
+#! Hessian symmetrization under the Abelian point group, checked against an
+#! atom-pair-wise application of each operation and for idempotence.
+
+
+def _pairwise_symmetrize(hess, mol):
+    ct = mol.point_group().char_table()
+    atom_map = compute_atom_map(mol)
+    nat = mol.natom()
+
+    tot = np.zeros_like(hess)
+    for g in range(ct.order()):
+        sym = np.asarray(ct.symm_operation(g).d)
+        for iat in range(nat):
+            for jat in range(nat):
+                ig = atom_map[iat][g]
+                jg = atom_map[jat][g]
+                tot[3 * iat:3 * iat + 3, 3 * jat:3 * jat + 3] += sym.dot(hess[3 * ig:3 * ig + 3, 3 * jg:3 * jg + 3].dot(sym))
+    return tot / ct.order()
+
+
+_c2h4 = """
+C 0 0  0.6695
+C 0 0 -0.6695
+H 0  0.9289  1.2321
+H 0 -0.9289  1.2321
+H 0  0.9289 -1.2321
+H 0 -0.9289 -1.2321
+"""
+
+_nh3 = """
+N  0     0     0.1
+H  0.94  0    -0.3
+H -0.47  0.81 -0.3
+H -0.47 -0.81 -0.3
+"""
+
+
+@pytest.mark.parametrize('geom,pg', [(_c2h4, 'd2h'), (_nh3, 'cs')])
+def test_hessian_symmetrize(geom, pg):
+    mol = qcdb.Molecule(geom)
+    mol.update_geometry()
+    assert compare_strings(pg, mol.schoenflies_symbol(), tnm() + ' point group')
+
+    nat3 = 3 * mol.natom()
+    hess = np.random.RandomState(4).uniform(-1., 1., (nat3, nat3))
+    hess = hess + hess.T
+
+    symm = vib.hessian_symmetrize(hess, mol)
+    assert compare_arrays(_pairwise_symmetrize(hess, mol), symm, 12, tnm() + ' pairwise')
+    assert compare_arrays(symm, vib.hessian_symmetrize(symm, mol), 12, tnm() + ' idempotent')
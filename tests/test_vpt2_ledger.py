@@ -0,0 +1,117 @@
+import os
+import uuid
+
+import pytest
+from .utils import *
+
+from qcdb.util import run_graph
+from qcdb.driver.vpt2 import VPT2Ledger, vpt2_job_graph
+
+#! vpt2 job graph run over a ledger by stand-in stages that generate
+#! displacements as Cfour would, serially and concurrently, and resumed
+#! after an interruption without recomputing finished displacements.
+
+_fail_after = [None]
+
+
+def _make_job(ledger, calls):
+    """Stand-in for the job runner of vpt2: setups record displacement ZMATs, gradients record FJOBARCs."""
+
+    def run_job(job):
+        if _fail_after[0] is not None and len(os.listdir(calls)) >= _fail_after[0]:
+            raise RuntimeError('interrupted')
+        with open(os.path.join(calls, job + '.' + str(uuid.uuid4())), 'w') as handle:
+            handle.write(job)
+
+        if job == 'harmonic-setup':
+            for zm2 in ['001', '002', '003']:
+                ledger['zmat']['000-' + zm2] = 'zmat ' + zm2
+        elif job == 'harmonic':
+            assert all(('000-' + zm2) in ledger['fjobarc'] for zm2 in ['001', '002', '003'])
+            for zm1 in ['001', '002']:
+                ledger['zmat'][zm1 + '-000'] = 'zmat ' + zm1
+        elif job.endswith('-setup'):
+            for zm2 in ['001', '002', '003', '004']:
+                ledger['zmat'][job[:3] + '-' + zm2] = 'zmat ' + zm2
+        elif job == 'anharmonic':
+            assert len(ledger['fjobarc']) == 11
+        else:
+            ledger['fjobarc'][job] = 'fjobarc ' + ledger['zmat'][job]
+            return
+        ledger['stages'][job] = True
+
+    return run_job
+
+
+def _run(path, nproc):
+    ledger = VPT2Ledger(os.path.join(path, 'vpt2scratch.ledger'))
+    calls = os.path.join(path, 'calls')
+    os.makedirs(calls, exist_ok=True)
+    if '000-000' not in ledger['zmat']:
+        ledger['zmat']['000-000'] = 'zmat 000'
+
+    remaining = run_graph(lambda: vpt2_job_graph(ledger['zmat'].keys()),
+                          _make_job(ledger, calls),
+                          lambda: set(ledger['stages'].keys()) | set(ledger['fjobarc'].keys()),
+                          nproc=nproc)
+    ran = sorted(fl.split('.')[0] for fl in os.listdir(calls))
+    return ledger, remaining, ran
+
+
+def test_vpt2_job_graph():
+    graph = vpt2_job_graph(['000-000', '000-001', '000-002', '001-000', '001-001', '002-000'])
+
+    assert compare(['harmonic-setup', '000-001', '000-002', 'harmonic', '001-setup', '002-setup', '001-001', 'anharmonic'],
+                   list(graph), tnm() + ' jobs')
+    assert compare(['harmonic-setup', '000-001', '000-002'], graph['harmonic'], tnm() + ' harmonic')
+    assert compare(['001-setup'], graph['001-001'], tnm() + ' displaced gradient')
+    assert compare(['harmonic', '001-setup', '002-setup', '001-001'], graph['anharmonic'], tnm() + ' anharmonic')
+
+
+@pytest.mark.parametrize('nproc', [1, 4])
+def test_vpt2_ledger_graph(tmp_path, nproc):
+    ledger, remaining, ran = _run(str(tmp_path), nproc)
+
+    assert compare([], remaining, tnm() + ' complete')
+    assert compare_integers(3 + 8, len(ledger['fjobarc']), tnm() + ' gradients')
+    assert compare(['001-setup', '002-setup', 'anharmonic', 'harmonic', 'harmonic-setup'],
+                   ledger['stages'].keys(), tnm() + ' stages')
+    assert compare(sorted(set(ran)), ran, tnm() + ' each job once')
+    assert compare_strings('fjobarc zmat 004', ledger['fjobarc']['002-004'], tnm() + ' record')
+    assert compare([], [fl for fl in os.listdir(str(tmp_path / 'vpt2scratch.ledger' / 'fjobarc')) if not fl.endswith('.json')],
+                   tnm() + ' no partial entries')
+
+
+@pytest.mark.parametrize('nproc', [1, 3])
+def test_vpt2_ledger_resume(tmp_path, nproc):
+    _fail_after[0] = 9
+    try:
+        with pytest.raises(RuntimeError):
+            _run(str(tmp_path), nproc)
+    finally:
+        _fail_after[0] = None
+
+    ledger = VPT2Ledger(str(tmp_path / 'vpt2scratch.ledger'))
+    finished = ledger['fjobarc'].keys()
+    assert len(finished) > 3, tnm() + ' some gradients finished before interruption'
+
+    ledger, remaining, ran = _run(str(tmp_path), nproc)
+    assert compare([], remaining, tnm() + ' complete')
+    for item in finished:
+        assert compare_integers(1, ran.count(item), tnm() + ' not recomputed ' + item)
+    assert compare_integers(3 + 8, len(ledger['fjobarc']), tnm() + ' gradients')
+
+
+def test_vpt2_ledger_stall(tmp_path):
+    ledger = VPT2Ledger(str(tmp_path))
+    ledger['zmat']['000-000'] = 'zmat 000'
+    ledger['zmat']['000-001'] = 'zmat 001'
+    ledger['stages']['harmonic-setup'] = True
+
+    remaining = run_graph(lambda: vpt2_job_graph(ledger['zmat'].keys()), lambda job: None,
+                          lambda: set(ledger['stages'].keys()) | set(ledger['fjobarc'].keys()))
+    assert compare(['000-001', 'harmonic', 'anharmonic'], remaining, tnm() + ' awaiting sown job')
+
+    with pytest.raises(KeyError):
+        ledger['fjobarc']['000-001']
+    assert compare('zmat 001', ledger['zmat']['000-001'], tnm() + ' reopened')